@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+預先建立字母素材圖集(letter atlas)。
+
+目的：
+    將字母素材目錄（預設 `assets/AZ`，或環境變數 `SPELLVID_LETTER_ASSET_DIR`）
+    中的所有字母一次縮放到佈局的目標尺寸，寫入快取目錄中的單一圖集檔。
+    渲染時會自動建立圖集；此腳本可在批次前先建立，或加入額外高度
+    （額外高度記錄在圖集索引中，素材變更後自動重建時會沿用）。
+
+範例用法（PowerShell）：
+    # 使用預設素材目錄
+    python scripts/build_letter_atlas.py
+
+    # 指定素材目錄並額外預先縮放 200px、160px 高度
+    python scripts/build_letter_atlas.py --asset-dir assets/AZ --extra-heights 200,160
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from spellvid.application.context_builder import (  # noqa: E402
+    resolve_letter_asset_dir,
+)
+from spellvid.infrastructure.rendering.letter_atlas import (  # noqa: E402
+    build_letter_atlas,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="建立字母素材圖集")
+    parser.add_argument("--asset-dir", help="字母素材目錄")
+    parser.add_argument(
+        "--extra-heights", default="",
+        help="額外預先縮放的高度,以逗號分隔(例如 200,160)",
+    )
+    args = parser.parse_args(argv)
+
+    asset_dir = args.asset_dir or resolve_letter_asset_dir(None)
+    heights = [int(h) for h in args.extra_heights.split(",") if h.strip()]
+    atlas = build_letter_atlas(asset_dir, extra_heights=heights)
+    if atlas is None:
+        print(f"找不到可用的字母素材: {asset_dir}")
+        return 1
+    print(f"已建立圖集: {atlas.data_path} ({len(atlas.index['files'])} 個字母)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,8 @@
 
 此模組協調領域層與基礎設施層:
 - video_service.py: 視頻生成服務
+- render_plan.py: 渲染計畫編譯器(可序列化的 RenderPlan)
 - batch_service.py: 批次處理服務
+- batch_manifest.py: 批次渲染清單(增量渲染的項目指紋)
 - resource_checker.py: 資源完整性檢查
 """
@@ -0,0 +1,150 @@
+"""批次渲染清單(manifest)
+
+中斷或部分失敗的批次重新執行時,不需要重新渲染已完成的項目。
+清單存放於輸出目錄的 spellvid_manifest.json,以輸出檔名為鍵,
+記錄每個項目的指紋與狀態:
+
+- 指紋:正規化後的 VideoConfig、是否保留片尾、素材檔案
+  (圖片、音樂、背景視頻、片頭/片尾、字母圖片)的路徑/大小/修改時間,
+  以及 video_service.RENDERER_VERSION
+- 狀態:"rendered" 或 "failed"(附錯誤訊息)
+
+重新執行時,輸出檔存在且指紋未變的 "rendered" 項目會被跳過。
+
+Example:
+    >>> manifest = BatchManifest.load("out/")
+    >>> fp = item_fingerprint(config, skip_ending=True)
+    >>> manifest.is_current("Ice.mp4", fp, "out/Ice.mp4")
+    False
+    >>> manifest.record("Ice.mp4", fp, "rendered")
+    >>> manifest.save()
+"""
+
+import dataclasses
+import json
+import os
+import stat
+from typing import Any, Dict, Optional
+
+from spellvid.application.context_builder import (
+    _resolve_ending_video_path,
+    _resolve_entry_video_path,
+    resolve_letter_asset_dir,
+)
+from spellvid.application.video_service import RENDERER_VERSION
+from spellvid.domain.layout import _letter_asset_filename
+from spellvid.infrastructure.media.cache import cache_key
+from spellvid.shared.types import VideoConfig
+
+# 清單檔名(位於輸出目錄)
+MANIFEST_NAME = "spellvid_manifest.json"
+
+# 清單格式變更時遞增
+MANIFEST_VERSION = 1
+
+
+def _asset_fingerprint(path: Optional[str]) -> Optional[Dict[str, Any]]:
+    """素材的路徑、大小與修改時間(不存在時只記路徑)
+
+    直接 stat 磁碟上的檔案而不經 AssetIndex:清單的用途就是偵測變動,
+    不能使用批次開始前索引的結果。
+    """
+    if not path:
+        return None
+    abs_path = os.path.abspath(str(path))
+    try:
+        info = os.stat(abs_path)
+    except OSError:
+        info = None
+    if info is None or not stat.S_ISREG(info.st_mode):
+        return {"path": abs_path, "missing": True}
+    return {"path": abs_path, "size": int(info.st_size),
+            "mtime_ns": int(info.st_mtime_ns)}
+
+
+def item_fingerprint(config: VideoConfig, skip_ending: bool) -> str:
+    """計算批次項目的指紋
+
+    Args:
+        config: 視頻配置
+        skip_ending: 此項目是否省略片尾
+
+    Returns:
+        固定長度的雜湊字串
+    """
+    normalized = dataclasses.asdict(config)
+    normalized.pop("output_path", None)
+    letter_dir = resolve_letter_asset_dir()
+    letter_files = sorted({
+        name for name in map(_letter_asset_filename, config.letters or "")
+        if name
+    })
+    assets = {
+        "image": _asset_fingerprint(config.image_path),
+        "music": _asset_fingerprint(config.music_path),
+        "video": _asset_fingerprint(config.video_path),
+        "entry": _asset_fingerprint(_resolve_entry_video_path()),
+        "ending": None if skip_ending else _asset_fingerprint(
+            _resolve_ending_video_path()),
+        "letters": [
+            _asset_fingerprint(os.path.join(letter_dir, name))
+            for name in letter_files
+        ],
+    }
+    return cache_key(RENDERER_VERSION, normalized, bool(skip_ending), assets)
+
+
+class BatchManifest:
+    """輸出目錄中的批次清單
+
+    Args:
+        path: 清單檔路徑
+        entries: {輸出檔名: {"fingerprint", "status", "error"?}}
+    """
+
+    def __init__(self, path: str,
+                 entries: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+
+    @classmethod
+    def load(cls, output_dir: str) -> "BatchManifest":
+        """讀取輸出目錄的清單(不存在或格式不符時為空清單)"""
+        path = os.path.join(output_dir, MANIFEST_NAME)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return cls(path)
+        if not isinstance(data, dict) or \
+                data.get("version") != MANIFEST_VERSION:
+            return cls(path)
+        return cls(path, dict(data.get("items") or {}))
+
+    def is_current(self, name: str, fingerprint: str,
+                   output_path: str) -> bool:
+        """項目是否已以相同指紋成功渲染,且輸出檔仍存在"""
+        entry = self.entries.get(name)
+        return (
+            entry is not None
+            and entry.get("status") == "rendered"
+            and entry.get("fingerprint") == fingerprint
+            and os.path.isfile(output_path)
+        )
+
+    def record(self, name: str, fingerprint: str, status: str,
+               error: Optional[str] = None) -> None:
+        """記錄項目的渲染結果"""
+        entry: Dict[str, Any] = {"fingerprint": fingerprint,
+                                 "status": status}
+        if error:
+            entry["error"] = error
+        self.entries[name] = entry
+
+    def save(self) -> None:
+        """以暫存檔加原子替換寫入清單"""
+        partial = f"{self.path}.{os.getpid()}.partial"
+        with open(partial, "w", encoding="utf-8") as handle:
+            json.dump({"version": MANIFEST_VERSION, "items": self.entries},
+                      handle, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(partial, self.path)
@@ -5,58 +5,219 @@
 主要功能:
 - render_batch(): 批次渲染多支視頻
 - 失敗處理:單支失敗不中斷批次
-- 片尾管理:最後一支視頻才加片尾
+- 片尾管理:最後一支視頻才加片尾(預讀一項判斷,不需事先知道總數)
+- 串流輸入:configs 可為任意迭代器,讀到第一項即開始渲染,
+  記憶體用量不隨批次大小成長
+- 平行渲染:workers > 1 時使用行程池,結果依輸入順序回傳
+- 增量渲染:輸出目錄的清單(見 batch_manifest)記錄每個項目的指紋,
+  重新執行時跳過輸出已存在且指紋未變的項目
+- 預先編譯:每個項目的 RenderPlan 先在主行程編譯,再交給工作行程
+- 計時:主行程各階段與每個項目的步驟計時放在 metadata["profile"]
 """
 
+import contextlib
+import itertools
 import os
-from typing import Any, Dict, List
-
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from spellvid.infrastructure.media.asset_index import asset_index_scope
+from spellvid.shared.profiling import RenderProfiler
 from spellvid.shared.types import VideoConfig
+from spellvid.application.batch_manifest import (
+    BatchManifest,
+    item_fingerprint,
+)
+from spellvid.application.render_plan import (
+    RenderPlan,
+    compile_render_plan,
+    config_to_item,
+)
 from spellvid.application.video_service import render_video
 
 
+def _config_summary(config: VideoConfig) -> Dict[str, Any]:
+    """擷取結果中回報用的 config 摘要"""
+    return {
+        "word_en": config.word_en,
+        "word_zh": config.word_zh,
+        "letters": config.letters,
+    }
+
+
+def _failure_result(idx: int, config: VideoConfig, output_path: str,
+                    error: Any) -> Dict[str, Any]:
+    """單支失敗的結果 dict"""
+    return {
+        "success": False,
+        "index": idx,
+        "output_path": output_path,
+        "error": str(error),
+        "config": _config_summary(config),
+    }
+
+
+def _render_batch_item(
+    idx: int,
+    config: VideoConfig,
+    output_path: str,
+    dry_run: bool,
+    skip_ending: bool,
+    plan: Optional[RenderPlan] = None,
+) -> Dict[str, Any]:
+    """渲染批次中的單一項目並回傳結果 dict
+
+    此函數為模組層級函數,可被 ProcessPoolExecutor pickle 後於子行程執行。
+    任何例外都會被轉為失敗結果,確保單支失敗不中斷批次。
+
+    Args:
+        idx: 項目在批次中的索引
+        config: 視頻配置
+        output_path: 輸出檔案路徑
+        dry_run: True 則僅計算 metadata 不渲染
+        skip_ending: 是否跳過片尾
+        plan: 主行程預先編譯的 RenderPlan(None 則由 config 編譯)
+
+    Returns:
+        單支視頻結果 dict (含 index 與 config 摘要)
+    """
+    try:
+        result = render_video(
+            config=config,
+            output_path=output_path,
+            dry_run=dry_run,
+            skip_ending=skip_ending,
+            plan=plan,
+        )
+        result["index"] = idx
+        result["config"] = _config_summary(config)
+        return result
+    except Exception as e:
+        # 單支失敗不中斷批次
+        return _failure_result(idx, config, output_path, e)
+
+
+# 工作行程的素材索引範圍 (行程只服務一個批次,結束時隨行程釋放)
+_worker_scope: Optional[contextlib.ExitStack] = None
+
+
+def _init_batch_worker() -> None:
+    """行程池初始化:工作行程內的所有項目共用一個素材索引"""
+    global _worker_scope
+    _worker_scope = contextlib.ExitStack()
+    _worker_scope.enter_context(asset_index_scope())
+
+
+def _with_last_flag(
+    configs: Iterable[VideoConfig],
+) -> Iterator[Tuple[int, VideoConfig, bool]]:
+    """依序產生 (索引, config, 是否為最後一項)
+
+    預讀一項來判斷最後一項,輸入可以是長度未知的迭代器。
+    """
+    iterator = iter(configs)
+    try:
+        current = next(iterator)
+    except StopIteration:
+        return
+    idx = 0
+    for upcoming in iterator:
+        yield idx, current, False
+        idx += 1
+        current = upcoming
+    yield idx, current, True
+
+
+# 清單寫入間隔(秒)的下限;實際間隔至少為上次寫入耗時的 10 倍,
+# 讓大型清單的重寫成本維持在渲染時間的一小部分
+MANIFEST_SAVE_INTERVAL = 1.0
+
+# 平行模式中每個工作行程可排隊的項目數 (限制已讀入但未完成的項目)
+PENDING_PER_WORKER = 2
+
+
 def render_batch(
-    configs: List[VideoConfig],
+    configs: Iterable[VideoConfig],
     output_dir: str,
     dry_run: bool = False,
     entry_hold: float = 0.0,
     skip_ending_per_video: bool = True,
+    workers: int = 1,
+    force: bool = False,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> Dict[str, Any]:
     """批次渲染多支視頻
 
-    按順序渲染多支視頻,單支失敗不中斷批次處理。
+    單支失敗不中斷批次處理。workers > 1 時以行程池平行渲染,
+    結果仍依輸入順序回傳。
+
+    configs 以串流方式讀取:讀到第一項就開始渲染,最後一項以預讀
+    一項判斷,平行模式最多只保留 workers × PENDING_PER_WORKER 個
+    進行中的項目。傳入 on_result 時,結果依輸入順序交給回呼而不保留
+    在回傳值中,記憶體用量不隨批次大小成長。
+
+    非 dry-run 時,輸出目錄中的清單記錄每個項目的指紋;輸出檔存在且
+    指紋未變的項目直接回報為 skipped(force=True 時一律重新渲染)。
+    清單在渲染過程中定期寫入並於結束時寫入,中斷的批次重新執行即可接續。
 
     Args:
-        configs: VideoConfig 列表
+        configs: VideoConfig 的列表或迭代器
         output_dir: 輸出目錄
         dry_run: True 則僅計算 metadata 不渲染
         entry_hold: 片頭保留時間(秒)
         skip_ending_per_video: True 則只有最後一支視頻有片尾
+        workers: 平行渲染的行程數 (1 = 依序渲染, 預設: 1)
+        force: True 則忽略清單,重新渲染所有項目
+        on_result: 每個項目完成時以結果 dict 呼叫(依輸入順序);
+            指定時回傳值的 results 為空列表
 
     Returns:
         批次結果摘要:
         - total: int (總數)
-        - success: int (成功數)
+        - success: int (成功數,含 skipped)
+        - rendered: int (實際渲染數)
+        - skipped: int (未變動而跳過的數量)
         - failed: int (失敗數)
-        - results: List[dict] (每支視頻結果)
+        - results: List[dict] (每支視頻結果,依輸入順序;渲染的項目
+          在 metadata["profile"] 含各步驟計時)
+        - metadata: dict (profile: 主行程的 manifest / compile_plans /
+          render 階段累計計時)
 
     Raises:
         FileNotFoundError: 輸出目錄不存在且無法建立
+        ValueError: workers 小於 1
 
     Example:
         >>> configs = [
         ...     VideoConfig(letters="A a", word_en="Apple", word_zh="蘋果"),
         ...     VideoConfig(letters="B b", word_en="Ball", word_zh="球"),
         ... ]
-        >>> result = render_batch(configs, "out/", dry_run=True)
+        >>> result = render_batch(configs, "out/", dry_run=True, workers=2)
         >>> result["total"]
         2
     """
-    # 驗證參數
-    if not configs:
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+
+    # 驗證參數 (預讀第一項,空輸入不建立輸出目錄)
+    items = _with_last_flag(configs)
+    first = next(items, None)
+    if first is None:
         return {
             "total": 0,
             "success": 0,
+            "rendered": 0,
+            "skipped": 0,
             "failed": 0,
             "results": [],
             "status": "empty",
@@ -70,62 +231,149 @@ def render_batch(
             f"Cannot create output dir: {output_dir}"
         ) from e
 
-    # 批次處理
+    profiler = RenderProfiler(label="batch")
     results: List[Dict[str, Any]] = []
-    success_count = 0
-    failed_count = 0
+    counts = {"total": 0, "success": 0, "skipped": 0}
+    # 已完成但前面還有未完成項目的結果 (平行模式依輸入順序送出)
+    finished: Dict[int, Dict[str, Any]] = {}
+    next_index = 0
+    fingerprints: Dict[int, str] = {}
+    save_state = {"dirty": False, "last": time.perf_counter(), "cost": 0.0}
+
+    # 素材索引在整個批次內共用 (含讀取輸入時的資源檢查)
+    with asset_index_scope():
+        with profiler.accumulate("manifest"):
+            manifest = None if dry_run else BatchManifest.load(output_dir)
+
+        def _save_manifest(final: bool = False) -> None:
+            if manifest is None or not save_state["dirty"]:
+                return
+            now = time.perf_counter()
+            interval = max(MANIFEST_SAVE_INTERVAL, 10 * save_state["cost"])
+            if not final and now - save_state["last"] < interval:
+                return
+            manifest.save()
+            save_state["last"] = time.perf_counter()
+            save_state["cost"] = save_state["last"] - now
+            save_state["dirty"] = False
+
+        def _finish(idx: int, result: Dict[str, Any],
+                    record: bool = True) -> None:
+            nonlocal next_index
+            fingerprint = fingerprints.pop(idx, None)
+            if record and manifest is not None and fingerprint is not None:
+                ok = bool(result.get("success", False))
+                manifest.record(
+                    os.path.basename(result["output_path"]), fingerprint,
+                    "rendered" if ok else "failed",
+                    None if ok else str(result.get("error", "")),
+                )
+                save_state["dirty"] = True
+                _save_manifest()
+            finished[idx] = result
+            while next_index in finished:
+                done = finished.pop(next_index)
+                next_index += 1
+                if done.get("success", False):
+                    counts["success"] += 1
+                if done.get("skipped", False):
+                    counts["skipped"] += 1
+                if on_result is not None:
+                    on_result(done)
+                else:
+                    results.append(done)
 
-    for idx, config in enumerate(configs):
-        # 決定是否跳過片尾
-        is_last = (idx == len(configs) - 1)
-        skip_ending = (not is_last) if skip_ending_per_video else False
+        executor: Optional[ProcessPoolExecutor] = None
+        in_flight: Dict[Any, Tuple[int, VideoConfig, str]] = {}
 
-        # 建立輸出路徑
-        output_filename = f"{config.word_en}.mp4"
-        output_path = os.path.join(output_dir, output_filename)
+        def _collect() -> None:
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                idx, config, output_path = in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # 子行程異常終止 (如 BrokenProcessPool) 也只記為單支失敗
+                    result = _failure_result(idx, config, output_path, e)
+                _finish(idx, result)
 
         try:
-            # 渲染視頻
-            result = render_video(
-                config=config,
-                output_path=output_path,
-                dry_run=dry_run,
-                skip_ending=skip_ending,
-            )
-
-            result["index"] = idx
-            result["config"] = {
-                "word_en": config.word_en,
-                "word_zh": config.word_zh,
-                "letters": config.letters,
-            }
-            results.append(result)
-
-            if result.get("success", False):
-                success_count += 1
-            else:
-                failed_count += 1
-
-        except Exception as e:
-            # 單支失敗不中斷批次
-            failed_count += 1
-            results.append({
-                "success": False,
-                "index": idx,
-                "output_path": output_path,
-                "error": str(e),
-                "config": {
-                    "word_en": config.word_en,
-                    "word_zh": config.word_zh,
-                    "letters": config.letters,
-                },
-            })
+            for idx, config, is_last in itertools.chain([first], items):
+                counts["total"] += 1
+                # 片尾規則:只有最後一項保留片尾
+                skip_ending = (not is_last) if skip_ending_per_video else False
+                output_path = os.path.join(output_dir, f"{config.word_en}.mp4")
+
+                # 增量渲染:比對清單,跳過未變動的項目
+                with profiler.accumulate("manifest"):
+                    skipped = False
+                    if manifest is not None:
+                        fingerprints[idx] = item_fingerprint(
+                            config, skip_ending)
+                        skipped = not force and manifest.is_current(
+                            os.path.basename(output_path), fingerprints[idx],
+                            output_path)
+                if skipped:
+                    fingerprints.pop(idx, None)
+                    _finish(idx, {
+                        "success": True,
+                        "skipped": True,
+                        "index": idx,
+                        "output_path": output_path,
+                        "status": "skipped",
+                        "config": _config_summary(config),
+                    }, record=False)
+                    continue
+
+                # 在主行程編譯計畫 (編譯失敗只記為單支失敗)
+                with profiler.accumulate("compile_plans"):
+                    try:
+                        plan = compile_render_plan(
+                            config_to_item(config), skip_ending=skip_ending,
+                            prefetch_content=not dry_run)
+                    except Exception as e:
+                        _finish(idx, _failure_result(idx, config,
+                                                     output_path, e))
+                        continue
+
+                job = (idx, config, output_path, dry_run, skip_ending, plan)
+                with profiler.accumulate("render"):
+                    if workers <= 1:
+                        _finish(idx, _render_batch_item(*job))
+                        continue
+                    if executor is None:
+                        executor = ProcessPoolExecutor(
+                            max_workers=workers,
+                            initializer=_init_batch_worker)
+                    while len(in_flight) >= workers * PENDING_PER_WORKER:
+                        _collect()
+                    try:
+                        future = executor.submit(_render_batch_item, *job)
+                    except Exception as e:
+                        # 行程池已損壞時,後續項目逐一記為失敗
+                        _finish(idx, _failure_result(idx, config, output_path,
+                                                     e))
+                        continue
+                    in_flight[future] = (idx, config, output_path)
+
+            with profiler.accumulate("render"):
+                while in_flight:
+                    _collect()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            _save_manifest(final=True)
 
+    total = counts["total"]
+    profiler.label = f"batch ({total} items)"
     return {
-        "total": len(configs),
-        "success": success_count,
-        "failed": failed_count,
+        "total": total,
+        "success": counts["success"],
+        "rendered": counts["success"] - counts["skipped"],
+        "skipped": counts["skipped"],
+        "failed": total - counts["success"],
         "results": results,
+        "metadata": {"profile": profiler.to_dict()},
         "status": "completed",
     }
 
@@ -135,17 +383,23 @@ def concatenate_videos_with_transitions(
     output_path: str,
     fade_in_duration: float = None,
     apply_audio_fadein: bool = False,
+    fast: bool = True,
 ) -> Dict[str, Any]:
     """拼接多支視頻並添加轉場效果
 
     載入多個視頻檔案,為除第一支外的視頻添加淡入效果,並拼接為單一輸出。
     每支輸入視頻應已在渲染階段套用淡出效果。
 
+    fast=True 時只重新編碼每支視頻開頭的淡入區段,其餘以 ffmpeg concat
+    demuxer 串流複製;輸入不相容(尺寸、編碼參數不同)或 ffmpeg 失敗時,
+    自動改用完整解碼再重新編碼的 MoviePy 流程。
+
     Args:
         video_paths: 待拼接的視頻檔案路徑列表(按順序)
         output_path: 最終拼接輸出視頻的路徑
         fade_in_duration: 淡入時長(秒)。None 則使用預設值 1.0s
         apply_audio_fadein: True 則同時對音訊套用淡入(Phase 3 功能)
+        fast: 是否使用串流複製的快速串接(預設 True)
 
     Returns:
         狀態資訊字典:
@@ -172,15 +426,23 @@ def concatenate_videos_with_transitions(
     """
     # Import MoviePy and constants
     try:
-        import moviepy.editor as mpy
+        from moviepy import editor as mpy  # type: ignore
         _HAS_MOVIEPY = True
-    except ImportError:
-        _HAS_MOVIEPY = False
+    except (ImportError, AttributeError):
+        try:
+            import moviepy as mpy  # type: ignore
+            _HAS_MOVIEPY = True
+        except ImportError:
+            _HAS_MOVIEPY = False
 
     from spellvid.shared.constants import FADE_IN_DURATION
     from spellvid.infrastructure.video.effects import (
         apply_fadein_effect
     )
+    from spellvid.infrastructure.video.ffmpeg_concat import (
+        concat_with_fadein
+    )
+    from spellvid.infrastructure.video.ffmpeg_pipe import encode_frames
 
     if not _HAS_MOVIEPY:
         return {
@@ -197,6 +459,24 @@ def concatenate_videos_with_transitions(
     if fade_in_duration is None:
         fade_in_duration = FADE_IN_DURATION
 
+    if fast and all(os.path.exists(path) for path in video_paths):
+        try:
+            fast_result = concat_with_fadein(
+                video_paths,
+                output_path,
+                fade_in_duration=fade_in_duration,
+                apply_audio_fadein=apply_audio_fadein,
+            )
+            return {
+                "status": "ok",
+                "output": output_path,
+                "clips_count": fast_result["clips_count"],
+                "total_duration": fast_result["total_duration"],
+            }
+        except RuntimeError:
+            # Incompatible inputs: fall back to the full re-encode below
+            pass
+
     clips = []
     cleanup_clips = []
 
@@ -273,20 +553,20 @@ def concatenate_videos_with_transitions(
             if output_dir and not os.path.exists(output_dir):
                 os.makedirs(output_dir, exist_ok=True)
 
-            # Use ffmpeg settings similar to render_video_moviepy
-            ffmpeg_exe = os.environ.get("IMAGEIO_FFMPEG_EXE")
-            if ffmpeg_exe:
-                final_clip.write_videofile(
-                    output_path,
-                    fps=30,
-                    codec="libx264",
-                    audio_codec="aac",
-                    threads=4,
-                    preset="medium",
-                )
-            else:
-                # Fallback: simple call
-                final_clip.write_videofile(output_path, fps=30)
+            # Stream decoded frames straight into ffmpeg; audio is muxed
+            # in the same invocation
+            encode_frames(
+                final_clip.get_frame,
+                total_duration,
+                output_path,
+                size=final_clip.size,
+                fps=30,
+                codec="libx264",
+                audio=final_clip.audio,
+                audio_codec="aac",
+                threads=4,
+                preset="medium",
+            )
 
         except Exception as e:
             return {
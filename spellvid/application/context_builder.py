@@ -6,6 +6,7 @@
 - prepare_entry_context(): 準備片頭視頻上下文
 - prepare_ending_context(): 準備片尾視頻上下文
 - prepare_letters_context(): 準備字母資源上下文
+- prefetch_media_info(): 同時探測項目用到的所有媒體檔案
 - resolve_letter_asset_dir(): 解析字母素材目錄路徑
 - log_missing_letter_assets(): 記錄缺失的字母素材
 """
@@ -21,6 +22,7 @@ from spellvid.shared.constants import (
     LETTER_TARGET_HEIGHT,
 )
 from spellvid.infrastructure.media.ffmpeg_wrapper import _probe_media_duration
+from spellvid.infrastructure.media.probe import MediaInfo, probe_many
 
 
 # ============================================================================
@@ -29,6 +31,9 @@ from spellvid.infrastructure.media.ffmpeg_wrapper import _probe_media_duration
 
 _DEFAULT_LETTER_ASSET_DIR = os.path.abspath("assets/letters")
 
+# image_path 以這些副檔名結尾時為背景視頻(與 video_service 一致)
+_VIDEO_EXTENSIONS = (".mp4", ".mov", ".mkv", ".avi", ".webm")
+
 
 # ============================================================================
 # Helper Functions
@@ -381,6 +386,46 @@ def prepare_ending_context(
     }
 
 
+def prefetch_media_info(
+    item: Dict[str, Any] | None = None,
+    *,
+    include_content: bool = True,
+) -> Dict[str, Optional[MediaInfo]]:
+    """同時探測項目用到的所有媒體檔案
+
+    片頭、片尾、背景視頻與音樂原本在各步驟中逐一探測,每個未命中都要
+    等一次 ffprobe。此函數先以 probe_many 同時探測,結果寫入共用的
+    探測快取(跨行程),之後各步驟(及批次的工作行程)的 probe() 直接命中。
+
+    Args:
+        item: 視頻配置字典
+        include_content: 是否包含背景視頻與音樂(dry-run 不需要其時長)
+
+    Returns:
+        {path: MediaInfo};不存在的檔案不列入,無法探測時對應 None
+
+    Example:
+        >>> infos = prefetch_media_info({"music_path": "assets/ice.mp3"})
+        >>> sorted(os.path.basename(p) for p in infos)
+        ['ending.mp4', 'entry.mp4', 'ice.mp3']
+    """
+    item = item or {}
+    paths: List[Optional[str]] = []
+    if _is_entry_enabled(item):
+        paths.append(_resolve_entry_video_path(item))
+    # 片尾即使被省略,prepare_ending_context 仍會探測其時長
+    if _is_ending_enabled(item):
+        paths.append(_resolve_ending_video_path(item))
+    if include_content:
+        image_path = str(item.get("image_path") or "")
+        if image_path.lower().endswith(_VIDEO_EXTENSIONS):
+            paths.append(image_path)
+        paths.extend([item.get("video_path"), item.get("music_path")])
+    return probe_many(
+        str(path) for path in paths if path and os.path.isfile(str(path))
+    )
+
+
 def resolve_letter_asset_dir(
     item: Dict[str, Any] | None = None
 ) -> str:
@@ -454,6 +499,9 @@ def prepare_letters_context(item: Dict[str, Any]) -> Dict[str, Any]:
     from spellvid.infrastructure.rendering.image_loader import (
         _load_letter_image_specs,
     )
+    from spellvid.infrastructure.rendering.letter_atlas import (
+        load_letter_atlas,
+    )
     from spellvid.domain.layout import _calculate_letter_layout
 
     letters_text = str(item.get("letters", "") or "")
@@ -472,8 +520,12 @@ def prepare_letters_context(item: Dict[str, Any]) -> Dict[str, Any]:
     missing: List[Dict[str, Any]] = []
 
     if has_letters and mode == "image":
-        # 載入圖片規格
-        specs, missing = _load_letter_image_specs(letters_text, asset_dir)
+        # 載入圖片規格:只沿用已建立的圖集,否則尺寸由素材索引讀取檔頭;
+        # 圖集只在實際渲染字母圖層時建立,dry-run 不需解碼與縮放字形
+        specs, missing = _load_letter_image_specs(
+            letters_text, asset_dir,
+            atlas=load_letter_atlas(asset_dir, build=False),
+        )
 
         # 計算佈局
         if specs:
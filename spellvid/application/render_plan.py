@@ -0,0 +1,463 @@
+"""渲染計畫編譯器
+
+把單一項目一次編譯成不可變、可序列化的 RenderPlan,包含渲染所需的
+所有事實:
+
+- item: 套用預設值後的正規化配置
+- layout / letters: 佈局(compute_layout_bboxes)與字母素材佈局
+- timeline: 倒數、揭示、停留與嗶聲時間點
+- layers: 每個圖層的時間區段、位置(或錨點)與 sprite 快取鍵
+- audio: 音訊事件(背景音樂、嗶聲、淡出)
+- entry / ending / offsets: 片頭片尾資訊與在完整輸出中的起點
+
+dry-run 直接回傳計畫;render_video 以計畫建立渲染上下文,不再重新
+計算佈局或時間軸;批次可先在主行程編譯所有計畫,再把計畫交給工作
+行程。計畫可轉為 JSON(to_json / from_json),安裝 msgpack 時也可
+轉為 msgpack。
+
+Example:
+    >>> plan = compile_render_plan({"letters": "I i", "word_en": "Ice",
+    ...                             "word_zh": "冰", "image_path": "",
+    ...                             "music_path": ""})
+    >>> [layer.name for layer in plan.layers]
+    ['background', 'letters', 'chinese', 'timer', 'reveal', 'progress_bar']
+    >>> RenderPlan.from_json(plan.to_json()) == plan
+    True
+"""
+
+import dataclasses
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import msgpack  # type: ignore
+    _HAS_MSGPACK = True
+except ImportError:
+    msgpack = None
+    _HAS_MSGPACK = False
+
+from spellvid.domain.layout import compute_layout_bboxes
+from spellvid.domain.timing import _coerce_bool, calculate_beep_schedule
+from spellvid.infrastructure.media.cache import cache_key
+from spellvid.shared.constants import (
+    BEEP_LENGTH,
+    FADE_OUT_DURATION,
+    LETTER_SAFE_X,
+    LETTER_SAFE_Y,
+    PROGRESS_BAR_HEIGHT,
+    PROGRESS_BAR_SAFE_X,
+    PROGRESS_BAR_WIDTH,
+)
+from spellvid.shared.types import VideoConfig
+
+# 計畫格式變更時遞增
+RENDER_PLAN_VERSION = 1
+
+# 主段落的畫布與輸出格式
+VIDEO_SIZE = (1920, 1080)
+VIDEO_FPS = 24
+BG_COLOR = (255, 250, 233)
+
+# 每個字母的揭示秒數
+PER_LETTER_SEC = 1.0
+
+# 圖層參數(與 video_service 的圖層渲染一致)
+TIMER_POSITION = (64, 450)
+TIMER_FONT_SIZE = 64
+REVEAL_FONT_SIZE = 128
+REVEAL_BOTTOM_MARGIN = 48
+CHINESE_MARGIN = 64
+
+
+@dataclass(frozen=True)
+class LayerSpan:
+    """單一圖層的時間區段與放置方式
+
+    Attributes:
+        name: 圖層名稱("background", "letters", "chinese", "timer",
+            "reveal", "progress_bar")
+        start: 起始時間(秒,主段落時間軸)
+        end: 結束時間(秒)
+        position: 左上角座標;由 sprite 尺寸決定時為 None
+        anchor: position 為 None 時的錨點("top-right" / "bottom-center")
+        margin: 錨點的邊距(像素)
+        size: 已知的圖層尺寸 (width, height),否則為 None
+        sprite_key: 圖層點陣的快取鍵(同鍵的項目可共用同一張 sprite)
+    """
+
+    name: str
+    start: float
+    end: float
+    position: Optional[Tuple[int, int]] = None
+    anchor: Optional[str] = None
+    margin: int = 0
+    size: Optional[Tuple[int, int]] = None
+    sprite_key: Optional[str] = None
+
+    def resolve_position(self, sprite_size: Tuple[int, int],
+                         canvas_size: Tuple[int, int]) -> Tuple[int, int]:
+        """依 sprite 尺寸計算左上角座標"""
+        if self.position is not None:
+            return self.position
+        width, height = sprite_size
+        canvas_w, canvas_h = canvas_size
+        if self.anchor == "top-right":
+            return (canvas_w - self.margin - width, self.margin)
+        if self.anchor == "bottom-center":
+            return ((canvas_w - width) // 2,
+                    max(0, canvas_h - height - self.margin))
+        raise ValueError(f"Unknown layer anchor: {self.anchor}")
+
+
+@dataclass(frozen=True)
+class AudioEvent:
+    """音訊事件
+
+    Attributes:
+        kind: "music" / "beep" / "fade_out"
+        start: 起始時間(秒,主段落時間軸)
+        end: 結束時間(秒)
+        path: 音訊檔(僅 music)
+    """
+
+    kind: str
+    start: float
+    end: float
+    path: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RenderPlan:
+    """單一項目的編譯結果(不可變;字典欄位請視為唯讀)
+
+    Attributes:
+        version: RENDER_PLAN_VERSION
+        item: 正規化配置
+        layout: compute_layout_bboxes 的結果
+        timeline: 主段落時間軸
+        letters: 字母素材上下文(prepare_letters_context)
+        entry: 片頭上下文(prepare_entry_context)
+        ending: 片尾上下文(prepare_ending_context)
+        metadata: 畫布尺寸、影格率、背景色與主段落長度
+        layers: 由下而上的圖層區段
+        audio: 音訊事件
+        offsets: 片頭、主段落、片尾在完整輸出中的起點與總長
+        skip_ending: 是否省略片尾
+    """
+
+    version: int
+    item: Dict[str, Any]
+    layout: Dict[str, Any]
+    timeline: Dict[str, Any]
+    letters: Dict[str, Any]
+    entry: Dict[str, Any]
+    ending: Dict[str, Any]
+    metadata: Dict[str, Any]
+    layers: Tuple[LayerSpan, ...]
+    audio: Tuple[AudioEvent, ...]
+    offsets: Dict[str, float]
+    skip_ending: bool = False
+
+    def layer(self, name: str) -> Optional[LayerSpan]:
+        """取得指定圖層,計畫中沒有時(例如計時器隱藏)為 None"""
+        for span in self.layers:
+            if span.name == name:
+                return span
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """轉為只含 JSON 型別的字典"""
+        return _jsonable(dataclasses.asdict(self))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RenderPlan":
+        """由 to_dict 的結果還原
+
+        Raises:
+            ValueError: 計畫版本不符
+        """
+        if data.get("version") != RENDER_PLAN_VERSION:
+            raise ValueError(
+                f"Unsupported render plan version: {data.get('version')}"
+            )
+        fields = dict(data)
+        fields["layers"] = tuple(
+            LayerSpan(**{
+                **layer,
+                "position": _tuple_or_none(layer.get("position")),
+                "size": _tuple_or_none(layer.get("size")),
+            })
+            for layer in data.get("layers", ())
+        )
+        fields["audio"] = tuple(
+            AudioEvent(**event) for event in data.get("audio", ())
+        )
+        return cls(**fields)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False,
+                          sort_keys=True)
+
+    @classmethod
+    def from_json(cls, text: str) -> "RenderPlan":
+        return cls.from_dict(json.loads(text))
+
+    def to_msgpack(self) -> bytes:
+        """轉為 msgpack
+
+        Raises:
+            ImportError: 若 msgpack 未安裝
+        """
+        if not _HAS_MSGPACK:
+            raise ImportError(
+                "msgpack is required for msgpack serialization. "
+                "Install with: pip install msgpack"
+            )
+        return msgpack.packb(self.to_dict(), use_bin_type=True)
+
+    @classmethod
+    def from_msgpack(cls, payload: bytes) -> "RenderPlan":
+        if not _HAS_MSGPACK:
+            raise ImportError(
+                "msgpack is required for msgpack serialization. "
+                "Install with: pip install msgpack"
+            )
+        return cls.from_dict(msgpack.unpackb(payload, raw=False))
+
+
+def _jsonable(value: Any) -> Any:
+    """tuple 轉為 list,使記憶體中的計畫與 JSON 往返後相同"""
+    return json.loads(json.dumps(value, ensure_ascii=False, default=str))
+
+
+def _tuple_or_none(value: Any) -> Optional[Tuple[int, int]]:
+    return None if value is None else tuple(value)
+
+
+def config_to_item(config: VideoConfig) -> Dict[str, Any]:
+    """把 VideoConfig 轉為 render_video 使用的配置字典(保留所有欄位)"""
+    return config.to_dict()
+
+
+def plan_layers(
+    item: Dict[str, Any],
+    layout: Dict[str, Any],
+    timeline: Dict[str, Any],
+    letters: Dict[str, Any],
+) -> Tuple[LayerSpan, ...]:
+    """決定要繪製的圖層及其區段(由下而上,靜態圖層在前)
+
+    compile_render_plan 與 render_video(手動建立上下文時)共用。
+
+    Args:
+        item: 正規化後的配置
+        layout: compute_layout_bboxes 的結果(dict)
+        timeline: 時間軸(需包含 total_duration、reveal_start、
+            countdown_end)
+        letters: prepare_letters_context 的結果
+
+    Returns:
+        LayerSpan 的 tuple
+    """
+    total = float(timeline["total_duration"])
+    layers = [LayerSpan(
+        "background", 0.0, total, position=(0, 0), size=VIDEO_SIZE,
+        sprite_key=cache_key("background", item.get("image_path") or "",
+                             item.get("video_mode", "cover"), VIDEO_SIZE),
+    )]
+
+    if letters.get("has_letters"):
+        entries = letters.get("layout", {}).get("letters", [])
+        if letters.get("mode") == "text":
+            layers.append(LayerSpan(
+                "letters", 0.0, total,
+                position=(LETTER_SAFE_X, LETTER_SAFE_Y),
+                sprite_key=cache_key("letters-text", letters["letters"]),
+            ))
+        elif entries:
+            min_x = min(int(entry.get("x", 0)) for entry in entries)
+            layers.append(LayerSpan(
+                "letters", 0.0, total,
+                position=(LETTER_SAFE_X + min_x, LETTER_SAFE_Y),
+                sprite_key=cache_key("letters", [
+                    (entry.get("filename"), entry.get("x"),
+                     entry.get("width"), entry.get("height"))
+                    for entry in entries
+                ]),
+            ))
+
+    if item.get("word_zh"):
+        layers.append(LayerSpan(
+            "chinese", 0.0, total, anchor="top-right", margin=CHINESE_MARGIN,
+            sprite_key=cache_key("zhuyin", item["word_zh"]),
+        ))
+
+    if _coerce_bool(item.get("timer_visible", True)):
+        layers.append(LayerSpan(
+            "timer", 0.0, total, position=TIMER_POSITION,
+            sprite_key=cache_key("timer-glyphs", TIMER_FONT_SIZE),
+        ))
+
+    if item.get("word_en"):
+        layers.append(LayerSpan(
+            "reveal", float(timeline["reveal_start"]), total,
+            anchor="bottom-center", margin=REVEAL_BOTTOM_MARGIN,
+            sprite_key=cache_key("reveal", item["word_en"],
+                                 REVEAL_FONT_SIZE),
+        ))
+
+    bar_y = layout.get("progress_bar_y")
+    countdown = float(timeline["countdown_end"])
+    if bar_y is not None and countdown > 0.0:
+        layers.append(LayerSpan(
+            "progress_bar", 0.0, countdown,
+            position=(PROGRESS_BAR_SAFE_X, int(bar_y)),
+            size=(PROGRESS_BAR_WIDTH, PROGRESS_BAR_HEIGHT),
+        ))
+    return tuple(layers)
+
+
+def plan_audio(item: Dict[str, Any],
+               timeline: Dict[str, Any]) -> Tuple[AudioEvent, ...]:
+    """背景音樂、倒數嗶聲與結尾淡出事件
+
+    Args:
+        item: 正規化後的配置
+        timeline: 時間軸(需包含 total_duration 與 beep_schedule)
+
+    Returns:
+        AudioEvent 的 tuple
+    """
+    total = float(timeline["total_duration"])
+    events = []
+    if item.get("music_path"):
+        events.append(AudioEvent("music", 0.0, total,
+                                 path=str(item["music_path"])))
+    offset = float(timeline.get("countdown_start", 0.0))
+    for t in timeline.get("beep_schedule", []):
+        events.append(AudioEvent("beep", offset + t,
+                                 min(total, offset + t + BEEP_LENGTH)))
+    fade = min(FADE_OUT_DURATION, total)
+    if fade > 0:
+        events.append(AudioEvent("fade_out", total - fade, total))
+    return tuple(events)
+
+
+def compile_render_plan(
+    item: Dict[str, Any],
+    *,
+    skip_ending: bool = False,
+    prefetch_content: bool = False,
+) -> RenderPlan:
+    """把一個項目編譯為 RenderPlan(不修改傳入的 item)
+
+    片頭與片尾(以及 prefetch_content 時的背景視頻與音樂)先以
+    prefetch_media_info 同時探測,再由各上下文從探測快取讀取。
+
+    Args:
+        item: JSON 配置(需包含 letters、word_en、word_zh、
+            image_path、music_path)
+        skip_ending: 是否省略片尾(批次模式只有最後一支保留)
+        prefetch_content: 是否一併探測背景視頻與音樂(實際渲染時需要,
+            dry-run 不需要)
+
+    Returns:
+        RenderPlan
+
+    Raises:
+        ValueError: 缺少必要欄位或欄位無效
+    """
+    from spellvid.application.context_builder import (
+        prefetch_media_info,
+        prepare_ending_context,
+        prepare_entry_context,
+        prepare_letters_context,
+    )
+
+    item = dict(item)
+    item.setdefault("countdown_sec", 10)
+    item.setdefault("reveal_hold_sec", 5)
+
+    required_fields = [
+        "letters", "word_en", "word_zh", "image_path", "music_path"
+    ]
+    missing = [f for f in required_fields if f not in item]
+    if missing:
+        raise ValueError(
+            f"Missing required fields: {', '.join(missing)}"
+        )
+
+    timer_visible = _coerce_bool(item.get("timer_visible", True))
+    progress_bar = _coerce_bool(item.get("progress_bar", True))
+    config = VideoConfig(
+        letters=item["letters"],
+        word_en=item["word_en"],
+        word_zh=item["word_zh"],
+        image_path=item.get("image_path", ""),
+        music_path=item.get("music_path", ""),
+        countdown_sec=int(item.get("countdown_sec", 10)),
+        reveal_hold_sec=int(item.get("reveal_hold_sec", 5)),
+        timer_visible=timer_visible,
+        progress_bar=progress_bar,
+    )
+    layout = compute_layout_bboxes(
+        config, timer_visible=timer_visible, progress_bar=progress_bar,
+    ).to_dict()
+
+    word_en = item.get("word_en", "")
+    reveal_time = len(word_en) * PER_LETTER_SEC
+    countdown = int(item.get("countdown_sec", 10))
+    reveal_hold = int(item.get("reveal_hold_sec", 5))
+    main_duration = countdown + reveal_time + reveal_hold
+    timeline = {
+        "countdown_start": 0.0,
+        "countdown_end": float(countdown),
+        "reveal_start": float(countdown),
+        "reveal_end": float(countdown + reveal_time),
+        "hold_start": float(countdown + reveal_time),
+        "hold_end": main_duration,
+        "total_duration": main_duration,
+        "beep_schedule": calculate_beep_schedule(countdown),
+    }
+
+    prefetch_media_info(item, include_content=prefetch_content)
+    entry = prepare_entry_context(item)
+    ending = prepare_ending_context(item)
+    letters = prepare_letters_context(item)
+
+    main_start = 0.0
+    if entry.get("enabled") and entry.get("exists"):
+        main_start = float(entry.get("total_lead_sec") or 0.0)
+    ending_start = main_start + float(main_duration)
+    ending_duration = 0.0
+    if not skip_ending and ending.get("enabled") and ending.get("exists"):
+        ending_duration = float(ending.get("total_tail_sec") or 0.0)
+    offsets = {
+        "entry_start": 0.0,
+        "main_start": main_start,
+        "ending_start": ending_start,
+        "total_duration": ending_start + ending_duration,
+    }
+
+    metadata = {
+        "video_size": VIDEO_SIZE,
+        "fps": VIDEO_FPS,
+        "bg_color": BG_COLOR,
+        "main_duration": main_duration,
+    }
+
+    return RenderPlan(
+        version=RENDER_PLAN_VERSION,
+        item=_jsonable(item),
+        layout=_jsonable(layout),
+        timeline=timeline,
+        letters=_jsonable(letters),
+        entry=_jsonable(entry),
+        ending=_jsonable(ending),
+        metadata=_jsonable(metadata),
+        layers=plan_layers(item, layout, timeline, letters),
+        audio=plan_audio(item, timeline),
+        offsets=offsets,
+        skip_ending=bool(skip_ending),
+    )
@@ -10,6 +10,8 @@
 from pathlib import Path
 from typing import Any, Dict
 
+from spellvid.infrastructure.media.asset_index import get_asset_index
+from spellvid.infrastructure.media.probe import probe
 from spellvid.shared.types import VideoConfig
 
 
@@ -53,15 +55,17 @@ def check_assets(config: VideoConfig) -> Dict[str, Any]:
         "all_present": True,
     }
 
-    # 檢查圖片
+    index = get_asset_index()
+
+    # 檢查圖片(依目錄索引,同一批次不重複 stat)
     if config.image_path:
-        result["image"]["exists"] = Path(config.image_path).exists()
+        result["image"]["exists"] = index.exists(config.image_path)
         if not result["image"]["exists"]:
             result["all_present"] = False
 
     # 檢查音樂
     if config.music_path:
-        result["music"]["exists"] = Path(config.music_path).exists()
+        result["music"]["exists"] = index.exists(config.music_path)
         if not result["music"]["exists"]:
             result["all_present"] = False
 
@@ -104,12 +108,13 @@ def prepare_entry_context() -> Dict[str, Any]:
     if entry_path.exists():
         result["exists"] = True
 
-        # 嘗試查詢時長(需要 IMediaProcessor)
-        # 完整實作需要:
-        # 1. 注入 IMediaProcessor
-        # 2. 呼叫 probe_duration()
-        # 簡化版本暫返回固定值
-        result["duration"] = 3.0
+        # 單次探測(經持久化快取)取得時長;無法探測時維持 0.0
+        try:
+            info = probe(entry_video_path)
+        except (OSError, RuntimeError):
+            info = None
+        if info is not None and info.duration is not None:
+            result["duration"] = float(info.duration)
 
     return result
 
@@ -191,7 +196,6 @@ def check_assets_dict(item: Dict[str, Any]) -> Dict[str, Any]:
         >>> result["image_exists"]
         False
     """
-    import os
     from spellvid.application.context_builder import (
         prepare_letters_context,
         resolve_letter_asset_dir,
@@ -208,12 +212,14 @@ def check_assets_dict(item: Dict[str, Any]) -> Dict[str, Any]:
         "letters_has_letters": False,
     }
 
+    index = get_asset_index()
+
     # Check image file
-    if os.path.isfile(item.get("image_path", "")):
+    if index.exists(item.get("image_path", "")):
         res["image_exists"] = True
 
     # Check music file
-    if os.path.isfile(item.get("music_path", "")):
+    if index.exists(item.get("music_path", "")):
         res["music_exists"] = True
 
     # Check letters resources
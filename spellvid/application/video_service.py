@@ -8,19 +8,43 @@
 - 支援 dry-run 和 skip_ending 模式
 """
 
+import copy
 import os
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Any, Dict, Optional
-
-# Domain layer imports
-from spellvid.domain.layout import compute_layout_bboxes
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+# Application layer imports
+from spellvid.application.render_plan import (
+    LayerSpan,
+    RenderPlan,
+    compile_render_plan,
+    config_to_item,
+    plan_audio,
+    plan_layers,
+)
 
 # Shared layer imports
+from spellvid.shared.constants import (
+    FADE_IN_DURATION,
+    LETTER_SAFE_X,
+)
 from spellvid.shared.types import VideoConfig
+from spellvid.shared.profiling import RenderProfiler
 
 # Infrastructure layer imports
-from spellvid.infrastructure.video.interface import IVideoComposer
+# (the compositor and MoviePy are imported inside the render steps, so
+# dry runs and `--help` never load them)
+from spellvid.infrastructure.media.asset_index import (
+    asset_index_scope,
+    get_asset_index,
+)
+
+if TYPE_CHECKING:
+    from spellvid.infrastructure.video.interface import IVideoComposer
+
+# Bump whenever the same inputs would render a different video, so that
+# incremental batches (see application.batch_manifest) re-render.
+RENDERER_VERSION = 1
 
 
 # ============================================================================
@@ -42,6 +66,8 @@ class VideoRenderingContext:
         ending_ctx: Ending video context (path, duration, enabled)
         letters_ctx: Letter images context (paths, bbox, missing)
         metadata: Additional computed info (durations, paths, etc.)
+        plan: The compiled RenderPlan this context was built from (None
+            for hand-built contexts)
     """
     item: Dict[str, Any]
     layout: Dict[str, Any]
@@ -50,6 +76,7 @@ class VideoRenderingContext:
     ending_ctx: Dict[str, Any]
     letters_ctx: Dict[str, Any]
     metadata: Dict[str, Any]
+    plan: Optional[RenderPlan] = None
 
 
 # ============================================================================
@@ -59,7 +86,8 @@ class VideoRenderingContext:
 def _prepare_all_context(item: Dict[str, Any]) -> VideoRenderingContext:
     """Prepare all rendering context data upfront.
 
-    Gathers all necessary data for video rendering:
+    Compiles the item into a RenderPlan (see application.render_plan) in
+    one pass and unpacks it into a context:
     - Layout computation (bboxes for all elements)
     - Timeline calculation (timing for countdown, reveal, etc.)
     - Entry/ending video contexts
@@ -74,96 +102,49 @@ def _prepare_all_context(item: Dict[str, Any]) -> VideoRenderingContext:
 
     Raises:
         ValueError: If item fails validation
-        FileNotFoundError: If required assets missing (unless dry_run)
 
     Example:
         >>> item = {"letters": "C c", "word_en": "Cat", "word_zh": "貓", ...}
         >>> ctx = _prepare_all_context(item)
         >>> assert "letters_bbox" in ctx.layout
     """
-    # Import context_builder functions
-    from spellvid.application.context_builder import (
-        prepare_entry_context,
-        prepare_ending_context,
-        prepare_letters_context,
-    )
+    return _context_from_plan(compile_render_plan(item))
 
-    # Set defaults for optional fields
-    if "countdown_sec" not in item:
-        item["countdown_sec"] = 10
-    if "reveal_hold_sec" not in item:
-        item["reveal_hold_sec"] = 5
 
-    # Validate required fields
-    required_fields = [
-        "letters", "word_en", "word_zh", "image_path", "music_path"
-    ]
-    missing = [f for f in required_fields if f not in item]
-    if missing:
-        raise ValueError(
-            f"Missing required fields: {', '.join(missing)}"
-        )
+def _context_from_plan(plan: RenderPlan) -> VideoRenderingContext:
+    """Build a rendering context from a compiled plan.
 
-    # Convert item dict to VideoConfig for layout computation
-    from spellvid.shared.types import VideoConfig as VC
-    config = VC(
-        letters=item["letters"],
-        word_en=item["word_en"],
-        word_zh=item["word_zh"],
-        image_path=item.get("image_path", ""),
-        music_path=item.get("music_path", ""),
-        countdown_sec=int(item.get("countdown_sec", 10)),
-        reveal_hold_sec=int(item.get("reveal_hold_sec", 5)),
+    The plan's dicts are copied, so rendering (which records errors in
+    ctx.metadata) never mutates the plan itself.
+    """
+    metadata = copy.deepcopy(plan.metadata)
+    metadata["video_size"] = tuple(metadata["video_size"])
+    metadata["bg_color"] = tuple(metadata["bg_color"])
+    return VideoRenderingContext(
+        item=copy.deepcopy(plan.item),
+        layout=copy.deepcopy(plan.layout),
+        timeline=copy.deepcopy(plan.timeline),
+        entry_ctx=copy.deepcopy(plan.entry),
+        ending_ctx=copy.deepcopy(plan.ending),
+        letters_ctx=copy.deepcopy(plan.letters),
+        metadata=metadata,
+        plan=plan,
     )
 
-    # Compute layout
-    layout_result = compute_layout_bboxes(config)
-    layout = layout_result.to_dict()
-
-    # Compute timeline
-    per_letter_time = 1.0
-    word_en = item.get("word_en", "")
-    reveal_time = len(word_en) * per_letter_time
-    countdown = int(item.get("countdown_sec", 10))
-    reveal_hold = int(item.get("reveal_hold_sec", 5))
-    main_duration = countdown + reveal_time + reveal_hold
-
-    timeline = {
-        "countdown_start": 0.0,
-        "countdown_end": float(countdown),
-        "reveal_start": float(countdown),
-        "reveal_end": float(countdown + reveal_time),
-        "hold_start": float(countdown + reveal_time),
-        "hold_end": main_duration,
-        "total_duration": main_duration,
-    }
-
-    # Prepare entry context
-    entry_ctx = prepare_entry_context(item)
-
-    # Prepare ending context
-    ending_ctx = prepare_ending_context(item)
 
-    # Prepare letters context
-    letters_ctx = prepare_letters_context(item)
+def _layer_span(ctx: VideoRenderingContext, name: str) -> Optional[LayerSpan]:
+    """Planned span of a layer, or None when the layer is not drawn.
 
-    # Prepare metadata
-    metadata = {
-        "video_size": (1920, 1080),  # CANVAS_WIDTH, CANVAS_HEIGHT
-        "fps": 24,
-        "bg_color": (255, 250, 233),  # COLOR_WHITE
-        "main_duration": main_duration,
-    }
-
-    return VideoRenderingContext(
-        item=item,
-        layout=layout,
-        timeline=timeline,
-        entry_ctx=entry_ctx,
-        ending_ctx=ending_ctx,
-        letters_ctx=letters_ctx,
-        metadata=metadata,
-    )
+    Hand-built contexts (without a plan) are planned on the fly with the
+    same rules the compiler uses.
+    """
+    if ctx.plan is not None:
+        return ctx.plan.layer(name)
+    for span in plan_layers(ctx.item, ctx.layout, ctx.timeline,
+                            ctx.letters_ctx or {}):
+        if span.name == name:
+            return span
+    return None
 
 
 def _create_background_clip(ctx: VideoRenderingContext) -> Any:
@@ -177,7 +158,8 @@ def _create_background_clip(ctx: VideoRenderingContext) -> Any:
         ctx: VideoRenderingContext with item and metadata
 
     Returns:
-        MoviePy Clip (ImageClip, VideoFileClip, or ColorClip)
+        MoviePy Clip (ImageClip or ColorClip), or a full-canvas dynamic
+        FrameLayer for video backgrounds
 
     Raises:
         FileNotFoundError: If image_path specified but not found
@@ -188,6 +170,8 @@ def _create_background_clip(ctx: VideoRenderingContext) -> Any:
         >>> bg_clip = _create_background_clip(ctx)
         >>> assert bg_clip.duration == ctx.timeline["total_duration"]
     """
+    from spellvid.infrastructure.video.frame_compositor import FrameLayer
+
     # Import MoviePy (try editor first, fall back to top-level)
     mpy = None
     try:
@@ -198,7 +182,7 @@ def _create_background_clip(ctx: VideoRenderingContext) -> Any:
         except ImportError:
             raise RuntimeError("MoviePy not available")
 
-    duration = ctx.timeline["total_duration"]
+    duration = _layer_span(ctx, "background").end
     video_size = ctx.metadata["video_size"]
     bg_color = ctx.metadata["bg_color"]
 
@@ -211,7 +195,7 @@ def _create_background_clip(ctx: VideoRenderingContext) -> Any:
 
     # If image/video provided, load and overlay
     img_path = ctx.item.get("image_path", "")
-    if img_path and os.path.exists(img_path):
+    if img_path and get_asset_index().exists(img_path):
         img_exts = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tiff")
         vid_exts = (".mp4", ".mov", ".mkv", ".avi", ".webm")
 
@@ -239,39 +223,28 @@ def _create_background_clip(ctx: VideoRenderingContext) -> Any:
             bg_clip = mpy.CompositeVideoClip([bg_clip, img_clip])
 
         elif img_path.lower().endswith(vid_exts):
-            # Video file - load as VideoFileClip
-            vid_clip = mpy.VideoFileClip(img_path)
+            # Video file - ffmpeg scales/crops (cover) or scales/pads (fit)
+            # while decoding, so frames arrive at canvas size and cover
+            # the color clip entirely. Short videos are decoded once and
+            # looped from RAM; longer ones loop with -stream_loop.
+            from spellvid.infrastructure.video.ffmpeg_reader import (
+                open_background_source,
+            )
 
-            # Get video mode (cover/contain)
             video_mode = ctx.item.get("video_mode", "cover")
-
-            if video_mode == "cover":
-                # Scale to cover entire canvas
-                vid_w, vid_h = vid_clip.size
-                canvas_w, canvas_h = video_size
-                scale_w = canvas_w / vid_w
-                scale_h = canvas_h / vid_h
-                scale = max(scale_w, scale_h)
-                vid_clip = vid_clip.resized(scale)
-                vid_clip = vid_clip.with_position(("center", "center"))
-            else:
-                # Contain mode - fit within canvas
-                vid_w, vid_h = vid_clip.size
-                canvas_w, canvas_h = video_size
-                scale_w = canvas_w / vid_w
-                scale_h = canvas_h / vid_h
-                scale = min(scale_w, scale_h)
-                vid_clip = vid_clip.resized(scale)
-                vid_clip = vid_clip.with_position(("center", "center"))
-
-            # Loop video if shorter than duration
-            if vid_clip.duration < duration:
-                vid_clip = vid_clip.loop(duration=duration)
-            else:
-                vid_clip = vid_clip.subclipped(0, duration)
-
-            # Composite: background + video
-            bg_clip = mpy.CompositeVideoClip([bg_clip, vid_clip])
+            reader = open_background_source(
+                img_path,
+                video_size,
+                ctx.metadata.get("fps", 24),
+                mode="cover" if video_mode == "cover" else "fit",
+                duration=duration,
+                pad_color=bg_color,
+            )
+            bg_clip = FrameLayer(
+                frame_function=reader.read_frame,
+                end=duration,
+                size=tuple(video_size),
+            )
 
     return bg_clip
 
@@ -279,170 +252,317 @@ def _create_background_clip(ctx: VideoRenderingContext) -> Any:
 def _render_letters_layer(ctx: VideoRenderingContext) -> Any:
     """Render letter images in top-left.
 
-    TODO: Extract full implementation from render_video_moviepy
+    All letters are flattened into a single static RGBA strip, so the
+    compositor can fold it into the per-video static plate. Glyphs are
+    sliced from the memory-mapped letter atlas instead of being decoded
+    and resized for every video.
 
     Args:
         ctx: VideoRenderingContext with letters_ctx and layout
 
     Returns:
-        MoviePy CompositeVideoClip with positioned letter images
+        Static FrameLayer positioned at (LETTER_SAFE_X, LETTER_SAFE_Y),
+        or None when there is nothing to draw
     """
-    # Import MoviePy
-    try:
-        from moviepy import editor as mpy  # type: ignore
-    except (ImportError, AttributeError):
-        import moviepy as mpy  # type: ignore
+    from spellvid.infrastructure.video.frame_compositor import FrameLayer
+
+    letters_ctx = ctx.letters_ctx or {}
+    span = _layer_span(ctx, "letters")
+    if span is None:
+        return None
 
-    # TODO: Load letter images from letters_ctx
-    # TODO: Position according to layout["letters"]
-    # TODO: Create composite clip
+    if letters_ctx.get("mode") == "text":
+        from spellvid.infrastructure.rendering.pillow_adapter import (
+            _make_text_imageclip,
+        )
+        clip = _make_text_imageclip(
+            text=letters_ctx.get("letters", ""),
+            font_size=140,
+            color=(0, 0, 0),
+        )
+        return FrameLayer(
+            image=clip.get_frame(0),
+            position=span.position,
+            end=span.end,
+        )
+
+    index = get_asset_index()
+    entries = [
+        entry for entry in letters_ctx.get("layout", {}).get("letters", [])
+        if entry.get("path") and index.exists(entry["path"])
+    ]
+    if not entries:
+        return None
+
+    from PIL import Image as PILImage
+    import numpy as np
+    from spellvid.infrastructure.rendering.letter_atlas import (
+        load_letter_atlas,
+    )
 
-    # Stub: return empty clip for now
-    return mpy.ColorClip(size=(1, 1), color=(0, 0, 0), duration=1.0)
+    atlas = load_letter_atlas(letters_ctx.get("asset_dir", ""))
+    min_x = span.position[0] - LETTER_SAFE_X
+    strip_w = max(
+        int(entry.get("x", 0)) + int(entry["width"]) for entry in entries
+    ) - min_x
+    strip_h = max(int(entry["height"]) for entry in entries)
+    strip = PILImage.new("RGBA", (strip_w, strip_h), (0, 0, 0, 0))
+    for entry in entries:
+        size = (int(entry["width"]), int(entry["height"]))
+        glyph = None
+        if atlas is not None:
+            glyph = atlas.get(entry.get("filename", ""), *size)
+        if glyph is not None:
+            letter = PILImage.fromarray(np.asarray(glyph), "RGBA")
+        else:
+            # Not pre-scaled (layout shrunk to fit): resize the source.
+            with PILImage.open(entry["path"]) as img:
+                letter = img.convert("RGBA").resize(size, PILImage.LANCZOS)
+        strip.alpha_composite(letter, (int(entry.get("x", 0)) - min_x, 0))
+
+    return FrameLayer(
+        image=np.array(strip),
+        position=span.position,
+        end=span.end,
+    )
 
 
 def _render_chinese_zhuyin_layer(ctx: VideoRenderingContext) -> Any:
     """Render Chinese text + Zhuyin annotations in top-right.
 
-    TODO: Extract full implementation from render_video_moviepy
-
     Args:
         ctx: VideoRenderingContext with item (word_zh) and layout
 
     Returns:
-        MoviePy ImageClip with rendered text
+        Static FrameLayer right-aligned 64px from the top-right corner,
+        or None when word_zh is empty
     """
-    # Import MoviePy
-    try:
-        from moviepy import editor as mpy  # type: ignore
-    except (ImportError, AttributeError):
-        import moviepy as mpy  # type: ignore
-
-    # TODO: Parse zhuyin from word_zh
-    # TODO: Render Chinese + zhuyin using Pillow
-    # TODO: Position according to layout["word_zh"]
+    from spellvid.infrastructure.video.frame_compositor import FrameLayer
+    from spellvid.infrastructure.rendering.pillow_adapter import (
+        _render_chinese_zhuyin_image,
+    )
 
-    # Stub: return empty clip
-    return mpy.ColorClip(size=(1, 1), color=(0, 0, 0), duration=1.0)
+    span = _layer_span(ctx, "chinese")
+    if span is None:
+        return None
+    arr = _render_chinese_zhuyin_image(ctx.item.get("word_zh", ""))
+    if arr is None:
+        return None
+
+    return FrameLayer(
+        image=arr,
+        position=span.resolve_position((arr.shape[1], arr.shape[0]),
+                                       ctx.metadata["video_size"]),
+        end=span.end,
+    )
 
 
 def _render_timer_layer(ctx: VideoRenderingContext) -> Any:
     """Render countdown timer in top-left corner.
 
-    TODO: Extract full implementation from render_video_moviepy
+    One dynamic layer composes the "MM:SS" text from a digit sprite
+    sheet rendered once per font size, instead of one text clip per
+    second of countdown. The timer stays at 00:00 after the countdown.
 
     Args:
-        ctx: VideoRenderingContext with timeline (countdown_sec)
+        ctx: VideoRenderingContext with item (timer_visible) and timeline
+            (countdown_end, total_duration)
 
     Returns:
-        MoviePy Clip with dynamic countdown text
+        Dynamic FrameLayer at (64, 450) spanning the whole main segment,
+        or None when the timer is hidden
     """
-    # Import MoviePy
-    try:
-        from moviepy import editor as mpy  # type: ignore
-    except (ImportError, AttributeError):
-        import moviepy as mpy  # type: ignore
-
-    # TODO: Create timer clips for each second
-    # TODO: Position according to layout["timer"]
-
-    # Stub: return empty clip
-    return mpy.ColorClip(size=(1, 1), color=(0, 0, 0), duration=1.0)
+    from spellvid.infrastructure.video.frame_compositor import FrameLayer
+    from spellvid.application.render_plan import TIMER_FONT_SIZE
+    from spellvid.infrastructure.ui.timer import make_timer_frame_function
+
+    span = _layer_span(ctx, "timer")
+    if span is None:
+        return None
+
+    make_frame, size = make_timer_frame_function(
+        int(ctx.timeline.get("countdown_end", 0)),
+        font_size=TIMER_FONT_SIZE,
+        color=(255, 255, 255),
+        bg=(0, 0, 0),
+    )
+    return FrameLayer(
+        frame_function=make_frame,
+        position=span.position,
+        start=span.start,
+        end=span.end,
+        size=size,
+    )
 
 
 def _render_reveal_layer(ctx: VideoRenderingContext) -> Any:
     """Render word reveal animation (typing effect) in bottom center.
 
-    TODO: Extract full implementation from render_video_moviepy
+    The full word is rasterized once (128px, 48px underline space) and a
+    single dynamic layer crops it to the visible prefix every frame, so
+    the reveal costs one layer regardless of word length (plus a raster
+    for each prefix a kerned or overhanging next glyph would leak into).
 
     Args:
         ctx: VideoRenderingContext with item (word_en) and timeline
+            (reveal_start, reveal_end, total_duration)
 
     Returns:
-        MoviePy Clip with typing animation
+        Dynamic FrameLayer horizontally centered 48px above the bottom
+        edge, or None when word_en is empty
     """
-    # Import MoviePy
-    try:
-        from moviepy import editor as mpy  # type: ignore
-    except (ImportError, AttributeError):
-        import moviepy as mpy  # type: ignore
-
-    # TODO: Create reveal animation clips
-    # TODO: Add underlines
-    # TODO: Position according to layout["reveal"]
+    from spellvid.infrastructure.video.frame_compositor import FrameLayer
+    from spellvid.infrastructure.ui.reveal import (
+        make_reveal_frame_function,
+        render_reveal_prefixes,
+    )
 
-    # Stub: return empty clip
-    return mpy.ColorClip(size=(1, 1), color=(0, 0, 0), duration=1.0)
+    from spellvid.application.render_plan import REVEAL_FONT_SIZE
+
+    word_en = ctx.item.get("word_en", "")
+    span = _layer_span(ctx, "reveal")
+    if span is None or not word_en:
+        return None
+
+    prefixes = render_reveal_prefixes(word_en, font_size=REVEAL_FONT_SIZE)
+    reveal_span = float(ctx.timeline["reveal_end"]) - span.start
+    per_letter = reveal_span / len(word_en) if reveal_span > 0 else 1.0
+
+    # The full-word prefix is the whole sprite
+    sprite_h, sprite_w = prefixes[-1].shape[:2]
+    return FrameLayer(
+        frame_function=make_reveal_frame_function(prefixes, per_letter),
+        position=span.resolve_position((sprite_w, sprite_h),
+                                       ctx.metadata["video_size"]),
+        start=span.start,
+        end=span.end,
+        size=(sprite_w, sprite_h),
+    )
 
 
 def _render_progress_bar_layer(ctx: VideoRenderingContext) -> Any:
     """Render progress bar at bottom of video.
 
-    TODO: Extract full implementation from render_video_moviepy
+    The bar is a single dynamic layer whose frame function slice-copies
+    the cached base color/mask arrays, shrinking smoothly every frame
+    until the countdown ends.
 
     Args:
-        ctx: VideoRenderingContext with timeline (total_duration)
+        ctx: VideoRenderingContext with timeline (countdown_end) and
+            layout (progress_bar_y)
 
     Returns:
-        MoviePy Clip with animated progress bar
+        Dynamic FrameLayer spanning the countdown, or None when the
+        progress bar is disabled or there is no countdown
     """
-    # Import MoviePy
-    try:
-        from moviepy import editor as mpy  # type: ignore
-    except (ImportError, AttributeError):
-        import moviepy as mpy  # type: ignore
+    from spellvid.infrastructure.video.frame_compositor import FrameLayer
+    from spellvid.infrastructure.ui.progress_bar import (
+        make_progress_bar_frame_function,
+    )
 
-    # TODO: Create progress bar segments
-    # TODO: Position at bottom
+    span = _layer_span(ctx, "progress_bar")
+    if span is None:
+        return None
 
-    # Stub: return empty clip
-    return mpy.ColorClip(size=(1, 1), color=(0, 0, 0), duration=1.0)
+    return FrameLayer(
+        frame_function=make_progress_bar_frame_function(span.end),
+        position=span.position,
+        start=span.start,
+        end=span.end,
+        size=span.size,
+    )
 
 
 def _process_audio_tracks(ctx: VideoRenderingContext) -> Any:
-    """Mix background music + countdown beeps.
+    """Mix background music + countdown beeps into one PCM audio bed.
 
-    TODO: Extract full implementation from render_video_moviepy
+    The music is decoded to PCM once and tiled or trimmed to the segment
+    with NumPy; a cached beep waveform is added at each beep_schedule
+    offset and the fade-out envelope is applied in one vectorized pass.
+    The encoder writes the bed as a single WAV and muxes it, so no MoviePy
+    audio graph is built. Music load failures are recorded in
+    ctx.metadata ("audio_loaded" / "audio_error"); the beeps still play.
 
     Args:
-        ctx: VideoRenderingContext with item (music_path) and timeline
+        ctx: VideoRenderingContext with the plan's audio events (music,
+            beep, fade_out) and timeline
 
     Returns:
-        MoviePy AudioClip (mixed audio)
+        AudioBed (mixed audio)
     """
-    # Import MoviePy
-    try:
-        from moviepy import editor as mpy  # type: ignore
-    except (ImportError, AttributeError):
-        import moviepy as mpy  # type: ignore
+    from spellvid.infrastructure.media.audio import render_audio_bed
 
-    # TODO: Load music file
-    # TODO: Generate beeps
-    # TODO: Mix audio tracks
-
-    # Stub: return silent audio
-    from moviepy.audio.AudioClip import AudioClip
-    return AudioClip(lambda t: [0, 0], duration=ctx.timeline["total_duration"])
+    events = (ctx.plan.audio if ctx.plan is not None
+              else plan_audio(ctx.item, ctx.timeline))
+    duration = float(ctx.timeline["total_duration"])
+    music_path = next(
+        (e.path for e in events if e.kind == "music"), None
+    )
+    if music_path and not get_asset_index().exists(music_path):
+        ctx.metadata["audio_error"] = f"music not found: {music_path}"
+        music_path = None
+
+    bed = render_audio_bed(
+        duration,
+        music_path=music_path,
+        beep_times=[e.start for e in events if e.kind == "beep"],
+        fade_out=sum(e.end - e.start for e in events
+                     if e.kind == "fade_out"),
+    )
+    ctx.metadata["audio_loaded"] = bed.music_loaded
+    if bed.music_error:
+        ctx.metadata["audio_error"] = bed.music_error
+    return bed
 
 
 def _load_entry_ending_clips(
-    ctx: VideoRenderingContext
+    ctx: VideoRenderingContext,
+    skip_ending: bool = False,
 ) -> tuple[Optional[Any], Optional[Any]]:
-    """Load optional entry and ending video clips.
+    """Prepare the entry (with hold) and ending intermediates.
 
-    TODO: Extract full implementation from render_video_moviepy
+    The sources are normalized once to the exact output format and cached
+    on disk (see infrastructure.video.intermediates), so a batch re-encodes
+    neither of them per video. Preparation failures are recorded in
+    ctx.metadata ("entry_error" / "ending_error") and the clip is skipped.
 
     Args:
         ctx: VideoRenderingContext with entry_ctx and ending_ctx
+        skip_ending: If True, the ending is not loaded (batch mode)
 
     Returns:
-        Tuple of (entry_clip, ending_clip) - either or both may be None
+        Tuple of (entry_path, ending_path) - either or both may be None
     """
-    # TODO: Load entry video if enabled
-    # TODO: Load ending video if enabled
+    from spellvid.infrastructure.video.intermediates import (
+        OutputSpec,
+        prepare_intermediate,
+    )
 
-    # Stub: return None for both
-    return (None, None)
+    width, height = ctx.metadata.get("video_size", (1920, 1080))
+    spec = OutputSpec(width=int(width), height=int(height),
+                      fps=ctx.metadata.get("fps", 24))
+
+    entry_path = None
+    if ctx.entry_ctx.get("enabled") and ctx.entry_ctx.get("exists"):
+        try:
+            entry_path = prepare_intermediate(
+                ctx.entry_ctx["path"], "entry", spec,
+                hold_sec=float(ctx.entry_ctx.get("hold_sec") or 0.0),
+            )
+        except (OSError, RuntimeError) as exc:
+            ctx.metadata["entry_error"] = str(exc)
+
+    ending_path = None
+    if (not skip_ending and ctx.ending_ctx.get("enabled")
+            and ctx.ending_ctx.get("exists")):
+        try:
+            ending_path = prepare_intermediate(
+                ctx.ending_ctx["path"], "ending", spec,
+            )
+        except (OSError, RuntimeError) as exc:
+            ctx.metadata["ending_error"] = str(exc)
+
+    return (entry_path, ending_path)
 
 
 def validate_context(ctx: VideoRenderingContext) -> bool:
@@ -517,48 +637,83 @@ def _compose_and_export(
     layers: list[Any],
     audio: Any,
     output_path: str,
-    composer: Optional[IVideoComposer] = None
+    composer: Optional["IVideoComposer"] = None,
+    entry_path: Optional[str] = None,
+    ending_path: Optional[str] = None,
 ) -> None:
     """Combine all layers + audio and export to MP4.
 
-    TODO: Extract full implementation from render_video_moviepy
+    Layers are handed to the composer as-is. The default composer is the
+    NumPy single-pass compositor, which flattens static MoviePy clips into
+    pre-cropped layers and blits only the layers active at each frame into
+    one pre-allocated canvas buffer. The batch fade-in window ends at
+    FADE_IN_DURATION in the final video; the entry intermediate carries
+    the keyframe there, so the main segment only forces one when no entry
+    (or an entry shorter than the fade) precedes it. Concatenation can
+    then stream-copy everything after the fade.
+
+    When entry/ending intermediates are given, only the main segment is
+    encoded; the intermediates are spliced around it by stream copy.
 
     Args:
         ctx: VideoRenderingContext with metadata
-        layers: List of MoviePy Clips (background, letters, etc.)
-        audio: MoviePy AudioClip
+        layers: List of layers (FrameLayer or MoviePy Clips), bottom first
+        audio: AudioBed, MoviePy AudioClip (or None)
         output_path: Output MP4 file path
-        composer: IVideoComposer implementation (None = default MoviePy)
+        composer: IVideoComposer implementation
+            (None = NumpyFrameCompositor)
+        entry_path: Prepared entry intermediate (or None)
+        ending_path: Prepared ending intermediate (or None)
 
     Side Effects:
         Writes MP4 file to output_path
     """
-    # Import MoviePy
-    try:
-        from moviepy import editor as mpy  # type: ignore
-    except (ImportError, AttributeError):
-        import moviepy as mpy  # type: ignore
+    from spellvid.infrastructure.video.frame_compositor import (
+        NumpyFrameCompositor,
+    )
 
-    # TODO: Composite all layers
-    # TODO: Set audio
-    # TODO: Export to file
+    if not layers:
+        return
 
-    # Stub: create simple composite and export
-    if layers:
-        final_clip = mpy.CompositeVideoClip(layers)
-        if audio:
-            final_clip = final_clip.with_audio(audio)
+    if composer is None:
+        lead = 0.0
+        if entry_path is not None:
+            lead = float(ctx.entry_ctx.get("total_lead_sec") or 0.0)
+        keyframes = ((FADE_IN_DURATION - lead,)
+                     if lead < FADE_IN_DURATION else ())
+        composer = NumpyFrameCompositor(keyframe_times=keyframes)
+
+    final_clip = composer.compose_clips(
+        layers, size=tuple(ctx.metadata.get("video_size", (1920, 1080)))
+    )
+    splice = entry_path is not None or ending_path is not None
+    if splice and audio is None:
+        # Every spliced segment needs the same stream layout
+        from spellvid.infrastructure.video.ffmpeg_pipe import SILENT_AUDIO
+        audio = SILENT_AUDIO
+    if audio is not None and hasattr(final_clip, "with_audio"):
+        final_clip = final_clip.with_audio(audio)
+
+    main_path = f"{output_path}.main.mp4" if splice else output_path
+    composer.render_to_file(
+        final_clip,
+        main_path,
+        fps=ctx.metadata.get("fps", 24),
+        codec="libx264",
+    )
+    if not splice:
+        return
 
-        # Create output directory
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    from spellvid.infrastructure.video.intermediates import splice_segments
 
-        # Export (simplified)
-        final_clip.write_videofile(
+    try:
+        splice_segments(
+            [p for p in (entry_path, main_path, ending_path) if p],
             output_path,
-            fps=ctx.metadata.get("fps", 24),
-            codec="libx264",
-            audio_codec="aac"
         )
+    finally:
+        if os.path.exists(main_path):
+            os.remove(main_path)
 
 
 # ============================================================================
@@ -571,28 +726,39 @@ def render_video(
     output_path: str = "",
     dry_run: bool = False,
     skip_ending: bool = False,
-    composer: Optional[IVideoComposer] = None,
+    composer: Optional["IVideoComposer"] = None,
     config: Optional[VideoConfig] = None,  # Backward compatibility
+    plan: Optional[RenderPlan] = None,
 ) -> Dict[str, Any]:
     """Orchestrate complete video rendering pipeline.
 
     New implementation that delegates to 11 specialized sub-functions,
     replacing the monolithic render_video_moviepy (~1,630 lines).
 
+    The item is first compiled into a RenderPlan; the layer and audio
+    steps read their spans and events from it. A plan compiled earlier
+    (e.g. by a batch, possibly in another process) can be passed instead
+    of item, and is then used without recomputing anything.
+
     Args:
         item: JSON configuration dict (see SCHEMA in shared.validation)
         output_path: Output MP4 file path
         dry_run: If True, only compute metadata without rendering
         skip_ending: If True, omit ending video (for batch processing)
-        composer: IVideoComposer implementation (None = default MoviePy)
+        composer: IVideoComposer implementation
+            (None = NumpyFrameCompositor)
         config: VideoConfig object (DEPRECATED, use item dict instead)
+        plan: Precompiled RenderPlan (item and config are then ignored)
 
     Returns:
         Rendering result dict:
         - success: bool
         - duration: float (total duration)
         - output_path: str
-        - metadata: dict (layout, resources, timing)
+        - metadata: dict (layout, timeline, config, profile)
+          profile is RenderProfiler.to_dict(): wall/CPU seconds per
+          step, frames encoded and peak RSS
+        - plan: dict (RenderPlan.to_dict(), dry-run only)
 
     Raises:
         ValueError: Invalid item configuration
@@ -611,26 +777,52 @@ def render_video(
         >>> result["success"]
         True
     """
-    # Backward compatibility: convert VideoConfig to dict
-    if config is not None and item is None:
-        item = {
-            "letters": config.letters,
-            "word_en": config.word_en,
-            "word_zh": config.word_zh,
-            "image_path": config.image_path,
-            "music_path": config.music_path,
-            "countdown_sec": config.countdown_sec,
-            "reveal_hold_sec": config.reveal_hold_sec,
-        }
-
-    if item is None:
-        raise ValueError(
-            "Either 'item' dict or 'config' VideoConfig must be provided"
+    profiler = RenderProfiler()
+    # Asset lookups are answered from one index for the whole render
+    # (or the enclosing batch), never from an earlier one
+    with asset_index_scope(), profiler.activate():
+        result = _run_render_steps(
+            profiler, item, output_path, dry_run, skip_ending, composer,
+            config, plan,
         )
+    result["metadata"]["profile"] = profiler.to_dict()
+    return result
+
 
-    # Step 1: Prepare all context data upfront
-    # (layout, timeline, entry/ending/letters contexts, metadata)
-    ctx = _prepare_all_context(item)
+def _run_render_steps(
+    profiler: RenderProfiler,
+    item: Optional[Dict[str, Any]],
+    output_path: str,
+    dry_run: bool,
+    skip_ending: bool,
+    composer: Optional["IVideoComposer"],
+    config: Optional[VideoConfig],
+    plan: Optional[RenderPlan],
+) -> Dict[str, Any]:
+    """Run the eleven render steps, timing each one as a profiler stage.
+
+    See render_video for the arguments and the returned dict.
+    """
+    with profiler.stage("plan"):
+        if plan is None:
+            # Backward compatibility: convert VideoConfig to dict
+            if config is not None and item is None:
+                item = config_to_item(config)
+
+            if item is None:
+                raise ValueError(
+                    "Either 'item' dict or 'config' VideoConfig must be "
+                    "provided"
+                )
+
+            # Step 1: Compile the render plan in one pass
+            # (layout, timeline, layer spans, audio events, entry/ending)
+            plan = compile_render_plan(item, skip_ending=skip_ending,
+                                       prefetch_content=not dry_run)
+        else:
+            skip_ending = skip_ending or plan.skip_ending
+        ctx = _context_from_plan(plan)
+    profiler.label = str(ctx.item.get("word_en") or output_path)
 
     # Dry-run mode: return metadata without rendering
     if dry_run:
@@ -643,59 +835,64 @@ def render_video(
                 "timeline": ctx.timeline,
                 "config": ctx.item,
             },
+            "plan": plan.to_dict(),
             "status": "dry-run",
         }
 
     # Step 2: Create background clip (image/video or solid color)
-    bg_clip = _create_background_clip(ctx)
+    with profiler.stage("background"):
+        bg_clip = _create_background_clip(ctx)
 
     # Step 3: Render letters layer (top-left letter images)
-    letters_clip = _render_letters_layer(ctx)
+    with profiler.stage("letters"):
+        letters_clip = _render_letters_layer(ctx)
 
     # Step 4: Render Chinese + Zhuyin layer (top-right)
-    chinese_clip = _render_chinese_zhuyin_layer(ctx)
+    with profiler.stage("chinese_zhuyin"):
+        chinese_clip = _render_chinese_zhuyin_layer(ctx)
 
     # Step 5: Render timer layer (countdown in top-left corner)
-    timer_clip = _render_timer_layer(ctx)
+    with profiler.stage("timer"):
+        timer_clip = _render_timer_layer(ctx)
 
     # Step 6: Render reveal layer (typing animation in bottom center)
-    reveal_clip = _render_reveal_layer(ctx)
+    with profiler.stage("reveal"):
+        reveal_clip = _render_reveal_layer(ctx)
 
     # Step 7: Render progress bar layer (bottom of video)
-    progress_clip = _render_progress_bar_layer(ctx)
+    with profiler.stage("progress_bar"):
+        progress_clip = _render_progress_bar_layer(ctx)
 
     # Step 8: Process audio tracks (music + countdown beeps)
-    audio_clip = _process_audio_tracks(ctx)
+    with profiler.stage("audio"):
+        audio_clip = _process_audio_tracks(ctx)
 
     # Step 9: Load optional entry and ending clips
-    entry_clip, ending_clip = _load_entry_ending_clips(ctx)
+    with profiler.stage("entry_ending"):
+        entry_clip, ending_clip = _load_entry_ending_clips(
+            ctx, skip_ending=skip_ending
+        )
 
     # Step 10: Collect all layers for composition
-    layers = [bg_clip]
-
-    # Add main content layers (only if not stub clips)
-    if letters_clip and hasattr(letters_clip, 'size'):
-        if letters_clip.size != (1, 1):  # Skip stub clips
-            layers.append(letters_clip)
-
-    if chinese_clip and hasattr(chinese_clip, 'size'):
-        if chinese_clip.size != (1, 1):
-            layers.append(chinese_clip)
-
-    if timer_clip and hasattr(timer_clip, 'size'):
-        if timer_clip.size != (1, 1):
-            layers.append(timer_clip)
-
-    if reveal_clip and hasattr(reveal_clip, 'size'):
-        if reveal_clip.size != (1, 1):
-            layers.append(reveal_clip)
-
-    if progress_clip and hasattr(progress_clip, 'size'):
-        if progress_clip.size != (1, 1):
-            layers.append(progress_clip)
+    # Static layers (background, letters, Chinese) come first so the
+    # compositor can pre-flatten them into one plate; the time-varying
+    # layers (timer, reveal, progress bar) are composited per frame.
+    with profiler.stage("collect_layers"):
+        layers = [bg_clip]
+
+        # Add main content layers (only if not stub clips)
+        for clip in (letters_clip, chinese_clip, timer_clip, reveal_clip,
+                     progress_clip):
+            if clip and hasattr(clip, 'size') and clip.size != (1, 1):
+                layers.append(clip)
 
     # Step 11: Compose and export final video
-    _compose_and_export(ctx, layers, audio_clip, output_path, composer)
+    # (the encoder reports "composite" and "encode" sub-stages)
+    with profiler.stage("compose_export"):
+        _compose_and_export(
+            ctx, layers, audio_clip, output_path, composer,
+            entry_path=entry_clip, ending_path=ending_clip,
+        )
 
     return {
         "success": True,
@@ -725,13 +922,15 @@ def _validate_resources(config: VideoConfig) -> Dict[str, Any]:
         "music": {"exists": False, "path": config.music_path},
     }
 
+    index = get_asset_index()
+
     if config.image_path:
-        result["image"]["exists"] = Path(config.image_path).exists()
+        result["image"]["exists"] = index.exists(config.image_path)
         if not result["image"]["exists"]:
             result["all_present"] = False
 
     if config.music_path:
-        result["music"]["exists"] = Path(config.music_path).exists()
+        result["music"]["exists"] = index.exists(config.music_path)
         if not result["music"]["exists"]:
             result["all_present"] = False
 
@@ -6,10 +6,12 @@
 
 向後相容性:
 - Re-export deprecated wrappers from commands.py directly
+
+make_command / batch_command 在第一次存取時才匯入 commands 模組 (PEP 562),
+commands 會載入應用層服務,只需要 parser 的呼叫端不必付出這個成本。
 """
 
 from .parser import build_parser, parse_make_args, parse_batch_args
-from .commands import make_command, batch_command
 
 # 為向後相容創建 alias (deprecated wrappers 直接在此定義)
 
@@ -22,6 +24,7 @@ def make(args):
         DeprecationWarning,
         stacklevel=2
     )
+    from .commands import make_command
     return make_command(args)
 
 
@@ -33,6 +36,7 @@ def batch(args):
         DeprecationWarning,
         stacklevel=2
     )
+    from .commands import batch_command
     return batch_command(args)
 
 
@@ -46,3 +50,12 @@ __all__ = [
     "make",
     "batch",
 ]
+
+
+def __getattr__(name: str):
+    if name in ("make_command", "batch_command"):
+        from . import commands
+        value = getattr(commands, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,20 +1,25 @@
 """CLI 模組的 __main__ 入口點
 
 允許使用 `python -m spellvid.cli` 執行。
-委派給 parser 和 commands 模組直接執行。
+委派給 parser 和 commands 模組直接執行(commands 延遲匯入)。
 """
 
 from .parser import build_parser
-from .commands import make_command, batch_command
 
 
 def main(argv: list[str] | None = None) -> int:
-    """CLI 入口點 - 解析參數並執行命令"""
+    """CLI 入口點 - 解析參數並執行命令
+
+    命令模組(以及其後的渲染堆疊)在解析參數後才匯入,
+    `--help` 與參數錯誤不需要載入它們。
+    """
     p = build_parser()
     args = p.parse_args(argv)
     if args.cmd == "make":
+        from .commands import make_command
         return make_command(args)
     if args.cmd == "batch":
+        from .commands import batch_command
         return batch_command(args)
     p.print_help()
     return 1
@@ -6,14 +6,26 @@
 
 import argparse
 import sys
-from typing import List
+from typing import Any, Dict, Iterable, Iterator, List
 from pathlib import Path
 
+from ..shared.profiling import collect_profiles, write_profile
 from ..shared.types import VideoConfig
-from ..shared.validation import load_json
+from ..shared.validation import BatchRecord, iter_batch_items
 from ..application.video_service import render_video
 from ..application.batch_service import render_batch
 from ..application.resource_checker import check_assets
+from ..infrastructure.media.asset_index import asset_index_scope
+
+
+def _write_profile(args: argparse.Namespace, result: dict) -> None:
+    """依 --profile / --profile-format 寫出計時檔(未指定時不做事)"""
+    path = getattr(args, "profile", None)
+    if not path:
+        return
+    fmt = getattr(args, "profile_format", "json")
+    write_profile(path, collect_profiles(result), fmt=fmt)
+    print(f"  Profile ({fmt}): {path}")
 
 
 def make_command(args: argparse.Namespace) -> int:
@@ -46,31 +58,35 @@ def make_command(args: argparse.Namespace) -> int:
             letters_as_image=args.letters_as_image,
         )
 
-        # 檢查資源 (dry-run 或實際渲染都需要)
-        assets_result = check_assets(config)
+        # 資源檢查與渲染共用同一個素材索引(每個目錄只掃描一次)
+        with asset_index_scope():
+            # 檢查資源 (dry-run 或實際渲染都需要)
+            assets_result = check_assets(config)
 
-        # 顯示資源檢查結果
-        image_exists = assets_result.get("image", {}).get("exists")
-        if config.image_path and not image_exists:
-            print(
-                f"WARNING: Image not found: {config.image_path}",
-                file=sys.stderr
-            )
-        music_exists = assets_result.get("music", {}).get("exists")
-        if config.music_path and not music_exists:
-            print(
-                f"WARNING: Music not found: {config.music_path}",
-                file=sys.stderr
+            # 顯示資源檢查結果
+            image_exists = assets_result.get("image", {}).get("exists")
+            if config.image_path and not image_exists:
+                print(
+                    f"WARNING: Image not found: {config.image_path}",
+                    file=sys.stderr
+                )
+            music_exists = assets_result.get("music", {}).get("exists")
+            if config.music_path and not music_exists:
+                print(
+                    f"WARNING: Music not found: {config.music_path}",
+                    file=sys.stderr
+                )
+
+            # 呼叫 video_service
+            result = render_video(
+                config=config,
+                output_path=args.out,
+                dry_run=args.dry_run,
+                skip_ending=False,  # make 命令單支視頻包含 ending
+                composer=None  # 使用預設 composer
             )
 
-        # 呼叫 video_service
-        result = render_video(
-            config=config,
-            output_path=args.out,
-            dry_run=args.dry_run,
-            skip_ending=False,  # make 命令單支視頻包含 ending
-            composer=None  # 使用預設 composer
-        )
+        _write_profile(args, result)
 
         # 輸出結果
         if result.get("success"):
@@ -96,10 +112,57 @@ def make_command(args: argparse.Namespace) -> int:
         return 1
 
 
+def _item_to_config(item: Dict[str, Any],
+                    args: argparse.Namespace) -> VideoConfig:
+    """把批次檔的一筆資料轉為 VideoConfig (未指定的欄位套用全域參數)"""
+    return VideoConfig(
+        letters=item["letters"],
+        word_en=item["word_en"],
+        word_zh=item["word_zh"],
+        image_path=item.get("image_path"),
+        music_path=item.get("music_path"),
+        countdown_sec=item.get("countdown_sec", 10),
+        reveal_hold_sec=item.get("reveal_hold_sec", 5),
+        entry_hold_sec=item.get("entry_hold_sec", args.entry_hold),
+        timer_visible=item.get("timer_visible", args.timer_visible),
+        progress_bar=item.get("progress_bar", args.progress_bar),
+        letters_as_image=item.get("letters_as_image", args.letters_as_image),
+    )
+
+
+def _iter_batch_configs(records: Iterable[BatchRecord],
+                        args: argparse.Namespace,
+                        invalid: List[int]) -> Iterator[VideoConfig]:
+    """逐筆產生 VideoConfig;驗證失敗的行立即回報並記入 invalid"""
+    for record in records:
+        if not record.ok:
+            invalid.append(record.line)
+            errors = "; ".join(record.errors)
+            print(f"ERROR: line {record.line}: {errors}", file=sys.stderr)
+            continue
+
+        config = _item_to_config(record.item, args)
+
+        # 檢查資源 (顯示警告,但不中斷)
+        assets_result = check_assets(config)
+        image_ok = assets_result.get("image", {}).get("exists")
+        if config.image_path and not image_ok:
+            msg = f"WARNING: Image missing for {config.word_en}"
+            print(f"{msg}: {config.image_path}", file=sys.stderr)
+        music_ok = assets_result.get("music", {}).get("exists")
+        if config.music_path and not music_ok:
+            msg = f"WARNING: Music missing for {config.word_en}"
+            print(f"{msg}: {config.music_path}", file=sys.stderr)
+
+        yield config
+
+
 def batch_command(args: argparse.Namespace) -> int:
     """處理 batch 命令 - 批次生成多支視頻
 
-    此函數載入 JSON 配置,轉換為 VideoConfig 列表,並委派給 batch_service。
+    此函數逐行讀取批次檔 (JSON 陣列、JSON Lines 或 CSV),轉換為
+    VideoConfig 串流並委派給 batch_service;讀到第一筆就開始渲染。
+    驗證失敗的行以行號回報並跳過,其餘項目照常渲染。
 
     Args:
         args: argparse 解析後的 Namespace 物件
@@ -109,80 +172,55 @@ def batch_command(args: argparse.Namespace) -> int:
 
     Example:
         $ python -m spellvid.cli batch --json config.json --outdir out/
+        $ python -m spellvid.cli batch --json doc/Fry_Words_1_500.csv
     """
     try:
-        # 載入與驗證 JSON
+        # 開啟批次檔 (依副檔名判斷格式)
         json_path = Path(args.json)
         if not json_path.exists():
             print(f"ERROR: JSON file not found: {args.json}", file=sys.stderr)
             return 1
 
-        data = load_json(str(json_path))
-
-        # 驗證資料必須是列表
-        if not isinstance(data, list):
-            print("ERROR: JSON must be an array of items", file=sys.stderr)
-            return 2
-
-        if len(data) == 0:
-            print("ERROR: JSON array is empty", file=sys.stderr)
-            return 2
-
-        # 轉換為 VideoConfig 列表
-        configs: List[VideoConfig] = []
-        for item in data:
-            # 套用全域參數 (如果 JSON 中沒有指定)
-            if "letters_as_image" not in item:
-                item["letters_as_image"] = args.letters_as_image
-            if "progress_bar" not in item:
-                item["progress_bar"] = args.progress_bar
-            if "timer_visible" not in item:
-                item["timer_visible"] = args.timer_visible
-            if "entry_hold_sec" not in item:
-                item["entry_hold_sec"] = args.entry_hold
-
-            config = VideoConfig(
-                letters=item["letters"],
-                word_en=item["word_en"],
-                word_zh=item["word_zh"],
-                image_path=item.get("image_path"),
-                music_path=item.get("music_path"),
-                countdown_sec=item.get("countdown_sec", 10),
-                reveal_hold_sec=item.get("reveal_hold_sec", 5),
-                entry_hold_sec=item.get("entry_hold_sec", 0.0),
-                timer_visible=item.get("timer_visible", True),
-                progress_bar=item.get("progress_bar", True),
-                letters_as_image=item.get("letters_as_image", True),
-            )
-            configs.append(config)
+        records = iter_batch_items(str(json_path))
+        invalid: List[int] = []
+        keep_all = bool(getattr(args, "profile", None))
+        kept: List[Dict[str, Any]] = []
 
-        # 檢查資源 (顯示警告,但不中斷)
-        for i, config in enumerate(configs):
-            assets_result = check_assets(config)
-            image_ok = assets_result.get("image", {}).get("exists")
-            if config.image_path and not image_ok:
-                msg = f"WARNING: Image missing for {config.word_en}"
-                print(f"{msg}: {config.image_path}", file=sys.stderr)
-            music_ok = assets_result.get("music", {}).get("exists")
-            if config.music_path and not music_ok:
-                msg = f"WARNING: Music missing for {config.word_en}"
-                print(f"{msg}: {config.music_path}", file=sys.stderr)
+        def _on_result(item: Dict[str, Any]) -> None:
+            # 只保留失敗項目 (與 --profile 時的每項計時),記憶體不隨批次成長
+            if keep_all or not item.get("success", False):
+                kept.append(item)
 
         # 呼叫 batch_service
         result = render_batch(
-            configs=configs,
+            configs=_iter_batch_configs(records, args, invalid),
             output_dir=args.outdir,
             dry_run=args.dry_run,
             entry_hold=args.entry_hold,
-            skip_ending_per_video=True  # 批次模式:只有最後一支有 ending
+            skip_ending_per_video=True,  # 批次模式:只有最後一支有 ending
+            workers=getattr(args, "jobs", 1),
+            force=getattr(args, "force", False),
+            on_result=_on_result,
         )
+        result["results"] = kept
+
+        if result["total"] == 0 and not invalid:
+            print("ERROR: Batch file has no items", file=sys.stderr)
+            return 2
+
+        _write_profile(args, result)
 
         # 輸出結果摘要
         print("\n" + "="*60)
         print("Batch Processing Summary:")
         print(f"  Total: {result['total']}")
         print(f"  Success: {result['success']}")
+        if not args.dry_run:
+            print(f"    Rendered: {result.get('rendered', 0)}")
+            print(f"    Skipped (unchanged): {result.get('skipped', 0)}")
         print(f"  Failed: {result['failed']}")
+        if invalid:
+            print(f"  Invalid lines: {len(invalid)}")
         print("="*60)
 
         # 如果有失敗,顯示失敗詳情
@@ -200,7 +238,7 @@ def batch_command(args: argparse.Namespace) -> int:
             print(f"\nWARNING: {msg}", file=sys.stderr)
 
         # 回傳 exit code
-        return 0 if result["failed"] == 0 else 1
+        return 0 if result["failed"] == 0 and not invalid else 1
 
     except FileNotFoundError as e:
         print(f"ERROR: {e}", file=sys.stderr)
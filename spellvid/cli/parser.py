@@ -107,6 +107,7 @@ def _register_make_command(subparsers) -> None:
         dest="dry_run",
         help="僅驗證參數與資源,不實際渲染"
     )
+    _add_profile_arguments(make_parser)
 
     # 視覺元素開關
     make_parser.add_argument(
@@ -179,7 +180,7 @@ def _register_batch_command(subparsers) -> None:
     batch_parser.add_argument(
         "--json",
         required=True,
-        help="JSON 配置檔案路徑"
+        help="批次檔路徑: JSON 陣列、JSON Lines (.jsonl) 或 CSV (.csv)"
     )
     batch_parser.add_argument(
         "--outdir",
@@ -201,6 +202,20 @@ def _register_batch_command(subparsers) -> None:
         default=0.0,
         help="入場影片後停留秒數 (套用到所有視頻, 預設: 0.0)"
     )
+    batch_parser.add_argument(
+        "--force",
+        action="store_true",
+        dest="force",
+        help="忽略輸出目錄的清單,重新渲染所有項目 (預設跳過未變動的項目)"
+    )
+    batch_parser.add_argument(
+        "--jobs",
+        type=int,
+        dest="jobs",
+        default=1,
+        help="平行渲染的行程數 (預設: 1, 依序渲染)"
+    )
+    _add_profile_arguments(batch_parser)
 
     # 視覺元素開關 (套用到所有視頻)
     batch_parser.add_argument(
@@ -284,6 +299,28 @@ def _register_batch_command(subparsers) -> None:
     )
 
 
+def _add_profile_arguments(parser) -> None:
+    """註冊 make / batch 共用的計時輸出參數
+
+    Args:
+        parser: 子命令的 ArgumentParser
+    """
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        default=None,
+        metavar="PATH",
+        help="將各階段的牆鐘/CPU 時間、影格數與峰值記憶體寫入檔案"
+    )
+    parser.add_argument(
+        "--profile-format",
+        dest="profile_format",
+        choices=["json", "chrome"],
+        default="json",
+        help="計時檔格式: json 摘要或 chrome trace-event (預設: json)"
+    )
+
+
 def parse_make_args(args: argparse.Namespace) -> dict:
     """從 Namespace 提取 make 命令所需參數並轉換為 dict
 
@@ -315,6 +352,8 @@ def parse_make_args(args: argparse.Namespace) -> dict:
         "letters_as_image": args.letters_as_image,
         "out": args.out,
         "dry_run": args.dry_run,
+        "profile": getattr(args, "profile", None),
+        "profile_format": getattr(args, "profile_format", "json"),
         "use_moviepy": getattr(args, "use_moviepy", False),
     }
 
@@ -341,6 +380,10 @@ def parse_batch_args(args: argparse.Namespace) -> dict:
         "outdir": args.outdir,
         "dry_run": args.dry_run,
         "entry_hold": args.entry_hold,
+        "jobs": getattr(args, "jobs", 1),
+        "force": getattr(args, "force", False),
+        "profile": getattr(args, "profile", None),
+        "profile_format": getattr(args, "profile_format", "json"),
         "progress_bar": args.progress_bar,
         "timer_visible": args.timer_visible,
         "letters_as_image": args.letters_as_image,
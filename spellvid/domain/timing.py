@@ -6,6 +6,7 @@
 - 格式化倒數計時器文字(秒 → "M:SS" 或 "SS")
 - 計算視頻時間軸(包含揭示、淡出等事件)
 - 生成計時器更新時間點列表
+- 計算倒數嗶聲時間點
 
 設計原則:
 - 純函數邏輯,不依賴任何基礎設施
@@ -190,6 +191,34 @@ def calculate_timer_updates(
     return updates
 
 
+def calculate_beep_schedule(countdown: float, beeps: int = 3) -> List[float]:
+    """計算倒數最後幾秒的嗶聲時間點
+
+    每個剩餘秒數 S(beeps, ..., 1)在 countdown - S 秒響一次;
+    倒數不足 S 秒時略過該聲。
+
+    Args:
+        countdown: 倒數秒數
+        beeps: 最後幾秒要響(預設 3)
+
+    Returns:
+        嗶聲時間點列表(秒,遞增)
+
+    Examples:
+        >>> calculate_beep_schedule(10)
+        [7.0, 8.0, 9.0]
+
+        >>> calculate_beep_schedule(2)
+        [0.0, 1.0]
+    """
+    countdown = float(countdown)
+    return [
+        float(max(0.0, countdown - remaining))
+        for remaining in range(int(beeps), 0, -1)
+        if remaining <= countdown
+    ]
+
+
 # ========== 內部工具函數 (從 utils.py 遷移) ==========
 
 
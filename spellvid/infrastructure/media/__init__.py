@@ -2,6 +2,12 @@
 
 - interface.py: IMediaProcessor Protocol 定義
 - ffmpeg_wrapper.py: FFmpeg 命令列包裝器(待實作)
+- cache.py: 磁碟快取目錄與鍵值工具
+- probe.py: 單次呼叫的媒體元資料探測(probe / probe_many)
+- probe_cache.py: 持久化媒體探測快取(SQLite)
+- asset_index.py: 素材目錄索引(存在、圖片尺寸、是否過期;選用持久化)
+- audio.py: 嗶聲與 NumPy 音訊底軌(AudioBed)
+- pcm_cache.py: 解碼後 PCM 的記憶體映射磁碟快取
 """
 
 from .interface import IMediaProcessor
@@ -0,0 +1,276 @@
+"""素材目錄索引
+
+批次中每個項目都會對圖片、音樂與每個字母素材各自 os.path.isfile,
+再以 PIL 開檔讀取尺寸;CLI 的 check_assets 與 render_video 又重複檢查
+一次。素材放在網路磁碟時,500 項的 dry-run 幾乎都花在這些呼叫上。
+
+AssetIndex 在第一次查詢某個目錄時以一次 os.scandir 列出該目錄,
+記錄每個檔案的大小與修改時間,圖片只讀取檔頭取得尺寸(PIL 延遲解碼),
+之後整個批次的存在、尺寸與是否過期都由記憶體回答(索引中找不到的
+檔案才會再 stat 一次,以接受掃描後新增的檔案):
+
+- exists(path) / entry(path) / dimensions(path)
+- is_stale(path): 重新 stat,檔案在索引後變動或刪除時為 True
+- 持久化(選用):<cache_root>/assets/asset_index.json,大小與修改時間
+  未變的圖片下次執行不再讀取檔頭;設定 SPELLVID_ASSET_INDEX_CACHE=1 啟用
+
+索引只在一次 render_batch / render_video 內有效:asset_index_scope()
+區塊內(同一執行緒、可巢狀)的 get_asset_index() 共用同一個索引,
+因此長時間執行的行程(GUI、函式庫使用)在批次之間修改或刪除的素材
+不會得到過期的答案。區塊外的查詢不掃描目錄,只 stat 查詢的檔案
+(尺寸查詢才讀取該檔的檔頭),成本與未使用索引時相同。
+
+Example:
+    >>> with asset_index_scope() as index:
+    ...     index.exists("assets/ice.png")
+    ...     index.dimensions("assets/ice.png")
+    True
+    (1024, 768)
+"""
+
+import contextlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+from spellvid.infrastructure.media.cache import cache_dir
+
+# 持久化格式變更時遞增
+ASSET_INDEX_VERSION = 1
+
+# 讀取檔頭尺寸的副檔名
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp")
+
+_TRUTHY = ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class AssetEntry:
+    """索引中的單一檔案
+
+    Attributes:
+        path: 絕對路徑
+        size: 檔案大小(位元組)
+        mtime_ns: 修改時間(奈秒)
+        width: 圖片寬度,非圖片或無法讀取時為 None
+        height: 圖片高度,非圖片或無法讀取時為 None
+    """
+
+    path: str
+    size: int
+    mtime_ns: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+def _read_image_size(path: str) -> Tuple[Optional[int], Optional[int]]:
+    """只讀取檔頭取得圖片尺寸(不解碼像素;PIL 在第一次需要時才載入)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None, None
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+    except Exception:
+        return None, None
+    return int(width), int(height)
+
+
+class AssetIndex:
+    """以目錄為單位的檔案索引
+
+    Args:
+        persist_path: 持久化 JSON 路徑,None 表示只使用記憶體
+        scan_directories: False 時不掃描目錄,每次查詢只 stat 該檔案
+            (asset_index_scope 區塊外的單次查詢)
+    """
+
+    def __init__(self, persist_path: Optional[str] = None,
+                 scan_directories: bool = True):
+        self.persist_path = persist_path
+        self.scan_directories = scan_directories
+        self.scans = 0
+        self._dirs: Dict[str, Dict[str, AssetEntry]] = {}
+        self._persisted: Dict[str, Dict[str, list]] = {}
+        self._lock = threading.Lock()
+        if persist_path:
+            self._persisted = self._load(persist_path)
+
+    def _directory(self, directory: str) -> Dict[str, AssetEntry]:
+        """取得目錄索引,第一次查詢時掃描"""
+        with self._lock:
+            entries = self._dirs.get(directory)
+            if entries is None:
+                entries = self._scan(directory)
+                self._dirs[directory] = entries
+            return entries
+
+    def _scan(self, directory: str) -> Dict[str, AssetEntry]:
+        self.scans += 1
+        entries: Dict[str, AssetEntry] = {}
+        known = self._persisted.get(directory, {})
+        try:
+            listing = list(os.scandir(directory))
+        except OSError:
+            listing = []
+        dirty = False
+        for item in listing:
+            try:
+                if not item.is_file():
+                    continue
+                stat = item.stat()
+            except OSError:
+                continue
+            size, mtime_ns = int(stat.st_size), int(stat.st_mtime_ns)
+            width = height = None
+            if item.name.lower().endswith(IMAGE_EXTENSIONS):
+                cached = known.get(item.name)
+                if cached and cached[:2] == [size, mtime_ns]:
+                    width, height = cached[2], cached[3]
+                else:
+                    width, height = _read_image_size(item.path)
+                    dirty = True
+            entries[item.name] = AssetEntry(
+                os.path.join(directory, item.name), size, mtime_ns,
+                width, height,
+            )
+        if self.persist_path and (dirty or set(known) != set(entries)):
+            self._persisted[directory] = {
+                name: [e.size, e.mtime_ns, e.width, e.height]
+                for name, e in entries.items()
+            }
+            self._save()
+        return entries
+
+    def entry(self, path: str) -> Optional[AssetEntry]:
+        """查詢檔案記錄,不存在(或不是檔案)時為 None"""
+        if not path:
+            return None
+        abs_path = os.path.abspath(str(path))
+        if not self.scan_directories:
+            if not os.path.isfile(abs_path):
+                return None
+            return self._index_file(abs_path)
+        directory, name = os.path.split(abs_path)
+        entries = self._directory(directory)
+        found = entries.get(name)
+        if found is None and os.path.isfile(abs_path):
+            # 掃描後才新增的檔案:只在未命中時多一次 stat
+            found = self._index_file(abs_path)
+            with self._lock:
+                entries[name] = found
+        return found
+
+    @staticmethod
+    def _index_file(abs_path: str) -> AssetEntry:
+        stat = os.stat(abs_path)
+        width = height = None
+        if abs_path.lower().endswith(IMAGE_EXTENSIONS):
+            width, height = _read_image_size(abs_path)
+        return AssetEntry(abs_path, int(stat.st_size),
+                          int(stat.st_mtime_ns), width, height)
+
+    def exists(self, path: str) -> bool:
+        """檔案是否存在(依索引)"""
+        if not self.scan_directories:
+            return bool(path) and os.path.isfile(os.path.abspath(str(path)))
+        return self.entry(path) is not None
+
+    def dimensions(self, path: str) -> Optional[Tuple[int, int]]:
+        """圖片尺寸 (width, height),非圖片或無法讀取時為 None"""
+        entry = self.entry(path)
+        if entry is None or entry.width is None or entry.height is None:
+            return None
+        return entry.width, entry.height
+
+    def is_stale(self, path: str) -> bool:
+        """檔案在索引後是否已變動(新增、刪除、大小或修改時間不同)"""
+        entry = self.entry(path)
+        try:
+            stat = os.stat(os.path.abspath(str(path)))
+        except OSError:
+            return entry is not None
+        if entry is None:
+            return True
+        return (int(stat.st_size), int(stat.st_mtime_ns)) != \
+            (entry.size, entry.mtime_ns)
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """捨棄目錄索引(path 所在目錄;None 表示全部),下次查詢時重新掃描"""
+        with self._lock:
+            if path is None:
+                self._dirs.clear()
+            else:
+                directory = os.path.dirname(os.path.abspath(str(path)))
+                self._dirs.pop(directory, None)
+
+    @staticmethod
+    def _load(path: str) -> Dict[str, Dict[str, list]]:
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != ASSET_INDEX_VERSION:
+            return {}
+        return data.get("dirs", {})
+
+    def _save(self) -> None:
+        # 先寫暫存檔再原子替換;失敗時只影響下次執行的速度
+        partial = f"{self.persist_path}.{os.getpid()}.partial"
+        try:
+            with open(partial, "w", encoding="utf-8") as handle:
+                json.dump({"version": ASSET_INDEX_VERSION,
+                           "dirs": self._persisted}, handle)
+            os.replace(partial, self.persist_path)
+        except OSError:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+
+# 目前執行緒的批次索引 (asset_index_scope 區塊內)
+_local = threading.local()
+
+
+def _persist_path() -> Optional[str]:
+    value = os.environ.get("SPELLVID_ASSET_INDEX_CACHE", "")
+    if value.strip().lower() not in _TRUTHY:
+        return None
+    return os.path.join(cache_dir("assets"), "asset_index.json")
+
+
+@contextlib.contextmanager
+def asset_index_scope() -> Iterator[AssetIndex]:
+    """在區塊內共用同一個 AssetIndex(一次批次或一次渲染)
+
+    巢狀使用時沿用外層的索引,例如 render_batch 內的 render_video。
+    持久化依 SPELLVID_ASSET_INDEX_CACHE 與目前的快取根目錄決定。
+
+    Yields:
+        此區塊共用的 AssetIndex
+    """
+    current = getattr(_local, "index", None)
+    if current is not None:
+        yield current
+        return
+    index = AssetIndex(persist_path=_persist_path())
+    _local.index = index
+    try:
+        yield index
+    finally:
+        _local.index = None
+
+
+def get_asset_index() -> AssetIndex:
+    """取得目前的 AssetIndex
+
+    asset_index_scope() 區塊內回傳該區塊共用的索引;區塊外回傳不掃描
+    目錄的新索引,只 stat 查詢的檔案,答案反映呼叫當下的檔案系統。
+    """
+    current = getattr(_local, "index", None)
+    if current is not None:
+        return current
+    return AssetIndex(scan_directories=False)
@@ -3,11 +3,27 @@
 此模組提供音訊生成和處理功能,主要用於視頻渲染中的音效處理。
 
 主要功能:
-- 合成嗶聲音效
-- 生成 MoviePy AudioClip
+- 合成嗶聲音效(波形依參數快取,只計算一次 np.sin)
+- 音訊底軌(AudioBed):背景音樂只解碼一次成 PCM(經 pcm_cache 跨次
+  執行重用),以 NumPy 循環或截斷到片段長度,在倒數時間點疊加嗶聲並
+  套用淡出包絡,最後寫成單一 WAV 交給編碼器 mux,不經過 MoviePy 的
+  音訊合成圖
+- 生成 MoviePy AudioClip(make_beep,相容舊呼叫端)
+
+Example:
+    >>> bed = render_audio_bed(13.0, music_path="assets/ice.mp3",
+    ...                        beep_times=[7.0, 8.0, 9.0], fade_out=3.0)
+    >>> bed.samples.shape
+    (573300, 2)
+    >>> bed.write_wav("out/ice.wav")
+    'out/ice.wav'
 """
 
-from typing import Any
+import subprocess
+import wave
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional, Sequence
 
 try:
     import numpy as np
@@ -16,6 +32,17 @@ except ImportError:
     _HAS_NUMPY = False
     np = None  # type: ignore
 
+from spellvid.shared.constants import BEEP_LENGTH
+
+# 底軌格式,與片頭/片尾中介檔一致
+SAMPLE_RATE = 44100
+CHANNELS = 2
+
+# 嗶聲參數(與舊版 render_video_moviepy 相同;長度也供渲染計畫使用,
+# 定義於 shared.constants,計畫編譯不需載入 NumPy)
+BEEP_FREQ = 1000.0
+BEEP_AMPLITUDE = 0.2
+
 
 def synthesize_beeps(duration_sec: int = 3, rate_hz: int = 1) -> bytes:
     """合成嗶聲音訊的佔位資料.
@@ -79,8 +106,8 @@ def make_beep(
         - 波形: 正弦波 sin(2πft)
 
     Implementation Notes:
-        使用 numpy 生成正弦波樣本,然後包裝為 MoviePy AudioClip。
-        時間參數 t 可能是陣列(向量化),因此使用 numpy 操作確保效能。
+        波形由 beep_waveform 快取,make_frame 只做查表;新的渲染流程
+        改用 render_audio_bed,不再建立 AudioClip。
     """
     if not _HAS_NUMPY:
         raise RuntimeError("numpy is required for audio generation")
@@ -90,31 +117,211 @@ def make_beep(
     except ImportError:
         raise RuntimeError("MoviePy is required for audio generation")
 
+    samples = beep_waveform(freq=freq, length=length)
+
     def make_frame(t):
-        """生成音訊幀的回調函數.
+        """依時間查表取樣快取的波形(t 可能是陣列)"""
+        index = np.clip((np.asarray(t) * SAMPLE_RATE).astype(np.int64),
+                        0, len(samples) - 1)
+        return samples[index]
+
+    # 創建 AudioClip: 44100 Hz 採樣率,指定時長
+    ac = mpy.AudioClip(make_frame, duration=length, fps=SAMPLE_RATE)
+
+    # 設定在視頻中的起始時間
+    return ac.with_start(start_sec)
+
+
+@lru_cache(maxsize=8)
+def beep_waveform(
+    freq: float = BEEP_FREQ,
+    length: float = BEEP_LENGTH,
+    amplitude: float = BEEP_AMPLITUDE,
+    sample_rate: int = SAMPLE_RATE,
+) -> "np.ndarray":
+    """嗶聲的立體聲波形(依參數快取,唯讀)
+
+    Args:
+        freq: 正弦波頻率(Hz)
+        length: 時長(秒)
+        amplitude: 振幅(0-1)
+        sample_rate: 取樣率
+
+    Returns:
+        (n, 2) float32 陣列
+
+    Raises:
+        RuntimeError: 如果 numpy 未安裝
+    """
+    if not _HAS_NUMPY:
+        raise RuntimeError("numpy is required for audio generation")
+    t = np.arange(int(round(length * sample_rate)), dtype=np.float64)
+    mono = (np.sin(2 * np.pi * freq * t / sample_rate) * amplitude)
+    stereo = np.repeat(mono.astype(np.float32)[:, None], CHANNELS, axis=1)
+    stereo.setflags(write=False)
+    return stereo
+
+
+def decode_audio_pcm(
+    path: str,
+    sample_rate: int = SAMPLE_RATE,
+    channels: int = CHANNELS,
+    ffmpeg_exe: Optional[str] = None,
+) -> "np.ndarray":
+    """以一次 ffmpeg 呼叫把音訊檔解碼為 PCM
+
+    Args:
+        path: 音訊檔路徑
+        sample_rate: 重新取樣的取樣率
+        channels: 聲道數
+        ffmpeg_exe: ffmpeg 執行檔(None = resolve_ffmpeg_exe())
+
+    Returns:
+        (n, channels) float32 陣列,範圍約 -1..1
+
+    Raises:
+        RuntimeError: 解碼失敗
+    """
+    if ffmpeg_exe is None:
+        from spellvid.infrastructure.video.ffmpeg_pipe import (
+            resolve_ffmpeg_exe,
+        )
+        ffmpeg_exe = resolve_ffmpeg_exe()
+    cmd = [
+        ffmpeg_exe, "-nostdin", "-hide_banner", "-loglevel", "error",
+        "-i", path, "-vn", "-f", "f32le", "-acodec", "pcm_f32le",
+        "-ac", str(int(channels)), "-ar", str(int(sample_rate)), "pipe:1",
+    ]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, check=False)
+    if result.returncode != 0:
+        detail = result.stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(f"ffmpeg audio decode failed for {path}: "
+                           f"{detail[-2000:]}")
+    samples = np.frombuffer(result.stdout, dtype="<f4")
+    usable = len(samples) - len(samples) % int(channels)
+    return samples[:usable].reshape(-1, int(channels))
 
-        Args:
-            t: 時間(秒),可能是單一浮點數或 numpy 陣列
+
+@dataclass
+class AudioBed:
+    """已混音的 PCM 底軌
+
+    Attributes:
+        samples: (n, channels) float32 陣列
+        sample_rate: 取樣率
+        music_loaded: 背景音樂是否成功載入
+        music_error: 背景音樂載入失敗的原因(或 None)
+    """
+
+    samples: "np.ndarray"
+    sample_rate: int = SAMPLE_RATE
+    music_loaded: bool = False
+    music_error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / float(self.sample_rate)
+
+    def write_wav(self, path: str) -> str:
+        """寫成 16-bit PCM WAV(超出範圍的樣本截斷)
 
         Returns:
-            立體聲音訊樣本陣列,形狀為 (n_samples, 2)
+            path
         """
-        # 生成正弦波: A * sin(2πft)
-        # 振幅 0.2 避免削波,頻率由 freq 決定
-        mono = (np.sin(2 * np.pi * freq * t) * 0.2).astype(np.float32)
+        pcm = np.empty(self.samples.shape, dtype="<i2")
+        np.multiply(np.clip(self.samples, -1.0, 1.0), 32767.0, out=pcm,
+                    casting="unsafe")
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(int(pcm.shape[1]))
+            wav.setsampwidth(2)
+            wav.setframerate(int(self.sample_rate))
+            wav.writeframes(pcm.tobytes())
+        return path
 
-        # 轉換為立體聲(兩個聲道相同)
-        # 確保形狀為 (n_samples, 2) 以匹配 MoviePy 期望
-        try:
-            stereo = np.column_stack((mono, mono))
-        except Exception:
-            # 如果 column_stack 失敗,嘗試 reshape
-            stereo = mono.reshape(-1, 1)
 
-        return stereo
+def fit_to_length(samples: "np.ndarray", length: int) -> "np.ndarray":
+    """循環或截斷 PCM 到指定樣本數
 
-    # 創建 AudioClip: 44100 Hz 採樣率,指定時長
-    ac = mpy.AudioClip(make_frame, duration=length, fps=44100)
+    Args:
+        samples: (n, channels) 陣列
+        length: 目標樣本數
 
-    # 設定在視頻中的起始時間
-    return ac.with_start(start_sec)
+    Returns:
+        (length, channels) 新陣列;來源為空時為靜音
+    """
+    channels = samples.shape[1] if samples.ndim == 2 else CHANNELS
+    if len(samples) == 0:
+        return np.zeros((length, channels), dtype=np.float32)
+    repeats = -(-length // len(samples))
+    looped = np.tile(samples, (repeats, 1))[:length]
+    return looped.astype(np.float32, copy=False)
+
+
+def apply_fade_out(samples: "np.ndarray", fade_samples: int) -> None:
+    """對最後 fade_samples 個樣本套用線性淡出(原地)"""
+    fade_samples = min(int(fade_samples), len(samples))
+    if fade_samples <= 0:
+        return
+    envelope = np.linspace(1.0, 0.0, fade_samples, dtype=np.float32)
+    samples[-fade_samples:] *= envelope[:, None]
+
+
+def render_audio_bed(
+    duration: float,
+    *,
+    music_path: Optional[str] = None,
+    beep_times: Sequence[float] = (),
+    fade_out: float = 0.0,
+    sample_rate: int = SAMPLE_RATE,
+    ffmpeg_exe: Optional[str] = None,
+) -> AudioBed:
+    """混出片段的音訊底軌
+
+    背景音樂經 PCM 快取載入(未命中時解碼一次)後循環或截斷到
+    duration;嗶聲波形加在 beep_times 的位置;最後 fade_out 秒套用線性
+    淡出。音樂無法載入時以靜音代替並記錄於 music_error,嗶聲仍照常
+    加入。
+
+    Args:
+        duration: 片段長度(秒)
+        music_path: 背景音樂(None 表示無)
+        beep_times: 嗶聲起點(秒)
+        fade_out: 淡出長度(秒)
+        sample_rate: 取樣率
+        ffmpeg_exe: ffmpeg 執行檔
+
+    Returns:
+        AudioBed
+    """
+    if not _HAS_NUMPY:
+        raise RuntimeError("numpy is required for audio generation")
+    length = max(0, int(round(float(duration) * sample_rate)))
+    music_loaded = False
+    music_error = None
+    samples = None
+    if music_path:
+        from spellvid.infrastructure.media.pcm_cache import load_pcm
+
+        try:
+            music = load_pcm(music_path, sample_rate, CHANNELS,
+                             ffmpeg_exe=ffmpeg_exe)
+            if len(music) == 0:
+                raise RuntimeError("source audio has zero duration")
+            samples = fit_to_length(music, length)
+            music_loaded = True
+        except (OSError, RuntimeError) as e:
+            music_error = str(e)
+    if samples is None:
+        samples = np.zeros((length, CHANNELS), dtype=np.float32)
+
+    beep = beep_waveform(sample_rate=sample_rate)
+    for start in beep_times:
+        offset = int(round(float(start) * sample_rate))
+        if offset < 0 or offset >= length:
+            continue
+        span = min(len(beep), length - offset)
+        samples[offset:offset + span] += beep[:span]
+
+    apply_fade_out(samples, int(round(float(fade_out) * sample_rate)))
+    return AudioBed(samples, sample_rate, music_loaded, music_error)
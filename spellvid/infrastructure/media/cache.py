@@ -0,0 +1,62 @@
+"""磁碟快取工具
+
+提供各種持久化快取共用的目錄解析與鍵值計算。
+
+快取根目錄優先順序:
+1. 環境變數 SPELLVID_CACHE_DIR
+2. ~/.cache/spellvid
+
+Example:
+    >>> path = cache_dir("intermediates")
+    >>> key = cache_key(file_fingerprint("assets/entry.mp4"), {"fps": 24})
+    >>> len(key)
+    24
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict
+
+
+def cache_root() -> str:
+    """取得快取根目錄(不保證存在)"""
+    override = os.environ.get("SPELLVID_CACHE_DIR")
+    if override:
+        return os.path.abspath(override)
+    return os.path.join(os.path.expanduser("~"), ".cache", "spellvid")
+
+
+def cache_dir(namespace: str) -> str:
+    """取得(並建立)指定命名空間的快取目錄
+
+    Args:
+        namespace: 子目錄名稱,例如 "intermediates"
+
+    Returns:
+        快取目錄絕對路徑
+    """
+    path = os.path.join(cache_root(), namespace)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_fingerprint(path: str) -> Dict[str, Any]:
+    """以絕對路徑、大小與修改時間代表檔案內容
+
+    Raises:
+        FileNotFoundError: 檔案不存在
+    """
+    abs_path = os.path.abspath(path)
+    stat = os.stat(abs_path)
+    return {
+        "path": abs_path,
+        "size": int(stat.st_size),
+        "mtime_ns": int(stat.st_mtime_ns),
+    }
+
+
+def cache_key(*parts: Any) -> str:
+    """將任意可 JSON 序列化的內容雜湊為固定長度鍵值"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:24]
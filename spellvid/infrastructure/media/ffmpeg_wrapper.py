@@ -3,7 +3,7 @@
 此模組實作 IMediaProcessor Protocol,使用 FFmpeg/ffprobe 進行媒體處理。
 
 主要功能:
-- 媒體元資料探測(時長、尺寸)
+- 媒體元資料探測(時長、尺寸,結果保存於持久化快取)
 - 音訊提取
 - FFmpeg 可用性檢查
 """
@@ -11,16 +11,19 @@
 import os
 import shutil
 import subprocess
+import sys
 from pathlib import Path
 from typing import Tuple
 
+from spellvid.infrastructure.media.probe import MediaInfo, probe
+
 
 class FFmpegWrapper:
     """FFmpeg 媒體處理包裝器
 
     實作 IMediaProcessor Protocol,提供 FFmpeg 工具的包裝。
 
-    使用 ffprobe 進行元資料探測,使用 ffmpeg 進行音訊提取。
+    元資料探測經由 probe_cache 的持久化快取,使用 ffmpeg 進行音訊提取。
     """
 
     def __init__(self):
@@ -32,7 +35,7 @@ class FFmpegWrapper:
     def probe_duration(self, media_path: str) -> float:
         """查詢媒體檔案時長
 
-        使用 ffprobe 讀取音訊/視頻檔案的總時長。
+        讀取音訊/視頻檔案的總時長(經由持久化探測快取)。
 
         Args:
             media_path: 媒體檔案絕對路徑(.mp3, .mp4, .wav 等)
@@ -53,40 +56,14 @@ class FFmpegWrapper:
         if not Path(media_path).exists():
             raise FileNotFoundError(f"Media file not found: {media_path}")
 
-        ffprobe = self._get_ffprobe_exe()
-        if not ffprobe:
-            raise RuntimeError("ffprobe not available")
-
-        cmd = [
-            ffprobe,
-            "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            media_path,
-        ]
-
-        try:
-            output = subprocess.check_output(
-                cmd,
-                stderr=subprocess.STDOUT,
-                text=True
-            )
-            duration = float(output.strip())
-
-            if duration < 0:
-                raise RuntimeError(
-                    f"Invalid duration: {duration} for {media_path}"
-                )
-
-            return duration
-        except subprocess.CalledProcessError as e:
+        info = self._probe_info(media_path)
+        if info.duration is None:
+            raise RuntimeError(f"Cannot parse duration from {media_path}")
+        if info.duration < 0:
             raise RuntimeError(
-                f"ffprobe failed for {media_path}: {e.output}"
-            )
-        except ValueError as e:
-            raise RuntimeError(
-                f"Cannot parse duration from {media_path}: {e}"
+                f"Invalid duration: {info.duration} for {media_path}"
             )
+        return float(info.duration)
 
     def probe_dimensions(self, video_path: str) -> Tuple[int, int]:
         """查詢視頻尺寸
@@ -112,49 +89,29 @@ class FFmpegWrapper:
         if not Path(video_path).exists():
             raise FileNotFoundError(f"Video file not found: {video_path}")
 
-        ffprobe = self._get_ffprobe_exe()
-        if not ffprobe:
-            raise RuntimeError("ffprobe not available")
+        info = self._probe_info(video_path)
+        if info.size is None:
+            raise RuntimeError(f"Cannot parse dimensions from {video_path}")
+        width, height = info.size
+        if width <= 0 or height <= 0:
+            raise RuntimeError(f"Invalid dimensions: {width}x{height}")
+        return (width, height)
 
-        cmd = [
-            ffprobe,
-            "-v", "error",
-            "-select_streams", "v:0",
-            "-show_entries", "stream=width,height",
-            "-of", "csv=s=x:p=0",
-            video_path,
-        ]
+    def _probe_info(self, media_path: str) -> MediaInfo:
+        """透過共用的持久化快取取得媒體資訊
 
-        try:
-            output = subprocess.check_output(
-                cmd,
-                stderr=subprocess.STDOUT,
-                text=True
-            )
-            parts = output.strip().split("x")
-
-            if len(parts) != 2:
-                raise RuntimeError(
-                    f"Cannot parse dimensions from output: {output}"
-                )
-
-            width = int(parts[0])
-            height = int(parts[1])
+        未命中時只需一次 ffprobe(或 ffmpeg)呼叫即可取得全部元資料。
 
-            if width <= 0 or height <= 0:
-                raise RuntimeError(
-                    f"Invalid dimensions: {width}x{height}"
-                )
-
-            return (width, height)
-        except subprocess.CalledProcessError as e:
-            raise RuntimeError(
-                f"ffprobe failed for {video_path}: {e.output}"
-            )
-        except ValueError as e:
-            raise RuntimeError(
-                f"Cannot parse dimensions from {video_path}: {e}"
-            )
+        Raises:
+            RuntimeError: 找不到 ffprobe 與 ffmpeg
+        """
+        if not (self._ffprobe_exe or self._ffmpeg_exe):
+            raise RuntimeError("ffmpeg not available")
+        return probe(
+            media_path,
+            ffprobe_exe=self._ffprobe_exe,
+            ffmpeg_exe=self._ffmpeg_exe,
+        )
 
     def extract_audio(
         self,
@@ -308,6 +265,11 @@ class FFmpegWrapper:
 
         return False
 
+    @property
+    def ffmpeg_exe(self) -> str | None:
+        """已解析的 ffmpeg 執行檔路徑(找不到 ffprobe 時仍可能有值)"""
+        return self._ffmpeg_exe
+
     def _get_ffmpeg_exe(self) -> str | None:
         """取得 ffmpeg 執行檔路徑"""
         return self._ffmpeg_exe
@@ -374,12 +336,14 @@ def _probe_media_duration(path: str) -> float | None:
 
     This function attempts to retrieve the duration of a media file using:
     1. In-memory cache (based on file mtime)
-    2. MoviePy VideoFileClip (if available)
-    3. ffprobe subprocess fallback
+    2. Persistent probe cache shared across processes (probe_cache)
+    3. A single ffprobe JSON (or `ffmpeg -i` header) read via probe()
+    4. ffprobe subprocess fallback when ffmpeg cannot be located
 
     Cache Strategy:
         Results are cached based on file path + modification time.
         If file hasn't changed (same mtime), cached duration is returned.
+        The persistent tier additionally checks file size.
 
     FFprobe Discovery:
         Searches for ffprobe in this order:
@@ -421,31 +385,17 @@ def _probe_media_duration(path: str) -> float | None:
         return cached[1]
 
     duration: float | None = None
+    probed = False
 
-    # Try MoviePy first if available
+    # Persistent cache / single ffprobe (or ffmpeg header) read
     try:
-        import moviepy as mpy  # type: ignore
-        _HAS_MOVIEPY = True
-    except ImportError:
-        _HAS_MOVIEPY = False
-
-    if _HAS_MOVIEPY:
-        try:
-            clip = mpy.VideoFileClip(path)  # type: ignore
-            try:
-                raw = getattr(clip, "duration", None)
-                if raw is not None:
-                    duration = float(raw)
-            finally:
-                try:
-                    clip.close()
-                except Exception:
-                    pass
-        except Exception:
-            duration = None
+        duration = probe(path).duration
+        probed = True
+    except (OSError, RuntimeError):
+        duration = None
 
-    # Fallback to ffprobe if MoviePy failed or unavailable
-    if duration is None:
+    # Fallback to ffprobe if ffmpeg is unavailable
+    if not probed:
         candidates = [
             shutil.which("ffprobe"),
             shutil.which("ffprobe.exe"),
@@ -505,7 +455,8 @@ def _find_and_set_ffmpeg():
 
     Side Effects:
         - Sets IMAGEIO_FFMPEG_EXE environment variable
-        - Updates MoviePy config FFMPEG_BINARY (if MoviePy available)
+        - Updates MoviePy config FFMPEG_BINARY (if MoviePy is already
+          imported; a later import reads IMAGEIO_FFMPEG_EXE instead)
 
     Usage:
         This function is typically called once at module initialization:
@@ -557,7 +508,11 @@ def _find_and_set_ffmpeg():
     if ffmpeg_path and os.path.isfile(ffmpeg_path):
         os.environ.setdefault("IMAGEIO_FFMPEG_EXE", ffmpeg_path)
 
-        # Try to configure MoviePy if available
+        # Only reconfigure MoviePy when it is already loaded; otherwise it
+        # picks up IMAGEIO_FFMPEG_EXE itself when first imported, and
+        # importing it here would make every caller pay for MoviePy.
+        if "moviepy" not in sys.modules:
+            return
         try:
             import moviepy.config as _mpy_config  # type: ignore
             if _mpy_config is not None:
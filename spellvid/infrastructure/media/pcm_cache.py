@@ -0,0 +1,103 @@
+"""解碼後 PCM 的磁碟快取
+
+重新渲染同一批單字(只調整倒數或停留秒數)時,每支視頻都會以 ffmpeg
+重新解碼相同的背景音樂。此模組把解碼並重新取樣後的 PCM
+(44.1kHz、立體聲、float32)存成 .npy 檔,以來源的絕對路徑、大小與
+修改時間為鍵:
+
+- <cache_root>/pcm/<path_key>-<content_key>.npy
+
+命中時以 np.load(mmap_mode="r") 記憶體映射開啟,不需複製也不需啟動
+ffmpeg;來源檔變更時產生新的 content_key,寫入新檔後移除同一路徑的
+舊檔。寫入採用暫存檔加原子替換,並行的渲染行程不會讀到不完整的檔案。
+
+Example:
+    >>> samples = load_pcm("assets/ice_60s.mp3")
+    >>> samples.shape, samples.dtype
+    ((2646000, 2), dtype('float32'))
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+
+from spellvid.infrastructure.media.cache import (
+    cache_dir,
+    cache_key,
+    file_fingerprint,
+)
+
+# 快取格式或解碼參數變更時遞增
+PCM_CACHE_VERSION = 1
+
+
+def pcm_cache_path(path: str, sample_rate: int, channels: int) -> str:
+    """來源檔目前內容對應的快取檔路徑
+
+    Raises:
+        FileNotFoundError: 來源檔不存在
+    """
+    fingerprint = file_fingerprint(path)
+    path_key = cache_key(PCM_CACHE_VERSION, fingerprint["path"])[:12]
+    content_key = cache_key(fingerprint, int(sample_rate), int(channels))
+    return os.path.join(cache_dir("pcm"), f"{path_key}-{content_key}.npy")
+
+
+def _remove_stale(cache_path: str) -> None:
+    """移除同一來源路徑的舊快取檔(仍被映射時略過)"""
+    directory, name = os.path.split(cache_path)
+    prefix = name.split("-", 1)[0] + "-"
+    for other in os.listdir(directory):
+        if other.startswith(prefix) and other.endswith(".npy") \
+                and other != name:
+            try:
+                os.remove(os.path.join(directory, other))
+            except OSError:
+                pass
+
+
+def load_pcm(
+    path: str,
+    sample_rate: int = 44100,
+    channels: int = 2,
+    *,
+    ffmpeg_exe: Optional[str] = None,
+) -> np.ndarray:
+    """取得音訊檔的 PCM,優先使用磁碟快取
+
+    Args:
+        path: 音訊檔路徑
+        sample_rate: 取樣率
+        channels: 聲道數
+        ffmpeg_exe: 未命中時使用的 ffmpeg 執行檔
+
+    Returns:
+        (n, channels) float32 陣列;命中或寫入成功時為唯讀 np.memmap
+
+    Raises:
+        FileNotFoundError: 來源檔不存在
+        RuntimeError: 解碼失敗
+    """
+    from spellvid.infrastructure.media import audio
+
+    cache_path = pcm_cache_path(path, sample_rate, channels)
+    try:
+        return np.load(cache_path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+
+    samples = audio.decode_audio_pcm(path, sample_rate, channels,
+                                     ffmpeg_exe=ffmpeg_exe)
+    partial = f"{cache_path}.{os.getpid()}.partial"
+    try:
+        with open(partial, "wb") as handle:
+            np.save(handle, np.ascontiguousarray(samples, dtype=np.float32))
+        os.replace(partial, cache_path)
+        _remove_stale(cache_path)
+        return np.load(cache_path, mmap_mode="r")
+    except (OSError, ValueError):
+        # 快取寫入失敗只影響下次執行的速度
+        if os.path.exists(partial):
+            os.remove(partial)
+        return samples
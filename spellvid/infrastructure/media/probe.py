@@ -0,0 +1,339 @@
+"""媒體元資料探測
+
+以單次子行程取得一個媒體檔案的全部元資料,回傳型別化的 MediaInfo:
+
+- 有 ffprobe 時:`ffprobe -show_format -show_streams -of json`
+- 只有 ffmpeg 時:`ffmpeg -i` 的標頭資訊(不解碼影格)
+
+probe() 先查詢持久化探測快取(見 probe_cache.py),未命中才啟動子行程;
+probe_many() 以執行緒池同時探測多個檔案(編譯渲染計畫時由
+context_builder.prefetch_media_info 一次探測項目的片頭、片尾、背景與音樂)。
+
+Example:
+    >>> info = probe("assets/entry.mp4")
+    >>> info.size, info.fps, info.sample_rate
+    ((1920, 1080), 30.0, 44100)
+    >>> infos = probe_many(["assets/entry.mp4", "assets/ending.mp4"])
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_VIDEO_RE = re.compile(
+    r"Stream #\d+:\d+.*?: Video: (\w+)[^,]*, (\w+).*?, (\d{1,5})x(\d{1,5})"
+)
+_AUDIO_RE = re.compile(
+    r"Stream #\d+:\d+.*?: Audio: (\w+).*?, (\d+) Hz, ([^,]+)"
+)
+_FPS_RE = re.compile(r"(\d+(?:\.\d+)?) (?:fps|tbr)")
+_ROTATION_RE = re.compile(r"rotation of (-?\d+(?:\.\d+)?) degrees")
+_CHANNELS_RE = re.compile(r"(\d+) channels")
+
+_CHANNEL_LAYOUTS = {
+    "mono": 1, "stereo": 2, "2.1": 3, "3.0": 3, "quad": 4, "4.0": 4,
+    "5.0": 5, "5.0(side)": 5, "5.1": 6, "5.1(side)": 6, "6.1": 7,
+    "7.1": 8,
+}
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    """媒體檔案探測結果
+
+    Attributes:
+        duration: 時長(秒),無法判斷時為 None
+        width: 視頻寬度(編碼尺寸,純音訊為 None)
+        height: 視頻高度(編碼尺寸,純音訊為 None)
+        fps: 影格率(純音訊為 None)
+        has_audio: 是否有音訊軌
+        codec: 視頻編碼;純音訊檔案為音訊編碼
+        rotation: 顯示旋轉角度(逆時針,0/90/180/270)
+        pix_fmt: 像素格式(例如 yuv420p)
+        audio_channels: 音訊聲道數
+        sample_rate: 音訊取樣率
+    """
+    duration: Optional[float]
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    has_audio: bool = False
+    codec: Optional[str] = None
+    rotation: int = 0
+    pix_fmt: Optional[str] = None
+    audio_channels: Optional[int] = None
+    sample_rate: Optional[int] = None
+
+    @property
+    def size(self) -> Optional[Tuple[int, int]]:
+        """(width, height),沒有視頻串流時為 None"""
+        if self.width is None or self.height is None:
+            return None
+        return (self.width, self.height)
+
+    @property
+    def display_size(self) -> Optional[Tuple[int, int]]:
+        """套用旋轉後的顯示尺寸"""
+        size = self.size
+        if size is not None and self.rotation in (90, 270):
+            return (size[1], size[0])
+        return size
+
+
+def _normalize_rotation(degrees: float) -> int:
+    return int(round(degrees / 90.0)) * 90 % 360
+
+
+def _parse_rate(value: Any) -> Optional[float]:
+    try:
+        rate = Fraction(str(value))
+    except (ValueError, ZeroDivisionError):
+        return None
+    return round(float(rate), 3) if rate > 0 else None
+
+
+def _parse_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_ffprobe_json(data: Dict[str, Any]) -> MediaInfo:
+    """解析 `ffprobe -show_format -show_streams -of json` 的輸出"""
+    streams = data.get("streams") or []
+    video = next(
+        (s for s in streams if s.get("codec_type") == "video"
+         and not (s.get("disposition") or {}).get("attached_pic")),
+        None,
+    )
+    audio = next(
+        (s for s in streams if s.get("codec_type") == "audio"), None
+    )
+
+    duration = _parse_float((data.get("format") or {}).get("duration"))
+    if duration is None:
+        duration = _parse_float((video or audio or {}).get("duration"))
+
+    fields: Dict[str, Any] = {"duration": duration}
+    if video is not None:
+        rotation = 0.0
+        for side in video.get("side_data_list") or []:
+            if "rotation" in side:
+                rotation = float(side["rotation"])
+                break
+        else:
+            # 舊版 rotate 標籤為順時針角度
+            rotate_tag = (video.get("tags") or {}).get("rotate")
+            if rotate_tag is not None:
+                rotation = -float(rotate_tag)
+        fields.update(
+            width=video.get("width"),
+            height=video.get("height"),
+            fps=(_parse_rate(video.get("avg_frame_rate"))
+                 or _parse_rate(video.get("r_frame_rate"))),
+            codec=video.get("codec_name"),
+            rotation=_normalize_rotation(rotation),
+            pix_fmt=video.get("pix_fmt"),
+        )
+    if audio is not None:
+        sample_rate = _parse_float(audio.get("sample_rate"))
+        fields.update(
+            has_audio=True,
+            audio_channels=audio.get("channels"),
+            sample_rate=int(sample_rate) if sample_rate else None,
+        )
+        if video is None:
+            fields["codec"] = audio.get("codec_name")
+    return MediaInfo(**fields)
+
+
+def parse_ffmpeg_header(text: str) -> MediaInfo:
+    """解析 `ffmpeg -i` 的輸入資訊
+
+    Args:
+        text: ffmpeg stderr 輸出
+
+    Returns:
+        MediaInfo(找不到任何串流時 duration 為 None)
+    """
+    header = text.partition("Stream mapping:")[0]
+    fields: Dict[str, Any] = {"duration": None}
+    duration_match = _DURATION_RE.search(header)
+    if duration_match:
+        hours, minutes, seconds = duration_match.groups()
+        fields["duration"] = (
+            int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        )
+
+    video_match = _VIDEO_RE.search(header)
+    if video_match:
+        # 視頻串流的 side data 會出現在下一個 Stream 行之前
+        video_block = header[video_match.start():]
+        video_line = video_block.splitlines()[0]
+        next_stream = video_block.find("Stream #", 1)
+        if next_stream > 0:
+            video_block = video_block[:next_stream]
+        fps_match = _FPS_RE.search(video_line)
+        rotation_match = _ROTATION_RE.search(video_block)
+        fields.update(
+            codec=video_match.group(1),
+            pix_fmt=video_match.group(2),
+            width=int(video_match.group(3)),
+            height=int(video_match.group(4)),
+            fps=float(fps_match.group(1)) if fps_match else None,
+            rotation=_normalize_rotation(
+                float(rotation_match.group(1)) if rotation_match else 0.0
+            ),
+        )
+
+    audio_match = _AUDIO_RE.search(header)
+    if audio_match:
+        layout = audio_match.group(3).strip()
+        channels_match = _CHANNELS_RE.match(layout)
+        fields.update(
+            has_audio=True,
+            sample_rate=int(audio_match.group(2)),
+            audio_channels=(int(channels_match.group(1)) if channels_match
+                            else _CHANNEL_LAYOUTS.get(layout)),
+        )
+        if not video_match:
+            fields["codec"] = audio_match.group(1)
+    return MediaInfo(**fields)
+
+
+_executables: Dict[str, Optional[str]] = {}
+
+
+def _find_ffprobe() -> Optional[str]:
+    if "ffprobe" not in _executables:
+        from spellvid.infrastructure.media.ffmpeg_wrapper import FFmpegWrapper
+
+        exe = FFmpegWrapper()._get_ffprobe_exe()
+        _executables["ffprobe"] = exe or shutil.which("ffprobe")
+    return _executables["ffprobe"]
+
+
+def read_media_info(
+    path: str,
+    *,
+    ffprobe_exe: Optional[str] = None,
+    ffmpeg_exe: Optional[str] = None,
+) -> MediaInfo:
+    """以單次子行程讀取媒體元資料(不使用快取)
+
+    Args:
+        path: 媒體檔案路徑
+        ffprobe_exe: 選用的 ffprobe 執行檔(None = 自動尋找)
+        ffmpeg_exe: 找不到 ffprobe 時使用的 ffmpeg 執行檔
+
+    Raises:
+        RuntimeError: ffprobe 與 ffmpeg 皆無法使用,或 ffprobe 失敗
+    """
+    ffprobe_exe = ffprobe_exe or _find_ffprobe()
+    if ffprobe_exe:
+        proc = subprocess.run(
+            [ffprobe_exe, "-v", "error", "-show_format", "-show_streams",
+             "-of", "json", path],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+        if proc.returncode != 0:
+            detail = proc.stderr.decode("utf-8", "replace").strip()
+            raise RuntimeError(f"ffprobe failed for {path}: {detail}")
+        try:
+            return parse_ffprobe_json(json.loads(proc.stdout or b"{}"))
+        except ValueError as exc:
+            raise RuntimeError(
+                f"Cannot parse ffprobe output for {path}: {exc}"
+            ) from exc
+
+    if ffmpeg_exe is None:
+        from spellvid.infrastructure.video.ffmpeg_pipe import (
+            resolve_ffmpeg_exe,
+        )
+        ffmpeg_exe = resolve_ffmpeg_exe()
+    # 沒有輸出檔時 ffmpeg 以非零結束碼離開,但標頭資訊已輸出
+    proc = subprocess.run(
+        [ffmpeg_exe, "-hide_banner", "-nostdin", "-i", path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    return parse_ffmpeg_header(proc.stderr.decode("utf-8", "replace"))
+
+
+def probe(
+    path: str,
+    *,
+    ffprobe_exe: Optional[str] = None,
+    ffmpeg_exe: Optional[str] = None,
+) -> MediaInfo:
+    """取得媒體元資料,優先使用持久化探測快取
+
+    Args:
+        path: 媒體檔案路徑
+        ffprobe_exe: 選用的 ffprobe 執行檔(None = 自動尋找)
+        ffmpeg_exe: 找不到 ffprobe 時使用的 ffmpeg 執行檔
+
+    Returns:
+        MediaInfo
+
+    Raises:
+        FileNotFoundError: 檔案不存在
+        RuntimeError: 未命中且無法探測
+
+    Example:
+        >>> info = probe("assets/ending.mp4")
+        >>> info.has_audio, info.audio_channels
+        (True, 2)
+    """
+    from spellvid.infrastructure.media.probe_cache import get_probe_cache
+
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Media file not found: {path}")
+    cache = get_probe_cache()
+    info = cache.get(path)
+    if info is None:
+        info = read_media_info(
+            path, ffprobe_exe=ffprobe_exe, ffmpeg_exe=ffmpeg_exe,
+        )
+        cache.put(path, info)
+    return info
+
+
+def probe_many(
+    paths: Iterable[str],
+    *,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Optional[MediaInfo]]:
+    """以執行緒池同時探測多個檔案
+
+    探測本身由子行程完成,執行緒只負責等待,因此不受 GIL 限制。
+
+    Args:
+        paths: 媒體檔案路徑(重複路徑只探測一次)
+        max_workers: 最大執行緒數(None = min(8, 檔案數))
+
+    Returns:
+        {path: MediaInfo};不存在或無法探測的檔案對應 None
+    """
+    unique = list(dict.fromkeys(p for p in paths if p))
+    if not unique:
+        return {}
+
+    def _safe_probe(path: str) -> Optional[MediaInfo]:
+        try:
+            return probe(path)
+        except (OSError, RuntimeError):
+            return None
+
+    workers = max_workers or min(8, len(unique))
+    if workers <= 1 or len(unique) == 1:
+        return {p: _safe_probe(p) for p in unique}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(unique, pool.map(_safe_probe, unique)))
@@ -0,0 +1,131 @@
+"""持久化媒體探測快取
+
+片頭、片尾、背景與音樂在每次 CLI 執行、每個 worker 中都會被重複探測。
+探測結果(probe.MediaInfo)以 SQLite 保存在
+快取目錄(見 media/cache.py),以絕對路徑、檔案大小與修改時間為鍵,
+檔案變動後自動失效。同一行程內另有記憶體層,避免重複查詢資料庫。
+
+查詢入口為 probe.probe() / probe.probe_many()。
+
+Example:
+    >>> cache = get_probe_cache()
+    >>> cache.get("assets/entry.mp4") is None
+    True
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import asdict
+from typing import Dict, Optional, Tuple
+
+from spellvid.infrastructure.media.cache import cache_dir, file_fingerprint
+from spellvid.infrastructure.media.probe import MediaInfo
+
+# MediaInfo 欄位變更時遞增,使舊記錄失效
+_SCHEMA_VERSION = 2
+_TABLE = f"probes_v{_SCHEMA_VERSION}"
+
+
+class ProbeCache:
+    """以 SQLite 保存的探測結果快取
+
+    可在多個行程間共用;每筆記錄存放檔案大小與修改時間,不符時視為
+    未命中。所有操作皆為 best-effort,資料庫無法使用時只退化為記憶體快取。
+
+    Args:
+        db_path: 資料庫路徑(None = <cache_root>/probe/media.sqlite3)
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.path.join(
+            cache_dir("probe"), "media.sqlite3"
+        )
+        self._memory: Dict[Tuple[str, int, int], MediaInfo] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        # fork 後不可沿用父行程的連線
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+        try:
+            conn = sqlite3.connect(
+                self.db_path, timeout=10.0, check_same_thread=False,
+            )
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {_TABLE} ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+                "info TEXT)"
+            )
+            conn.commit()
+        except sqlite3.Error:
+            return None
+        self._conn, self._conn_pid = conn, os.getpid()
+        return conn
+
+    def get(self, path: str) -> Optional[MediaInfo]:
+        """查詢快取;檔案不存在或已變動時回傳 None"""
+        try:
+            fp = file_fingerprint(path)
+        except OSError:
+            return None
+        key = (fp["path"], fp["size"], fp["mtime_ns"])
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+            conn = self._connection()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    f"SELECT info FROM {_TABLE} "
+                    "WHERE path = ? AND size = ? AND mtime_ns = ?",
+                    key,
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+            if row is None:
+                return None
+            try:
+                info = MediaInfo(**json.loads(row[0]))
+            except (TypeError, ValueError):
+                return None
+            self._memory[key] = info
+            return info
+
+    def put(self, path: str, info: MediaInfo) -> None:
+        """寫入快取(覆寫同路徑的舊記錄)"""
+        try:
+            fp = file_fingerprint(path)
+        except OSError:
+            return
+        key = (fp["path"], fp["size"], fp["mtime_ns"])
+        with self._lock:
+            self._memory[key] = info
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {_TABLE} VALUES (?, ?, ?, ?)",
+                    key + (json.dumps(asdict(info)),),
+                )
+                conn.commit()
+            except sqlite3.Error:
+                pass
+
+
+_caches: Dict[str, ProbeCache] = {}
+
+
+def get_probe_cache() -> ProbeCache:
+    """取得目前快取目錄對應的共用 ProbeCache"""
+    db_path = os.path.join(cache_dir("probe"), "media.sqlite3")
+    cache = _caches.get(db_path)
+    if cache is None:
+        cache = _caches[db_path] = ProbeCache(db_path)
+    return cache
+
@@ -2,6 +2,9 @@
 
 - interface.py: ITextRenderer Protocol 定義
 - pillow_adapter.py: Pillow 文字渲染適配器(待實作)
+- font_registry.py: 字型路徑與 FreeTypeFont 物件的行程層級快取
+- sprite_cache.py: 文字點陣圖的內容定址快取(記憶體 LRU + 選用 .npz)
+- letter_atlas.py: 預先縮放的字母素材圖集(np.memmap 載入)
 """
 
 from .interface import ITextRenderer
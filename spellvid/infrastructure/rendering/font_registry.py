@@ -0,0 +1,135 @@
+"""行程層級字型註冊表
+
+一支視頻的文字渲染會呼叫字型載入數十次(每秒計時器、每個 reveal
+前綴、每個注音符號),每次都重新搜尋字型路徑並以 ImageFont.truetype
+重新讀取字型檔。此模組集中快取:
+
+- 字型路徑:每組搜尋條件只解析一次(包含「找不到」的結果)
+- 字型目錄:每個目錄只走訪一次,之後以檔名樣式比對
+- FreeTypeFont 物件:以 (path, size) 為鍵的 LRU,上限 FONT_CACHE_SIZE
+
+FreeTypeFont 只供讀取(量測、繪製),可在呼叫端之間共用。
+
+Example:
+    >>> path = find_font_file([Path("/usr/share/fonts")], ["DejaVuSans.ttf"])
+    >>> font = load_font(path, 48)
+    >>> load_font(path, 48) is font
+    True
+"""
+
+import fnmatch
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+from PIL import ImageFont
+
+# (path, size) 字型物件快取上限
+FONT_CACHE_SIZE = 128
+
+_path_cache: Dict[Hashable, Optional[str]] = {}
+_dir_cache: Dict[str, List[Path]] = {}
+_lock = threading.Lock()
+
+
+def resolve_font_path(
+    key: Hashable,
+    finder: Callable[[], Optional[str]],
+) -> Optional[str]:
+    """以 key 快取 finder 的結果(None 也會快取)
+
+    Args:
+        key: 搜尋條件,例如 ("linux", prefer_cjk)
+        finder: 實際搜尋字型路徑的函數,找不到時回傳 None
+
+    Returns:
+        字型檔案路徑或 None
+    """
+    with _lock:
+        if key in _path_cache:
+            return _path_cache[key]
+    path = finder()
+    with _lock:
+        return _path_cache.setdefault(key, path)
+
+
+def list_font_files(directory: Path) -> List[Path]:
+    """遞迴列出目錄下的所有檔案(每個目錄只走訪一次)
+
+    Args:
+        directory: 字型目錄
+
+    Returns:
+        依路徑排序的檔案列表;目錄不存在時為空列表
+    """
+    key = str(directory)
+    with _lock:
+        cached = _dir_cache.get(key)
+    if cached is not None:
+        return cached
+    files: List[Path] = []
+    if directory.is_dir():
+        for root, _, names in os.walk(directory):
+            files.extend(Path(root) / name for name in names)
+        files.sort()
+    with _lock:
+        return _dir_cache.setdefault(key, files)
+
+
+def find_font_file(
+    directories: Iterable[Path],
+    patterns: Iterable[str],
+) -> Optional[str]:
+    """依樣式優先順序在目錄中尋找第一個符合的字型檔
+
+    順序與逐一 glob("**/<pattern>") 相同:先依目錄,再依樣式。
+
+    Args:
+        directories: 搜尋目錄(依優先順序)
+        patterns: 檔名樣式(例如 "NotoSansCJK*.ttc")
+
+    Returns:
+        字型檔案路徑或 None
+    """
+    patterns = list(patterns)
+    for directory in directories:
+        files = list_font_files(directory)
+        for pattern in patterns:
+            for path in files:
+                if fnmatch.fnmatchcase(path.name, pattern):
+                    return str(path)
+    return None
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """載入(或取得已快取的)TrueType 字型
+
+    Args:
+        path: 字型檔案路徑
+        size: 字型大小(像素)
+
+    Returns:
+        FreeTypeFont 物件
+
+    Raises:
+        OSError: 字型無法載入(失敗結果不快取)
+    """
+    return ImageFont.truetype(path, size)
+
+
+@lru_cache(maxsize=1)
+def default_font() -> ImageFont.ImageFont:
+    """Pillow 預設字型(只載入一次)"""
+    return ImageFont.load_default()
+
+
+def clear_font_caches() -> None:
+    """清除所有快取(字型檔案變動或測試時使用)"""
+    with _lock:
+        _path_cache.clear()
+        _dir_cache.clear()
+    load_font.cache_clear()
+    default_font.cache_clear()
@@ -35,6 +35,7 @@ def _load_letter_image_specs(
     *,
     normalize_fn=None,
     filename_fn=None,
+    atlas=None,
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """載入字母圖片規格資訊
 
@@ -46,6 +47,8 @@ def _load_letter_image_specs(
         asset_dir: 素材目錄路徑
         normalize_fn: 正規化函數 (預設從 domain.layout 導入)
         filename_fn: 檔名生成函數 (預設從 domain.layout 導入)
+        atlas: 選用的 LetterAtlas;圖集中的檔案直接使用索引記錄的
+            原始尺寸,不再以 PIL 開檔
 
     Returns:
         (specs, missing) 元組:
@@ -102,6 +105,10 @@ def _load_letter_image_specs(
         from spellvid.domain.layout import _letter_asset_filename
         filename_fn = _letter_asset_filename
 
+    from spellvid.infrastructure.media.asset_index import get_asset_index
+
+    index = get_asset_index()
+
     # 正規化字母序列
     seq = normalize_fn(letters)
 
@@ -125,8 +132,20 @@ def _load_letter_image_specs(
         # 構建完整路徑
         path_str = os.path.join(asset_dir, fname)
 
-        # 檢查檔案是否存在
-        if not os.path.isfile(path_str):
+        # 圖集索引已記錄尺寸(圖集載入時已確認檔案未變更)
+        size = atlas.source_size(fname) if atlas is not None else None
+        if size is not None:
+            specs.append({
+                "char": ch,
+                "filename": fname,
+                "path": path_str,
+                "width": size[0],
+                "height": size[1],
+            })
+            continue
+
+        # 檢查檔案是否存在(依目錄索引,每個目錄只掃描一次)
+        if not index.exists(path_str):
             missing.append({
                 "char": ch,
                 "filename": fname,
@@ -135,10 +154,13 @@ def _load_letter_image_specs(
             })
             continue
 
-        # 嘗試讀取圖片尺寸
+        # 尺寸由索引讀取檔頭取得;讀取失敗時重新開檔以取得錯誤訊息
+        dims = index.dimensions(path_str)
         try:
-            with Image.open(path_str) as img:
-                orig_w, orig_h = img.size
+            if dims is None:
+                with Image.open(path_str) as img:
+                    dims = img.size
+            orig_w, orig_h = dims
         except Exception as exc:
             missing.append({
                 "char": ch,
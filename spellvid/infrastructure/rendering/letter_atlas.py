@@ -0,0 +1,339 @@
+"""預先縮放的字母素材圖集(atlas)
+
+每支視頻都會重新解碼字母 PNG 並縮放到佈局高度,載入規格時又各自以
+PIL 開檔讀取尺寸。此模組把素材目錄(assets/AZ 或
+SPELLVID_LETTER_ASSET_DIR)中的所有字母一次縮放到佈局的目標尺寸,
+存成單一原始 RGBA 圖集檔與一份尺寸索引:
+
+- <cache_root>/letter_atlas/atlas-<key>-<token>.bin: 所有字形的 RGBA 連續區塊
+- <cache_root>/letter_atlas/atlas-<key>.json: 索引(原始尺寸、檔案指紋、
+  每個縮放尺寸在圖集中的位移、建立時的額外高度)
+
+渲染時以 np.memmap 載入圖集,字母圖層只需切片,不需解碼與縮放
+(NumPy 在第一次取用字形時才載入,只讀尺寸的 dry-run 不需要它)。
+素材檔案的大小或修改時間變更、增刪檔案時,渲染字母圖層會自動重建,
+並沿用上次建立時的額外高度(scripts/build_letter_atlas.py
+--extra-heights);只需尺寸的呼叫端以 build=False 載入,不會觸發建立。
+
+Example:
+    >>> atlas = load_letter_atlas("assets/AZ")
+    >>> atlas.source_size("A.png")
+    (800, 1000)
+    >>> atlas.get("A.png", 264, 330).shape
+    (330, 264, 4)
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from PIL import Image
+    _HAS_PIL = True
+except ImportError:
+    Image = None
+    _HAS_PIL = False
+
+from spellvid.infrastructure.media.cache import cache_dir, cache_key
+from spellvid.shared.constants import (
+    LETTER_EXTRA_SCALE,
+    LETTER_TARGET_HEIGHT,
+)
+
+# 圖集格式或縮放邏輯變更時遞增
+ATLAS_VERSION = 1
+
+_atlases: Dict[Tuple[Any, ...], "LetterAtlas"] = {}
+_lock = threading.Lock()
+
+
+def default_letter_size(
+    width: int,
+    height: int,
+    target_height: int = LETTER_TARGET_HEIGHT,
+    extra_scale: float = LETTER_EXTRA_SCALE,
+) -> Tuple[int, int]:
+    """字母在未觸發寬度壓縮時的佈局尺寸
+
+    與 domain.layout._calculate_letter_layout 在 adjust=1 時的結果相同。
+
+    Example:
+        >>> default_letter_size(800, 1000)
+        (264, 330)
+    """
+    scale = min(1.0, target_height / float(max(1, height))) * extra_scale
+    return (max(1, int(round(max(1, width) * scale))),
+            max(1, int(round(max(1, height) * scale))))
+
+
+def _letter_files(asset_dir: str) -> Dict[str, Tuple[int, int]]:
+    """列出素材目錄中的字母檔案 {filename: (size, mtime_ns)}"""
+    from spellvid.domain.layout import _letter_asset_filename
+
+    files: Dict[str, Tuple[int, int]] = {}
+    try:
+        entries = list(os.scandir(asset_dir))
+    except OSError:
+        return files
+    for entry in entries:
+        stem = entry.name[:-len("_small.png")] if entry.name.endswith(
+            "_small.png") else entry.name[:-len(".png")]
+        if len(stem) != 1 or _letter_asset_filename(stem) != entry.name:
+            continue
+        try:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+        except OSError:
+            continue
+        files[entry.name] = (int(stat.st_size), int(stat.st_mtime_ns))
+    return files
+
+
+class LetterAtlas:
+    """記憶體映射的字母圖集
+
+    Args:
+        data_path: 圖集原始資料檔路徑
+        index: 圖集索引(見模組說明)
+    """
+
+    def __init__(self, data_path: str, index: Dict[str, Any]):
+        self.data_path = data_path
+        self.index = index
+        self._data: Optional["np.memmap"] = None
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self.index["files"]
+
+    def _memmap(self) -> "np.memmap":
+        # 只有取用字形時才載入 NumPy;dry-run 只需要 source_size
+        import numpy as np
+
+        if self._data is None:
+            self._data = np.memmap(self.data_path, dtype=np.uint8, mode="r")
+        return self._data
+
+    def source_size(self, filename: str) -> Optional[Tuple[int, int]]:
+        """素材原始尺寸 (width, height),不在圖集中時為 None"""
+        entry = self.index["files"].get(filename)
+        if entry is None:
+            return None
+        return int(entry["width"]), int(entry["height"])
+
+    def get(self, filename: str, width: int,
+            height: int) -> Optional["np.ndarray"]:
+        """取得預先縮放的字形
+
+        Args:
+            filename: 素材檔名,例如 "A.png"
+            width: 目標寬度
+            height: 目標高度
+
+        Returns:
+            (height, width, 4) 唯讀 uint8 視圖;圖集中沒有此尺寸時為 None
+        """
+        entry = self.index["files"].get(filename)
+        if entry is None:
+            return None
+        for w, h, offset in entry["scaled"]:
+            if (w, h) == (int(width), int(height)):
+                block = self._memmap()[offset:offset + w * h * 4]
+                return block.reshape(h, w, 4)
+        return None
+
+    def is_fresh(self, files: Dict[str, Tuple[int, int]]) -> bool:
+        """索引是否與目前的素材檔案一致"""
+        recorded = {
+            name: (entry["size"], entry["mtime_ns"])
+            for name, entry in self.index["files"].items()
+        }
+        recorded.update({
+            name: tuple(fp) for name, fp in self.index["skipped"].items()
+        })
+        return recorded == files and os.path.isfile(self.data_path)
+
+
+def _atlas_paths(asset_dir: str, target_height: int,
+                 extra_scale: float) -> Tuple[str, str]:
+    key = cache_key(ATLAS_VERSION, os.path.abspath(asset_dir),
+                    int(target_height), float(extra_scale))
+    directory = cache_dir("letter_atlas")
+    return directory, os.path.join(directory, f"atlas-{key}.json")
+
+
+def _read_index(index_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(index_path, "r", encoding="utf-8") as handle:
+            index = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != ATLAS_VERSION:
+        return None
+    return index
+
+
+def build_letter_atlas(
+    asset_dir: str,
+    *,
+    target_height: int = LETTER_TARGET_HEIGHT,
+    extra_scale: float = LETTER_EXTRA_SCALE,
+    extra_heights: Iterable[int] = (),
+) -> Optional[LetterAtlas]:
+    """縮放素材目錄中所有字母並寫入圖集
+
+    每個字母至少包含 default_letter_size 的尺寸;extra_heights 可再加入
+    其他高度(例如字母很多、佈局壓縮後的高度)。
+
+    Args:
+        asset_dir: 字母素材目錄
+        target_height: 佈局目標高度
+        extra_scale: 佈局額外縮放係數
+        extra_heights: 額外預先縮放的高度(像素)
+
+    Returns:
+        LetterAtlas;目錄中沒有可讀取的字母時為 None
+
+    Raises:
+        ImportError: 若 PIL 未安裝
+    """
+    if not _HAS_PIL:
+        raise ImportError(
+            "PIL (Pillow) is required to build the letter atlas. "
+            "Install with: pip install Pillow"
+        )
+
+    files = _letter_files(asset_dir)
+    directory, index_path = _atlas_paths(asset_dir, target_height,
+                                         extra_scale)
+    token = cache_key(sorted(files.items()), sorted(set(extra_heights)))[:8]
+    data_path = index_path[:-len(".json")] + f"-{token}.bin"
+    partial = f"{data_path}.{os.getpid()}.partial"
+
+    index: Dict[str, Any] = {
+        "version": ATLAS_VERSION,
+        "asset_dir": os.path.abspath(asset_dir),
+        "data": os.path.basename(data_path),
+        "files": {},
+        "skipped": {},
+        # 自動重建時沿用
+        "extra_heights": sorted({max(1, int(h)) for h in extra_heights}),
+    }
+    offset = 0
+    with open(partial, "wb") as out:
+        for name in sorted(files):
+            size, mtime_ns = files[name]
+            path = os.path.join(asset_dir, name)
+            try:
+                with Image.open(path) as img:
+                    rgba = img.convert("RGBA")
+            except Exception:
+                # 無法讀取的檔案交由規格載入回報 unreadable
+                index["skipped"][name] = [size, mtime_ns]
+                continue
+            orig_w, orig_h = rgba.size
+            sizes = [default_letter_size(orig_w, orig_h, target_height,
+                                         extra_scale)]
+            for h in extra_heights:
+                h = max(1, int(h))
+                sizes.append((max(1, int(round(orig_w * h / orig_h))), h))
+            scaled: List[List[int]] = []
+            for w, h in dict.fromkeys(sizes):
+                out.write(rgba.resize((w, h), Image.LANCZOS).tobytes())
+                scaled.append([w, h, offset])
+                offset += w * h * 4
+            index["files"][name] = {
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "width": int(orig_w),
+                "height": int(orig_h),
+                "scaled": scaled,
+            }
+
+    if offset == 0:
+        os.remove(partial)
+        return None
+
+    os.replace(partial, data_path)
+    # 索引最後寫入,作為圖集完成的標記
+    index_partial = f"{index_path}.{os.getpid()}.partial"
+    with open(index_partial, "w", encoding="utf-8") as handle:
+        json.dump(index, handle)
+    os.replace(index_partial, index_path)
+    _remove_stale_data(directory, index_path, data_path)
+    return LetterAtlas(data_path, index)
+
+
+def _remove_stale_data(directory: str, index_path: str,
+                       current: str) -> None:
+    """移除同一圖集的舊資料檔(仍被其他行程映射時略過)"""
+    prefix = os.path.basename(index_path)[:-len(".json")] + "-"
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name.startswith(prefix) and name.endswith(".bin") \
+                and path != current:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def load_letter_atlas(
+    asset_dir: str,
+    *,
+    target_height: int = LETTER_TARGET_HEIGHT,
+    extra_scale: float = LETTER_EXTRA_SCALE,
+    build: bool = True,
+) -> Optional[LetterAtlas]:
+    """取得素材目錄的圖集(行程內共用),必要時建立或重建
+
+    每次呼叫只列出一次素材目錄以確認圖集仍然有效。重建時沿用舊索引
+    記錄的額外高度。
+
+    Args:
+        asset_dir: 字母素材目錄
+        target_height: 佈局目標高度
+        extra_scale: 佈局額外縮放係數
+        build: 圖集不存在或過期時是否建立(只需原始尺寸時傳 False)
+
+    Returns:
+        LetterAtlas,或 None(目錄沒有字母、或 build=False 且無有效圖集)
+    """
+    if not _HAS_PIL or not asset_dir:
+        return None
+    files = _letter_files(asset_dir)
+    if not files:
+        return None
+
+    key = (os.path.abspath(asset_dir), int(target_height),
+           float(extra_scale))
+    with _lock:
+        cached = _atlases.get(key)
+        if cached is not None and cached.is_fresh(files):
+            return cached
+
+        _, index_path = _atlas_paths(asset_dir, target_height, extra_scale)
+        index = _read_index(index_path)
+        atlas = None
+        if index is not None:
+            data_path = os.path.join(os.path.dirname(index_path),
+                                     index["data"])
+            atlas = LetterAtlas(data_path, index)
+            if not atlas.is_fresh(files):
+                atlas = None
+        if atlas is None and build:
+            previous = index or (cached.index if cached is not None else {})
+            try:
+                atlas = build_letter_atlas(
+                    asset_dir, target_height=target_height,
+                    extra_scale=extra_scale,
+                    extra_heights=previous.get("extra_heights", ()),
+                )
+            except OSError:
+                atlas = None
+        if atlas is None:
+            _atlases.pop(key, None)
+        else:
+            _atlases[key] = atlas
+        return atlas
@@ -6,14 +6,23 @@
 - 文字轉圖片渲染(支援透明背景)
 - 文字尺寸預測
 - 跨平台字型偵測(支援 CJK 字型)
+- 字型路徑與字型物件由 font_registry 在行程內快取
 """
 
+import os
 import platform
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
+from spellvid.infrastructure.rendering.font_registry import (
+    default_font,
+    find_font_file,
+    load_font,
+    resolve_font_path,
+)
+
 
 class PillowAdapter:
     """Pillow 文字渲染適配器
@@ -68,9 +77,9 @@ class PillowAdapter:
         if not Path(font_path).exists():
             raise FileNotFoundError(f"Font file not found: {font_path}")
 
-        # 載入字型
+        # 載入字型(行程層級快取)
         try:
-            font = ImageFont.truetype(font_path, font_size)
+            font = load_font(font_path, font_size)
         except Exception as e:
             raise ValueError(f"Failed to load font {font_path}: {e}")
 
@@ -141,9 +150,9 @@ class PillowAdapter:
         if not Path(font_path).exists():
             raise FileNotFoundError(f"Font file not found: {font_path}")
 
-        # 載入字型
+        # 載入字型(行程層級快取)
         try:
-            font = ImageFont.truetype(font_path, font_size)
+            font = load_font(font_path, font_size)
         except Exception as e:
             raise ValueError(f"Failed to load font {font_path}: {e}")
 
@@ -187,11 +196,23 @@ class PillowAdapter:
         system = platform.system()
 
         if system == "Windows":
-            return self._find_windows_font(prefer_cjk)
+            finder = self._find_windows_font
         elif system == "Darwin":  # macOS
-            return self._find_macos_font(prefer_cjk)
+            finder = self._find_macos_font
         else:  # Linux and others
-            return self._find_linux_font(prefer_cjk)
+            finder = self._find_linux_font
+
+        def _search() -> Optional[str]:
+            try:
+                return finder(prefer_cjk)
+            except FileNotFoundError:
+                return None
+
+        # 每個 (平台, prefer_cjk) 只搜尋一次
+        path = resolve_font_path(("system", system, prefer_cjk), _search)
+        if path is None:
+            raise FileNotFoundError(f"No suitable font found on {system}")
+        return path
 
     def _find_windows_font(self, prefer_cjk: bool) -> str:
         """Windows 字型偵測
@@ -296,34 +317,27 @@ class PillowAdapter:
             Path("/usr/local/share/fonts"),
         ]
 
+        # 目錄只走訪一次,之後以檔名樣式比對(等同遞迴 glob)
         if prefer_cjk:
             # CJK 字型優先順序
             cjk_patterns = [
-                "**/NotoSansCJK*.ttc",
-                "**/DroidSansFallback.ttf",
-                "**/wqy-*.ttc",
+                "NotoSansCJK*.ttc",
+                "DroidSansFallback.ttf",
+                "wqy-*.ttc",
             ]
-            for font_dir in font_dirs:
-                if not font_dir.exists():
-                    continue
-                for pattern in cjk_patterns:
-                    matches = list(font_dir.glob(pattern))
-                    if matches:
-                        return str(matches[0])
+            match = find_font_file(font_dirs, cjk_patterns)
+            if match:
+                return match
 
         # 一般字型
         standard_patterns = [
-            "**/Arial.ttf",
-            "**/DejaVuSans.ttf",
-            "**/FreeSans.ttf",
+            "Arial.ttf",
+            "DejaVuSans.ttf",
+            "FreeSans.ttf",
         ]
-        for font_dir in font_dirs:
-            if not font_dir.exists():
-                continue
-            for pattern in standard_patterns:
-                matches = list(font_dir.glob(pattern))
-                if matches:
-                    return str(matches[0])
+        match = find_font_file(font_dirs, standard_patterns)
+        if match:
+            return match
 
         raise FileNotFoundError("No suitable font found on Linux")
 
@@ -358,6 +372,7 @@ def _find_system_font(prefer_cjk: bool, size: int):
         - 僅支援 Windows 系統路徑
         - 跨平台支援需額外擴充
         - 字型載入失敗時靜默回退至預設字型
+        - 路徑只解析一次;字型物件由 font_registry 以 (path, size) 快取
 
     遷移自: spellvid/utils.py:677
     遷移日期: 2025-01-20
@@ -383,21 +398,28 @@ def _find_system_font(prefer_cjk: bool, size: int):
             r"C:\Windows\Fonts\times.ttf",     # Times New Roman
         ]
 
-    # 嘗試載入第一個存在的字型檔案
-    for p in candidates:
+    def _first_loadable() -> Optional[str]:
+        # 第一個存在且可載入的字型檔案
+        for p in candidates:
+            try:
+                if os.path.isfile(p):
+                    load_font(p, size)
+                    return p
+            except Exception:
+                # 字型載入失敗,嘗試下一個
+                continue
+        return None
+
+    # 路徑只解析一次,字型物件由 (path, size) LRU 共用
+    path = resolve_font_path(("legacy", prefer_cjk), _first_loadable)
+    if path is not None:
         try:
-            if os.path.isfile(p):
-                return ImageFont.truetype(p, size)
+            return load_font(path, size)
         except Exception:
-            # 字型載入失敗,嘗試下一個
-            continue
+            pass
 
     # 所有字型都失敗,使用預設字型
-    try:
-        return ImageFont.load_default()
-    except Exception:
-        # 極端情況: 預設字型也失敗
-        return ImageFont.load_default()
+    return default_font()
 
 
 def _measure_text_with_pil(text: str, pil_font: ImageFont.ImageFont):
@@ -454,6 +476,249 @@ def _measure_text_with_pil(text: str, pil_font: ImageFont.ImageFont):
         return estimated_width, estimated_height
 
 
+def _font_identity(font: Any) -> Tuple[Any, ...]:
+    """字型的快取識別:檔案路徑、大小、修改時間與字級"""
+    import PIL
+
+    path = getattr(font, "path", None)
+    if isinstance(path, str) and os.path.isfile(path):
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns,
+                getattr(font, "size", None), PIL.__version__)
+    return ("<default>", getattr(font, "size", None), PIL.__version__)
+
+
+def _rasterize_text(
+    text: str,
+    font: Any,
+    font_size: int,
+    color,
+    bg,
+    extra_bottom: int,
+    fixed_size: tuple | None,
+):
+    """以 Pillow 將文字點陣化為 RGBA 陣列(不經快取)"""
+    import numpy as np
+
+    # 測量文字尺寸
+    try:
+        w, h = _measure_text_with_pil(text, font)
+    except Exception:
+        # 測量失敗,使用啟發式估算
+        w, h = (int(len(text) * font_size * 0.6), font_size)
+
+    # 計算 padding (基於字型大小,最小值保證可讀性)
+    pad_x = max(12, font_size // 6)  # 水平內邊距,至少 12px
+    pad_y = max(8, font_size // 6)   # 垂直內邊距,至少 8px
+
+    # 計算底部安全空間
+    # - extra_bottom: 呼叫者明確要求的額外空間 (例如 reveal 下劃線)
+    # - 黑色背景啟發式: 假設是倒數計時器,需要 32px 防止下沿裁切
+    bottom_safe_margin = int(extra_bottom or 0)
+    if bg is not None and isinstance(bg, tuple) and len(bg) == 3:
+        if bg == (0, 0, 0):  # 黑色背景 = 倒數計時器
+            bottom_safe_margin += 32
+
+    # 計算圖片尺寸
+    img_w = int(w + pad_x * 2)
+    img_h = int(h + pad_y * 2 + bottom_safe_margin)
+
+    # 固定畫布模式: 確保字母子串位置一致
+    if fixed_size is not None:
+        try:
+            fx_w, fx_h = int(fixed_size[0]), int(fixed_size[1])
+            # 固定畫布至少要能容納測量的圖片尺寸
+            img_w = max(img_w, fx_w)
+            img_h = max(img_h, fx_h)
+            # 文字靠左上對齊 (pad_x, pad_y),不居中
+            # 這確保 "I", "Ic", "Ice" 的 "I" 都在相同位置
+            offset_x = 0
+            offset_y = 0
+        except Exception:
+            offset_x = 0
+            offset_y = 0
+    else:
+        offset_x = 0
+        offset_y = 0
+
+    # 建立 PIL 圖片
+    bg_col = (255, 255, 255, 0) if bg is None else tuple(
+        bg) + (255,)  # 加 alpha 通道
+    img = Image.new("RGBA", (img_w, img_h), bg_col)
+    draw = ImageDraw.Draw(img)
+
+    # 繪製文字 (位置 = padding + offset)
+    draw_x = pad_x + offset_x
+    draw_y = pad_y + offset_y
+    draw.text((draw_x, draw_y), text, font=font, fill=color)
+
+    # 轉換為 numpy array (MoviePy 格式)
+    return np.array(img)
+
+
+def render_text_sprite(
+    text: str,
+    font_size: int = 48,
+    color=(0, 0, 0),
+    bg=None,
+    prefer_cjk: bool = False,
+    extra_bottom: int = 0,
+    fixed_size: tuple | None = None,
+):
+    """渲染文字為 RGBA 陣列,結果由 sprite 快取共用
+
+    鍵值包含文字、字型(路徑/大小/修改時間)、字級、顏色、背景、
+    padding、fixed_size 與 extra_bottom;相同參數回傳同一份唯讀陣列,
+    批次中的其他視頻(或啟用磁碟層時的其他 worker)不需重新點陣化。
+
+    Args:
+        text: 要渲染的文字內容
+        font_size: 字型大小 (像素)
+        color: 文字顏色 RGB tuple
+        bg: 背景顏色 RGB tuple,None 表示透明背景
+        prefer_cjk: 是否優先使用 CJK 字型
+        extra_bottom: 額外底部空間 (像素)
+        fixed_size: 固定畫布尺寸 (width, height)
+
+    Returns:
+        np.ndarray: (H, W, 4) uint8 唯讀 RGBA 陣列
+
+    Examples:
+        >>> arr = render_text_sprite("00:10", font_size=64, bg=(0, 0, 0))
+        >>> arr is render_text_sprite("00:10", font_size=64, bg=(0, 0, 0))
+        True
+    """
+    from spellvid.infrastructure.rendering.sprite_cache import (
+        get_sprite_cache,
+    )
+
+    try:
+        font = _find_system_font(prefer_cjk, font_size)
+    except Exception:
+        font = default_font()
+
+    pad_x = max(12, font_size // 6)
+    pad_y = max(8, font_size // 6)
+    # bg 以 repr 區分 tuple/list:只有 tuple (0,0,0) 觸發計時器底部空間
+    parts = (
+        "text", text, _font_identity(font), int(font_size),
+        repr(color), repr(bg), (pad_x, pad_y), int(extra_bottom or 0),
+        repr(fixed_size),
+    )
+    return get_sprite_cache().get_or_render(
+        parts,
+        lambda: _rasterize_text(text, font, font_size, color, bg,
+                                extra_bottom, fixed_size),
+    )
+
+
+def measure_prefix_edges(
+    text: str,
+    font_size: int = 48,
+    prefer_cjk: bool = False,
+) -> list[int]:
+    """量測每個前綴在 render_text_sprite 點陣圖中的右緣位置
+
+    與 render_text_sprite 使用相同字型與 padding,文字繪製於
+    (pad_x, pad_y);第 k 個值為 text[:k+1] 的墨水右緣(含 pad_x),
+    裁切整字點陣圖的 [:, :edge] 即得該前綴的畫面,不必重新點陣化。
+
+    Args:
+        text: 完整文字
+        font_size: 字型大小 (像素)
+        prefer_cjk: 是否優先使用 CJK 字型
+
+    Returns:
+        長度為 len(text) 的非遞減整數列表
+
+    Examples:
+        >>> edges = measure_prefix_edges("Ice", font_size=128)
+        >>> len(edges), edges[0] < edges[-1]
+        (3, True)
+    """
+    import math
+
+    try:
+        font = _find_system_font(prefer_cjk, font_size)
+    except Exception:
+        font = default_font()
+    pad_x = max(12, font_size // 6)
+
+    edges: list[int] = []
+    last = pad_x
+    for idx in range(1, len(text) + 1):
+        try:
+            right = font.getbbox(text[:idx])[2]
+        except Exception:
+            # 無法量測時以字級啟發式估算(與 _rasterize_text 一致)
+            right = idx * font_size * 0.6
+        last = max(last, pad_x + int(math.ceil(right)))
+        edges.append(last)
+    return edges
+
+
+def measure_prefix_overlaps(
+    text: str,
+    font_size: int = 48,
+    prefer_cjk: bool = False,
+) -> list[bool]:
+    """量測每個前綴的裁切範圍是否含有後續字形的墨水
+
+    字距調整(如 "AV"、"Ty")或字形外伸(如 "fj" 的 f)會讓後續字形
+    伸入前綴墨水右緣的左側,此時整字點陣圖的 [:, :edge] 會多出後續
+    字形的一部分,與單獨渲染該前綴不同。
+
+    Args:
+        text: 完整文字
+        font_size: 字型大小 (像素)
+        prefer_cjk: 是否優先使用 CJK 字型
+
+    Returns:
+        長度為 len(text) 的布林列表;第 k 個值對應 text[:k+1]
+        (最後一個前綴即整字,恆為 False)
+
+    Examples:
+        >>> measure_prefix_overlaps("AV", font_size=128)
+        [True, False]
+    """
+    import math
+
+    try:
+        font = _find_system_font(prefer_cjk, font_size)
+    except Exception:
+        font = default_font()
+    edges = measure_prefix_edges(text, font_size, prefer_cjk)
+    pad_x = max(12, font_size // 6)
+
+    # 每個字形在整字中的墨水左緣 (無墨水的字元如空白為 None)
+    lefts: list = []
+    for idx, ch in enumerate(text):
+        try:
+            bbox = font.getbbox(ch)
+            if bbox[2] <= bbox[0]:
+                lefts.append(None)
+                continue
+            # 字形原點 = 含此字的前綴寬度 - 此字寬度 (包含與前一字的字距)
+            origin = font.getlength(text[:idx + 1]) - font.getlength(ch)
+        except Exception:
+            lefts.append(None)
+            continue
+        lefts.append(pad_x + int(math.floor(origin + bbox[0])))
+
+    overlaps: list[bool] = []
+    suffix_min = None
+    mins: list = [None] * len(text)
+    for idx in range(len(text) - 1, -1, -1):
+        mins[idx] = suffix_min
+        if lefts[idx] is not None:
+            suffix_min = lefts[idx] if suffix_min is None \
+                else min(suffix_min, lefts[idx])
+    for idx, edge in enumerate(edges):
+        later = mins[idx]
+        overlaps.append(later is not None and later < edge)
+    return overlaps
+
+
 def _make_text_imageclip(
     text: str,
     font_size: int = 48,
@@ -523,64 +788,16 @@ def _make_text_imageclip(
     遷移自: spellvid/utils.py:689
     遷移日期: 2025-01-20
     """
-    import numpy as np
-
-    # 嘗試載入字型並測量文字尺寸
-    try:
-        font = _find_system_font(prefer_cjk, font_size)
-        w, h = _measure_text_with_pil(text, font)
-    except Exception:
-        # 字型載入失敗,使用預設字型和啟發式估算
-        font = ImageFont.load_default()
-        w, h = (int(len(text) * font_size * 0.6), font_size)
-
-    # 計算 padding (基於字型大小,最小值保證可讀性)
-    pad_x = max(12, font_size // 6)  # 水平內邊距,至少 12px
-    pad_y = max(8, font_size // 6)   # 垂直內邊距,至少 8px
-
-    # 計算底部安全空間
-    # - extra_bottom: 呼叫者明確要求的額外空間 (例如 reveal 下劃線)
-    # - 黑色背景啟發式: 假設是倒數計時器,需要 32px 防止下沿裁切
-    bottom_safe_margin = int(extra_bottom or 0)
-    if bg is not None and isinstance(bg, tuple) and len(bg) == 3:
-        if bg == (0, 0, 0):  # 黑色背景 = 倒數計時器
-            bottom_safe_margin += 32
-
-    # 計算圖片尺寸
-    img_w = int(w + pad_x * 2)
-    img_h = int(h + pad_y * 2 + bottom_safe_margin)
-
-    # 固定畫布模式: 確保字母子串位置一致
-    if fixed_size is not None:
-        try:
-            fx_w, fx_h = int(fixed_size[0]), int(fixed_size[1])
-            # 固定畫布至少要能容納測量的圖片尺寸
-            img_w = max(img_w, fx_w)
-            img_h = max(img_h, fx_h)
-            # 文字靠左上對齊 (pad_x, pad_y),不居中
-            # 這確保 "I", "Ic", "Ice" 的 "I" 都在相同位置
-            offset_x = 0
-            offset_y = 0
-        except Exception:
-            offset_x = 0
-            offset_y = 0
-    else:
-        offset_x = 0
-        offset_y = 0
-
-    # 建立 PIL 圖片
-    bg_col = (255, 255, 255, 0) if bg is None else tuple(
-        bg) + (255,)  # 加 alpha 通道
-    img = Image.new("RGBA", (img_w, img_h), bg_col)
-    draw = ImageDraw.Draw(img)
-
-    # 繪製文字 (位置 = padding + offset)
-    draw_x = pad_x + offset_x
-    draw_y = pad_y + offset_y
-    draw.text((draw_x, draw_y), text, font=font, fill=color)
-
-    # 轉換為 numpy array (MoviePy 格式)
-    arr = np.array(img)
+    # 點陣化結果由 sprite 快取共用(相同參數回傳同一份唯讀陣列)
+    arr = render_text_sprite(
+        text,
+        font_size=font_size,
+        color=color,
+        bg=bg,
+        prefer_cjk=prefer_cjk,
+        extra_bottom=extra_bottom,
+        fixed_size=fixed_size,
+    )
 
     # 嘗試使用 MoviePy ImageClip
     try:
@@ -620,3 +837,146 @@ def _make_text_imageclip(
 
     clip = _SimpleImageClip(arr, duration=duration)
     return clip
+
+
+def _render_chinese_zhuyin_image(word_zh: str, font_size: int = 96):
+    """渲染中文字與直排注音為單張透明 RGBA 陣列
+
+    每個中文字佔一欄:主字在左,注音符號直排於右側,聲調依
+    domain.layout._layout_zhuyin_column 的規則擺放(輕聲置於上方居中)。
+    注音字級會逐步縮小,直到直排高度不超過主字高度。
+
+    Args:
+        word_zh: 中文字串 (例如: "冰" 或 "動物")
+        font_size: 主字字型大小 (像素),預設 96
+
+    Returns:
+        np.ndarray: (H, W, 4) uint8 唯讀 RGBA 陣列(由 sprite 快取共用);
+            word_zh 為空時回傳 None
+
+    Examples:
+        >>> arr = _render_chinese_zhuyin_image("冰")
+        >>> arr.shape[2]
+        4
+
+    遷移自: spellvid/utils.py render_video_moviepy (中文+注音區塊)
+    """
+    from spellvid.infrastructure.rendering.sprite_cache import (
+        get_sprite_cache,
+    )
+
+    if not any(ch.strip() for ch in (word_zh or "")):
+        return None
+    main_font = _find_system_font(prefer_cjk=True, size=font_size)
+    return get_sprite_cache().get_or_render(
+        ("zhuyin", word_zh, int(font_size), _font_identity(main_font)),
+        lambda: _rasterize_chinese_zhuyin(word_zh, font_size),
+    )
+
+
+def _rasterize_chinese_zhuyin(word_zh: str, font_size: int):
+    """點陣化中文字與直排注音(不經快取)"""
+    import numpy as np
+    from spellvid.domain.layout import _layout_zhuyin_column
+    from spellvid.domain.typography import (
+        _zhuyin_main_gap,
+        split_zhuyin_symbols,
+        zhuyin_for,
+    )
+    from spellvid.shared.constants import (
+        ZHUYIN_BASE_HEIGHT_RATIO,
+        ZHUYIN_MIN_FONT_SIZE,
+    )
+
+    chars = [ch for ch in (word_zh or "") if ch.strip()]
+    if not chars:
+        return None
+
+    main_font = _find_system_font(prefer_cjk=True, size=font_size)
+    padding = 8
+
+    # 第一輪:測量每欄尺寸並決定注音字級
+    columns = []
+    for ch in chars:
+        ch_w, ch_h = _measure_text_with_pil(ch, main_font)
+        main_syms, tone = split_zhuyin_symbols(zhuyin_for(ch) or "")
+        tone_syms = [tone] if tone else []
+        symbol_count = len(main_syms)
+        main_gap = _zhuyin_main_gap(symbol_count)
+
+        zh_font_size = min(
+            max(ZHUYIN_MIN_FONT_SIZE, int(ch_h * ZHUYIN_BASE_HEIGHT_RATIO)),
+            max(1, int(ch_h)),
+        )
+        while True:
+            zh_font = _find_system_font(prefer_cjk=True, size=zh_font_size)
+            sizes = [_measure_text_with_pil(s, zh_font) for s in main_syms]
+            zh_w = max((w for w, _ in sizes), default=0)
+            total_main_h = sum(h for _, h in sizes)
+            total_main_h += main_gap * max(0, symbol_count - 1)
+            if total_main_h <= ch_h or zh_font_size <= ZHUYIN_MIN_FONT_SIZE:
+                break
+            zh_font_size -= 1
+
+        tone_sizes = [_measure_text_with_pil(t, zh_font) for t in tone_syms]
+        columns.append({
+            "ch": ch,
+            "ch_size": (ch_w, ch_h),
+            "main_syms": main_syms,
+            "main_sizes": sizes,
+            "main_gap": main_gap,
+            "tone_syms": tone_syms,
+            "tone_sizes": tone_sizes,
+            "zh_font": zh_font,
+            "zh_w": zh_w,
+            "total_main_h": total_main_h,
+            "col_w": ch_w + zh_w + padding,
+        })
+
+    img_w = int(sum(c["col_w"] for c in columns) + padding)
+    img_h = int(max(c["ch_size"][1] for c in columns) + padding * 2)
+    img = Image.new("RGBA", (max(1, img_w), max(1, img_h)), (255, 255, 255, 0))
+    draw = ImageDraw.Draw(img)
+
+    # 第二輪:由左至右繪製各欄
+    cursor_x = padding
+    cursor_y = padding
+    for col in columns:
+        ch_w, ch_h = col["ch_size"]
+        draw.text((cursor_x, cursor_y), col["ch"], font=main_font,
+                  fill=(0, 0, 0))
+
+        tone_layout = _layout_zhuyin_column(
+            cursor_y=cursor_y,
+            col_h=ch_h,
+            total_main_h=col["total_main_h"],
+            tone_syms=col["tone_syms"],
+            tone_sizes=col["tone_sizes"],
+            tone_gap=10,
+        )
+
+        zh_x = cursor_x + ch_w + 2
+        cur_y = tone_layout["main_start_y"]
+        for idx, sym in enumerate(col["main_syms"]):
+            draw.text((zh_x, cur_y), sym, font=col["zh_font"],
+                      fill=(0, 0, 0))
+            cur_y += col["main_sizes"][idx][1]
+            if idx < len(col["main_syms"]) - 1:
+                cur_y += col["main_gap"]
+
+        tone_start_y = tone_layout.get("tone_start_y")
+        if col["tone_syms"] and tone_start_y is not None:
+            if tone_layout.get("tone_alignment") == "center":
+                tone_w = col["tone_sizes"][0][0]
+                tone_x = zh_x + max(0, (int(col["zh_w"]) - tone_w) // 2)
+            else:
+                tone_x = zh_x + int(col["zh_w"]) - 2
+            tcur = tone_start_y
+            for ts, (_, th) in zip(col["tone_syms"], col["tone_sizes"]):
+                draw.text((tone_x, tcur), ts, font=col["zh_font"],
+                          fill=(0, 0, 0))
+                tcur += th + 2
+
+        cursor_x += col["col_w"]
+
+    return np.array(img)
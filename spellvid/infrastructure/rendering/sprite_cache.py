@@ -0,0 +1,165 @@
+"""內容定址的點陣圖(sprite)快取
+
+批次中的每支視頻都會重新點陣化相同的文字:計時器字串、常見的 reveal
+前綴、相同的注音符號。此模組以渲染參數的雜湊為鍵,回傳同一份唯讀
+RGBA 陣列:
+
+- 記憶體層:LRU,以位元組數為上限(SPRITE_CACHE_BYTES)
+- 磁碟層(選用):<cache_root>/sprites/<key>.npz,讓批次 worker 與
+  重複執行完全跳過點陣化;設定環境變數 SPELLVID_SPRITE_DISK_CACHE=1 啟用
+
+回傳的陣列設為唯讀(writeable=False),呼叫端需要修改時請先複製。
+
+Example:
+    >>> cache = get_sprite_cache()
+    >>> arr = cache.get_or_render(("text", "00:10", 64), render_fn)
+    >>> cache.get_or_render(("text", "00:10", 64), render_fn) is arr
+    True
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+
+from spellvid.infrastructure.media.cache import cache_dir, cache_key
+
+# 記憶體層上限(位元組)
+SPRITE_CACHE_BYTES = 256 * 1024 * 1024
+
+# 點陣化邏輯變更時遞增,使磁碟快取失效
+SPRITE_CACHE_VERSION = 1
+
+_TRUTHY = ("1", "true", "yes", "on")
+
+
+def _disk_tier_enabled() -> bool:
+    value = os.environ.get("SPELLVID_SPRITE_DISK_CACHE", "")
+    return value.strip().lower() in _TRUTHY
+
+
+class SpriteCache:
+    """RGBA 點陣圖快取
+
+    Args:
+        max_bytes: 記憶體層上限(位元組)
+        disk_dir: 磁碟層目錄,None 表示只使用記憶體層
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = SPRITE_CACHE_BYTES,
+        disk_dir: Optional[str] = None,
+    ):
+        self.max_bytes = int(max_bytes)
+        self.disk_dir = disk_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key_for(parts: Tuple[Any, ...]) -> str:
+        """將渲染參數轉為快取鍵"""
+        return cache_key(SPRITE_CACHE_VERSION, *parts)
+
+    def get_or_render(
+        self,
+        parts: Tuple[Any, ...],
+        render: Callable[[], np.ndarray],
+    ) -> np.ndarray:
+        """取得快取的點陣圖,未命中時呼叫 render 並保存
+
+        Args:
+            parts: 決定點陣圖內容的所有參數(需可 JSON 序列化)
+            render: 點陣化函數,回傳 (H, W, C) uint8 陣列
+
+        Returns:
+            唯讀的 uint8 陣列(相同參數回傳同一物件)
+        """
+        key = self.key_for(parts)
+        with self._lock:
+            arr = self._entries.get(key)
+            if arr is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return arr
+
+        arr = self._load(key)
+        if arr is None:
+            arr = np.ascontiguousarray(render(), dtype=np.uint8)
+            self._store(key, arr)
+        arr.setflags(write=False)
+
+        with self._lock:
+            # 其他執行緒可能已先放入,統一回傳同一物件
+            existing = self._entries.get(key)
+            if existing is not None:
+                self._entries.move_to_end(key)
+                return existing
+            self.misses += 1
+            self._entries[key] = arr
+            self._bytes += arr.nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+        return arr
+
+    def clear(self) -> None:
+        """清除記憶體層(不影響磁碟層)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+    def _path(self, key: str) -> Optional[str]:
+        if not self.disk_dir:
+            return None
+        return os.path.join(self.disk_dir, f"{key}.npz")
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        path = self._path(key)
+        if path is None or not os.path.isfile(path):
+            return None
+        try:
+            with np.load(path) as data:
+                return np.ascontiguousarray(data["sprite"], dtype=np.uint8)
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _store(self, key: str, arr: np.ndarray) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        # 先寫暫存檔再原子替換,平行 worker 不會讀到半成品
+        partial = f"{path}.{os.getpid()}.partial.npz"
+        try:
+            np.savez_compressed(partial, sprite=arr)
+            os.replace(partial, path)
+        except OSError:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+
+_cache: Optional[SpriteCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_sprite_cache() -> SpriteCache:
+    """取得行程共用的 SpriteCache
+
+    磁碟層依 SPELLVID_SPRITE_DISK_CACHE 與目前的快取根目錄決定;
+    設定變更時會建立新的實例。
+    """
+    global _cache
+    disk_dir = cache_dir("sprites") if _disk_tier_enabled() else None
+    with _cache_lock:
+        if _cache is None or _cache.disk_dir != disk_dir:
+            _cache = SpriteCache(disk_dir=disk_dir)
+        return _cache
@@ -428,3 +428,106 @@ def plan_segments(
     )
 
     return segments
+
+
+def progress_width_at(
+    t: float,
+    countdown: float,
+    bar_width: int = PROGRESS_BAR_WIDTH,
+    *,
+    fps: Any = None,
+) -> int:
+    """Compute the visible progress bar width at time ``t``.
+
+    With ``fps=None`` the width follows the remaining time continuously
+    (one step per rendered frame). With a positive ``fps`` the time is
+    quantized to the same steps as :func:`plan_segments`, so the result
+    matches ``segment["width"]`` of the segment containing ``t``.
+
+    Args:
+        t: Time in seconds since countdown start.
+        countdown: Countdown duration in seconds.
+        bar_width: Total width of the progress bar in pixels.
+        fps: Step rate for quantized shrinking, or None for smooth.
+
+    Returns:
+        Visible width in pixels; at least 1 while time remains, 0 after
+        the countdown.
+
+    Example:
+        >>> progress_width_at(0.0, 10)
+        1792
+        >>> progress_width_at(5.0, 10)
+        896
+        >>> progress_width_at(10.0, 10)
+        0
+    """
+    import math
+
+    countdown = float(max(0.0, countdown))
+    if bar_width <= 0 or countdown == 0.0 or t >= countdown:
+        return 0
+    t = max(0.0, float(t))
+    if fps:
+        step_count = max(1, int(math.ceil(countdown * float(fps))))
+        step = countdown / step_count
+        t = min(countdown, int(t / step + 1e-9) * step)
+    ratio = (countdown - t) / countdown
+    return max(1, min(bar_width, int(round(bar_width * ratio))))
+
+
+def make_progress_bar_frame_function(
+    countdown: float,
+    *,
+    bar_width: int = PROGRESS_BAR_WIDTH,
+    fps: Any = None,
+) -> Any:
+    """Build a ``make_frame(t)`` callable drawing the shrinking bar.
+
+    The callable reuses the cached :func:`generate_base_arrays` color and
+    mask and one preallocated RGBA buffer of shape (height, bar_width, 4).
+    Each frame only computes the visible width and slice-copies the mask
+    columns, replacing the per-segment ImageClip + mask clip pairs used
+    by the legacy renderer (one clip instead of ``countdown × fps``).
+
+    The returned buffer is reused between calls; callers must consume it
+    before requesting the next frame.
+
+    Args:
+        countdown: Countdown duration in seconds.
+        bar_width: Total width of the progress bar in pixels.
+        fps: Step rate for quantized shrinking (legacy 10 Hz look), or
+            None for smooth per-frame shrinking.
+
+    Returns:
+        Function mapping time (seconds) to an RGBA uint8 array, or None
+        when the bar is fully hidden.
+
+    Example:
+        >>> make_frame = make_progress_bar_frame_function(10)
+        >>> make_frame(0.0).shape
+        (32, 1792, 4)
+        >>> make_frame(10.0) is None
+        True
+    """
+    color, mask = generate_base_arrays(bar_width)
+    buffer = np.zeros((color.shape[0], bar_width, 4), dtype=np.uint8)
+    buffer[..., :3] = color
+    alpha = buffer[..., 3]
+    # Bar shrinks right-aligned, so only the hidden left edge moves.
+    shown_from = [bar_width]
+
+    def make_frame(t: float) -> Any:
+        width = progress_width_at(t, countdown, bar_width, fps=fps)
+        if width <= 0:
+            return None
+        x_start = bar_width - width
+        prev = shown_from[0]
+        if x_start > prev:
+            alpha[:, prev:x_start] = 0
+        elif x_start < prev:
+            alpha[:, x_start:prev] = mask[:, x_start:prev]
+        shown_from[0] = x_start
+        return buffer
+
+    return make_frame
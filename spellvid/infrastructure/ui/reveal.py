@@ -0,0 +1,154 @@
+"""Typewriter reveal rendering infrastructure.
+
+The legacy renderer rasterized ``word_en[:idx]`` on a fixed full-size
+canvas once per letter and kept every substring clip alive until the end
+of the video. This module rasterizes the full word once (through the
+shared sprite cache) together with the right edge of every prefix, and
+exposes the visible prefix at frame time as a column crop of that single
+raster.
+
+Technical Details:
+- The crop is a NumPy view, so no frame allocates a new array
+- Prefix edges are the ink right edge of ``word[:k]`` drawn at the same
+  origin as the full word
+- Where kerning or an overhang pulls a later glyph left of that edge
+  (e.g. "AV", "Ty", the f in "fjord"), the crop would show part of the
+  next glyph; those prefixes alone are rasterized separately, so every
+  prefix frame is pixel-identical to the legacy per-prefix render
+"""
+
+from typing import Any, List, Tuple
+
+
+def render_reveal_sprite(
+    word: str,
+    *,
+    font_size: int = 128,
+    color: Tuple[int, int, int] = (0, 0, 0),
+    extra_bottom: int = 48,
+) -> Tuple[Any, List[int]]:
+    """Rasterize the full word once and measure every prefix edge.
+
+    Args:
+        word: Word to reveal letter by letter.
+        font_size: Font size in pixels (legacy reveal uses 128).
+        color: Text RGB color.
+        extra_bottom: Extra space below the glyphs reserved for underlines.
+
+    Returns:
+        Tuple of (sprite, edges): the read-only (H, W, 4) RGBA raster of
+        the full word and, for each prefix length k (1..len(word)), the
+        crop width ``edges[k - 1]``. The last edge is the sprite width.
+
+    Example:
+        >>> sprite, edges = render_reveal_sprite("Ice")
+        >>> edges[-1] == sprite.shape[1]
+        True
+    """
+    from spellvid.infrastructure.rendering.pillow_adapter import (
+        measure_prefix_edges,
+        render_text_sprite,
+    )
+
+    sprite = render_text_sprite(
+        word, font_size=font_size, color=color, extra_bottom=extra_bottom,
+    )
+    width = int(sprite.shape[1])
+    edges = [min(edge, width)
+             for edge in measure_prefix_edges(word, font_size=font_size)]
+    if edges:
+        # The full word keeps its right padding, as the legacy render did.
+        edges[-1] = width
+    return sprite, edges
+
+
+def render_reveal_prefixes(
+    word: str,
+    *,
+    font_size: int = 128,
+    color: Tuple[int, int, int] = (0, 0, 0),
+    extra_bottom: int = 48,
+) -> List[Any]:
+    """Build the frame shown for every prefix length of the reveal.
+
+    Each prefix is a column crop of the single full-word raster, except
+    where a later glyph's ink reaches into the crop; such prefixes are
+    rasterized on the full-word canvas (cached like any sprite) and
+    cropped to the same width.
+
+    Args:
+        word: Word to reveal letter by letter.
+        font_size: Font size in pixels (legacy reveal uses 128).
+        color: Text RGB color.
+        extra_bottom: Extra space below the glyphs reserved for underlines.
+
+    Returns:
+        List of read-only (H, w_k, 4) RGBA views, one per prefix length
+        k = 1..len(word); all share the full-word height and the last is
+        the full raster.
+
+    Example:
+        >>> prefixes = render_reveal_prefixes("AV")
+        >>> prefixes[-1].shape == render_reveal_sprite("AV")[0].shape
+        True
+    """
+    from spellvid.infrastructure.rendering.pillow_adapter import (
+        measure_prefix_overlaps,
+        render_text_sprite,
+    )
+
+    sprite, edges = render_reveal_sprite(
+        word, font_size=font_size, color=color, extra_bottom=extra_bottom,
+    )
+    overlaps = measure_prefix_overlaps(word, font_size=font_size)
+    fixed = (int(sprite.shape[1]), int(sprite.shape[0]))
+    prefixes = []
+    for k, edge in enumerate(edges, start=1):
+        source = sprite
+        if overlaps[k - 1]:
+            source = render_text_sprite(
+                word[:k], font_size=font_size, color=color,
+                extra_bottom=extra_bottom, fixed_size=fixed,
+            )
+        prefixes.append(source[:, :edge])
+    return prefixes
+
+
+def make_reveal_frame_function(
+    prefixes: List[Any],
+    per_letter: float = 1.0,
+) -> Any:
+    """Build a ``make_frame(t)`` callable exposing the visible prefix.
+
+    Letter ``k`` (1-based) appears at ``(k - 1) * per_letter`` seconds of
+    layer-local time and stays visible, so the word grows cumulatively
+    and remains complete after the last letter. Each frame returns the
+    precomputed view ``prefixes[k - 1]``, replacing the ``len(word)``
+    overlapping substring clips.
+
+    Args:
+        prefixes: Prefix frames from :func:`render_reveal_prefixes`.
+        per_letter: Seconds between consecutive letters.
+
+    Returns:
+        Function mapping layer-local time (seconds) to an RGBA view, or
+        None before the first letter.
+
+    Example:
+        >>> prefixes = render_reveal_prefixes("Ice")
+        >>> make_frame = make_reveal_frame_function(prefixes)
+        >>> make_frame(1.5) is prefixes[1]
+        True
+    """
+    views = list(prefixes)
+    count = len(views)
+    per_letter = float(per_letter) if per_letter > 0 else 1.0
+
+    def make_frame(t: float) -> Any:
+        if count == 0 or t < 0:
+            return None
+        # Tolerate float error in (t - start) at letter boundaries.
+        visible = min(count, int(t / per_letter + 1e-9) + 1)
+        return views[visible - 1]
+
+    return make_frame
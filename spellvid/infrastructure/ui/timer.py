@@ -0,0 +1,208 @@
+"""Countdown timer rendering infrastructure.
+
+The legacy renderer built ``countdown_sec + 1`` independent text clips
+from ``timer_plan`` (one Pillow render per second). This module renders
+the glyphs ``0-9`` and ``:`` once per font and size into a coverage
+sprite sheet, and a single ``make_frame(t)`` callable composes the
+"MM:SS" text by indexing that sheet - a constant number of Pillow calls
+and one layer regardless of the countdown length.
+
+Technical Details:
+- Glyph cells store 8-bit coverage; overlapping glyph edges merge with
+  ``np.maximum``
+- Coverage maps to RGB through a 256-entry lookup table, so the text
+  color and background cost nothing per frame
+- The RGB buffer is only recomposed when the displayed text changes
+  (once per second)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Glyphs needed for "MM:SS"
+TIMER_GLYPHS = "0123456789:"
+
+# Extra bottom space of the legacy black-background timer image
+TIMER_BOTTOM_MARGIN = 32
+
+# (font identity, font size, glyphs) -> GlyphSheet
+_glyph_sheet_cache: Dict[Tuple[Any, ...], "GlyphSheet"] = {}
+
+
+def format_timer_text(seconds_left: int) -> str:
+    """Format remaining seconds as the legacy "MM:SS" timer text.
+
+    Example:
+        >>> format_timer_text(75)
+        '01:15'
+    """
+    seconds_left = max(0, int(seconds_left))
+    return f"{seconds_left // 60:02d}:{seconds_left % 60:02d}"
+
+
+@dataclass(frozen=True)
+class GlyphSheet:
+    """Pre-rendered glyph coverage sheet for one font and size.
+
+    Attributes:
+        sheet: Read-only (height, total_width) uint8 coverage strip.
+        glyphs: Characters in the sheet, in strip order.
+        spans: Per glyph (sheet_x, width, bearing_x, advance); the cell
+            drawn at pen position ``x`` covers ``x + bearing_x``.
+        pad_x: Left/right padding of the composed text image.
+        pad_y: Top padding; also the baseline origin row of every cell.
+    """
+
+    sheet: np.ndarray
+    glyphs: str
+    spans: Tuple[Tuple[int, int, int, float], ...]
+    pad_x: int
+    pad_y: int
+
+    @property
+    def height(self) -> int:
+        """Height of every glyph cell (and of the composed image)."""
+        return int(self.sheet.shape[0])
+
+    def text_width(self, text: str) -> int:
+        """Width of the composed image for ``text`` (padding included)."""
+        return self.pad_x * 2 + int(np.ceil(sum(
+            self.spans[self.glyphs.index(ch)][3] for ch in text
+        )))
+
+    def max_width(self, length: int) -> int:
+        """Width that fits any digits/colon string of ``length`` chars."""
+        widest = max(span[3] for span in self.spans)
+        return self.pad_x * 2 + int(np.ceil(widest * length))
+
+    def compose(self, text: str, coverage: np.ndarray) -> None:
+        """Write the coverage of ``text`` into ``coverage`` in place.
+
+        Args:
+            text: Characters from :attr:`glyphs`.
+            coverage: (height, width) uint8 buffer; it is cleared first
+                and glyphs past its right edge are clipped.
+        """
+        coverage.fill(0)
+        width = coverage.shape[1]
+        pen = float(self.pad_x)
+        for ch in text:
+            sheet_x, cell_w, bearing, advance = self.spans[
+                self.glyphs.index(ch)]
+            x0 = int(round(pen)) + bearing
+            pen += advance
+            lo, hi = max(0, x0), min(width, x0 + cell_w)
+            if hi <= lo:
+                continue
+            src = self.sheet[:, sheet_x + lo - x0:sheet_x + hi - x0]
+            np.maximum(coverage[:, lo:hi], src, out=coverage[:, lo:hi])
+
+
+def _rasterize_glyph_sheet(font: Any, font_size: int,
+                           glyphs: str) -> GlyphSheet:
+    pad_x = max(12, font_size // 6)
+    pad_y = max(8, font_size // 6)
+    boxes = [font.getbbox(ch) for ch in glyphs]
+    text_h = max(box[3] for box in boxes) - min(box[1] for box in boxes)
+    height = int(text_h + pad_y * 2 + TIMER_BOTTOM_MARGIN)
+
+    cells = []
+    spans = []
+    sheet_x = 0
+    for ch, (left, _, right, _) in zip(glyphs, boxes):
+        cell_w = max(1, int(np.ceil(right)) - int(np.floor(left)))
+        bearing = int(np.floor(left))
+        cell = Image.new("L", (cell_w, height), 0)
+        ImageDraw.Draw(cell).text((-bearing, pad_y), ch, font=font, fill=255)
+        cells.append(np.array(cell))
+        spans.append((sheet_x, cell_w, bearing, float(font.getlength(ch))))
+        sheet_x += cell_w
+
+    sheet = np.ascontiguousarray(np.hstack(cells))
+    sheet.setflags(write=False)
+    return GlyphSheet(sheet=sheet, glyphs=glyphs, spans=tuple(spans),
+                      pad_x=pad_x, pad_y=pad_y)
+
+
+def get_glyph_sheet(font_size: int = 64,
+                    glyphs: str = TIMER_GLYPHS) -> GlyphSheet:
+    """Return the glyph sheet for the timer font at ``font_size``.
+
+    The sheet is rendered on first use and shared for the rest of the
+    process (one entry per font file, size and glyph set).
+
+    Example:
+        >>> get_glyph_sheet(64) is get_glyph_sheet(64)
+        True
+    """
+    from spellvid.infrastructure.rendering.pillow_adapter import (
+        _find_system_font,
+        _font_identity,
+        default_font,
+    )
+
+    try:
+        font = _find_system_font(False, font_size)
+    except Exception:
+        font = default_font()
+    key = (_font_identity(font), int(font_size), glyphs)
+    sheet = _glyph_sheet_cache.get(key)
+    if sheet is None:
+        sheet = _rasterize_glyph_sheet(font, int(font_size), glyphs)
+        _glyph_sheet_cache[key] = sheet
+    return sheet
+
+
+def make_timer_frame_function(
+    countdown: int,
+    *,
+    font_size: int = 64,
+    color: Tuple[int, int, int] = (255, 255, 255),
+    bg: Tuple[int, int, int] = (0, 0, 0),
+) -> Tuple[Any, Tuple[int, int]]:
+    """Build a ``make_frame(t)`` callable drawing the countdown timer.
+
+    At time ``t`` the timer shows ``countdown - floor(t)`` seconds (never
+    below 0), matching the per-second entries of the legacy timer plan.
+
+    The returned RGB buffer is reused between calls; callers must consume
+    it before requesting the next frame.
+
+    Args:
+        countdown: Countdown duration in whole seconds.
+        font_size: Font size in pixels.
+        color: Text RGB color.
+        bg: Background RGB color.
+
+    Returns:
+        Tuple of (make_frame, (width, height)); the size fits the widest
+        text of this countdown.
+
+    Example:
+        >>> make_frame, size = make_timer_frame_function(10)
+        >>> make_frame(0.0).shape == (size[1], size[0], 3)
+        True
+    """
+    sheet = get_glyph_sheet(font_size)
+    countdown = max(0, int(countdown))
+    width = sheet.max_width(len(format_timer_text(countdown)))
+    coverage = np.zeros((sheet.height, width), dtype=np.uint8)
+    ramp = np.arange(256, dtype=np.float32)[:, None] / 255.0
+    fg = np.asarray(color, dtype=np.float32)
+    back = np.asarray(bg, dtype=np.float32)
+    lut = np.round(back + (fg - back) * ramp).astype(np.uint8)
+    buffer = np.empty((sheet.height, width, 3), dtype=np.uint8)
+    shown = [None]
+
+    def make_frame(t: float) -> Any:
+        text = format_timer_text(countdown - int(np.floor(t + 1e-9)))
+        if text != shown[0]:
+            sheet.compose(text, coverage)
+            np.take(lut, coverage, axis=0, out=buffer)
+            shown[0] = text
+        return buffer
+
+    return make_frame, (width, sheet.height)
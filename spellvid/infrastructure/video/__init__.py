@@ -1,9 +1,39 @@
 """視頻合成引擎介面與實作
 
 - interface.py: IVideoComposer Protocol 定義
-- moviepy_adapter.py: MoviePy 適配器實作(待實作)
+- moviepy_adapter.py: MoviePy 適配器實作
+- frame_compositor.py: NumPy 單趟影格合成器(預設渲染路徑)
+- ffmpeg_pipe.py: rawvideo stdin 管線編碼器(取代 write_videofile)
+- ffmpeg_reader.py: 背景影片解碼器(ffmpeg 端 cover/fit 縮放裁切)
+- ffmpeg_concat.py: 批次串接(僅重新編碼淡入區段)
+- intermediates.py: 片頭/片尾中介檔快取與串流複製拼接
 """
 
-from .interface import IVideoComposer
+import importlib
 
-__all__ = ["IVideoComposer"]
+# 匯出名稱 → 子模組;首次存取時才匯入 (PEP 562),
+# 載入子模組(如 ffmpeg_pipe)不會連帶載入 MoviePy
+_EXPORTS = {
+    "IVideoComposer": "interface",
+    "FrameLayer": "frame_compositor",
+    "FrameTimeline": "frame_compositor",
+    "NumpyFrameCompositor": "frame_compositor",
+}
+
+__all__ = [
+    "IVideoComposer",
+    "FrameLayer",
+    "FrameTimeline",
+    "NumpyFrameCompositor",
+]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,333 @@
+"""FFmpeg 串流複製串接
+
+批次輸出的各支視頻已經編碼完成,串接時只需要重新編碼每支視頻開頭的
+淡入區段;其餘內容以 concat demuxer 搭配 `-c copy` 直接拼接。
+
+流程:
+1. 以 `-skip_frame nokey` 掃描每支輸入的關鍵影格、時長與串流資訊
+2. 需要淡入的視頻(D2:第一支除外)切成兩段:
+   - [0, K) 重新編碼並套用 fade 濾鏡,K 為淡入結束後的第一個關鍵影格
+   - [K, end) 直接複製封包
+3. 所有視頻段封裝為獨立 MP4,再以 concat demuxer 串流複製為單一 MP4;
+   concat demuxer 沿用第一段的 SPS/PPS,因此淡入區段以與渲染輸出相同的
+   x264 設定編碼,並在串接前比對參數集,不一致時回報錯誤
+4. 音訊於同一次最終呼叫中以濾鏡串接並編碼(D4:由 apply_audio_fadein
+   決定是否淡入);音訊編碼成本極低,且可避免 AAC 邊界的取樣誤差
+
+D1(每支視頻渲染時已淡出)不需在此處理。
+
+Example:
+    >>> result = concat_with_fadein(
+    ...     ["out/a.mp4", "out/b.mp4"], "out/batch.mp4", fade_in_duration=1.0
+    ... )
+    >>> result["clips_count"]
+    2
+"""
+
+import os
+import re
+import subprocess
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from spellvid.infrastructure.video.ffmpeg_pipe import resolve_ffmpeg_exe
+
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_VIDEO_RE = re.compile(
+    r"Stream #0:\d+.*?: Video: (\w+).*?, (\d{2,5})x(\d{2,5})"
+)
+_FPS_RE = re.compile(r"(\d+(?:\.\d+)?) fps")
+_AUDIO_RE = re.compile(r"Stream #0:\d+.*?: Audio:")
+_KEY_PTS_RE = re.compile(r"pts_time:\s*(-?\d+(?:\.\d+)?)")
+
+# 容許的時間誤差(秒),吸收 pts_time 的進位
+_TIME_EPSILON = 1e-3
+
+
+@dataclass
+class ConcatSource:
+    """串接輸入的串流資訊
+
+    Attributes:
+        path: 檔案路徑
+        duration: 容器時長(秒)
+        codec: 視頻編碼(例如 h264)
+        width: 視頻寬度
+        height: 視頻高度
+        fps: 影格率
+        has_audio: 是否有音訊軌
+        keyframes: 關鍵影格時間(秒,遞增)
+    """
+    path: str
+    duration: float
+    codec: str
+    width: int
+    height: int
+    fps: float
+    has_audio: bool
+    keyframes: List[float] = field(default_factory=list)
+
+
+@dataclass
+class ConcatSegment:
+    """串接計畫中的單一視頻段
+
+    Attributes:
+        source: 來源視頻
+        start: 段落起點(秒)
+        end: 段落終點(秒),None 表示到結尾
+        fade_in: 淡入秒數,0 表示直接複製封包
+    """
+    source: ConcatSource
+    start: float
+    end: Optional[float]
+    fade_in: float = 0.0
+
+    @property
+    def reencode(self) -> bool:
+        return self.fade_in > 0
+
+
+def scan_source(path: str, ffmpeg_exe: Optional[str] = None) -> ConcatSource:
+    """以單次 ffmpeg 呼叫讀取時長、串流資訊與關鍵影格
+
+    只解碼關鍵影格(-skip_frame nokey),成本遠低於完整解碼。
+
+    Raises:
+        RuntimeError: ffmpeg 失敗或無法解析視頻串流
+    """
+    cmd = [
+        ffmpeg_exe or resolve_ffmpeg_exe(), "-hide_banner", "-nostdin",
+        "-skip_frame", "nokey", "-i", path,
+        "-map", "0:v:0", "-vf", "showinfo", "-f", "null", "-",
+    ]
+    proc = subprocess.run(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    text = proc.stderr.decode("utf-8", "replace")
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg scan failed for {path}: {text[-500:]}")
+
+    # 只有 "Stream mapping" 之前是輸入檔的資訊
+    header, _, body = text.partition("Stream mapping:")
+    duration_match = _DURATION_RE.search(header)
+    video_match = _VIDEO_RE.search(header)
+    if not duration_match or not video_match:
+        raise RuntimeError(f"Cannot parse stream info from {path}")
+    hours, minutes, seconds = duration_match.groups()
+    video_line = header[video_match.start():].splitlines()[0]
+    fps_match = _FPS_RE.search(video_line)
+
+    return ConcatSource(
+        path=path,
+        duration=int(hours) * 3600 + int(minutes) * 60 + float(seconds),
+        codec=video_match.group(1),
+        width=int(video_match.group(2)),
+        height=int(video_match.group(3)),
+        fps=float(fps_match.group(1)) if fps_match else 0.0,
+        has_audio=bool(_AUDIO_RE.search(header)),
+        keyframes=[float(v) for v in _KEY_PTS_RE.findall(body)],
+    )
+
+
+def plan_concat_segments(
+    sources: Sequence[ConcatSource],
+    fade_in_duration: float,
+) -> List[ConcatSegment]:
+    """規劃哪些區段需要重新編碼
+
+    與 apply_fadein_effect 的行為一致:第一支視頻不淡入(D2),
+    時長短於淡入秒數的視頻也維持原樣。
+
+    Args:
+        sources: 依串接順序排列的輸入
+        fade_in_duration: 淡入秒數
+
+    Returns:
+        依序排列的 ConcatSegment 列表
+    """
+    segments: List[ConcatSegment] = []
+    for idx, src in enumerate(sources):
+        if idx == 0 or fade_in_duration <= 0 or (
+            src.duration < fade_in_duration
+        ):
+            segments.append(ConcatSegment(src, 0.0, None))
+            continue
+        cut = next(
+            (k for k in src.keyframes
+             if k >= fade_in_duration - _TIME_EPSILON),
+            None,
+        )
+        if cut is None or cut >= src.duration - _TIME_EPSILON:
+            segments.append(ConcatSegment(src, 0.0, None, fade_in_duration))
+            continue
+        segments.append(ConcatSegment(src, 0.0, cut, fade_in_duration))
+        segments.append(ConcatSegment(src, cut, None))
+    return segments
+
+
+def _run(cmd: List[str], what: str) -> None:
+    proc = subprocess.run(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    if proc.returncode != 0:
+        detail = proc.stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(f"ffmpeg {what} failed: {detail[-1000:]}")
+
+
+def _segment_command(ffmpeg_exe: str, seg: ConcatSegment,
+                     output_path: str) -> List[str]:
+    cmd = [ffmpeg_exe, "-y", "-loglevel", "error", "-nostdin"]
+    if seg.reencode:
+        cmd += ["-i", seg.source.path, "-map", "0:v:0", "-an"]
+        if seg.end is not None:
+            cmd += ["-t", f"{seg.end:.6f}"]
+        cmd += [
+            "-vf", f"fade=t=in:st=0:d={seg.fade_in}",
+            "-c:v", "libx264", "-preset", "medium", "-pix_fmt", "yuv420p",
+        ]
+    else:
+        if seg.start > 0:
+            # 輸入端 seek 到關鍵影格(加半格避免落到前一個關鍵影格)
+            fps = seg.source.fps or 30.0
+            cmd += ["-ss", f"{seg.start + 0.5 / fps:.6f}"]
+        cmd += ["-i", seg.source.path, "-map", "0:v:0", "-an", "-c", "copy"]
+    cmd += ["-f", "mp4", output_path]
+    return cmd
+
+
+def h264_parameter_sets(ffmpeg_exe: str, path: str) -> bytes:
+    """取出視頻的 SPS/PPS NAL 單元(Annex B 位元組)"""
+    cmd = [
+        ffmpeg_exe, "-loglevel", "error", "-nostdin", "-i", path,
+        "-map", "0:v:0", "-c", "copy", "-frames:v", "1",
+        "-bsf:v", "h264_mp4toannexb", "-f", "h264", "pipe:1",
+    ]
+    proc = subprocess.run(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    nals = re.split(b"\x00\x00\x01", proc.stdout)
+    return b"|".join(
+        nal.rstrip(b"\x00") for nal in nals
+        if nal and (nal[0] & 0x1F) in (7, 8)
+    )
+
+
+def _audio_filter(
+    sources: Sequence[ConcatSource],
+    fade_in_duration: float,
+    apply_audio_fadein: bool,
+) -> str:
+    """組出音訊串接濾鏡(無音訊的視頻補靜音)"""
+    parts = []
+    labels = []
+    for idx, src in enumerate(sources):
+        label = f"a{idx}"
+        if src.has_audio:
+            chain = (
+                f"[{idx + 1}:a:0]aresample=44100,"
+                "aformat=sample_fmts=fltp:channel_layouts=stereo,"
+                f"apad,atrim=0:{src.duration:.6f}"
+            )
+            if (apply_audio_fadein and idx > 0
+                    and src.duration >= fade_in_duration > 0):
+                chain += f",afade=t=in:st=0:d={fade_in_duration}"
+        else:
+            chain = (
+                "anullsrc=r=44100:cl=stereo,"
+                f"atrim=0:{src.duration:.6f}"
+            )
+        parts.append(f"{chain}[{label}]")
+        labels.append(f"[{label}]")
+    parts.append(
+        f"{''.join(labels)}concat=n={len(sources)}:v=0:a=1[aout]"
+    )
+    return ";".join(parts)
+
+
+def concat_with_fadein(
+    video_paths: Sequence[str],
+    output_path: str,
+    fade_in_duration: float = 1.0,
+    apply_audio_fadein: bool = False,
+    ffmpeg_exe: Optional[str] = None,
+) -> Dict[str, Any]:
+    """只重新編碼淡入區段的快速串接
+
+    Args:
+        video_paths: 依序串接的視頻(需為相同尺寸的 H.264)
+        output_path: 輸出 MP4 路徑
+        fade_in_duration: 第二支起每支視頻的淡入秒數
+        apply_audio_fadein: 是否同時對音訊淡入(D4)
+        ffmpeg_exe: 選用的 ffmpeg 執行檔
+
+    Returns:
+        {"clips_count", "total_duration", "reencoded_seconds"}
+
+    Raises:
+        RuntimeError: 輸入不相容或 ffmpeg 失敗(呼叫端可改走完整重編碼)
+    """
+    if not video_paths:
+        raise RuntimeError("No video paths provided for concatenation")
+    ffmpeg_exe = ffmpeg_exe or resolve_ffmpeg_exe()
+    sources = [scan_source(p, ffmpeg_exe) for p in video_paths]
+
+    first = sources[0]
+    for src in sources:
+        if src.codec != "h264" or (src.width, src.height) != (
+            first.width, first.height
+        ):
+            raise RuntimeError(
+                f"Stream copy needs matching H.264 inputs: {src.path}"
+            )
+
+    segments = plan_concat_segments(sources, fade_in_duration)
+    out_dir = os.path.dirname(output_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="spellvid_concat_") as tmp:
+        reference = h264_parameter_sets(ffmpeg_exe, first.path)
+        list_lines = []
+        for idx, seg in enumerate(segments):
+            seg_path = os.path.join(tmp, f"seg{idx:04d}.mp4")
+            _run(_segment_command(ffmpeg_exe, seg, seg_path), "segment")
+            if h264_parameter_sets(ffmpeg_exe, seg_path) != reference:
+                raise RuntimeError(
+                    f"Stream copy needs matching H.264 parameter sets: "
+                    f"{seg.source.path}"
+                )
+            escaped = seg_path.replace("\\", "/").replace("'", r"'\''")
+            list_lines.append(f"file '{escaped}'")
+        list_path = os.path.join(tmp, "segments.txt")
+        with open(list_path, "w", encoding="utf-8") as fh:
+            fh.write("\n".join(list_lines) + "\n")
+
+        cmd = [
+            ffmpeg_exe, "-y", "-loglevel", "error", "-nostdin",
+            "-f", "concat", "-safe", "0", "-i", list_path,
+        ]
+        with_audio = any(src.has_audio for src in sources)
+        if with_audio:
+            for src in sources:
+                cmd += ["-i", src.path]
+            cmd += [
+                "-filter_complex",
+                _audio_filter(sources, fade_in_duration, apply_audio_fadein),
+                "-map", "0:v:0", "-map", "[aout]", "-c:a", "aac",
+            ]
+        else:
+            cmd += ["-map", "0:v:0"]
+        cmd += ["-c:v", "copy", "-movflags", "+faststart", output_path]
+        _run(cmd, "concat")
+
+    reencoded = sum(
+        (seg.end if seg.end is not None else seg.source.duration) - seg.start
+        for seg in segments if seg.reencode
+    )
+    return {
+        "clips_count": len(sources),
+        "total_duration": float(sum(src.duration for src in sources)),
+        "reencoded_seconds": float(reencoded),
+    }
@@ -0,0 +1,404 @@
+"""FFmpeg rawvideo 管線編碼器
+
+此模組以 `ffmpeg -f rawvideo -pix_fmt rgb24 -i pipe:0` 直接接收合成器
+產生的影格,取代 MoviePy write_videofile 的逐影格 Python 包裝與複製。
+
+設計原則:
+- 沿用 FFmpegWrapper.ensure_ffmpeg_available 解析出的 ffmpeg 執行檔
+- 有界雙緩衝:主執行緒合成/複製下一張影格時,背景執行緒同時把上一張
+  寫入 ffmpeg stdin(寫入 pipe 時會釋放 GIL),ffmpeg 於自己的行程編碼
+- 音訊與視頻於同一次 ffmpeg 呼叫中 mux(AudioBed 或 AudioClip 先輸出為
+  暫存 WAV)
+- 有使用中的 RenderProfiler 時,回報影格數與合成/編碼兩個子階段
+
+Example:
+    >>> from spellvid.infrastructure.video.ffmpeg_pipe import encode_frames
+    >>> timeline = NumpyFrameCompositor().compose_clips([bg])
+    >>> encode_frames(timeline.make_frame, timeline.duration,
+    ...               "out/test.mp4", size=timeline.size, fps=24)
+    120
+"""
+
+import os
+import queue
+import subprocess
+import tempfile
+import threading
+import time
+import wave
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from spellvid.shared.profiling import active_profiler, child_cpu_time
+
+# 已解析的 ffmpeg 執行檔路徑(行程內只解析一次)
+_ffmpeg_exe_cache: Optional[str] = None
+
+# 以 audio_path 傳入時產生靜音音軌(讓主段落能與中介檔串流複製串接)
+SILENT_AUDIO = "anullsrc"
+
+# 輸出音訊格式,與片頭/片尾中介檔一致
+AUDIO_SAMPLE_RATE = 44100
+AUDIO_CHANNELS = 2
+
+
+def resolve_ffmpeg_exe() -> str:
+    """取得 FFmpegWrapper 解析出的 ffmpeg 執行檔
+
+    Returns:
+        ffmpeg 執行檔路徑
+
+    Raises:
+        RuntimeError: 找不到 ffmpeg
+    """
+    global _ffmpeg_exe_cache
+    if _ffmpeg_exe_cache:
+        return _ffmpeg_exe_cache
+
+    from spellvid.infrastructure.media.ffmpeg_wrapper import FFmpegWrapper
+
+    wrapper = FFmpegWrapper()
+    wrapper.ensure_ffmpeg_available()
+    exe = wrapper.ffmpeg_exe
+    if not exe:
+        raise RuntimeError("ffmpeg not available")
+    _ffmpeg_exe_cache = exe
+    return exe
+
+
+def build_encode_command(
+    ffmpeg_exe: str,
+    output_path: str,
+    size: Tuple[int, int],
+    fps: float,
+    *,
+    codec: str = "libx264",
+    audio_path: Optional[str] = None,
+    audio_codec: str = "aac",
+    duration: Optional[float] = None,
+    preset: str = "medium",
+    pix_fmt: str = "yuv420p",
+    threads: Optional[int] = None,
+    keyframe_times: Sequence[float] = (),
+) -> List[str]:
+    """組出 rawvideo stdin 編碼的 ffmpeg 命令列
+
+    Args:
+        ffmpeg_exe: ffmpeg 執行檔
+        output_path: 輸出檔案
+        size: (width, height) 影格尺寸
+        fps: 影格率
+        codec: 視頻編碼器
+        audio_path: 選用的音訊檔,於同一次呼叫 mux;
+            SILENT_AUDIO 表示輸出靜音音軌
+        audio_codec: 音訊編碼器
+        duration: 輸出長度上限(秒),避免較長的音訊拉長輸出
+        preset: x264 preset
+        pix_fmt: 輸出像素格式
+        threads: 編碼執行緒數,None 由 ffmpeg 自行決定
+        keyframe_times: 強制插入關鍵影格的時間點(秒),
+            讓串接時可在這些位置直接複製封包
+
+    Returns:
+        subprocess 用的參數列表
+    """
+    width, height = int(size[0]), int(size[1])
+    cmd = [
+        ffmpeg_exe, "-y", "-loglevel", "error", "-nostdin",
+        "-f", "rawvideo", "-pix_fmt", "rgb24",
+        "-s", f"{width}x{height}", "-r", f"{fps}",
+        "-i", "pipe:0",
+    ]
+    if audio_path == SILENT_AUDIO:
+        cmd += ["-f", "lavfi", "-i",
+                f"anullsrc=r={AUDIO_SAMPLE_RATE}:cl=stereo"]
+    elif audio_path:
+        cmd += ["-i", audio_path]
+    cmd += ["-map", "0:v:0"]
+    if audio_path:
+        cmd += ["-map", "1:a:0", "-c:a", audio_codec,
+                "-ar", str(AUDIO_SAMPLE_RATE), "-ac", str(AUDIO_CHANNELS)]
+    cmd += ["-c:v", codec]
+    if codec in ("libx264", "libx265"):
+        cmd += ["-preset", preset]
+    cmd += ["-pix_fmt", pix_fmt]
+    if keyframe_times:
+        cmd += ["-force_key_frames",
+                ",".join(f"{float(t):g}" for t in keyframe_times)]
+    if threads:
+        cmd += ["-threads", str(int(threads))]
+    if duration is not None:
+        cmd += ["-t", f"{float(duration):.6f}"]
+    cmd.append(output_path)
+    return cmd
+
+
+class FFmpegPipeWriter:
+    """以有界雙緩衝將 RGB 影格串流至 ffmpeg stdin
+
+    write_frame 會把影格複製進預先配置的空閒緩衝區後交給寫入執行緒,
+    因此呼叫端可以立刻覆寫自己的畫布(FrameTimeline 每影格重用同一個
+    緩衝區)。所有緩衝區都在排隊時,write_frame 會阻塞直到 ffmpeg 消化。
+
+    Example:
+        >>> with FFmpegPipeWriter("out/a.mp4", (1920, 1080), 30) as writer:
+        ...     for i in range(90):
+        ...         writer.write_frame(timeline.make_frame(i / 30))
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        size: Tuple[int, int],
+        fps: float,
+        *,
+        codec: str = "libx264",
+        audio_path: Optional[str] = None,
+        audio_codec: str = "aac",
+        duration: Optional[float] = None,
+        preset: str = "medium",
+        threads: Optional[int] = None,
+        buffers: int = 2,
+        ffmpeg_exe: Optional[str] = None,
+        keyframe_times: Sequence[float] = (),
+    ):
+        if buffers < 1:
+            raise ValueError(f"buffers must be >= 1, got {buffers}")
+        self.output_path = output_path
+        self.size = (int(size[0]), int(size[1]))
+        self.frames_written = 0
+        width, height = self.size
+        self._cmd = build_encode_command(
+            ffmpeg_exe or resolve_ffmpeg_exe(), output_path, self.size, fps,
+            codec=codec, audio_path=audio_path, audio_codec=audio_codec,
+            duration=duration, preset=preset, threads=threads,
+            keyframe_times=keyframe_times,
+        )
+        self._free: "queue.Queue[np.ndarray]" = queue.Queue()
+        for _ in range(buffers):
+            self._free.put(np.empty((height, width, 3), dtype=np.uint8))
+        self._full: "queue.Queue[Optional[np.ndarray]]" = queue.Queue()
+        self._error: Optional[Exception] = None
+        self._stderr = tempfile.TemporaryFile()
+        self._proc = subprocess.Popen(
+            self._cmd, stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL, stderr=self._stderr,
+        )
+        self._thread = threading.Thread(
+            target=self._writer_loop, name="ffmpeg-pipe-writer", daemon=True
+        )
+        self._thread.start()
+        self._closed = False
+
+    def __enter__(self) -> "FFmpegPipeWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _writer_loop(self) -> None:
+        stdin = self._proc.stdin
+        while True:
+            slot = self._full.get()
+            if slot is None:
+                break
+            if self._error is None:
+                try:
+                    stdin.write(memoryview(slot).cast("B"))
+                except (OSError, ValueError) as e:  # BrokenPipe 等
+                    self._error = e
+            # 發生錯誤後仍持續歸還緩衝區,避免主執行緒阻塞
+            self._free.put(slot)
+        try:
+            stdin.close()
+        except OSError:
+            pass
+
+    def write_frame(self, frame: np.ndarray) -> None:
+        """排入一張 (H, W, 3|4) 影格
+
+        Raises:
+            RuntimeError: ffmpeg 已中止或影格尺寸不符
+        """
+        if self._error is not None:
+            raise RuntimeError(self._failure_message())
+        frame = np.asarray(frame)
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            frame = frame[..., :3]
+        slot = self._free.get()
+        if frame.shape != slot.shape:
+            self._free.put(slot)
+            raise RuntimeError(
+                f"影格尺寸 {frame.shape} 與編碼器 {slot.shape} 不符"
+            )
+        np.copyto(slot, frame, casting="unsafe")
+        self._full.put(slot)
+        self.frames_written += 1
+
+    def close(self) -> None:
+        """送出結束訊號並等待 ffmpeg 完成
+
+        Raises:
+            RuntimeError: ffmpeg 回傳非零結束碼
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._full.put(None)
+        self._thread.join()
+        returncode = self._proc.wait()
+        message = self._failure_message() if returncode != 0 else None
+        self._stderr.close()
+        if message is not None:
+            raise RuntimeError(message)
+
+    def abort(self) -> None:
+        """中止編碼(呼叫端發生例外時使用)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._full.put(None)
+        self._thread.join()
+        try:
+            self._proc.kill()
+        except OSError:
+            pass
+        self._proc.wait()
+        self._stderr.close()
+
+    def _failure_message(self) -> str:
+        try:
+            self._stderr.seek(0)
+            detail = self._stderr.read().decode("utf-8", "replace").strip()
+        except (OSError, ValueError):
+            detail = ""
+        if not detail and self._error is not None:
+            detail = str(self._error)
+        return f"ffmpeg encode failed for {self.output_path}: {detail[-2000:]}"
+
+
+def frame_count(duration: float, fps: float) -> int:
+    """與 MoviePy iter_frames 相同的影格數:int(duration * fps)"""
+    return max(0, int(float(duration) * float(fps)))
+
+
+def write_audio_wav(audio: Any, path: str, duration: Optional[float] = None,
+                    fps: int = 44100) -> str:
+    """將 MoviePy AudioClip 輸出為 16-bit PCM WAV
+
+    Args:
+        audio: AudioClip(具 to_soundarray)
+        path: 輸出 WAV 路徑
+        duration: 選用的長度上限(秒)
+        fps: 取樣率
+
+    Returns:
+        path
+    """
+    clip = audio
+    if duration is not None and getattr(audio, "duration", None):
+        if float(audio.duration) > float(duration):
+            clip = audio.with_duration(float(duration))
+    samples = clip.to_soundarray(fps=fps, quantize=True, nbytes=2)
+    samples = np.asarray(samples)
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    pcm = np.ascontiguousarray(samples.astype("<i2", copy=False))
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(int(pcm.shape[1]))
+        wav.setsampwidth(2)
+        wav.setframerate(int(fps))
+        wav.writeframes(pcm.tobytes())
+    return path
+
+
+def encode_frames(
+    frame_function: Callable[[float], np.ndarray],
+    duration: float,
+    output_path: str,
+    *,
+    size: Sequence[int],
+    fps: float = 30,
+    codec: str = "libx264",
+    audio: Any = None,
+    audio_codec: str = "aac",
+    preset: str = "medium",
+    threads: Optional[int] = None,
+    buffers: int = 2,
+    keyframe_times: Sequence[float] = (),
+) -> int:
+    """取樣 frame_function 並經 rawvideo pipe 編碼為視頻檔案
+
+    Args:
+        frame_function: t(秒) -> (H, W, 3|4) 影格
+        duration: 總長(秒)
+        output_path: 輸出檔案
+        size: (width, height)
+        fps: 影格率
+        codec: 視頻編碼器
+        audio: None、音訊檔路徑、SILENT_AUDIO、AudioBed(具 write_wav)
+            或 MoviePy AudioClip
+        audio_codec: 音訊編碼器
+        preset: x264 preset
+        threads: 編碼執行緒數
+        buffers: 排隊中的影格緩衝區數(預設雙緩衝)
+        keyframe_times: 強制插入關鍵影格的時間點(秒)
+
+    Returns:
+        寫入的影格數
+    """
+    out_dir = os.path.dirname(output_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    temp_audio = None
+    audio_path = None
+    if isinstance(audio, (str, os.PathLike)):
+        audio_path = os.fspath(audio)
+    elif audio is not None:
+        fd, temp_audio = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        if hasattr(audio, "write_wav"):
+            audio_path = audio.write_wav(temp_audio)
+        else:
+            audio_path = write_audio_wav(audio, temp_audio,
+                                         duration=duration)
+
+    profiler = active_profiler()
+    composite = [0.0, 0.0]  # wall, cpu
+    started = (time.perf_counter(), time.process_time(), child_cpu_time())
+    try:
+        with FFmpegPipeWriter(
+            output_path, (int(size[0]), int(size[1])), fps,
+            codec=codec, audio_path=audio_path, audio_codec=audio_codec,
+            duration=duration if audio_path else None,
+            preset=preset, threads=threads, buffers=buffers,
+            keyframe_times=keyframe_times,
+        ) as writer:
+            for idx in range(frame_count(duration, fps)):
+                wall0, cpu0 = time.perf_counter(), time.process_time()
+                frame = frame_function(idx / float(fps))
+                composite[0] += time.perf_counter() - wall0
+                composite[1] += time.process_time() - cpu0
+                writer.write_frame(frame)
+        if profiler is not None:
+            # 合成 = 取樣 frame_function;編碼 = 其餘時間(等待 ffmpeg
+            # 消化影格與結束),x264 的 CPU 計入子行程時間
+            profiler.frames += writer.frames_written
+            profiler.add_stage("composite", composite[0], composite[1],
+                               parent="compose_export")
+            profiler.add_stage(
+                "encode",
+                time.perf_counter() - started[0] - composite[0],
+                time.process_time() - started[1] - composite[1],
+                child_cpu_sec=child_cpu_time() - started[2],
+                parent="compose_export",
+            )
+        return writer.frames_written
+    finally:
+        if temp_audio and os.path.exists(temp_audio):
+            os.remove(temp_audio)
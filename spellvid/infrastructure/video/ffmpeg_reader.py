@@ -0,0 +1,419 @@
+"""FFmpeg rawvideo 背景解碼器
+
+MoviePy 的 VideoFileClip.resized() 會在 Python/PIL 中把每張解碼後的影格
+重新取樣到 1920x1080。此模組把縮放、裁切與補邊放進 ffmpeg 的解碼指令,
+影格從 stdout 以 rgb24 送出時已經是畫布尺寸:
+
+- cover: scale=W:H:force_original_aspect_ratio=increase,crop=W:H
+  (等比放大填滿畫布,置中裁切超出部分)
+- fit:   scale=W:H:force_original_aspect_ratio=decrease,pad=W:H
+  (等比縮放放入畫布,置中並以背景色補邊)
+
+兩種模式輸出的都是不透明的全畫布影格,合成器只需整張複製。
+
+循環(open_background_source):
+- 比片段短、且一輪影格不超過位元組預算(BACKGROUND_LOOP_BUDGET,
+  可由 SPELLVID_BG_LOOP_BUDGET 覆寫)的影片只解碼一次,存入連續的
+  uint8 環形緩衝區,循環影格直接由記憶體提供
+- 其餘影片以 -stream_loop 循環,-t 截止於目標長度
+
+Example:
+    >>> reader = FFmpegFrameReader("assets/bg.mp4", (1920, 1080), 24,
+    ...                            mode="cover", duration=12.0)
+    >>> reader.read_frame(0.0).shape
+    (1080, 1920, 3)
+"""
+
+import math
+import os
+import subprocess
+import tempfile
+import threading
+import weakref
+from typing import IO, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 支援的背景影片模式
+BACKGROUND_MODES = ("cover", "fit")
+
+# 解碼一次並循環的影片,一輪影格的位元組上限(1080p rgb24 約 42 張/256MB)
+BACKGROUND_LOOP_BUDGET = 256 * 1024 * 1024
+
+
+def build_scale_filter(
+    size: Tuple[int, int],
+    mode: str = "cover",
+    pad_color: Sequence[int] = (0, 0, 0),
+) -> str:
+    """產生縮放到畫布尺寸的 ffmpeg 濾鏡字串
+
+    Args:
+        size: (width, height) 畫布尺寸
+        mode: "cover" 或 "fit"
+        pad_color: fit 模式的補邊顏色 (R, G, B)
+
+    Returns:
+        -vf 濾鏡字串
+
+    Raises:
+        ValueError: 不支援的模式
+
+    Example:
+        >>> build_scale_filter((1920, 1080), "cover")
+        'scale=1920:1080:force_original_aspect_ratio=increase,crop=1920:1080'
+    """
+    width, height = int(size[0]), int(size[1])
+    if mode == "cover":
+        return (f"scale={width}:{height}:force_original_aspect_ratio="
+                f"increase,crop={width}:{height}")
+    if mode == "fit":
+        color = "0x{:02X}{:02X}{:02X}".format(*[int(c) for c in pad_color])
+        # 先轉為 rgb24 再補邊,補邊顏色才會與畫布背景逐位元相同
+        return (f"scale={width}:{height}:force_original_aspect_ratio="
+                f"decrease,format=rgb24,pad={width}:{height}:"
+                f"(ow-iw)/2:(oh-ih)/2:color={color}")
+    raise ValueError(f"video_mode must be one of {BACKGROUND_MODES}: {mode}")
+
+
+def build_decode_command(
+    ffmpeg_exe: str,
+    source_path: str,
+    size: Tuple[int, int],
+    fps: float,
+    *,
+    mode: str = "cover",
+    duration: Optional[float] = None,
+    start: float = 0.0,
+    loop: bool = True,
+    pad_color: Sequence[int] = (0, 0, 0),
+) -> List[str]:
+    """組出輸出畫布尺寸 rgb24 影格到 stdout 的 ffmpeg 指令
+
+    Args:
+        ffmpeg_exe: ffmpeg 執行檔
+        source_path: 來源影片
+        size: (width, height) 畫布尺寸
+        fps: 輸出影格率
+        mode: "cover" 或 "fit"
+        duration: 輸出長度(秒),None 表示到來源結束
+        start: 輸出起點(秒,循環後的時間)
+        loop: 來源較短時是否循環
+        pad_color: fit 模式的補邊顏色
+
+    Returns:
+        指令參數列表
+    """
+    cmd = [ffmpeg_exe, "-nostdin", "-hide_banner", "-loglevel", "error"]
+    if loop:
+        cmd += ["-stream_loop", "-1"]
+    cmd += ["-i", source_path, "-an", "-sn",
+            "-vf", f"fps={fps},{build_scale_filter(size, mode, pad_color)}"]
+    # 輸出端 -ss:循環後的時間軸與 fps 濾鏡對齊,跳轉結果與順序讀取相同
+    if start > 0:
+        cmd += ["-ss", f"{start:.6f}"]
+    if duration is not None:
+        cmd += ["-t", f"{float(duration):.6f}"]
+    cmd += ["-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1"]
+    return cmd
+
+
+def _stop_process(proc: subprocess.Popen,
+                  stderr: Optional[IO[bytes]] = None) -> None:
+    if proc.poll() is None:
+        try:
+            proc.kill()
+        except OSError:
+            pass
+    try:
+        proc.stdout.close()
+    except (OSError, AttributeError):
+        pass
+    proc.wait()
+    if stderr is not None:
+        stderr.close()
+
+
+class FFmpegFrameReader:
+    """順序讀取已縮放至畫布尺寸的背景影格
+
+    read_frame(t) 以 int(t * fps) 對應影格索引;順序前進時只讀取(或略過)
+    所需影格,倒退時才重新啟動 ffmpeg 並從該時間點開始。來源結束後
+    (loop=False)持續回傳最後一張影格。
+
+    回傳的緩衝區在下次呼叫時會被覆寫,呼叫端需要保留時請自行複製。
+
+    Args:
+        source_path: 來源影片
+        size: (width, height) 畫布尺寸
+        fps: 輸出影格率
+        mode: "cover" 或 "fit"
+        duration: 需要的長度(秒)
+        loop: 來源較短時是否循環
+        pad_color: fit 模式的補邊顏色
+        ffmpeg_exe: ffmpeg 執行檔(None = resolve_ffmpeg_exe())
+    """
+
+    def __init__(
+        self,
+        source_path: str,
+        size: Tuple[int, int],
+        fps: float,
+        *,
+        mode: str = "cover",
+        duration: Optional[float] = None,
+        loop: bool = True,
+        pad_color: Sequence[int] = (0, 0, 0),
+        ffmpeg_exe: Optional[str] = None,
+    ):
+        if mode not in BACKGROUND_MODES:
+            raise ValueError(
+                f"video_mode must be one of {BACKGROUND_MODES}: {mode}"
+            )
+        if ffmpeg_exe is None:
+            from spellvid.infrastructure.video.ffmpeg_pipe import (
+                resolve_ffmpeg_exe,
+            )
+            ffmpeg_exe = resolve_ffmpeg_exe()
+        self.source_path = source_path
+        self.size = (int(size[0]), int(size[1]))
+        self.fps = float(fps)
+        self.mode = mode
+        self.duration = duration
+        self.loop = loop
+        self.pad_color = tuple(pad_color)
+        self.ffmpeg_exe = ffmpeg_exe
+        self.restarts = 0
+        width, height = self.size
+        self._frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self._view = memoryview(self._frame).cast("B")
+        self._index = -1      # 緩衝區目前的影格索引
+        self._next = 0        # 管線下一張影格的索引
+        self._eof = False
+        self._proc: Optional[subprocess.Popen] = None
+        self._stderr = None
+        self._finalizer = None
+        self._lock = threading.Lock()
+
+    def _start(self, index: int) -> None:
+        self.close()
+        cmd = build_decode_command(
+            self.ffmpeg_exe, self.source_path, self.size, self.fps,
+            mode=self.mode, start=index / self.fps, loop=self.loop,
+            duration=(None if self.duration is None
+                      else max(0.0, self.duration - index / self.fps)),
+            pad_color=self.pad_color,
+        )
+        self._stderr = tempfile.TemporaryFile()
+        self._proc = subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+            stderr=self._stderr, bufsize=self._frame.nbytes,
+        )
+        self._finalizer = weakref.finalize(
+            self, _stop_process, self._proc, self._stderr)
+        self._next = index
+        self._eof = False
+
+    def _read_next(self) -> bool:
+        """讀取管線下一張影格到緩衝區,資料不足時回傳 False"""
+        stdout = self._proc.stdout
+        got = 0
+        total = len(self._view)
+        while got < total:
+            chunk = stdout.readinto(self._view[got:])
+            if not chunk:
+                return False
+            got += chunk
+        self._next += 1
+        return True
+
+    def read_frame(self, t: float) -> np.ndarray:
+        """取得時間 t(秒)的 (H, W, 3) uint8 影格
+
+        Raises:
+            RuntimeError: ffmpeg 無法解碼來源(一張影格都沒有輸出)
+        """
+        index = max(0, int(t * self.fps + 1e-6))
+        with self._lock:
+            if index == self._index:
+                return self._frame
+            if self._proc is None or index < self._next:
+                if self._index >= 0 and self._eof and index > self._index:
+                    return self._frame
+                if self._proc is not None:
+                    self.restarts += 1
+                self._start(index)
+            while not self._eof and self._next <= index:
+                if not self._read_next():
+                    # 來源提早結束:保留最後一張影格
+                    self._eof = True
+                    if self._index < 0:
+                        raise RuntimeError(self._failure_message())
+                    break
+                self._index = self._next - 1
+            return self._frame
+
+    def _failure_message(self) -> str:
+        detail = ""
+        if self._proc is not None and self._proc.wait() != 0:
+            try:
+                self._stderr.seek(0)
+                detail = self._stderr.read().decode("utf-8", "replace")
+            except (OSError, ValueError):
+                detail = ""
+        return (f"ffmpeg decode failed for {self.source_path}: "
+                f"{detail.strip()[-2000:] or 'no frames'}")
+
+    def close(self) -> None:
+        """結束 ffmpeg 行程"""
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self._proc = None
+
+
+class RingBufferFrameSource:
+    """由記憶體中的一輪影格提供循環背景
+
+    Args:
+        frames: (N, H, W, 3) uint8 連續陣列,索引 i 為時間 i / fps
+        fps: 影格率
+    """
+
+    def __init__(self, frames: np.ndarray, fps: float):
+        if len(frames) == 0:
+            raise ValueError("frames must not be empty")
+        self.frames = frames
+        self.fps = float(fps)
+        self.size = (int(frames.shape[2]), int(frames.shape[1]))
+
+    def read_frame(self, t: float) -> np.ndarray:
+        """取得時間 t(秒)的影格(緩衝區中的視圖,不複製)"""
+        index = max(0, int(t * self.fps + 1e-6))
+        return self.frames[index % len(self.frames)]
+
+    def close(self) -> None:
+        """與 FFmpegFrameReader 介面一致(沒有需要釋放的行程)"""
+
+
+def _loop_budget() -> int:
+    value = os.environ.get("SPELLVID_BG_LOOP_BUDGET", "").strip()
+    try:
+        return int(value) if value else BACKGROUND_LOOP_BUDGET
+    except ValueError:
+        return BACKGROUND_LOOP_BUDGET
+
+
+def decode_loop_frames(
+    source_path: str,
+    size: Tuple[int, int],
+    fps: float,
+    *,
+    mode: str = "cover",
+    pad_color: Sequence[int] = (0, 0, 0),
+    source_duration: float,
+    max_bytes: int,
+    ffmpeg_exe: Optional[str] = None,
+) -> Optional[np.ndarray]:
+    """把一輪影片解碼進預先配置的連續緩衝區
+
+    Args:
+        source_path: 來源影片
+        size: (width, height) 畫布尺寸
+        fps: 輸出影格率
+        mode: "cover" 或 "fit"
+        pad_color: fit 模式的補邊顏色
+        source_duration: 來源長度(秒),用於預先配置緩衝區
+        max_bytes: 緩衝區位元組上限
+        ffmpeg_exe: ffmpeg 執行檔(None = resolve_ffmpeg_exe())
+
+    Returns:
+        (N, H, W, 3) uint8 陣列;超出預算或無法解碼時為 None
+    """
+    width, height = int(size[0]), int(size[1])
+    frame_bytes = width * height * 3
+    # fps 濾鏡的輸出張數可能比 duration * fps 多一張
+    capacity = int(math.ceil(source_duration * fps)) + 1
+    if capacity * frame_bytes > max_bytes:
+        return None
+    if ffmpeg_exe is None:
+        from spellvid.infrastructure.video.ffmpeg_pipe import (
+            resolve_ffmpeg_exe,
+        )
+        ffmpeg_exe = resolve_ffmpeg_exe()
+
+    frames = np.empty((capacity, height, width, 3), dtype=np.uint8)
+    view = memoryview(frames).cast("B")
+    cmd = build_decode_command(ffmpeg_exe, source_path, size, fps,
+                               mode=mode, loop=False, pad_color=pad_color)
+    proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL)
+    got = 0
+    try:
+        while got < len(view):
+            chunk = proc.stdout.readinto(view[got:])
+            if not chunk:
+                break
+            got += chunk
+        overflow = bool(proc.stdout.read(1))
+    finally:
+        _stop_process(proc)
+    count = got // frame_bytes
+    if overflow or count == 0:
+        return None
+    return frames[:count]
+
+
+def open_background_source(
+    source_path: str,
+    size: Tuple[int, int],
+    fps: float,
+    *,
+    mode: str = "cover",
+    duration: float,
+    pad_color: Sequence[int] = (0, 0, 0),
+    loop_budget: Optional[int] = None,
+    ffmpeg_exe: Optional[str] = None,
+):
+    """開啟背景影片來源,短片以環形緩衝區循環
+
+    Args:
+        source_path: 來源影片
+        size: (width, height) 畫布尺寸
+        fps: 輸出影格率
+        mode: "cover" 或 "fit"
+        duration: 片段長度(秒)
+        pad_color: fit 模式的補邊顏色
+        loop_budget: 環形緩衝區位元組上限(None = SPELLVID_BG_LOOP_BUDGET
+            或 BACKGROUND_LOOP_BUDGET)
+        ffmpeg_exe: ffmpeg 執行檔
+
+    Returns:
+        具有 read_frame(t) 與 close() 的 RingBufferFrameSource 或
+        FFmpegFrameReader
+    """
+    from spellvid.infrastructure.media.probe import probe
+
+    if mode not in BACKGROUND_MODES:
+        raise ValueError(
+            f"video_mode must be one of {BACKGROUND_MODES}: {mode}"
+        )
+    try:
+        info = probe(source_path)
+    except (OSError, RuntimeError):
+        info = None
+    source_duration = getattr(info, "duration", None)
+    if source_duration and 0 < source_duration < duration:
+        frames = decode_loop_frames(
+            source_path, size, fps, mode=mode, pad_color=pad_color,
+            source_duration=source_duration,
+            max_bytes=_loop_budget() if loop_budget is None else loop_budget,
+            ffmpeg_exe=ffmpeg_exe,
+        )
+        if frames is not None:
+            return RingBufferFrameSource(frames, fps)
+    return FFmpegFrameReader(
+        source_path, size, fps, mode=mode, duration=duration, loop=True,
+        pad_color=pad_color, ffmpeg_exe=ffmpeg_exe,
+    )
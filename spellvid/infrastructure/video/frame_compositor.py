@@ -0,0 +1,837 @@
+"""NumPy 單趟影格合成器
+
+此模組實作 IVideoComposer Protocol,以單一預先配置的 uint8 畫布緩衝區
+取代 MoviePy 巢狀 CompositeVideoClip 的逐 clip 混色流程。
+
+設計原則:
+- 單趟合成:每個影格只走訪在時間 t 有效的圖層,以 NumPy 切片就地 blit
+- 預先處理:靜態圖層於建立時間軸時即裁切至畫布並分類 alpha
+  (不透明 / 二值 / 半透明),每影格不再重複計算
+- 相容 MoviePy:可直接接收 ImageClip / ColorClip / CompositeVideoClip,
+  靜態 ImageClip 會被攤平為靜態圖層,其餘 clip 以 get_frame 取樣
+
+Example:
+    >>> from spellvid.infrastructure.video.frame_compositor import (
+    ...     NumpyFrameCompositor,
+    ... )
+    >>> composer = NumpyFrameCompositor()
+    >>> bg = composer.create_color_clip((1920, 1080), (255, 250, 233), 5.0)
+    >>> timeline = composer.compose_clips([bg])
+    >>> timeline.make_frame(0.0).shape
+    (1080, 1920, 3)
+"""
+
+import copy
+import os
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from moviepy import VideoFileClip
+    MOVIEPY_AVAILABLE = True
+except ImportError:
+    MOVIEPY_AVAILABLE = False
+
+
+# alpha 分類:決定每影格使用哪一種 blit 路徑
+_ALPHA_OPAQUE = "opaque"
+_ALPHA_BINARY = "binary"
+_ALPHA_BLEND = "blend"
+
+FrameFunction = Callable[[float], Optional[np.ndarray]]
+
+
+class FrameLayer:
+    """合成器使用的單一圖層
+
+    圖層可以是靜態影像(image)或動態影格函數(frame_function)。
+    動態函數接收圖層區域時間(t - start),回傳 RGB 或 RGBA uint8 陣列;
+    回傳 None 表示該影格不顯示此圖層。
+
+    Attributes:
+        image: 靜態影像 (H, W, 3|4) uint8,動態圖層為 None
+        frame_function: 動態影格函數,靜態圖層為 None
+        position: (x, y) 在畫布上的左上角位置
+        start: 開始時間(秒)
+        end: 結束時間(秒),None 表示持續到時間軸結束
+
+    Example:
+        >>> layer = FrameLayer(image=np.zeros((10, 20, 4), np.uint8),
+        ...                    position=(5, 5), start=1.0, end=2.0)
+        >>> layer.size, layer.duration
+        ((20, 10), 1.0)
+    """
+
+    def __init__(
+        self,
+        image: Optional[np.ndarray] = None,
+        position: Tuple[int, int] = (0, 0),
+        start: float = 0.0,
+        end: Optional[float] = None,
+        frame_function: Optional[FrameFunction] = None,
+        size: Optional[Tuple[int, int]] = None,
+    ):
+        if image is None and frame_function is None:
+            raise ValueError("FrameLayer 需要 image 或 frame_function")
+        if image is not None:
+            image = _as_uint8_image(image)
+            size = (int(image.shape[1]), int(image.shape[0]))
+        self.image = image
+        self.frame_function = frame_function
+        self.position = (int(position[0]), int(position[1]))
+        self.start = float(start)
+        self.end = None if end is None else float(end)
+        self.size = size if size is not None else (0, 0)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """圖層持續時間,end 未設定時為 None"""
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+    @property
+    def is_static(self) -> bool:
+        """是否為靜態影像圖層"""
+        return self.frame_function is None
+
+    def is_active(self, t: float) -> bool:
+        """判斷圖層在時間 t 是否顯示"""
+        if t < self.start:
+            return False
+        return self.end is None or t < self.end
+
+    def with_position(self, position: Tuple[int, int]) -> "FrameLayer":
+        """回傳位置更新後的複本"""
+        layer = copy.copy(self)
+        layer.position = (int(position[0]), int(position[1]))
+        return layer
+
+    def with_start(self, start: float) -> "FrameLayer":
+        """回傳開始時間更新後的複本(保持原持續時間)"""
+        layer = copy.copy(self)
+        duration = self.duration
+        layer.start = float(start)
+        layer.end = None if duration is None else layer.start + duration
+        return layer
+
+
+class FrameTimeline:
+    """預先配置畫布緩衝區的合成時間軸
+
+    make_frame(t) 每次都寫入同一個 (H, W, 3) uint8 緩衝區並回傳它,
+    呼叫端若需保留影格內容必須自行複製。
+
+    建立時會把全程不變的靜態圖層(背景、字母、中文注音等)攤平成
+    快取平面,每影格只需複製底圖再疊上動態圖層。
+
+    Attributes:
+        size: (width, height) 畫布尺寸
+        duration: 時間軸總長(秒)
+        audio: 選用的 MoviePy AudioClip,於 render_to_file 時一併輸出
+        fadeout_duration: 結尾淡出秒數(0 表示不淡出)
+    """
+
+    def __init__(
+        self,
+        layers: Sequence[FrameLayer],
+        size: Tuple[int, int] = (1920, 1080),
+        duration: Optional[float] = None,
+        bg_color: Tuple[int, int, int] = (0, 0, 0),
+    ):
+        self.size = (int(size[0]), int(size[1]))
+        width, height = self.size
+        if duration is None:
+            ends = [layer.end for layer in layers if layer.end is not None]
+            duration = max(ends) if ends else 0.0
+        self.duration = float(duration)
+        self.audio: Any = None
+        self.fadeout_duration = 0.0
+
+        # 時間不變的靜態圖層預先攤平:最底層一段直接畫進底圖,
+        # 夾在動態圖層之間的各段則合併為一張 RGBA 平面
+        self._base = np.empty((height, width, 3), dtype=np.uint8)
+        self._base[:] = np.asarray(bg_color[:3], dtype=np.uint8)
+        flattened = _flatten_static_runs(
+            list(layers), self.size, self.duration, self._base
+        )
+        prepared = [_PreparedLayer(layer, self.size) for layer in flattened]
+        self._layers = [p for p in prepared if not p.is_empty]
+        self._buffer = np.empty_like(self._base)
+        self._scratch: dict = {}
+
+    def make_frame(self, t: float) -> np.ndarray:
+        """合成時間 t 的影格
+
+        Args:
+            t: 時間軸上的時間(秒)
+
+        Returns:
+            (H, W, 3) uint8 陣列(內部緩衝區,下次呼叫會被覆寫)
+        """
+        buffer = self._buffer
+        np.copyto(buffer, self._base)
+        for layer in self._layers:
+            if layer.source.is_active(t):
+                layer.blit(buffer, t, self._scratch)
+        if self.fadeout_duration > 0:
+            remaining = self.duration - t
+            if remaining < self.fadeout_duration:
+                factor = max(0.0, remaining / self.fadeout_duration)
+                np.multiply(buffer, factor, out=buffer, casting="unsafe")
+        return buffer
+
+    # 與 MoviePy clip 介面一致,方便既有程式碼直接取樣
+    get_frame = make_frame
+
+    @property
+    def static_plate(self) -> np.ndarray:
+        """最底層的靜態平面(底色 + 全程靜態圖層),唯讀使用"""
+        return self._base
+
+    @property
+    def dynamic_layer_count(self) -> int:
+        """每影格需要合成的圖層數"""
+        return len(self._layers)
+
+    def with_audio(self, audio: Any) -> "FrameTimeline":
+        """回傳附帶音訊的複本(共用畫布緩衝區)"""
+        timeline = copy.copy(self)
+        timeline.audio = audio
+        return timeline
+
+    def with_fadeout(self, duration: float) -> "FrameTimeline":
+        """回傳結尾淡出的複本(共用畫布緩衝區)"""
+        timeline = copy.copy(self)
+        timeline.fadeout_duration = max(0.0, float(duration))
+        return timeline
+
+
+class FrameSequence:
+    """多條 FrameTimeline 在時間上的串接
+
+    Attributes:
+        size: 畫布尺寸(取第一段)
+        duration: 各段時長總和
+        audio: 選用的 AudioClip
+    """
+
+    def __init__(self, timelines: Sequence[Any]):
+        if not timelines:
+            raise ValueError("FrameSequence 至少需要一段時間軸")
+        self._timelines = list(timelines)
+        self._offsets = np.cumsum(
+            [0.0] + [float(tl.duration) for tl in self._timelines]
+        )
+        self.size = tuple(self._timelines[0].size)
+        self.duration = float(self._offsets[-1])
+        self.audio: Any = None
+        self.fadeout_duration = 0.0
+
+    def make_frame(self, t: float) -> np.ndarray:
+        """取得串接後時間 t 的影格"""
+        idx = int(np.searchsorted(self._offsets, t, side="right")) - 1
+        idx = min(max(idx, 0), len(self._timelines) - 1)
+        frame = self._timelines[idx].get_frame(t - self._offsets[idx])
+        if self.fadeout_duration > 0:
+            remaining = self.duration - t
+            if remaining < self.fadeout_duration:
+                factor = max(0.0, remaining / self.fadeout_duration)
+                frame = (frame * factor).astype(np.uint8)
+        return frame
+
+    get_frame = make_frame
+
+    def with_audio(self, audio: Any) -> "FrameSequence":
+        """回傳附帶音訊的複本"""
+        seq = copy.copy(self)
+        seq.audio = audio
+        return seq
+
+    def with_fadeout(self, duration: float) -> "FrameSequence":
+        """回傳結尾淡出的複本"""
+        seq = copy.copy(self)
+        seq.fadeout_duration = max(0.0, float(duration))
+        return seq
+
+
+class NumpyFrameCompositor:
+    """NumPy 單趟影格合成器
+
+    實作 IVideoComposer Protocol。create_* 回傳輕量 FrameLayer,
+    compose_clips 回傳 FrameTimeline;也可直接傳入 MoviePy clip。
+
+    Args:
+        keyframe_times: render_to_file 時強制插入關鍵影格的時間點(秒),
+            批次串接可在這些位置之後直接複製封包
+
+    Example:
+        >>> composer = NumpyFrameCompositor()
+        >>> bg = composer.create_color_clip((1920, 1080), (255, 250, 233), 3.0)
+        >>> img = composer.create_image_clip(
+        ...     np.zeros((100, 100, 4), np.uint8), 3.0, (50, 50))
+        >>> timeline = composer.compose_clips([bg, img])
+        >>> composer.render_to_file(timeline, "out/test.mp4", fps=24)
+    """
+
+    def __init__(self, keyframe_times: Sequence[float] = ()):
+        self.keyframe_times = tuple(float(t) for t in keyframe_times)
+
+    def create_color_clip(
+        self,
+        size: Tuple[int, int],
+        color: Tuple[int, int, int],
+        duration: float
+    ) -> FrameLayer:
+        """建立純色圖層
+
+        Args:
+            size: (width, height) 尺寸
+            color: (R, G, B) 顏色值
+            duration: 持續時間(秒)
+
+        Returns:
+            靜態 FrameLayer
+        """
+        width, height = int(size[0]), int(size[1])
+        image = np.empty((height, width, 3), dtype=np.uint8)
+        image[:] = np.asarray(color[:3], dtype=np.uint8)
+        return FrameLayer(image=image, start=0.0, end=float(duration))
+
+    def create_image_clip(
+        self,
+        image_array: np.ndarray,
+        duration: float,
+        position: Tuple[int, int] = (0, 0)
+    ) -> FrameLayer:
+        """建立圖片圖層
+
+        Args:
+            image_array: (H, W, 3|4) 陣列
+            duration: 持續時間(秒)
+            position: (x, y) 位置
+
+        Returns:
+            靜態 FrameLayer
+        """
+        return FrameLayer(
+            image=image_array, position=position, start=0.0,
+            end=float(duration),
+        )
+
+    def create_video_clip(
+        self,
+        video_path: str,
+        duration: float,
+        position: Tuple[int, int] = (0, 0)
+    ) -> FrameLayer:
+        """建立視頻圖層
+
+        視頻較短時循環播放,較長時於 duration 截止。
+
+        Args:
+            video_path: 視頻檔案路徑
+            duration: 目標持續時間(秒)
+            position: (x, y) 位置
+
+        Returns:
+            動態 FrameLayer
+
+        Raises:
+            FileNotFoundError: 視頻檔案不存在
+        """
+        if not os.path.isfile(video_path):
+            raise FileNotFoundError(f"視頻檔案不存在: {video_path}")
+        if not MOVIEPY_AVAILABLE:
+            raise ImportError("MoviePy 未安裝。請執行: pip install moviepy")
+        clip = VideoFileClip(video_path, audio=False)
+        clip_duration = float(clip.duration or duration)
+
+        def frame_function(t: float) -> np.ndarray:
+            if clip_duration > 0:
+                t = t % clip_duration
+            return clip.get_frame(t)
+
+        return FrameLayer(
+            frame_function=frame_function,
+            position=position,
+            start=0.0,
+            end=float(duration),
+            size=tuple(clip.size),
+        )
+
+    def compose_clips(
+        self,
+        clips: List[Any],
+        size: Tuple[int, int] = (1920, 1080)
+    ) -> FrameTimeline:
+        """組合圖層為時間軸
+
+        Args:
+            clips: FrameLayer 或 MoviePy clip 列表(底層在前)
+            size: 畫布尺寸
+
+        Returns:
+            FrameTimeline
+        """
+        layers: List[FrameLayer] = []
+        for clip in clips:
+            layers.extend(_to_frame_layers(clip, size))
+        duration = _clips_duration(clips)
+        return FrameTimeline(layers, size=size, duration=duration)
+
+    def apply_fadeout(
+        self,
+        clip: Any,
+        duration: float
+    ) -> Any:
+        """對時間軸套用結尾淡出(總時長不變)
+
+        Args:
+            clip: FrameTimeline / FrameSequence
+            duration: 淡出秒數
+
+        Returns:
+            套用淡出後的複本
+        """
+        if hasattr(clip, "with_fadeout"):
+            return clip.with_fadeout(duration)
+        return self.compose_clips([clip], size=_clip_size(clip)).with_fadeout(
+            duration
+        )
+
+    def render_to_file(
+        self,
+        clip: Any,
+        output_path: str,
+        fps: int = 30,
+        codec: str = "libx264"
+    ) -> None:
+        """將時間軸編碼為視頻檔案
+
+        影格經 rawvideo pipe 直接送入 ffmpeg(見 ffmpeg_pipe 模組);
+        若時間軸帶有 audio,會於同一次 ffmpeg 呼叫以 AAC 一併輸出。
+
+        Args:
+            clip: FrameTimeline / FrameSequence(或任何具 get_frame 的 clip)
+            output_path: 輸出檔案路徑
+            fps: 影格率
+            codec: 視頻編碼器
+
+        Raises:
+            IOError: 無法寫入檔案
+            RuntimeError: 渲染失敗
+        """
+        from spellvid.infrastructure.video.ffmpeg_pipe import encode_frames
+
+        frame_function = getattr(clip, "make_frame", None) or clip.get_frame
+        try:
+            encode_frames(
+                frame_function,
+                float(clip.duration),
+                output_path,
+                size=_clip_size(clip),
+                fps=fps,
+                codec=codec,
+                audio=getattr(clip, "audio", None),
+                keyframe_times=self.keyframe_times,
+            )
+        except (IOError, OSError) as e:
+            raise IOError(f"無法寫入輸出檔案: {output_path}") from e
+        except Exception as e:
+            raise RuntimeError(f"視頻渲染失敗: {e}") from e
+
+    def concatenate_clips(
+        self,
+        clips: List[Any],
+        method: str = "compose"
+    ) -> FrameSequence:
+        """串接多段時間軸
+
+        Args:
+            clips: FrameTimeline / FrameLayer / MoviePy clip 列表
+            method: "compose" 或 "chain"(兩者皆為時間串接)
+
+        Returns:
+            FrameSequence
+
+        Raises:
+            ValueError: 不支援的串接方法
+        """
+        if method not in ("compose", "chain"):
+            raise ValueError(f"不支援的串接方法: {method}")
+        timelines = []
+        for clip in clips:
+            if isinstance(clip, (FrameTimeline, FrameSequence)):
+                timelines.append(clip)
+            else:
+                timelines.append(
+                    self.compose_clips([clip], size=_clip_size(clip))
+                )
+        return FrameSequence(timelines)
+
+
+# ============================================================================
+# 內部:圖層預處理與 blit
+# ============================================================================
+
+class _PreparedLayer:
+    """已裁切至畫布並分類 alpha 的圖層
+
+    靜態圖層在建立時就完成裁切、alpha 分類與預乘;
+    動態圖層則每影格取樣後再走相同的 blit 路徑。
+    """
+
+    def __init__(self, source: FrameLayer, canvas_size: Tuple[int, int]):
+        self.source = source
+        self.canvas_size = canvas_size
+        self.is_empty = False
+        self.rgb: Optional[np.ndarray] = None
+        if source.is_static:
+            self._prepare_static(source.image)
+
+    def _prepare_static(self, image: np.ndarray) -> None:
+        region = _clip_region(image.shape, self.source.position,
+                              self.canvas_size)
+        if region is None:
+            self.is_empty = True
+            return
+        dst_slice, src_slice = region
+        cropped = image[src_slice]
+        self.dst = dst_slice
+        self.rgb = np.ascontiguousarray(cropped[..., :3])
+        self.mode, self.alpha = _classify_alpha(cropped)
+        if self.mode == _ALPHA_BINARY:
+            self.mask = self.alpha[..., None] > 0
+        elif self.mode == _ALPHA_BLEND:
+            alpha = self.alpha.astype(np.uint16)[..., None]
+            self.premul = self.rgb.astype(np.uint16) * alpha
+            self.inv_alpha = (255 - alpha).astype(np.uint16)
+        elif self.mode is None:
+            # 完全透明的靜態圖層
+            self.is_empty = True
+
+    def blit(self, buffer: np.ndarray, t: float, scratch: dict) -> None:
+        """將圖層就地寫入畫布緩衝區"""
+        if self.source.is_static:
+            _blit_prepared(buffer, self, scratch)
+            return
+        frame = self.source.frame_function(t - self.source.start)
+        if frame is None:
+            return
+        frame = _as_uint8_image(frame)
+        region = _clip_region(frame.shape, self.source.position,
+                              self.canvas_size)
+        if region is None:
+            return
+        dst_slice, src_slice = region
+        cropped = frame[src_slice]
+        dst = buffer[dst_slice]
+        if cropped.shape[2] == 3:
+            np.copyto(dst, cropped)
+            return
+        _blend_into(dst, cropped[..., :3], cropped[..., 3])
+
+
+def _is_time_invariant(layer: FrameLayer, duration: float) -> bool:
+    """圖層是否為整段時間軸都顯示的靜態影像"""
+    if not layer.is_static or layer.start > 0:
+        return False
+    return layer.end is None or layer.end >= duration
+
+
+def _flatten_static_runs(
+    layers: List[FrameLayer],
+    canvas_size: Tuple[int, int],
+    duration: float,
+    base: np.ndarray,
+) -> List[FrameLayer]:
+    """將連續的時間不變靜態圖層攤平
+
+    最底層的一段直接合成進 base(就地修改);其後每一段連續靜態圖層
+    合併為單一 RGBA FrameLayer,保持與動態圖層之間的 Z-order。
+
+    Returns:
+        攤平後仍需逐影格合成的圖層列表
+    """
+    result: List[FrameLayer] = []
+    run: List[FrameLayer] = []
+
+    def flush() -> None:
+        if not run:
+            return
+        if not result:
+            scratch: dict = {}
+            for layer in run:
+                prepared = _PreparedLayer(layer, canvas_size)
+                if not prepared.is_empty:
+                    _blit_prepared(base, prepared, scratch)
+        elif len(run) == 1:
+            result.append(run[0])
+        else:
+            plate = _merge_rgba_layers(run, canvas_size)
+            if plate is not None:
+                result.append(plate)
+        run.clear()
+
+    for layer in layers:
+        if _is_time_invariant(layer, duration):
+            run.append(layer)
+        else:
+            flush()
+            result.append(layer)
+    flush()
+    return result
+
+
+def _merge_rgba_layers(
+    layers: List[FrameLayer],
+    canvas_size: Tuple[int, int],
+) -> Optional[FrameLayer]:
+    """以 Porter-Duff over 合併多個靜態圖層為一張裁切後的 RGBA 平面"""
+    regions = []
+    for layer in layers:
+        region = _clip_region(layer.image.shape, layer.position, canvas_size)
+        if region is not None:
+            regions.append((layer, region))
+    if not regions:
+        return None
+
+    x0 = min(r[0][1].start for _, r in regions)
+    y0 = min(r[0][0].start for _, r in regions)
+    x1 = max(r[0][1].stop for _, r in regions)
+    y1 = max(r[0][0].stop for _, r in regions)
+
+    # 預乘 alpha 的浮點累積緩衝區(僅在建立時間軸時執行一次)
+    premul = np.zeros((y1 - y0, x1 - x0, 3), dtype=np.float32)
+    alpha = np.zeros((y1 - y0, x1 - x0, 1), dtype=np.float32)
+    for layer, (dst, src) in regions:
+        image = layer.image[src]
+        local = (slice(dst[0].start - y0, dst[0].stop - y0),
+                 slice(dst[1].start - x0, dst[1].stop - x0))
+        src_rgb = image[..., :3].astype(np.float32)
+        if image.shape[2] >= 4:
+            src_a = image[..., 3:4].astype(np.float32) / 255.0
+        else:
+            src_a = np.ones(image.shape[:2] + (1,), dtype=np.float32)
+        keep = 1.0 - src_a
+        premul[local] = src_rgb * src_a + premul[local] * keep
+        alpha[local] = src_a + alpha[local] * keep
+
+    rgb = np.divide(premul, alpha, out=np.zeros_like(premul),
+                    where=alpha > 0)
+    plate = np.dstack([
+        np.clip(np.rint(rgb), 0, 255).astype(np.uint8),
+        np.clip(np.rint(alpha * 255.0), 0, 255).astype(np.uint8),
+    ])
+    return FrameLayer(image=plate, position=(x0, y0), start=0.0, end=None)
+
+
+def _blit_prepared(buffer: np.ndarray, layer: _PreparedLayer,
+                   scratch: dict) -> None:
+    dst = buffer[layer.dst]
+    if layer.mode == _ALPHA_OPAQUE:
+        np.copyto(dst, layer.rgb)
+    elif layer.mode == _ALPHA_BINARY:
+        np.copyto(dst, layer.rgb, where=layer.mask)
+    else:
+        # out = (src * a + dst * (255 - a)) / 255,使用預乘結果減少運算
+        key = layer.premul.shape
+        tmp = scratch.get(key)
+        if tmp is None:
+            tmp = np.empty(key, dtype=np.uint16)
+            scratch[key] = tmp
+        np.multiply(dst, layer.inv_alpha, out=tmp)
+        tmp += layer.premul
+        tmp += 127
+        tmp //= 255
+        np.copyto(dst, tmp, casting="unsafe")
+
+
+def _blend_into(dst: np.ndarray, rgb: np.ndarray, alpha: np.ndarray) -> None:
+    """以 alpha 就地混色(動態圖層使用)"""
+    a = alpha.astype(np.uint16)[..., None]
+    out = dst.astype(np.uint16) * (255 - a)
+    out += rgb.astype(np.uint16) * a
+    out += 127
+    out //= 255
+    np.copyto(dst, out, casting="unsafe")
+
+
+def _classify_alpha(image: np.ndarray) -> Tuple[Optional[str], Any]:
+    """分類影像的 alpha 通道
+
+    Returns:
+        (mode, alpha):mode 為 opaque/binary/blend,完全透明時為 None
+    """
+    if image.ndim != 3 or image.shape[2] < 4:
+        return _ALPHA_OPAQUE, None
+    alpha = np.ascontiguousarray(image[..., 3])
+    lo, hi = int(alpha.min()), int(alpha.max())
+    if lo == 255:
+        return _ALPHA_OPAQUE, None
+    if hi == 0:
+        return None, None
+    if np.all((alpha == 0) | (alpha == 255)):
+        return _ALPHA_BINARY, alpha
+    return _ALPHA_BLEND, alpha
+
+
+def _clip_region(
+    shape: Tuple[int, ...],
+    position: Tuple[int, int],
+    canvas_size: Tuple[int, int],
+) -> Optional[Tuple[Tuple[slice, slice], Tuple[slice, slice]]]:
+    """計算圖層與畫布交集的目標/來源切片,無交集時回傳 None"""
+    height, width = int(shape[0]), int(shape[1])
+    canvas_w, canvas_h = canvas_size
+    x, y = position
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(canvas_w, x + width), min(canvas_h, y + height)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    dst = (slice(y0, y1), slice(x0, x1))
+    src = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+    return dst, src
+
+
+def _as_uint8_image(image: np.ndarray) -> np.ndarray:
+    """確保影像為 (H, W, C) uint8"""
+    arr = np.asarray(image)
+    if arr.ndim == 2:
+        arr = np.stack([arr] * 3, axis=-1)
+    if arr.dtype != np.uint8:
+        arr = np.clip(arr, 0, 255).astype(np.uint8)
+    return arr
+
+
+# ============================================================================
+# 內部:MoviePy clip 轉換
+# ============================================================================
+
+def _is_static_image_clip(clip: Any) -> bool:
+    """判斷 MoviePy clip 是否為未經轉換的 ImageClip/ColorClip
+
+    ImageClip 在建構時以閉包回傳同一張 img;一旦套用效果,
+    frame_function 會被替換,此時就不能直接使用 clip.img。
+    """
+    if getattr(clip, "img", None) is None:
+        return False
+    func = getattr(clip, "frame_function", None)
+    qualname = getattr(func, "__qualname__", "")
+    return qualname.startswith("ImageClip.__init__")
+
+
+def _to_frame_layers(
+    clip: Any,
+    canvas_size: Tuple[int, int],
+    offset: Tuple[int, int] = (0, 0),
+    time_offset: float = 0.0,
+) -> List[FrameLayer]:
+    """將 FrameLayer 或 MoviePy clip 轉換為 FrameLayer 列表"""
+    if isinstance(clip, FrameLayer):
+        if offset == (0, 0) and time_offset == 0.0:
+            return [clip]
+        layer = clip.with_position(
+            (clip.position[0] + offset[0], clip.position[1] + offset[1])
+        )
+        return [layer.with_start(layer.start + time_offset)]
+
+    start = float(getattr(clip, "start", 0.0) or 0.0) + time_offset
+    end = getattr(clip, "end", None)
+    end = None if end is None else float(end) + time_offset
+    size = _clip_size(clip)
+    pos = _resolve_position(clip, size, canvas_size)
+    position = (pos[0] + offset[0], pos[1] + offset[1])
+
+    # CompositeVideoClip:攤平子 clip,讓靜態子圖層也能預先處理
+    children = getattr(clip, "clips", None)
+    if children is not None and getattr(clip, "mask", None) is None:
+        layers: List[FrameLayer] = []
+        bg = getattr(clip, "bg", None)
+        if bg is not None and not getattr(clip, "created_bg", True):
+            children = [bg] + list(children)
+        for child in children:
+            for layer in _to_frame_layers(child, size, position, start):
+                if end is not None and (layer.end is None or layer.end > end):
+                    layer = copy.copy(layer)
+                    layer.end = end
+                layers.append(layer)
+        return layers
+
+    mask = getattr(clip, "mask", None)
+    if _is_static_image_clip(clip) and (
+        mask is None or _is_static_image_clip(mask)
+    ):
+        image = _as_uint8_image(clip.img)[..., :3]
+        if mask is not None:
+            alpha = np.clip(np.asarray(mask.img) * 255.0, 0, 255)
+            image = np.dstack([image, alpha.astype(np.uint8)])
+        return [FrameLayer(image=image, position=position, start=start,
+                           end=end)]
+
+    def frame_function(t: float) -> np.ndarray:
+        frame = _as_uint8_image(clip.get_frame(t))[..., :3]
+        if mask is None:
+            return frame
+        alpha = np.clip(np.asarray(mask.get_frame(t)) * 255.0, 0, 255)
+        return np.dstack([frame, alpha.astype(np.uint8)])
+
+    return [FrameLayer(frame_function=frame_function, position=position,
+                       start=start, end=end, size=size)]
+
+
+def _resolve_position(
+    clip: Any,
+    size: Tuple[int, int],
+    canvas_size: Tuple[int, int],
+) -> Tuple[int, int]:
+    """解析 MoviePy clip 於 t=0 的位置(支援 center/left/right 等字串)"""
+    pos_fn = getattr(clip, "pos", None)
+    if pos_fn is None:
+        return (0, 0)
+    try:
+        pos = pos_fn(0)
+    except Exception:
+        return (0, 0)
+    if isinstance(pos, str):
+        pos = (pos, pos)
+    w, h = size
+    canvas_w, canvas_h = canvas_size
+    relative = bool(getattr(clip, "relative_pos", False))
+    resolved = []
+    for value, clip_len, canvas_len, names in (
+        (pos[0], w, canvas_w, ("left", "right")),
+        (pos[1], h, canvas_h, ("top", "bottom")),
+    ):
+        if value == "center":
+            resolved.append((canvas_len - clip_len) // 2)
+        elif value == names[0]:
+            resolved.append(0)
+        elif value == names[1]:
+            resolved.append(canvas_len - clip_len)
+        elif relative:
+            resolved.append(int(float(value) * canvas_len))
+        else:
+            resolved.append(int(value))
+    return resolved[0], resolved[1]
+
+
+def _clip_size(clip: Any) -> Tuple[int, int]:
+    size = getattr(clip, "size", None) or (1920, 1080)
+    return int(size[0]), int(size[1])
+
+
+def _clips_duration(clips: Sequence[Any]) -> Optional[float]:
+    """取 clips 中最大的結束時間,皆未知時回傳 None"""
+    ends = []
+    for clip in clips:
+        end = getattr(clip, "end", None)
+        if end is None:
+            duration = getattr(clip, "duration", None)
+            if duration is not None:
+                end = float(getattr(clip, "start", 0.0) or 0.0) + duration
+        if end is not None:
+            ends.append(float(end))
+    return max(ends) if ends else None
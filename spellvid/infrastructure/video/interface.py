@@ -20,7 +20,8 @@ class IVideoComposer(Protocol):
     隱藏在基礎設施層,讓 Domain 和 Application 層不依賴具體實作。
 
     實作者:
-        - MoviePyAdapter: 當前使用的 MoviePy 適配器
+        - MoviePyAdapter: MoviePy 適配器
+        - NumpyFrameCompositor: NumPy 單趟影格合成器(預設)
         - (未來可替換為其他視頻引擎)
 
     Clip 物件:
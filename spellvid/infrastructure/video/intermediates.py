@@ -0,0 +1,309 @@
+"""片頭 / 片尾中介檔
+
+片頭(含片頭停留)與片尾在整個批次中都相同,因此只需正規化一次:
+轉成與主段落完全相同的編碼器、解析度、影格率與音訊格式,並依來源路徑、
+修改時間與輸出設定快取在磁碟上。每支視頻渲染時只編碼主段落,再以
+concat demuxer 串流複製把中介檔接上。
+
+正規化內容:
+- 片頭:縮放至輸出尺寸,停留秒數以最後一格延長(tpad clone)
+- 片尾:先裁掉黑邊(與舊版 _auto_letterbox_crop 相同的判斷),
+  再縮放至輸出尺寸(舊版 _ensure_dimensions / _ensure_fullscreen_cover
+  皆為非等比例縮放)
+- 音訊統一為 AAC、44.1kHz 立體聲;來源沒有音訊時補靜音
+- 片頭在 FADE_IN_DURATION 處強制關鍵影格:片頭接在每支視頻最前面,
+  批次串接的淡入只需重新編碼到這個關鍵影格為止
+
+Example:
+    >>> spec = OutputSpec(fps=24)
+    >>> entry = prepare_intermediate("assets/entry.mp4", "entry", spec,
+    ...                              hold_sec=1.0)
+    >>> splice_segments([entry, "out/main.mp4"], "out/final.mp4")
+"""
+
+import os
+import subprocess
+import tempfile
+from dataclasses import asdict, dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from spellvid.infrastructure.media.cache import (
+    cache_dir,
+    cache_key,
+    file_fingerprint,
+)
+from spellvid.infrastructure.video.ffmpeg_concat import (
+    ConcatSource,
+    h264_parameter_sets,
+    scan_source,
+)
+from spellvid.infrastructure.video.ffmpeg_pipe import resolve_ffmpeg_exe
+from spellvid.shared.constants import FADE_IN_DURATION
+
+# 正規化流程變更時遞增,使舊快取失效
+INTERMEDIATE_VERSION = 3
+
+INTERMEDIATE_KINDS = ("entry", "ending")
+
+# 黑邊判斷門檻(灰階平均值),與舊版 _auto_letterbox_crop 一致
+_LETTERBOX_THRESHOLD = 15.0
+_LETTERBOX_PAD = 2
+
+
+@dataclass(frozen=True)
+class OutputSpec:
+    """主段落與中介檔共用的輸出格式
+
+    Attributes:
+        width: 輸出寬度
+        height: 輸出高度
+        fps: 影格率
+        codec: 視頻編碼器
+        preset: x264 preset
+        pix_fmt: 像素格式
+        audio_codec: 音訊編碼器
+        sample_rate: 音訊取樣率
+        channels: 音訊聲道數
+    """
+    width: int = 1920
+    height: int = 1080
+    fps: float = 24
+    codec: str = "libx264"
+    preset: str = "medium"
+    pix_fmt: str = "yuv420p"
+    audio_codec: str = "aac"
+    sample_rate: int = 44100
+    channels: int = 2
+
+
+def detect_letterbox(
+    source: ConcatSource,
+    ffmpeg_exe: Optional[str] = None,
+) -> Optional[Tuple[int, int, int, int]]:
+    """偵測黑邊並回傳內容區域
+
+    取第一格(失敗時改取中間格)判斷,規則與舊版 _auto_letterbox_crop
+    相同:灰階 > 15 視為內容,外擴 2px。
+
+    Returns:
+        (x, y, width, height);畫面已填滿或無法判斷時回傳 None
+    """
+    ffmpeg_exe = ffmpeg_exe or resolve_ffmpeg_exe()
+    w, h = source.width, source.height
+    sample_points = [0.0]
+    if source.duration > 0.5:
+        sample_points.append(source.duration / 2.0)
+
+    frame = None
+    for t in sample_points:
+        proc = subprocess.run(
+            [ffmpeg_exe, "-loglevel", "error", "-nostdin",
+             "-ss", f"{t:.3f}", "-i", source.path, "-frames:v", "1",
+             "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+        if len(proc.stdout) == w * h * 3:
+            frame = np.frombuffer(proc.stdout, np.uint8).reshape(h, w, 3)
+            break
+    if frame is None:
+        return None
+
+    valid = frame.mean(axis=2) > _LETTERBOX_THRESHOLD
+    if not valid.any():
+        return None
+    rows = np.where(valid.any(axis=1))[0]
+    cols = np.where(valid.any(axis=0))[0]
+    top, bottom = int(rows[0]), int(rows[-1])
+    left, right = int(cols[0]), int(cols[-1])
+    if top <= 2 and left <= 2 and bottom >= h - 3 and right >= w - 3:
+        return None
+
+    top = max(0, top - _LETTERBOX_PAD)
+    left = max(0, left - _LETTERBOX_PAD)
+    bottom = min(h - 1, bottom + _LETTERBOX_PAD)
+    right = min(w - 1, right + _LETTERBOX_PAD)
+    return left, top, right + 1 - left, bottom + 1 - top
+
+
+def build_intermediate_command(
+    ffmpeg_exe: str,
+    source: ConcatSource,
+    output_path: str,
+    spec: OutputSpec,
+    *,
+    hold_sec: float = 0.0,
+    crop: Optional[Tuple[int, int, int, int]] = None,
+    keyframe_times: Sequence[float] = (),
+) -> List[str]:
+    """組出正規化中介檔的 ffmpeg 命令列
+
+    keyframe_times 中落在輸出長度內的時間點會強制為關鍵影格。
+    """
+    total = source.duration + max(0.0, float(hold_sec))
+    filters = []
+    if crop is not None:
+        x, y, cw, ch = crop
+        filters.append(f"crop={cw}:{ch}:{x}:{y}")
+    filters += [
+        # 主段落由 rgb24 轉換(BT.601、無色彩標記),中介檔需一致才會
+        # 產生相同的 SPS,否則無法串流複製
+        f"scale={spec.width}:{spec.height}:out_color_matrix=bt601",
+        "setparams=color_primaries=unknown:color_trc=unknown"
+        ":colorspace=unknown",
+        "setsar=0",
+        f"fps={spec.fps}",
+        f"format={spec.pix_fmt}",
+    ]
+    if hold_sec > 0:
+        filters.append(f"tpad=stop_mode=clone:stop_duration={hold_sec}")
+
+    layout = "stereo" if spec.channels == 2 else "mono"
+    cmd = [ffmpeg_exe, "-y", "-loglevel", "error", "-nostdin",
+           "-i", source.path]
+    if source.has_audio:
+        audio_map = "0:a:0"
+        cmd += ["-af", (f"aresample={spec.sample_rate},"
+                        f"aformat=channel_layouts={layout},apad")]
+    else:
+        cmd += ["-f", "lavfi", "-i",
+                f"anullsrc=r={spec.sample_rate}:cl={layout}"]
+        audio_map = "1:a:0"
+    cmd += [
+        "-map", "0:v:0", "-map", audio_map,
+        "-vf", ",".join(filters),
+        "-c:v", spec.codec, "-preset", spec.preset, "-pix_fmt", spec.pix_fmt,
+    ]
+    keyframes = [float(t) for t in keyframe_times if 0.0 < float(t) < total]
+    if keyframes:
+        cmd += ["-force_key_frames",
+                ",".join(f"{t:g}" for t in keyframes)]
+    cmd += [
+        "-c:a", spec.audio_codec, "-ar", str(spec.sample_rate),
+        "-ac", str(spec.channels),
+        "-t", f"{total:.6f}",
+        "-movflags", "+faststart",
+        "-f", "mp4", output_path,
+    ]
+    return cmd
+
+
+def prepare_intermediate(
+    source_path: str,
+    kind: str,
+    spec: OutputSpec = OutputSpec(),
+    *,
+    hold_sec: float = 0.0,
+    ffmpeg_exe: Optional[str] = None,
+) -> str:
+    """取得(必要時建立)正規化後的中介檔
+
+    Args:
+        source_path: 原始片頭/片尾視頻
+        kind: "entry" 或 "ending"
+        spec: 輸出格式,需與主段落相同
+        hold_sec: 片頭停留秒數(僅 entry 使用)
+        ffmpeg_exe: 選用的 ffmpeg 執行檔
+
+    Returns:
+        快取中的中介檔路徑
+
+    Raises:
+        ValueError: 不支援的 kind
+        FileNotFoundError: 來源不存在
+        RuntimeError: ffmpeg 失敗
+    """
+    if kind not in INTERMEDIATE_KINDS:
+        raise ValueError(f"Unsupported intermediate kind: {kind}")
+    if kind != "entry":
+        hold_sec = 0.0
+
+    key = cache_key(
+        file_fingerprint(source_path), kind, round(float(hold_sec), 6),
+        asdict(spec), INTERMEDIATE_VERSION,
+    )
+    target = os.path.join(cache_dir("intermediates"), f"{kind}-{key}.mp4")
+    if os.path.isfile(target):
+        return target
+
+    ffmpeg_exe = ffmpeg_exe or resolve_ffmpeg_exe()
+    source = scan_source(source_path, ffmpeg_exe)
+    crop = detect_letterbox(source, ffmpeg_exe) if kind == "ending" else None
+
+    # 先寫到暫存名稱再原子替換,平行渲染時不會讀到半成品
+    partial = f"{target}.{os.getpid()}.partial"
+    cmd = build_intermediate_command(
+        ffmpeg_exe, source, partial, spec, hold_sec=hold_sec, crop=crop,
+        keyframe_times=(FADE_IN_DURATION,) if kind == "entry" else (),
+    )
+    proc = subprocess.run(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    if proc.returncode != 0 or not os.path.isfile(partial):
+        if os.path.exists(partial):
+            os.remove(partial)
+        detail = proc.stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(
+            f"Failed to prepare {kind} intermediate for {source_path}: "
+            f"{detail[-1000:]}"
+        )
+    os.replace(partial, target)
+    return target
+
+
+def splice_segments(
+    paths: Sequence[str],
+    output_path: str,
+    ffmpeg_exe: Optional[str] = None,
+) -> None:
+    """串接已正規化的段落
+
+    參數集(SPS/PPS)一致時以 concat demuxer 串流複製;否則改用 concat
+    濾鏡重新編碼,確保仍能輸出正確的視頻。
+
+    Raises:
+        RuntimeError: ffmpeg 失敗
+    """
+    ffmpeg_exe = ffmpeg_exe or resolve_ffmpeg_exe()
+    out_dir = os.path.dirname(output_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    reference = h264_parameter_sets(ffmpeg_exe, paths[0])
+    copyable = bool(reference) and all(
+        h264_parameter_sets(ffmpeg_exe, p) == reference for p in paths[1:]
+    )
+
+    with tempfile.TemporaryDirectory(prefix="spellvid_splice_") as tmp:
+        if copyable:
+            list_path = os.path.join(tmp, "segments.txt")
+            with open(list_path, "w", encoding="utf-8") as fh:
+                for path in paths:
+                    escaped = os.path.abspath(path).replace("\\", "/")
+                    escaped = escaped.replace("'", r"'\''")
+                    fh.write(f"file '{escaped}'\n")
+            cmd = [
+                ffmpeg_exe, "-y", "-loglevel", "error", "-nostdin",
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-map", "0:v:0", "-map", "0:a:0?", "-c", "copy",
+                "-movflags", "+faststart", output_path,
+            ]
+        else:
+            cmd = [ffmpeg_exe, "-y", "-loglevel", "error", "-nostdin"]
+            for path in paths:
+                cmd += ["-i", path]
+            streams = "".join(f"[{i}:v:0][{i}:a:0]" for i in range(len(paths)))
+            cmd += [
+                "-filter_complex",
+                f"{streams}concat=n={len(paths)}:v=1:a=1[v][a]",
+                "-map", "[v]", "-map", "[a]",
+                "-c:v", "libx264", "-preset", "medium", "-pix_fmt", "yuv420p",
+                "-c:a", "aac", "-movflags", "+faststart", output_path,
+            ]
+        proc = subprocess.run(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+    if proc.returncode != 0:
+        detail = proc.stderr.decode("utf-8", "replace").strip()
+        raise RuntimeError(f"ffmpeg splice failed: {detail[-1000:]}")
@@ -1,47 +1,28 @@
 """共用層 - 型別定義、常數與驗證邏輯
 
-此模組包含專案中跨層使用的共用元件:
+此模組包含專案中跨層使用的共用元件(套件層級的名稱延遲匯入):
 - types.py: VideoConfig, LayoutBox 等資料類別
 - constants.py: 畫布尺寸、顏色、安全邊界等常數
-- validation.py: JSON schema 驗證與資料載入
+- validation.py: JSON schema 驗證與資料載入(含 JSON Lines / CSV 串流讀取)
+- profiling.py: 渲染階段計時(牆鐘/CPU 時間、影格數、峰值記憶體)
 """
 
-# 型別定義
-from .types import VideoConfig, LayoutBox
+import importlib
 
-# 常數定義
-from .constants import (
-    CANVAS_WIDTH,
-    CANVAS_HEIGHT,
-    PROGRESS_BAR_SAFE_X,
-    PROGRESS_BAR_MAX_X,
-    PROGRESS_BAR_WIDTH,
-    PROGRESS_BAR_HEIGHT,
-    PROGRESS_BAR_CORNER_RADIUS,
-    PROGRESS_BAR_COLORS,
-    PROGRESS_BAR_RATIOS,
-    LETTER_SAFE_X,
-    LETTER_SAFE_Y,
-    LETTER_AVAILABLE_WIDTH,
-    LETTER_TARGET_HEIGHT,
-    LETTER_BASE_GAP,
-    LETTER_EXTRA_SCALE,
-    MAIN_BG_COLOR,
-    FADE_OUT_DURATION,
-    FADE_IN_DURATION,
-    DEFAULT_LETTER_ASSET_DIR,
-    DEFAULT_ENTRY_VIDEO_PATH,
-    DEFAULT_ENDING_VIDEO_PATH,
-    ZHUYIN_MAP_SIMPLE,
-)
-
-# 驗證功能
-from .validation import (
-    SCHEMA,
-    ValidationError,
-    validate_schema,
-    load_json,
-)
+# 匯出名稱 → 子模組;首次存取時才匯入 (PEP 562),
+# 讓只需要 types 或 constants 的呼叫端不必載入其他子模組
+_EXPORTS = {
+    # 型別定義
+    "VideoConfig": "types",
+    "LayoutBox": "types",
+    # 驗證功能
+    "SCHEMA": "validation",
+    "ValidationError": "validation",
+    "validate_schema": "validation",
+    "load_json": "validation",
+    "BatchRecord": "validation",
+    "iter_batch_items": "validation",
+}
 
 __all__ = [
     # Types
@@ -74,10 +55,34 @@ __all__ = [
     "DEFAULT_ENTRY_VIDEO_PATH",
     "DEFAULT_ENDING_VIDEO_PATH",
     # Constants - Zhuyin
+    "ZHUYIN_BASE_HEIGHT_RATIO",
+    "ZHUYIN_MIN_FONT_SIZE",
     "ZHUYIN_MAP_SIMPLE",
     # Validation
     "SCHEMA",
     "ValidationError",
     "validate_schema",
     "load_json",
+    "BatchRecord",
+    "iter_batch_items",
 ]
+
+# 常數定義
+for _name in __all__:
+    _EXPORTS.setdefault(_name, "constants")
+del _name
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -54,6 +54,9 @@ COLOR_BLACK = (0, 0, 0)          # 黑色
 FADE_OUT_DURATION = 3.0  # 秒 - 片尾淡出黑屏時長
 FADE_IN_DURATION = 1.0   # 秒 - 片頭淡入時長
 
+# ========== 音效常數 ==========
+BEEP_LENGTH = 0.3  # 秒 - 倒數嗶聲長度
+
 # ========== 預設資源路徑 ==========
 # 注意: 這些路徑相對於 spellvid/shared/ 解析到專案根目錄的 assets/
 _MODULE_DIR = os.path.dirname(__file__)  # spellvid/shared/
@@ -63,6 +66,10 @@ DEFAULT_LETTER_ASSET_DIR = os.path.join(_PROJECT_ROOT, "assets", "AZ")
 DEFAULT_ENTRY_VIDEO_PATH = os.path.join(_PROJECT_ROOT, "assets", "entry.mp4")
 DEFAULT_ENDING_VIDEO_PATH = os.path.join(_PROJECT_ROOT, "assets", "ending.mp4")
 
+# ========== 注音排版 ==========
+ZHUYIN_BASE_HEIGHT_RATIO = 0.65  # 注音字級相對主字高度的比例
+ZHUYIN_MIN_FONT_SIZE = 10  # 注音字級下限
+
 # ========== 簡化注音對應表(測試用) ==========
 # 注意: 完整的注音邏輯應在 domain.zhuyin 模組中
 ZHUYIN_MAP_SIMPLE = {
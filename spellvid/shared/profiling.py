@@ -0,0 +1,271 @@
+"""渲染階段計時
+
+記錄每個渲染階段的牆鐘時間與 CPU 時間,用來判斷慢的渲染花在哪裡
+(上下文建立、背景解碼、文字點陣化、合成、音訊或 x264):
+
+- wall_sec: 牆鐘時間(time.perf_counter)
+- cpu_sec: 本行程 CPU 時間(所有執行緒,time.process_time)
+- child_cpu_sec: 已結束子行程的 CPU 時間(os.times;ffmpeg 編碼與解碼
+  在子行程執行,Windows 上恆為 0)
+- frames: 編碼的影格數
+- peak_rss_mb: 行程峰值常駐記憶體(resource.getrusage,無此模組時為 None;
+  這是行程生命週期的峰值,批次工作行程中會涵蓋先前的項目)
+
+RenderProfiler 以 activate() 設為目前執行緒的使用中 profiler,讓
+encode_frames 等深層函數不需額外參數即可回報子階段與影格數。
+to_chrome_trace 把多個 profile(可來自不同工作行程)轉為 Chrome
+trace-event 格式,可在 chrome://tracing 或 Perfetto 並排檢視。
+
+Example:
+    >>> profiler = RenderProfiler("Ice")
+    >>> with profiler.activate():
+    ...     with profiler.stage("background"):
+    ...         build_background()
+    >>> profiler.to_dict()["stages"][0]["name"]
+    'background'
+"""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+try:
+    import resource
+    _HAS_RESOURCE = True
+except ImportError:  # Windows
+    resource = None
+    _HAS_RESOURCE = False
+
+# profile 輸出格式變更時遞增
+PROFILE_VERSION = 1
+
+PROFILE_FORMATS = ("json", "chrome")
+
+_local = threading.local()
+
+
+def child_cpu_time() -> float:
+    """已結束子行程累計的 CPU 時間(秒)"""
+    times = os.times()
+    return float(times.children_user + times.children_system)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """行程峰值常駐記憶體(MB),無法取得時為 None"""
+    if not _HAS_RESOURCE:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 回報,macOS 以位元組回報
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+class RenderProfiler:
+    """記錄單次渲染(或一個批次)的各階段耗時
+
+    Args:
+        label: 顯示名稱(如單字或輸出檔名)
+    """
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.frames = 0
+        self.stages: List[Dict[str, Any]] = []
+        self._started_at = time.time()
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._child0 = child_cpu_time()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Any]]:
+        """計時一個階段(例外時仍會記錄)"""
+        record: Dict[str, Any] = {"name": name, "start": time.time()}
+        wall0 = time.perf_counter()
+        cpu0 = time.process_time()
+        child0 = child_cpu_time()
+        self.stages.append(record)
+        try:
+            yield record
+        finally:
+            record["wall_sec"] = time.perf_counter() - wall0
+            record["cpu_sec"] = time.process_time() - cpu0
+            record["child_cpu_sec"] = child_cpu_time() - child0
+
+    @contextlib.contextmanager
+    def accumulate(self, name: str) -> Iterator[Dict[str, Any]]:
+        """計時一個可重複進入的階段,多次進入的時間累加到同一筆紀錄
+
+        用於串流批次等交錯執行的階段(每個項目依序經過比對清單、
+        編譯與渲染),紀錄的開始時間為第一次進入的時間。
+        """
+        record = None
+        for existing in self.stages:
+            if existing["name"] == name and existing.get("accumulated"):
+                record = existing
+                break
+        if record is None:
+            record = {"name": name, "start": time.time(), "wall_sec": 0.0,
+                      "cpu_sec": 0.0, "child_cpu_sec": 0.0,
+                      "accumulated": True}
+            self.stages.append(record)
+        wall0 = time.perf_counter()
+        cpu0 = time.process_time()
+        child0 = child_cpu_time()
+        try:
+            yield record
+        finally:
+            record["wall_sec"] += time.perf_counter() - wall0
+            record["cpu_sec"] += time.process_time() - cpu0
+            record["child_cpu_sec"] += child_cpu_time() - child0
+
+    def add_stage(self, name: str, wall_sec: float, cpu_sec: float = 0.0,
+                  *, child_cpu_sec: float = 0.0,
+                  parent: Optional[str] = None) -> None:
+        """加入外部量測的階段(如編碼迴圈內累計的合成與編碼時間)
+
+        Args:
+            name: 階段名稱
+            wall_sec: 累計牆鐘時間
+            cpu_sec: 累計 CPU 時間
+            child_cpu_sec: 子行程 CPU 時間
+            parent: 所屬的上層階段名稱
+        """
+        start = time.time() - wall_sec
+        if parent is not None:
+            for record in reversed(self.stages):
+                if record["name"] == parent:
+                    start = record["start"]
+                    break
+        self.stages.append({
+            "name": name, "start": start, "wall_sec": wall_sec,
+            "cpu_sec": cpu_sec, "child_cpu_sec": child_cpu_sec,
+            "parent": parent,
+        })
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator["RenderProfiler"]:
+        """在此區塊內設為目前執行緒的使用中 profiler"""
+        previous = getattr(_local, "profiler", None)
+        _local.profiler = self
+        try:
+            yield self
+        finally:
+            _local.profiler = previous
+
+    def to_dict(self) -> Dict[str, Any]:
+        """轉為可 JSON 序列化的 dict(總計算到呼叫當下)"""
+        return {
+            "label": self.label,
+            "pid": os.getpid(),
+            "started_at": self._started_at,
+            "wall_sec": time.perf_counter() - self._wall0,
+            "cpu_sec": time.process_time() - self._cpu0,
+            "child_cpu_sec": child_cpu_time() - self._child0,
+            "frames": self.frames,
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": [dict(record) for record in self.stages],
+        }
+
+
+def active_profiler() -> Optional[RenderProfiler]:
+    """目前執行緒的使用中 profiler,沒有時為 None"""
+    return getattr(_local, "profiler", None)
+
+
+def to_chrome_trace(profiles: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """把多個 profile 轉為 Chrome trace-event 格式
+
+    每個 profile 以 pid 分組(工作行程並排),以 label 為執行緒名稱;
+    子階段(parent 不為 None)依序排在上層階段開始處,顯示為巢狀區段。
+
+    Args:
+        profiles: RenderProfiler.to_dict() 的列表
+
+    Returns:
+        {"traceEvents": [...], "displayTimeUnit": "ms"}
+    """
+    events: List[Dict[str, Any]] = []
+    for tid, profile in enumerate(profiles, start=1):
+        pid = profile.get("pid", 0)
+        events.append({
+            "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+            "args": {"name": profile.get("label") or f"render {tid}"},
+        })
+        cursor: Dict[str, float] = {}
+        for record in profile.get("stages", []):
+            start = record["start"]
+            parent = record.get("parent")
+            if parent is not None:
+                start = cursor.get(parent, start)
+                cursor[parent] = start + record["wall_sec"]
+            events.append({
+                "name": record["name"],
+                "cat": "render",
+                "ph": "X",
+                "ts": int(start * 1e6),
+                "dur": max(1, int(record["wall_sec"] * 1e6)),
+                "pid": pid,
+                "tid": tid,
+                "args": {
+                    "cpu_sec": round(record.get("cpu_sec", 0.0), 6),
+                    "child_cpu_sec": round(
+                        record.get("child_cpu_sec", 0.0), 6),
+                },
+            })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def collect_profiles(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """從 render_video 或 render_batch 的結果取出所有 profile
+
+    批次結果會先列出主行程的 profile,再依輸入順序列出各項目的 profile
+    (跳過或失敗的項目沒有 profile)。
+
+    Args:
+        result: render_video / render_batch 的回傳值
+
+    Returns:
+        RenderProfiler.to_dict() 的列表
+    """
+    items = [result] + list(result.get("results") or [])
+    profiles = []
+    for item in items:
+        profile = (item.get("metadata") or {}).get("profile")
+        if profile:
+            profiles.append(profile)
+    return profiles
+
+
+def write_profile(path: str, profiles: Sequence[Dict[str, Any]],
+                  fmt: str = "json") -> str:
+    """把 profile 寫入檔案
+
+    Args:
+        path: 輸出路徑
+        profiles: RenderProfiler.to_dict() 的列表
+        fmt: "json"(計時摘要)或 "chrome"(trace-event 檔)
+
+    Returns:
+        輸出路徑
+
+    Raises:
+        ValueError: 不支援的格式
+    """
+    if fmt not in PROFILE_FORMATS:
+        raise ValueError(
+            f"不支援的 profile 格式: {fmt} (可用: {', '.join(PROFILE_FORMATS)})"
+        )
+    if fmt == "chrome":
+        payload: Dict[str, Any] = to_chrome_trace(profiles)
+    else:
+        payload = {"version": PROFILE_VERSION, "profiles": list(profiles)}
+    out_dir = os.path.dirname(path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False, indent=2)
+    return path
@@ -4,12 +4,17 @@
 - SCHEMA: JSON Schema 定義(Draft-07 規範)
 - validate_schema: 驗證單一資料項目
 - load_json: 從檔案載入並解析 JSON
+- iter_batch_items: 逐行串流讀取批次檔(JSON / JSON Lines / CSV),
+  每行各自驗證,錯誤以行號回報而不中斷讀取
 
 這些函數從 utils.py 遷移而來,並增強錯誤處理。
 """
 
+import csv
 import json
-from typing import Any, List
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
 from pathlib import Path
 
 # ========== JSON Schema 定義 ==========
@@ -183,3 +188,190 @@ def load_json(file_path: str) -> List[dict]:
         raise TypeError(f"JSON 根節點必須是陣列,收到 {type(data).__name__}")
 
     return data
+
+
+# ========== 批次檔串流讀取 ==========
+
+# 支援的批次檔格式(依副檔名判斷,其餘視為 JSON 陣列)
+BATCH_FORMATS = ("json", "jsonl", "csv")
+
+_BATCH_EXTENSIONS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+}
+
+# doc/Fry_Words_1_500.csv 格式的欄位 (Word,詞性,中文翻譯,例句)
+_WORD_LIST_COLUMNS = {"Word": "word_en", "中文翻譯": "word_zh"}
+
+_TRUE_VALUES = {"true", "1", "yes", "y"}
+_FALSE_VALUES = {"false", "0", "no", "n"}
+
+
+@dataclass
+class BatchRecord:
+    """批次檔中的一筆資料
+
+    Attributes:
+        line: 行號(JSON 陣列為項目序號,從 1 起算)
+        item: 通過驗證的配置字典(驗證失敗時為 None)
+        errors: 驗證錯誤訊息(空列表表示通過)
+    """
+
+    line: int
+    item: Optional[Dict[str, Any]] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """此行是否通過驗證"""
+        return not self.errors
+
+
+def detect_batch_format(file_path: str) -> str:
+    """依副檔名判斷批次檔格式
+
+    Args:
+        file_path: 批次檔路徑
+
+    Returns:
+        "jsonl"(.jsonl / .ndjson)、"csv" 或 "json"
+    """
+    ext = os.path.splitext(str(file_path))[1].lower()
+    return _BATCH_EXTENSIONS.get(ext, "json")
+
+
+def _letters_from_word(word: str) -> Optional[str]:
+    """由單字第一個英文字母推導 letters 欄位(如 "able" → "Aa")"""
+    for ch in word:
+        if ch.isascii() and ch.isalpha():
+            return ch.upper() + ch.lower()
+    return None
+
+
+def _coerce_csv_value(key: str, value: str) -> Any:
+    """依 SCHEMA 型別轉換 CSV 字串欄位"""
+    expected_type = SCHEMA["items"]["properties"].get(key, {}).get("type")
+    if expected_type == "number":
+        try:
+            number = float(value)
+        except ValueError:
+            return value
+        return int(number) if number.is_integer() else number
+    if expected_type == "boolean":
+        lowered = value.lower()
+        if lowered in _TRUE_VALUES:
+            return True
+        if lowered in _FALSE_VALUES:
+            return False
+    return value
+
+
+def _csv_row_to_item(row: Dict[str, Any]) -> Dict[str, Any]:
+    """把 CSV 列轉為配置字典
+
+    欄位名稱與 SCHEMA 相同時直接使用(空白欄位視為未指定);
+    單字表格式(Word / 中文翻譯)則由單字推導 letters,其餘欄位忽略。
+    """
+    if "word_en" in row or "letters" in row:
+        return {
+            key: _coerce_csv_value(key, value.strip())
+            for key, value in row.items()
+            if key is not None and value is not None and value.strip()
+        }
+    item: Dict[str, Any] = {}
+    for column, key in _WORD_LIST_COLUMNS.items():
+        value = (row.get(column) or "").strip()
+        if value:
+            item[key] = value
+    letters = _letters_from_word(item.get("word_en", ""))
+    if letters:
+        item["letters"] = letters
+    return item
+
+
+def _check_item(line: int, item: Any) -> BatchRecord:
+    """驗證單筆資料,錯誤收進 BatchRecord 而不拋出"""
+    if not isinstance(item, dict):
+        return BatchRecord(line, errors=[
+            f"項目必須是物件,收到 {type(item).__name__}"])
+    try:
+        validate_schema(item)
+    except ValidationError as e:
+        return BatchRecord(line, errors=list(e.errors))
+    return BatchRecord(line, item=item)
+
+
+def _iter_json_array(path: Path) -> Iterator[BatchRecord]:
+    for index, item in enumerate(load_json(str(path)), start=1):
+        yield _check_item(index, item)
+
+
+def _iter_json_lines(path: Path) -> Iterator[BatchRecord]:
+    with path.open("r", encoding="utf-8-sig") as handle:
+        for line_no, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield BatchRecord(line_no, errors=[f"JSON 格式錯誤: {e.msg}"])
+                continue
+            yield _check_item(line_no, item)
+
+
+def _iter_csv_rows(path: Path) -> Iterator[BatchRecord]:
+    # utf-8-sig: 容許 Excel 匯出的 BOM
+    with path.open("r", encoding="utf-8-sig", newline="") as handle:
+        reader = csv.DictReader(handle)
+        for row in reader:
+            if not any((value or "").strip() for value in row.values()
+                       if isinstance(value, str)):
+                continue
+            yield _check_item(reader.line_num, _csv_row_to_item(row))
+
+
+def iter_batch_items(file_path: str,
+                     fmt: Optional[str] = None) -> Iterator[BatchRecord]:
+    """逐筆讀取並驗證批次檔
+
+    JSON Lines 與 CSV 一次只讀一行,記憶體用量與檔案大小無關;
+    JSON 陣列格式需先整份解析(相容既有的 config.json)。
+    每行各自驗證,格式或欄位錯誤以 BatchRecord.errors 回報,
+    不會中斷後續資料的讀取。
+
+    CSV 可使用與 SCHEMA 相同的欄位名稱,或 doc/Fry_Words_1_500.csv
+    的單字表格式(Word,詞性,中文翻譯,例句;letters 由單字首字母推導)。
+
+    Args:
+        file_path: 批次檔路徑
+        fmt: "json" / "jsonl" / "csv",None 則依副檔名判斷
+
+    Returns:
+        BatchRecord 的迭代器(依檔案順序)
+
+    Raises:
+        FileNotFoundError: 當檔案不存在時
+        ValueError: 不支援的格式
+
+    Example:
+        >>> for record in iter_batch_items("doc/Fry_Words_1_500.csv"):
+        ...     if not record.ok:
+        ...         print(record.line, record.errors)
+        >>> next(iter_batch_items("words.jsonl")).item["word_en"]
+        'Ice'
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"找不到檔案: {file_path}")
+
+    fmt = fmt or detect_batch_format(file_path)
+    if fmt == "jsonl":
+        return _iter_json_lines(path)
+    if fmt == "csv":
+        return _iter_csv_rows(path)
+    if fmt == "json":
+        return _iter_json_array(path)
+    raise ValueError(
+        f"不支援的批次檔格式: {fmt} (可用: {', '.join(BATCH_FORMATS)})"
+    )
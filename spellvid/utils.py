@@ -18,8 +18,6 @@ import shutil
 import subprocess
 import tempfile
 from typing import Dict, List, Any, Tuple, Optional
-import numpy as _np
-from PIL import Image, ImageDraw, ImageFont
 
 # Issue deprecation warning
 warnings.warn(
@@ -30,36 +28,59 @@ warnings.warn(
     stacklevel=2
 )
 
-# moviepy imports are optional; try several fallbacks so utils can detect
-# moviepy whether it's packaged as `moviepy.editor` or `moviepy` module.
-_mpy = None
-_mpy_config = None
-_HAS_MOVIEPY = False
-try:
-    # try editor submodule first (preferred)
-    from moviepy import editor as _mpy  # type: ignore
-    try:
-        from moviepy import config as _mpy_config  # type: ignore
-    except Exception:
-        _mpy_config = None  # type: ignore
-    _HAS_MOVIEPY = True
-except Exception:
+# numpy, PIL and moviepy are loaded on first access (see __getattr__ at
+# the bottom of this module), so importing this compatibility layer no
+# longer pulls in the whole rendering stack.
+_LAZY_IMPORTS = {
+    "_np": ("numpy", None),
+    "Image": ("PIL", "Image"),
+    "ImageDraw": ("PIL", "ImageDraw"),
+    "ImageFont": ("PIL", "ImageFont"),
+}
+_MOVIEPY_NAMES = ("_mpy", "_mpy_config", "_HAS_MOVIEPY")
+
+
+def _load_moviepy() -> bool:
+    """Detect moviepy and store it in _mpy / _mpy_config / _HAS_MOVIEPY.
+
+    moviepy imports are optional; try several fallbacks so utils can detect
+    moviepy whether it's packaged as `moviepy.editor` or `moviepy` module.
+    """
+    if "_HAS_MOVIEPY" in globals():
+        return globals()["_HAS_MOVIEPY"]
+    mpy = None
+    mpy_config = None
+    has_moviepy = False
     try:
-        # fall back to top-level moviepy module
-        import moviepy as _mpy  # type: ignore
+        # try editor submodule first (preferred)
+        from moviepy import editor as mpy  # type: ignore
         try:
-            from moviepy import config as _mpy_config  # type: ignore
+            from moviepy import config as mpy_config  # type: ignore
         except Exception:
-            _mpy_config = None  # type: ignore
-        # verify it exposes the core classes we need
-        if hasattr(_mpy, "ImageClip") and hasattr(_mpy, "AudioFileClip"):
-            _HAS_MOVIEPY = True
-        else:
-            _mpy = None
+            mpy_config = None  # type: ignore
+        has_moviepy = True
     except Exception:
-        _mpy = None
-        _mpy_config = None
-        _HAS_MOVIEPY = False
+        try:
+            # fall back to top-level moviepy module
+            import moviepy as mpy  # type: ignore
+            try:
+                from moviepy import config as mpy_config  # type: ignore
+            except Exception:
+                mpy_config = None  # type: ignore
+            # verify it exposes the core classes we need
+            if hasattr(mpy, "ImageClip") and hasattr(mpy, "AudioFileClip"):
+                has_moviepy = True
+            else:
+                mpy = None
+        except Exception:
+            mpy = None
+            mpy_config = None
+            has_moviepy = False
+    globals().update(
+        _mpy=mpy, _mpy_config=mpy_config, _HAS_MOVIEPY=has_moviepy
+    )
+    return has_moviepy
+
 
 PROGRESS_BAR_SAFE_X = 64
 PROGRESS_BAR_MAX_X = 1856
@@ -341,12 +362,12 @@ def _progress_bar_band_layout(bar_width: int) -> List[Dict[str, Any]]:
     return _impl(bar_width)
 
 
-_progress_bar_cache: Dict[int, Tuple[_np.ndarray, _np.ndarray]] = {}
+_progress_bar_cache: Dict[int, Tuple["_np.ndarray", "_np.ndarray"]] = {}
 
 
 def _progress_bar_base_arrays(
     bar_width: int,
-) -> Tuple[_np.ndarray, _np.ndarray]:
+) -> Tuple["_np.ndarray", "_np.ndarray"]:
     """⚠️ DEPRECATED: 向後相容層 - 將在 v2.0 移除
 
     使用 infrastructure.ui.progress_bar.generate_base_arrays
@@ -358,7 +379,7 @@ def _progress_bar_base_arrays(
     return _impl(bar_width)
 
 
-def _make_progress_bar_mask(mask_slice: _np.ndarray, duration: float):
+def _make_progress_bar_mask(mask_slice: "_np.ndarray", duration: float):
     """⚠️ DEPRECATED: 向後相容層 - 將在 v2.0 移除
 
     使用 infrastructure.ui.progress_bar.create_mask_clip
@@ -398,7 +419,7 @@ def _find_and_set_ffmpeg():
     return _impl()
 
 
-def _measure_text_with_pil(text: str, pil_font: ImageFont.ImageFont):
+def _measure_text_with_pil(text: str, pil_font: "ImageFont.ImageFont"):
     """⚠️ DEPRECATED: 向後相容層 - 將在 v2.0 移除
 
     已遷移至: spellvid.infrastructure.rendering.pillow_adapter._measure_text_with_pil
@@ -662,6 +683,11 @@ def compute_layout_bboxes(
 
     Returns bounding boxes for keys: letters, zh, timer, reveal.
     """
+    from spellvid.infrastructure.rendering.font_registry import (
+        default_font,
+        load_font,
+    )
+
     w_vid, h_vid = video_size
     boxes: Dict[str, Dict[str, int]] = {}
 
@@ -691,7 +717,7 @@ def compute_layout_bboxes(
                 letters_y = LETTER_SAFE_Y
                 font_size = 140
                 try:
-                    font = ImageFont.load_default()
+                    font = default_font()
                 except Exception:
                     font = None
                 if font is None:
@@ -731,9 +757,9 @@ def compute_layout_bboxes(
         base_font_size = 96
         try:
             if font_path:
-                ch_font = ImageFont.truetype(font_path, base_font_size)
+                ch_font = load_font(font_path, base_font_size)
             else:
-                ch_font = ImageFont.load_default()
+                ch_font = default_font()
 
             padding = 8
             total_w = 0
@@ -768,12 +794,12 @@ def compute_layout_bboxes(
                     while True:
                         try:
                             zh_font = (
-                                ImageFont.truetype(font_path, zh_font_size)
+                                load_font(font_path, zh_font_size)
                                 if font_path
-                                else ImageFont.load_default()
+                                else default_font()
                             )
                         except Exception:
-                            zh_font = ImageFont.load_default()
+                            zh_font = default_font()
 
                         zh_w = 0
                         zh_h = 0
@@ -1060,7 +1086,7 @@ def render_video_stub(
         stacklevel=2
     )
 
-    if use_moviepy and _HAS_MOVIEPY:
+    if use_moviepy and _load_moviepy():
         return render_video_moviepy(
             item, out_path, dry_run=dry_run, skip_ending=skip_ending
         )
@@ -1400,3 +1426,20 @@ __all__ = [
     '_HAS_MOVIEPY',
     '_find_and_set_ffmpeg',
 ]
+
+
+def __getattr__(name: str):
+    if name in _MOVIEPY_NAMES:
+        _load_moviepy()
+        return globals()[name]
+    if name in _LAZY_IMPORTS:
+        import importlib
+
+        module_name, attr = _LAZY_IMPORTS[name]
+        if attr is None:
+            value = importlib.import_module(module_name)
+        else:
+            value = importlib.import_module(f"{module_name}.{attr}")
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,6 +7,8 @@
 2. 驗證失敗處理(單支失敗不中斷批次)
 3. 驗證 skip_ending 在批次中的行為
 4. 驗證效能符合預期(≤ 110% baseline)
+5. 驗證增量渲染清單(跳過未變動項目、--force、失敗重試)
+6. 驗證串流輸入(讀到第一項即渲染、預讀判斷片尾、依序回呼)
 """
 
 import pytest
@@ -245,5 +247,323 @@ class TestBatchServiceIntegration:
         #     f"批次時間 {batch_time:.2f}s 超過 110% baseline {baseline:.2f}s"
 
 
+class TestBatchServiceParallel:
+    """BatchService 平行渲染 (workers > 1) 測試套件"""
+
+    def test_render_batch_workers_preserves_input_order(self, tmp_path):
+        """TC-BATCH-008: workers > 1 時結果仍依輸入順序回傳"""
+        from spellvid.application.batch_service import render_batch
+        from spellvid.shared.types import VideoConfig
+
+        words = ["Apple", "Ball", "Cat", "Dog", "Egg"]
+        configs = [
+            VideoConfig(letters=f"{w[0]} {w[0].lower()}", word_en=w,
+                        word_zh=w.lower())
+            for w in words
+        ]
+
+        result = render_batch(
+            configs=configs,
+            output_dir=str(tmp_path),
+            dry_run=True,
+            workers=3,
+        )
+
+        assert result["total"] == 5
+        assert result["success"] == 5
+        assert [r["index"] for r in result["results"]] == list(range(5))
+        assert [r["config"]["word_en"] for r in result["results"]] == words
+
+    def test_render_batch_workers_failure_does_not_abort(self, tmp_path):
+        """TC-BATCH-009: 平行模式下單支失敗不中斷批次"""
+        from spellvid.application.batch_service import render_batch
+        from spellvid.shared.types import VideoConfig
+
+        bad = VideoConfig(letters="B b", word_en="Ball", word_zh="ball")
+        # 建立後才破壞設定,使其在渲染階段 (子行程內) 失敗
+        bad.countdown_sec = "invalid"
+        configs = [
+            VideoConfig(letters="A a", word_en="Apple", word_zh="apple"),
+            bad,
+            VideoConfig(letters="C c", word_en="Cat", word_zh="cat"),
+        ]
+
+        result = render_batch(
+            configs=configs,
+            output_dir=str(tmp_path),
+            dry_run=True,
+            workers=2,
+        )
+
+        assert result["total"] == 3
+        assert result["success"] == 2
+        assert result["failed"] == 1
+        assert result["results"][1]["success"] is False
+        assert "error" in result["results"][1]
+        assert result["results"][2]["config"]["word_en"] == "Cat"
+
+    def test_render_batch_workers_passes_skip_ending(self, tmp_path):
+        """TC-BATCH-010: 平行模式仍只讓最後一支視頻保留片尾"""
+        from spellvid.application import batch_service
+        from spellvid.shared.types import VideoConfig
+
+        configs = [
+            VideoConfig(letters="A a", word_en="Apple", word_zh="apple"),
+            VideoConfig(letters="B b", word_en="Ball", word_zh="ball"),
+            VideoConfig(letters="C c", word_en="Cat", word_zh="cat"),
+        ]
+
+        jobs = []
+        original = batch_service._render_batch_item
+
+        def _record(idx, config, output_path, dry_run, skip_ending,
+                    plan=None):
+            jobs.append((idx, skip_ending))
+            return original(idx, config, output_path, dry_run, skip_ending,
+                            plan)
+
+        batch_service._render_batch_item = _record
+        try:
+            # workers=1 走同行程路徑,可直接觀察片尾參數
+            batch_service.render_batch(
+                configs, str(tmp_path), dry_run=True, workers=1
+            )
+        finally:
+            batch_service._render_batch_item = original
+
+        assert sorted(jobs) == [(0, True), (1, True), (2, False)]
+
+    def test_render_batch_rejects_invalid_workers(self, tmp_path):
+        """TC-BATCH-011: workers < 1 應拋出 ValueError"""
+        from spellvid.application.batch_service import render_batch
+        from spellvid.shared.types import VideoConfig
+
+        configs = [VideoConfig(letters="A a", word_en="Apple", word_zh="a")]
+        with pytest.raises(ValueError):
+            render_batch(configs, str(tmp_path), dry_run=True, workers=0)
+
+    def test_render_batch_passes_compiled_plans(self, tmp_path,
+                                                monkeypatch):
+        """TC-BATCH-015: 主行程預先編譯計畫,並交給每個項目"""
+        from spellvid.application import batch_service
+        from spellvid.application.render_plan import RenderPlan
+        from spellvid.shared.types import VideoConfig
+
+        configs = [
+            VideoConfig(letters="A a", word_en="Apple", word_zh="apple"),
+            VideoConfig(letters="B b", word_en="Ball", word_zh="ball"),
+        ]
+        plans = []
+        original = batch_service._render_batch_item
+
+        def _record(idx, config, output_path, dry_run, skip_ending,
+                    plan=None):
+            plans.append(plan)
+            return original(idx, config, output_path, dry_run, skip_ending,
+                            plan)
+
+        monkeypatch.setattr(batch_service, "_render_batch_item", _record)
+        result = batch_service.render_batch(
+            configs, str(tmp_path), dry_run=True)
+
+        assert all(isinstance(p, RenderPlan) for p in plans)
+        assert [p.item["word_en"] for p in plans] == ["Apple", "Ball"]
+        assert [p.skip_ending for p in plans] == [True, False]
+        assert result["results"][1]["plan"]["item"]["word_en"] == "Ball"
+
+    def test_render_batch_reports_profile(self, tmp_path):
+        """TC-BATCH-016: 批次與每個項目的 metadata 含階段計時"""
+        from spellvid.application.batch_service import render_batch
+        from spellvid.shared.types import VideoConfig
+
+        configs = [
+            VideoConfig(letters="A a", word_en="Apple", word_zh="apple"),
+            VideoConfig(letters="B b", word_en="Ball", word_zh="ball"),
+        ]
+        result = render_batch(configs, str(tmp_path), dry_run=True)
+
+        profile = result["metadata"]["profile"]
+        assert [s["name"] for s in profile["stages"]] == \
+            ["manifest", "compile_plans", "render"]
+        for item in result["results"]:
+            stages = item["metadata"]["profile"]["stages"]
+            assert [s["name"] for s in stages] == ["plan"]
+
+    def test_render_batch_streams_iterator(self, tmp_path, monkeypatch):
+        """TC-BATCH-017: 迭代器輸入讀到第一項即渲染,預讀一項保留片尾"""
+        from spellvid.application import batch_service
+        from spellvid.shared.types import VideoConfig
+
+        events = []
+
+        def _configs():
+            for word in ["Apple", "Ball", "Cat"]:
+                events.append(("read", word))
+                yield VideoConfig(letters=f"{word[0]} {word[0].lower()}",
+                                  word_en=word, word_zh=word.lower())
+
+        original = batch_service._render_batch_item
+
+        def _record(idx, config, output_path, dry_run, skip_ending,
+                    plan=None):
+            events.append(("render", config.word_en, skip_ending))
+            return original(idx, config, output_path, dry_run, skip_ending,
+                            plan)
+
+        monkeypatch.setattr(batch_service, "_render_batch_item", _record)
+        delivered = []
+        result = batch_service.render_batch(
+            _configs(), str(tmp_path), dry_run=True,
+            on_result=lambda r: delivered.append(r["config"]["word_en"]),
+        )
+
+        # 第一項在讀完整個輸入前就已渲染 (只預讀下一項)
+        assert events.index(("render", "Apple", True)) < \
+            events.index(("read", "Cat"))
+        assert ("render", "Cat", False) in events
+        assert delivered == ["Apple", "Ball", "Cat"]
+        assert (result["total"], result["success"]) == (3, 3)
+        assert result["results"] == []
+        stages = result["metadata"]["profile"]["stages"]
+        assert [s["name"] for s in stages] == \
+            ["manifest", "compile_plans", "render"]
+
+    def test_render_batch_workers_stream_in_order(self, tmp_path):
+        """TC-BATCH-018: 平行模式串流輸入仍依輸入順序回呼"""
+        from spellvid.application.batch_service import render_batch
+        from spellvid.shared.types import VideoConfig
+
+        words = [f"Word{i}" for i in range(7)]
+        configs = (VideoConfig(letters="W w", word_en=w, word_zh="字")
+                   for w in words)
+        delivered = []
+
+        result = render_batch(configs, str(tmp_path), dry_run=True,
+                              workers=2, on_result=delivered.append)
+
+        assert [r["index"] for r in delivered] == list(range(7))
+        assert [r["config"]["word_en"] for r in delivered] == words
+        assert (result["total"], result["failed"]) == (7, 0)
+
+
+@pytest.fixture
+def fake_render(monkeypatch):
+    """以寫入佔位輸出檔取代實際渲染,記錄被渲染的項目"""
+    from spellvid.application import batch_service
+
+    rendered = []
+
+    def _fake(idx, config, output_path, dry_run, skip_ending, plan=None):
+        rendered.append(config.word_en)
+        if config.word_zh == "fail":
+            return {"success": False, "index": idx,
+                    "output_path": output_path, "error": "boom",
+                    "config": batch_service._config_summary(config)}
+        with open(output_path, "wb") as handle:
+            handle.write(b"mp4")
+        return {"success": True, "index": idx, "output_path": output_path,
+                "config": batch_service._config_summary(config)}
+
+    monkeypatch.setattr(batch_service, "_render_batch_item", _fake)
+    return rendered
+
+
+class TestBatchServiceManifest:
+    """BatchService 增量渲染清單測試套件"""
+
+    def test_rerun_skips_unchanged_items(self, tmp_path, fake_render):
+        """TC-BATCH-012: 重新執行時跳過輸出存在且指紋未變的項目"""
+        from spellvid.application.batch_manifest import MANIFEST_NAME
+        from spellvid.application.batch_service import render_batch
+        from spellvid.shared.types import VideoConfig
+
+        configs = [
+            VideoConfig(letters="A a", word_en="Apple", word_zh="apple"),
+            VideoConfig(letters="B b", word_en="Ball", word_zh="ball"),
+        ]
+        first = render_batch(configs, str(tmp_path))
+        assert (first["rendered"], first["skipped"]) == (2, 0)
+        assert (tmp_path / MANIFEST_NAME).exists()
+
+        configs[1].countdown_sec = 5
+        (tmp_path / "Apple.mp4").unlink()
+        fake_render.clear()
+        second = render_batch(configs, str(tmp_path))
+
+        # Apple 輸出被刪除、Ball 設定變更,兩者都重新渲染
+        assert fake_render == ["Apple", "Ball"]
+        assert second["skipped"] == 0
+
+        fake_render.clear()
+        third = render_batch(configs, str(tmp_path))
+        assert fake_render == []
+        assert (third["success"], third["rendered"], third["skipped"]) == \
+            (2, 0, 2)
+        assert all(r["status"] == "skipped" for r in third["results"])
+
+    def test_force_and_failed_items(self, tmp_path, fake_render):
+        """TC-BATCH-013: 失敗項目下次重試,force 重新渲染全部"""
+        from spellvid.application.batch_service import render_batch
+        from spellvid.shared.types import VideoConfig
+
+        configs = [
+            VideoConfig(letters="A a", word_en="Apple", word_zh="apple"),
+            VideoConfig(letters="B b", word_en="Ball", word_zh="fail"),
+        ]
+        first = render_batch(configs, str(tmp_path))
+        assert (first["rendered"], first["failed"]) == (1, 1)
+
+        fake_render.clear()
+        render_batch(configs, str(tmp_path))
+        assert fake_render == ["Ball"]
+
+        fake_render.clear()
+        forced = render_batch(configs, str(tmp_path), force=True)
+        assert fake_render == ["Apple", "Ball"]
+        assert forced["skipped"] == 0
+
+    def test_asset_change_and_ending_invalidate(self, tmp_path, fake_render):
+        """TC-BATCH-014: 素材修改時間或片尾規則變更時指紋不同"""
+        import os
+
+        from spellvid.application.batch_manifest import item_fingerprint
+        from spellvid.shared.types import VideoConfig
+
+        image = tmp_path / "apple.png"
+        image.write_bytes(b"png")
+        config = VideoConfig(letters="A a", word_en="Apple", word_zh="a",
+                             image_path=str(image))
+        before = item_fingerprint(config, skip_ending=True)
+
+        assert item_fingerprint(config, skip_ending=False) != before
+        os.utime(image, ns=(1, 1))
+        assert item_fingerprint(config, skip_ending=True) != before
+
+    def test_asset_change_between_batches(self, tmp_path, fake_render):
+        """TC-BATCH-019: 同一行程內兩次批次之間素材變動時重新渲染"""
+        from spellvid.application.batch_service import render_batch
+        from spellvid.infrastructure.media.asset_index import (
+            asset_index_scope,
+        )
+        from spellvid.shared.types import VideoConfig
+
+        image = tmp_path / "apple.png"
+        image.write_bytes(b"png")
+        configs = [VideoConfig(letters="A a", word_en="Apple", word_zh="a",
+                               image_path=str(image))]
+
+        # 外層共用的索引 (如 GUI 行程) 也不能讓變動的素材被跳過
+        with asset_index_scope() as index:
+            render_batch(configs, str(tmp_path / "out"))
+            assert index.exists(str(image))
+            image.write_bytes(b"png with new content")
+
+            fake_render.clear()
+            second = render_batch(configs, str(tmp_path / "out"))
+
+        assert fake_render == ["Apple"]
+        assert (second["rendered"], second["skipped"]) == (1, 0)
+
+
 # 標記此測試模組為整合測試
 pytestmark = pytest.mark.integration
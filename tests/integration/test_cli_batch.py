@@ -7,6 +7,7 @@
 2. 使用 subprocess 執行 CLI 命令
 3. 驗證批次處理結果
 4. 驗證輸出檔案存在
+5. 驗證 CSV / JSON Lines 批次檔與逐行錯誤回報
 """
 
 import pytest
@@ -250,3 +251,33 @@ class TestCliBatch:
         #     "應該顯示 --outdir 參數說明"
         # assert "--dry-run" in result.stdout, \
         #     "應該顯示 --dry-run 參數說明"
+
+    def test_batch_command_streams_csv(self, tmp_path, capsys):
+        """TC-CLI-BATCH-007: 驗證 CSV 批次檔逐行回報錯誤並渲染其餘項目
+
+        測試案例: doc/Fry_Words_1_500.csv 格式含一行缺欄位
+        前置條件: dry-run
+        預期結果: 錯誤行以行號回報, 其餘項目成功, exit code 1
+        """
+        from spellvid.cli.__main__ import main
+
+        csv_file = tmp_path / "words.csv"
+        csv_file.write_text(
+            "Word,詞性,中文翻譯,例句\n"
+            "able,其他,能夠的,He is able to swim.\n"
+            "bus,公車\n"
+            "cat,名詞,貓,I see a cat.\n",
+            encoding="utf-8",
+        )
+
+        exit_code = main([
+            "batch", "--json", str(csv_file),
+            "--outdir", str(tmp_path / "out"), "--dry-run",
+        ])
+
+        captured = capsys.readouterr()
+        assert exit_code == 1
+        assert "line 3: 缺少必填欄位: word_zh" in captured.err
+        assert "Total: 2" in captured.out
+        assert "Success: 2" in captured.out
+        assert "Invalid lines: 1" in captured.out
@@ -0,0 +1,424 @@
+"""端到端渲染效能基準
+
+以本機合成的素材實際渲染,量測渲染吞吐量,並與 JSON 基準比較:
+
+- 素材:字母 PNG(A-Z 大小寫)、圖片背景、短 mp4 背景視頻、片頭/片尾
+  視頻與 mp3 音樂,全部由 Pillow 與 ffmpeg lavfi 在工作目錄產生
+- 情境:
+    make   — 單支視頻(圖片 + 音樂 + 片頭 + 片尾)
+    batch  — 26 個項目的 batch(圖片與視頻背景交錯)
+    concat — 以 concatenate_videos_with_transitions 串接 batch 輸出
+- 指標:frames_per_sec、sec_per_video、peak_rss_mb、output_bytes、wall_sec
+  (make/batch 經 CLI 子行程執行並以 --profile 取得影格數與峰值記憶體,
+  因此每個情境的峰值記憶體互不影響)
+- 比較:與基準相比變差超過門檻(預設 20%)的指標視為回歸;基準的
+  machine(平台或 CPU 數)與本機不同時,時間類指標無從比較,只發出
+  警告並略過,仍比較峰值記憶體與輸出大小
+
+執行方式:
+    # 執行並與基準比較(有回歸時 exit code 1)
+    python tests/performance/benchmark_suite.py
+
+    # 重新記錄基準
+    python tests/performance/benchmark_suite.py --update-baseline
+
+    # pytest(預設略過,需設定 SPELLVID_RUN_BENCHMARKS=1)
+    SPELLVID_RUN_BENCHMARKS=1 pytest tests/performance/test_benchmarks.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from spellvid.infrastructure.video.ffmpeg_pipe import (  # noqa: E402
+    resolve_ffmpeg_exe,
+)
+
+# 基準檔格式變更時遞增
+BENCHMARK_VERSION = 1
+
+BASELINE_PATH = Path(__file__).with_name("benchmark_baseline.json")
+
+# 預設回歸門檻(相對基準變差的比例)
+DEFAULT_THRESHOLD = 0.2
+
+# 指標方向:True 表示越大越好
+METRICS = {
+    "frames_per_sec": True,
+    "sec_per_video": False,
+    "wall_sec": False,
+    "peak_rss_mb": False,
+    "output_bytes": False,
+}
+
+# 依賴機器速度的指標(基準機器不同時略過)
+TIME_METRICS = ("frames_per_sec", "sec_per_video", "wall_sec")
+
+# 判斷是否為同一台基準機器的欄位
+MACHINE_KEYS = ("platform", "cpu_count")
+
+# batch 情境的 26 個單字(每個字母一個)
+BATCH_WORDS = [
+    "Ant", "Bee", "Cat", "Dog", "Egg", "Fox", "Gum", "Hat", "Ink", "Jam",
+    "Kit", "Leg", "Map", "Net", "Owl", "Pig", "Quiz", "Rat", "Sun", "Top",
+    "Up", "Van", "Web", "Box", "Yak", "Zoo",
+]
+
+
+def _ffmpeg(*args: str) -> None:
+    subprocess.run(
+        [resolve_ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y",
+         *args],
+        check=True,
+    )
+
+
+def _lavfi_clip(path: Path, duration: float, size: str,
+                with_audio: bool) -> None:
+    """以 testsrc2(與 sine)產生 H.264 測試片段"""
+    args = ["-f", "lavfi", "-i",
+            f"testsrc2=size={size}:rate=24:duration={duration}"]
+    if with_audio:
+        args += ["-f", "lavfi", "-i",
+                 f"sine=frequency=440:sample_rate=44100:duration={duration}",
+                 "-c:a", "aac", "-ac", "2"]
+    args += ["-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt",
+             "yuv420p", str(path)]
+    _ffmpeg(*args)
+
+
+def generate_synthetic_assets(root: Path) -> Dict[str, str]:
+    """在 root 產生基準用素材
+
+    Args:
+        root: 素材目錄
+
+    Returns:
+        {"letters_dir", "image", "video", "entry", "ending", "music"}
+    """
+    from PIL import Image, ImageDraw
+
+    root.mkdir(parents=True, exist_ok=True)
+    letters_dir = root / "letters"
+    letters_dir.mkdir(exist_ok=True)
+    for code in range(ord("A"), ord("Z") + 1):
+        lower = chr(code).lower()
+        for ch, name in ((chr(code), f"{chr(code)}.png"),
+                         (lower, f"{lower}_small.png")):
+            img = Image.new("RGBA", (160, 220), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(img)
+            draw.rounded_rectangle((8, 8, 152, 212), radius=24,
+                                   fill=(40 + code, 90, 200, 255))
+            draw.text((64, 96), ch, fill=(255, 255, 255, 255))
+            img.save(letters_dir / name)
+
+    image = root / "picture.png"
+    Image.new("RGB", (800, 600), (120, 180, 90)).save(image)
+
+    video = root / "background.mp4"
+    _lavfi_clip(video, 2.0, "640x360", with_audio=False)
+    entry = root / "entry.mp4"
+    _lavfi_clip(entry, 1.0, "1920x1080", with_audio=True)
+    ending = root / "ending.mp4"
+    _lavfi_clip(ending, 1.0, "1920x1080", with_audio=True)
+
+    music = root / "music.mp3"
+    _ffmpeg("-f", "lavfi", "-i",
+            "sine=frequency=330:sample_rate=44100:duration=20",
+            "-ac", "2", "-c:a", "libmp3lame", "-b:a", "128k", str(music))
+
+    return {
+        "letters_dir": str(letters_dir),
+        "image": str(image),
+        "video": str(video),
+        "entry": str(entry),
+        "ending": str(ending),
+        "music": str(music),
+    }
+
+
+def _environment(assets: Dict[str, str], cache_dir: Path) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "SPELLVID_LETTER_ASSET_DIR": assets["letters_dir"],
+        "SPELLVID_ENTRY_VIDEO_PATH": assets["entry"],
+        "SPELLVID_ENDING_VIDEO_PATH": assets["ending"],
+        "SPELLVID_CACHE_DIR": str(cache_dir),
+        "PYTHONPATH": os.pathsep.join(
+            p for p in (str(PROJECT_ROOT), env.get("PYTHONPATH")) if p),
+    })
+    return env
+
+
+def _run_cli(args: List[str], env: Dict[str, str],
+             profile_path: Path) -> tuple[float, List[Dict[str, Any]]]:
+    """執行 CLI 子命令,回傳 (牆鐘秒數, profiles)"""
+    cmd = [sys.executable, "-m", "spellvid.cli", *args,
+           "--profile", str(profile_path)]
+    started = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"{' '.join(args[:1])} failed ({proc.returncode}):\n"
+            f"{proc.stdout[-2000:]}\n{proc.stderr[-2000:]}"
+        )
+    with open(profile_path, encoding="utf-8") as handle:
+        return elapsed, json.load(handle)["profiles"]
+
+
+def _scenario_result(elapsed: float, videos: int, frames: Optional[int],
+                     peak_rss: List[Optional[float]],
+                     outputs: List[Path]) -> Dict[str, Any]:
+    peaks = [p for p in peak_rss if p is not None]
+    return {
+        "wall_sec": round(elapsed, 3),
+        "videos": videos,
+        "frames": frames,
+        "frames_per_sec": round(frames / elapsed, 2) if frames else None,
+        "sec_per_video": round(elapsed / max(videos, 1), 3),
+        "peak_rss_mb": max(peaks) if peaks else None,
+        "output_bytes": sum(p.stat().st_size for p in outputs),
+    }
+
+
+def bench_make(assets: Dict[str, str], env: Dict[str, str],
+               out_dir: Path) -> Dict[str, Any]:
+    """單支視頻:圖片背景、音樂、片頭與片尾"""
+    output = out_dir / "make" / "Ice.mp4"
+    elapsed, profiles = _run_cli([
+        "make", "--letters", "I i", "--word-en", "Ice", "--word-zh", "冰",
+        "--image", assets["image"], "--music", assets["music"],
+        "--countdown", "3", "--reveal-hold", "2", "--out", str(output),
+    ], env, out_dir / "make_profile.json")
+    return _scenario_result(
+        elapsed, 1, sum(p["frames"] for p in profiles),
+        [p.get("peak_rss_mb") for p in profiles], [output])
+
+
+def bench_batch(assets: Dict[str, str], env: Dict[str, str],
+                out_dir: Path, size: int = 26,
+                jobs: int = 1) -> Dict[str, Any]:
+    """size 個項目的 batch,圖片與視頻背景交錯"""
+    words = [BATCH_WORDS[i % len(BATCH_WORDS)] + ("" if i < 26 else str(i))
+             for i in range(size)]
+    items = [
+        {
+            "letters": f"{word[0].upper()} {word[0].lower()}",
+            "word_en": word,
+            "word_zh": word.lower(),
+            "image_path": assets["image"] if i % 2 == 0 else assets["video"],
+            "music_path": assets["music"],
+            "countdown_sec": 1,
+            "reveal_hold_sec": 1,
+        }
+        for i, word in enumerate(words)
+    ]
+    config = out_dir / "batch.json"
+    config.write_text(json.dumps(items, ensure_ascii=False), encoding="utf-8")
+    batch_dir = out_dir / "batch"
+    elapsed, profiles = _run_cli([
+        "batch", "--json", str(config), "--outdir", str(batch_dir),
+        "--jobs", str(jobs), "--force",
+    ], env, out_dir / "batch_profile.json")
+    outputs = [batch_dir / f"{word}.mp4" for word in words]
+    return _scenario_result(
+        elapsed, size, sum(p["frames"] for p in profiles),
+        [p.get("peak_rss_mb") for p in profiles], outputs)
+
+
+_CONCAT_SNIPPET = """
+import json, sys
+from spellvid.application.batch_service import (
+    concatenate_videos_with_transitions,
+)
+from spellvid.shared.profiling import peak_rss_mb
+result = concatenate_videos_with_transitions(sys.argv[2:], sys.argv[1])
+print(json.dumps({"status": result["status"],
+                  "message": result.get("message"),
+                  "peak_rss_mb": peak_rss_mb()}))
+"""
+
+
+def bench_concat(env: Dict[str, str], out_dir: Path,
+                 inputs: List[Path]) -> Dict[str, Any]:
+    """串接 batch 的輸出(淡入區段重新編碼,其餘串流複製)"""
+    output = out_dir / "concat.mp4"
+    cmd = [sys.executable, "-c", _CONCAT_SNIPPET, str(output),
+           *map(str, inputs)]
+    started = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True,
+                          check=True)
+    elapsed = time.perf_counter() - started
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    if report["status"] != "ok":
+        raise RuntimeError(f"concat failed: {report['message']}")
+    return _scenario_result(elapsed, len(inputs), None,
+                            [report["peak_rss_mb"]], [output])
+
+
+def run_benchmarks(workdir: Path, batch_size: int = 26,
+                   jobs: int = 1) -> Dict[str, Any]:
+    """產生素材並執行所有情境
+
+    Args:
+        workdir: 工作目錄(素材、快取與輸出)
+        batch_size: batch 情境的項目數
+        jobs: batch 情境的平行行程數
+
+    Returns:
+        {"version", "machine", "scenarios": {名稱: 指標}}
+    """
+    assets = generate_synthetic_assets(workdir / "assets")
+    out_dir = workdir / "out"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    env = _environment(assets, workdir / "cache")
+
+    scenarios = {"make": bench_make(assets, env, out_dir)}
+    scenarios["batch"] = bench_batch(assets, env, out_dir, batch_size, jobs)
+    batch_outputs = sorted((out_dir / "batch").glob("*.mp4"))
+    scenarios["concat"] = bench_concat(env, out_dir, batch_outputs)
+    return {
+        "version": BENCHMARK_VERSION,
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "batch_size": batch_size,
+        "jobs": jobs,
+        "scenarios": scenarios,
+    }
+
+
+def machine_mismatch(current: Dict[str, Any],
+                     baseline: Dict[str, Any]) -> List[str]:
+    """列出與基準不同的機器欄位(任一方未記錄的欄位不比較)"""
+    ours = current.get("machine") or {}
+    theirs = baseline.get("machine") or {}
+    return [
+        key for key in MACHINE_KEYS
+        if key in ours and key in theirs and ours[key] != theirs[key]
+    ]
+
+
+def compare_to_baseline(current: Dict[str, Any], baseline: Dict[str, Any],
+                        threshold: float = DEFAULT_THRESHOLD
+                        ) -> List[Dict[str, Any]]:
+    """找出相對基準變差超過門檻的指標
+
+    Args:
+        current: run_benchmarks 的結果
+        baseline: 基準(同格式)
+        threshold: 容許的變差比例(0.2 = 20%)
+
+    Returns:
+        回歸列表,每筆為 {"scenario", "metric", "baseline", "current",
+        "change"}(change 為相對變化,正值表示變差)。基準來自不同機器
+        時略過 TIME_METRICS 並發出 RuntimeWarning。
+    """
+    skipped = ()
+    mismatch = machine_mismatch(current, baseline)
+    if mismatch:
+        skipped = TIME_METRICS
+        warnings.warn(
+            "Benchmark baseline was recorded on a different machine "
+            f"({', '.join(mismatch)} differ); skipping time-based metrics",
+            RuntimeWarning, stacklevel=2,
+        )
+    regressions = []
+    for name, base_metrics in baseline.get("scenarios", {}).items():
+        metrics = current.get("scenarios", {}).get(name)
+        if metrics is None:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            if metric in skipped:
+                continue
+            base, value = base_metrics.get(metric), metrics.get(metric)
+            if not base or value is None:
+                continue
+            change = (value - base) / base
+            if higher_is_better:
+                change = -change
+            if change > threshold:
+                regressions.append({
+                    "scenario": name, "metric": metric, "baseline": base,
+                    "current": value, "change": round(change, 3),
+                })
+    return regressions
+
+
+def _print_report(current: Dict[str, Any],
+                  baseline: Optional[Dict[str, Any]]) -> None:
+    base_scenarios = (baseline or {}).get("scenarios", {})
+    for name, metrics in current["scenarios"].items():
+        print(f"[{name}]")
+        for metric in METRICS:
+            value = metrics.get(metric)
+            base = base_scenarios.get(name, {}).get(metric)
+            suffix = f"  (baseline {base})" if base is not None else ""
+            print(f"  {metric:>15}: {value}{suffix}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="端到端渲染效能基準")
+    parser.add_argument("--workdir", help="工作目錄 (預設: 暫存目錄)")
+    parser.add_argument("--batch-size", type=int, default=26,
+                        help="batch 情境的項目數 (預設: 26)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="batch 情境的平行行程數 (預設: 1)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH),
+                        help="基準 JSON 路徑")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="回歸門檻比例 (預設: 0.2)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="以本次結果覆寫基準")
+    parser.add_argument("--output", help="另存本次結果的 JSON 路徑")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="spellvid-bench-") as tmp:
+        workdir = Path(args.workdir) if args.workdir else Path(tmp)
+        current = run_benchmarks(workdir, args.batch_size, args.jobs)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    _print_report(current, baseline)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2),
+                                     encoding="utf-8")
+    if args.update_baseline:
+        Path(args.baseline).write_text(json.dumps(current, indent=2) + "\n",
+                                       encoding="utf-8")
+        print(f"已更新基準: {args.baseline}")
+        return 0
+    if baseline is None:
+        print("找不到基準檔,以 --update-baseline 建立")
+        return 0
+
+    regressions = compare_to_baseline(current, baseline, args.threshold)
+    for item in regressions:
+        print(f"REGRESSION {item['scenario']}.{item['metric']}: "
+              f"{item['baseline']} -> {item['current']} "
+              f"({item['change']:+.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
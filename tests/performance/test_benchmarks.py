@@ -4,6 +4,8 @@
 1. 領域邏輯效能 (compute_layout_bboxes < 50ms)
 2. Dry-run 效能 (< 100ms)
 3. 批次處理效能 (optional: 實際渲染 100 支視頻)
+4. 端到端渲染基準 (benchmark_suite.py: make / batch / concat 與 JSON 基準比較)
+5. CLI 啟動 (--help 與 --dry-run 不載入 NumPy / MoviePy;啟動時間 < 200ms)
 
 執行方式:
     pytest tests/performance/ -v --tb=short
@@ -11,13 +13,26 @@
 注意: 
 - 測試 1, 2 很快 (< 1 秒)
 - 測試 3 (批次 100 支視頻) 需要較長時間,標記為 slow
+- 測試 4 需設定 SPELLVID_RUN_BENCHMARKS=1 才會執行完整渲染
+- 測試 5 的牆鐘時間門檻同樣需設定 SPELLVID_RUN_BENCHMARKS=1(負載高的
+  機器上會誤報);模組載入的檢查一律執行
 """
 
+import json
+import os
+import subprocess
+import sys
 import pytest
 import time
 from spellvid.shared.types import VideoConfig
 from spellvid.domain.layout import compute_layout_bboxes
 from spellvid.application.video_service import render_video
+from tests.performance.benchmark_suite import (
+    BASELINE_PATH,
+    compare_to_baseline,
+    generate_synthetic_assets,
+    run_benchmarks,
+)
 
 
 class TestDomainPerformance:
@@ -180,6 +195,153 @@ class TestRegressionPrevention:
             f"\n[PERF] Layout regression check: {elapsed:.2f}ms (baseline: {BASELINE_MS}ms)")
 
 
+class TestRenderBenchmarkSuite:
+    """端到端渲染基準測試 (合成素材 + JSON 基準)"""
+
+    def test_compare_flags_regressions(self):
+        """超過門檻的變差才視為回歸,方向依指標決定"""
+        baseline = {"scenarios": {"batch": {
+            "frames_per_sec": 10.0, "sec_per_video": 4.0,
+            "peak_rss_mb": 300.0, "output_bytes": 1000,
+        }}}
+        current = {"scenarios": {"batch": {
+            "frames_per_sec": 7.0, "sec_per_video": 4.4,
+            "peak_rss_mb": 250.0, "output_bytes": 1300,
+        }}}
+
+        regressions = compare_to_baseline(current, baseline, threshold=0.2)
+
+        assert {(r["scenario"], r["metric"]) for r in regressions} == {
+            ("batch", "frames_per_sec"), ("batch", "output_bytes"),
+        }
+        assert compare_to_baseline(current, baseline, threshold=0.5) == []
+
+    def test_compare_skips_time_metrics_on_other_machine(self):
+        """基準來自不同平台或 CPU 數時,只比較非時間類指標並發出警告"""
+        machine = {"platform": "Linux-x86_64", "python": "3.11.7",
+                   "cpu_count": 1}
+        baseline = {"machine": machine, "scenarios": {"make": {
+            "frames_per_sec": 10.0, "wall_sec": 5.0, "output_bytes": 1000,
+        }}}
+        current = {"machine": dict(machine, cpu_count=8),
+                   "scenarios": {"make": {
+                       "frames_per_sec": 5.0, "wall_sec": 10.0,
+                       "output_bytes": 1300,
+                   }}}
+
+        with pytest.warns(RuntimeWarning, match="cpu_count"):
+            regressions = compare_to_baseline(current, baseline)
+
+        assert [r["metric"] for r in regressions] == ["output_bytes"]
+        current["machine"] = dict(machine)
+        assert {r["metric"] for r in compare_to_baseline(
+            current, baseline)} == {"frames_per_sec", "wall_sec",
+                                    "output_bytes"}
+
+    def test_synthetic_assets(self, tmp_path):
+        """合成素材包含全部字母、背景視頻、片頭片尾與音樂"""
+        assets = generate_synthetic_assets(tmp_path)
+
+        letters = os.listdir(assets["letters_dir"])
+        assert "A.png" in letters and "z_small.png" in letters
+        assert len(letters) == 52
+        for key in ("image", "video", "entry", "ending", "music"):
+            assert os.path.getsize(assets[key]) > 0
+
+    @pytest.mark.slow
+    @pytest.mark.skipif(
+        os.environ.get("SPELLVID_RUN_BENCHMARKS") != "1",
+        reason="Full render benchmark (set SPELLVID_RUN_BENCHMARKS=1)",
+    )
+    def test_no_throughput_regression(self, tmp_path):
+        """make / batch / concat 不應比基準變差超過 20%"""
+        import json
+
+        current = run_benchmarks(tmp_path)
+        with open(BASELINE_PATH, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+
+        regressions = compare_to_baseline(current, baseline)
+        assert regressions == [], f"Render regressions: {regressions}"
+
+        for name, metrics in current["scenarios"].items():
+            print(f"\n[PERF] {name}: {metrics}")
+
+
+# 在全新的直譯器中執行 CLI,回報匯入加執行時間與已載入的重量級模組
+_STARTUP_SNIPPET = """
+import contextlib, io, json, sys, time
+started = time.perf_counter()
+from spellvid.cli.__main__ import main
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        main(sys.argv[1:])
+    except SystemExit:
+        pass
+elapsed = time.perf_counter() - started
+heavy = [m for m in ("numpy", "moviepy", "PIL") if m in sys.modules]
+print(json.dumps({"elapsed": elapsed, "heavy": heavy}))
+"""
+
+STARTUP_BUDGET_SEC = 0.2
+
+
+def _measure_cli_startup(argv, tmp_path, runs=3):
+    """取多次執行中最快的一次,降低行程啟動雜訊"""
+    env = dict(os.environ)
+    env["SPELLVID_CACHE_DIR"] = str(tmp_path / "cache")
+    root = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (root, env.get("PYTHONPATH")) if p)
+    reports = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-c", _STARTUP_SNIPPET, *argv],
+            cwd=str(tmp_path), env=env, capture_output=True, text=True,
+            check=True,
+        )
+        reports.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return min(reports, key=lambda r: r["elapsed"])
+
+
+class TestStartupPerformance:
+    """CLI 啟動效能測試 (渲染堆疊延遲匯入)"""
+
+    DRY_RUN_ARGV = [
+        "make", "--letters", "I i", "--word-en", "Ice",
+        "--word-zh", "冰", "--dry-run",
+    ]
+
+    def test_help_startup(self, tmp_path):
+        """--help 只載入 parser,不載入 NumPy / MoviePy / Pillow"""
+        report = _measure_cli_startup(["--help"], tmp_path, runs=1)
+
+        assert report["heavy"] == []
+
+    def test_dry_run_startup(self, tmp_path):
+        """make --dry-run 不載入 NumPy / MoviePy"""
+        report = _measure_cli_startup(self.DRY_RUN_ARGV, tmp_path, runs=1)
+
+        assert "numpy" not in report["heavy"]
+        assert "moviepy" not in report["heavy"]
+
+    @pytest.mark.slow
+    @pytest.mark.skipif(
+        os.environ.get("SPELLVID_RUN_BENCHMARKS") != "1",
+        reason="Wall-clock startup budget (set SPELLVID_RUN_BENCHMARKS=1)",
+    )
+    def test_startup_within_budget(self, tmp_path):
+        """--help 與 make --dry-run 應 < 200ms(在閒置的機器上量測)"""
+        for argv in (["--help"], self.DRY_RUN_ARGV):
+            report = _measure_cli_startup(argv, tmp_path)
+
+            assert report["elapsed"] < STARTUP_BUDGET_SEC, (argv, report)
+
+            print(f"\n[PERF] cli {' '.join(argv[:1])}: "
+                  f"{report['elapsed'] * 1000:.1f}ms")
+
+
 if __name__ == "__main__":
     """允許直接執行此模組進行快速測試"""
     pytest.main([__file__, "-v", "--tb=short", "-s"])
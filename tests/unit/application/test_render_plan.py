@@ -0,0 +1,130 @@
+"""單元測試: 渲染計畫編譯器
+
+此測試驗證 application/render_plan.py:
+- RenderPlan 可經 JSON 來回轉換且保持相等
+- dry-run 回傳的計畫與直接編譯的計畫一致,隱藏的圖層不出現在計畫中
+- render_video 收到計畫時不重新計算佈局
+- 編譯時以 probe_many 一次探測項目的所有媒體
+- VideoConfig 的顯示選項(計時器、進度條、片頭停留)傳入計畫
+"""
+
+import os
+
+import pytest
+
+from spellvid.application import render_plan, video_service
+from spellvid.application.render_plan import (
+    RenderPlan,
+    compile_render_plan,
+    config_to_item,
+)
+from spellvid.shared.types import VideoConfig
+
+
+@pytest.fixture
+def item():
+    return {
+        "letters": "I i",
+        "word_en": "Ice",
+        "word_zh": "冰",
+        "image_path": "",
+        "music_path": "",
+        "countdown_sec": 3,
+        "reveal_hold_sec": 2,
+    }
+
+
+class TestRenderPlan:
+    """渲染計畫測試套件"""
+
+    def test_json_roundtrip(self, item):
+        """TC-PLAN-001: to_json / from_json 來回轉換後計畫相等"""
+        plan = compile_render_plan(item, skip_ending=True)
+
+        restored = RenderPlan.from_json(plan.to_json())
+
+        assert restored == plan
+        assert restored.skip_ending is True
+        assert restored.layer("timer").position == (64, 450)
+        assert restored.timeline["beep_schedule"] == [0.0, 1.0, 2.0]
+        assert plan.offsets["ending_start"] == \
+            plan.offsets["main_start"] + plan.timeline["total_duration"]
+
+    def test_dry_run_returns_plan(self, item):
+        """TC-PLAN-002: dry-run 回傳計畫,timer 隱藏時不規劃該圖層"""
+        result = video_service.render_video(
+            item, "out/Ice.mp4", dry_run=True)
+
+        assert result["plan"] == compile_render_plan(item).to_dict()
+
+        hidden = compile_render_plan(dict(item, timer_visible=False))
+        assert hidden.layer("timer") is None
+        assert hidden.layer("reveal") is not None
+
+    def test_render_uses_precompiled_plan(self, item, monkeypatch):
+        """TC-PLAN-003: 傳入計畫時 render_video 不再重新編譯"""
+        plan = compile_render_plan(item)
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("plan recompiled")
+
+        monkeypatch.setattr(video_service, "compile_render_plan", _fail)
+        monkeypatch.setattr(render_plan, "compute_layout_bboxes", _fail)
+
+        result = video_service.render_video(
+            output_path="out/Ice.mp4", dry_run=True, plan=plan)
+
+        assert result["success"] is True
+        assert RenderPlan.from_dict(result["plan"]) == plan
+
+    def test_media_probed_together(self, item, tmp_path, monkeypatch):
+        """TC-PLAN-004: 片頭、片尾、背景與音樂以一次 probe_many 探測"""
+        from spellvid.application import context_builder
+
+        for name in ("entry.mp4", "ending.mp4", "bg.mp4", "ice.mp3"):
+            (tmp_path / name).write_bytes(b"not media")
+        calls = []
+
+        def _record(paths):
+            calls.append(sorted(os.path.basename(p) for p in paths))
+            return {}
+
+        monkeypatch.setattr(context_builder, "probe_many", _record)
+        item = dict(
+            item,
+            entry_video_path=str(tmp_path / "entry.mp4"),
+            ending_video_path=str(tmp_path / "ending.mp4"),
+            image_path=str(tmp_path / "bg.mp4"),
+            music_path=str(tmp_path / "ice.mp3"),
+        )
+
+        compile_render_plan(item, skip_ending=True)
+        compile_render_plan(item, prefetch_content=True)
+
+        assert calls == [
+            ["ending.mp4", "entry.mp4"],
+            ["bg.mp4", "ending.mp4", "entry.mp4", "ice.mp3"],
+        ]
+
+    def test_config_options_reach_plan(self):
+        """TC-PLAN-005: timer_visible/progress_bar/entry_hold_sec 不被丟棄"""
+        config = VideoConfig(
+            letters="I i", word_en="Ice", word_zh="冰",
+            image_path="", music_path="", countdown_sec=3,
+            timer_visible=False, progress_bar=False, entry_hold_sec=2.0,
+        )
+
+        plan = compile_render_plan(config_to_item(config))
+
+        names = [layer.name for layer in plan.layers]
+        assert "timer" not in names
+        assert "progress_bar" not in names
+        assert plan.entry["hold_sec"] == 2.0
+
+        default = compile_render_plan(config_to_item(VideoConfig(
+            letters="I i", word_en="Ice", word_zh="冰",
+            image_path="", music_path="", countdown_sec=3,
+        )))
+        default_names = [layer.name for layer in default.layers]
+        assert "timer" in default_names
+        assert "progress_bar" in default_names
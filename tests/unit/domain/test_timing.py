@@ -222,6 +222,18 @@ class TestTimerUpdateLogic:
         assert updates[1] == 0.5
         assert updates[-1] == 4.5
 
+    def test_calculate_beep_schedule(self):
+        """TC-TIMING-015: 驗證倒數嗶聲時間點
+
+        測試案例: 10 秒與 2 秒倒數
+        預期結果: 最後三秒各響一次,倒數不足時略過
+        """
+        from spellvid.domain.timing import calculate_beep_schedule
+
+        assert calculate_beep_schedule(10) == [7.0, 8.0, 9.0]
+        assert calculate_beep_schedule(2) == [0.0, 1.0]
+        assert calculate_beep_schedule(0) == []
+
 
 class TestEdgeCases:
     """邊界情況測試"""
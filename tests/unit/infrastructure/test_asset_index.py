@@ -0,0 +1,149 @@
+"""單元測試: 素材目錄索引
+
+此測試驗證 infrastructure/media/asset_index.py:
+- 每個目錄只掃描一次,存在與尺寸由記憶體回答
+- 檔案變動時 is_stale 為 True
+- 持久化後新實例不再讀取圖片檔頭
+- 資源檢查與字母規格載入經由索引
+- 索引只在 asset_index_scope 內共用,區塊外反映檔案的目前狀態
+- 區塊外的查詢不掃描目錄,也不讀取其他圖片的檔頭
+"""
+
+import os
+
+import pytest
+from PIL import Image
+
+from spellvid.application.resource_checker import check_assets_dict
+from spellvid.infrastructure.media import asset_index
+from spellvid.infrastructure.media.asset_index import (
+    AssetIndex,
+    asset_index_scope,
+    get_asset_index,
+)
+
+
+@pytest.fixture
+def assets(tmp_path):
+    Image.new("RGB", (64, 48), (255, 0, 0)).save(tmp_path / "ice.png")
+    (tmp_path / "ice.mp3").write_bytes(b"ID3")
+    (tmp_path / "sub").mkdir()
+    return tmp_path
+
+
+def _count_header_reads(monkeypatch):
+    reads = []
+    real = asset_index._read_image_size
+    monkeypatch.setattr(asset_index, "_read_image_size",
+                        lambda p: reads.append(p) or real(p))
+    return reads
+
+
+class TestAssetIndex:
+    """素材目錄索引測試套件"""
+
+    def test_directory_scanned_once(self, assets, monkeypatch):
+        """TC-ASSET-001: 同目錄的多次查詢只掃描一次、只讀一次檔頭"""
+        reads = _count_header_reads(monkeypatch)
+        index = AssetIndex()
+
+        assert index.dimensions(str(assets / "ice.png")) == (64, 48)
+        assert index.exists(str(assets / "ice.mp3"))
+        assert index.dimensions(str(assets / "ice.mp3")) is None
+        assert not index.exists(str(assets / "missing.png"))
+        assert not index.exists(str(assets / "sub"))
+        assert not index.exists("")
+
+        assert index.scans == 1
+        assert len(reads) == 1
+
+    def test_staleness_and_new_files(self, assets):
+        """TC-ASSET-002: 變動檔案視為過期,掃描後新增的檔案仍可找到"""
+        index = AssetIndex()
+        path = str(assets / "ice.png")
+        assert not index.is_stale(path)
+
+        Image.new("RGB", (10, 10)).save(path)
+        os.utime(path, ns=(1, 1))
+        (assets / "new.mp3").write_bytes(b"ID3")
+
+        assert index.is_stale(path)
+        assert index.exists(str(assets / "new.mp3"))
+        index.invalidate(path)
+        assert index.dimensions(path) == (10, 10)
+        assert not index.is_stale(path)
+
+    def test_persisted_dimensions_reused(self, assets, tmp_path,
+                                         monkeypatch):
+        """TC-ASSET-003: 持久化後,未變動的圖片不再讀取檔頭"""
+        monkeypatch.setenv("SPELLVID_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setenv("SPELLVID_ASSET_INDEX_CACHE", "1")
+        with asset_index_scope() as first:
+            assert first.dimensions(str(assets / "ice.png")) == (64, 48)
+
+        reads = _count_header_reads(monkeypatch)
+        fresh = AssetIndex(persist_path=first.persist_path)
+
+        assert fresh.dimensions(str(assets / "ice.png")) == (64, 48)
+        assert reads == []
+        assert os.path.isfile(tmp_path / "cache" / "assets" /
+                              "asset_index.json")
+
+    def test_checkers_use_index(self, assets, monkeypatch):
+        """TC-ASSET-004: check_assets_dict 不再逐檔 stat"""
+        monkeypatch.setattr(asset_index, "_persist_path", lambda: None)
+
+        with asset_index_scope() as index:
+            result = check_assets_dict({
+                "letters": "", "image_path": str(assets / "ice.png"),
+                "music_path": str(assets / "ice.mp3"),
+            })
+
+        assert result["image_exists"] and result["music_exists"]
+        assert index.scans == 1
+
+    def test_index_scoped_to_one_batch(self, assets):
+        """TC-ASSET-005: 區塊內共用索引,區塊外刪除或修改檔案後答案更新"""
+        from spellvid.application.resource_checker import check_assets
+        from spellvid.shared.types import VideoConfig
+
+        image = assets / "ice.png"
+        config = VideoConfig(letters="I i", word_en="Ice", word_zh="冰",
+                             image_path=str(image))
+        assert check_assets(config)["image"]["exists"]
+
+        with asset_index_scope() as index:
+            assert get_asset_index() is index
+            with asset_index_scope() as inner:
+                assert inner is index
+            assert index.dimensions(str(image)) == (64, 48)
+            Image.new("RGB", (8, 8)).save(image)
+            # 同一批次內沿用第一次查詢的結果
+            assert get_asset_index().dimensions(str(image)) == (64, 48)
+
+        assert get_asset_index().dimensions(str(image)) == (8, 8)
+        image.unlink()
+        assert not check_assets(config)["image"]["exists"]
+
+    def test_unscoped_query_reads_one_file(self, assets, monkeypatch):
+        """TC-ASSET-006: 區塊外的 check_assets 不掃描目錄、不讀其他檔頭"""
+        from spellvid.application.resource_checker import check_assets
+        from spellvid.shared.types import VideoConfig
+
+        for i in range(40):
+            Image.new("RGB", (4, 4)).save(assets / f"other{i}.png")
+        reads = _count_header_reads(monkeypatch)
+        scans = []
+        monkeypatch.setattr(AssetIndex, "_scan",
+                            lambda self, d: scans.append(d) or {})
+        config = VideoConfig(letters="I i", word_en="Ice", word_zh="冰",
+                             image_path=str(assets / "ice.png"),
+                             music_path=str(assets / "ice.mp3"))
+
+        result = check_assets(config)
+
+        assert result["image"]["exists"] and result["music"]["exists"]
+        assert get_asset_index().dimensions(
+            str(assets / "ice.png")) == (64, 48)
+        assert scans == []
+        assert reads == [os.path.abspath(str(assets / "ice.png"))]
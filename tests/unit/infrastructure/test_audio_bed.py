@@ -0,0 +1,92 @@
+"""單元測試: NumPy 音訊底軌
+
+此測試驗證 infrastructure/media/audio.py:
+- 背景音樂解碼一次後循環到片段長度
+- 嗶聲疊加在倒數時間點,淡出包絡套用於結尾
+- 寫出的 WAV 由編碼器直接 mux
+"""
+
+import subprocess
+import wave
+
+import numpy as np
+import pytest
+
+from spellvid.infrastructure.media import audio
+from spellvid.infrastructure.media.audio import (
+    SAMPLE_RATE,
+    beep_waveform,
+    render_audio_bed,
+)
+from spellvid.infrastructure.video.ffmpeg_pipe import resolve_ffmpeg_exe
+
+
+@pytest.fixture
+def short_music(tmp_path, monkeypatch):
+    """0.5 秒、440Hz 的立體聲 WAV(PCM 快取位於暫存目錄)"""
+    monkeypatch.setenv("SPELLVID_CACHE_DIR", str(tmp_path / "cache"))
+    try:
+        exe = resolve_ffmpeg_exe()
+    except RuntimeError:
+        pytest.skip("ffmpeg not available")
+    path = tmp_path / "music.wav"
+    subprocess.run(
+        [exe, "-y", "-loglevel", "error", "-f", "lavfi",
+         "-i", "sine=frequency=440:sample_rate=44100:duration=0.5",
+         "-ac", "2", str(path)],
+        check=True,
+    )
+    return str(path)
+
+
+class TestAudioBed:
+    """音訊底軌測試套件"""
+
+    def test_music_tiled_with_single_decode(self, short_music, monkeypatch):
+        """TC-AUDIO-001: 短音樂只解碼一次,循環至片段長度"""
+        calls = []
+        real = audio.decode_audio_pcm
+        monkeypatch.setattr(audio, "decode_audio_pcm",
+                            lambda *a, **k: calls.append(a) or real(*a, **k))
+
+        bed = render_audio_bed(1.6, music_path=short_music)
+        music = real(short_music)
+
+        assert len(calls) == 1
+        assert bed.music_loaded and bed.music_error is None
+        assert bed.samples.shape == (int(1.6 * SAMPLE_RATE), 2)
+        period = len(music)
+        assert np.array_equal(bed.samples[period:2 * period], music)
+        assert np.array_equal(bed.samples[3 * period:],
+                              music[:len(bed.samples) - 3 * period])
+
+    def test_beeps_and_fade_out(self, tmp_path):
+        """TC-AUDIO-002: 嗶聲位於排程位置,結尾線性淡出,缺音樂時記錄錯誤"""
+        bed = render_audio_bed(
+            3.0, music_path=str(tmp_path / "missing.mp3"),
+            beep_times=[0.5, 2.9], fade_out=1.0,
+        )
+        beep = beep_waveform()
+        start = int(0.5 * SAMPLE_RATE)
+
+        assert not bed.music_loaded and bed.music_error
+        assert np.array_equal(bed.samples[start:start + len(beep)], beep)
+        assert not bed.samples[:start].any()
+        assert not bed.samples[start + len(beep):int(2.9 * SAMPLE_RATE)].any()
+        # 最後一聲被片段結尾截斷,且位於淡出區段
+        tail = bed.samples[int(2.9 * SAMPLE_RATE):]
+        assert np.abs(tail).max() < 0.2 * 0.11
+        assert beep_waveform() is beep
+
+    def test_wav_written_once(self, tmp_path):
+        """TC-AUDIO-003: 底軌寫成 44.1kHz 立體聲 16-bit WAV"""
+        bed = render_audio_bed(0.5, beep_times=[0.0])
+        path = bed.write_wav(str(tmp_path / "bed.wav"))
+
+        with wave.open(path, "rb") as wav:
+            assert wav.getframerate() == SAMPLE_RATE
+            assert wav.getnchannels() == 2
+            assert wav.getsampwidth() == 2
+            assert wav.getnframes() == len(bed.samples)
+            pcm = np.frombuffer(wav.readframes(wav.getnframes()), "<i2")
+        assert abs(int(pcm.max()) - int(0.2 * 32767)) <= 2
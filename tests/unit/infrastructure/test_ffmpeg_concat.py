@@ -0,0 +1,115 @@
+"""單元測試: FFmpeg 串流複製串接
+
+此測試驗證 infrastructure/video/ffmpeg_concat.py:
+- 淡入區段規劃符合 D2(第一支不淡入)與短片段不淡入
+- 只重新編碼到淡入後第一個關鍵影格
+- 實際串接結果的淡入位置與總長度
+"""
+
+import numpy as np
+import pytest
+
+from spellvid.infrastructure.video.ffmpeg_concat import (
+    ConcatSource,
+    concat_with_fadein,
+    plan_concat_segments,
+)
+from spellvid.infrastructure.video.ffmpeg_pipe import (
+    encode_frames,
+    resolve_ffmpeg_exe,
+)
+
+
+def _source(path, duration, keyframes):
+    return ConcatSource(path=path, duration=duration, codec="h264",
+                        width=64, height=48, fps=10.0, has_audio=False,
+                        keyframes=keyframes)
+
+
+def _solid_video(path, color, duration=2.0, size=(64, 48)):
+    frame = np.empty((size[1], size[0], 3), np.uint8)
+    frame[:] = color
+    encode_frames(lambda t: frame, duration, str(path), size=size, fps=10,
+                  keyframe_times=(1.0,))
+    return str(path)
+
+
+class TestConcatPlan:
+    """串接計畫測試套件"""
+
+    def test_first_clip_is_copied_whole(self):
+        """TC-CONCAT-001: 第一支視頻不淡入,整支複製(D2)"""
+        segments = plan_concat_segments(
+            [_source("a", 5.0, [0.0, 1.0]), _source("b", 5.0, [0.0, 1.0])],
+            1.0,
+        )
+
+        assert [(s.source.path, s.start, s.end, s.reencode)
+                for s in segments] == [
+            ("a", 0.0, None, False),
+            ("b", 0.0, 1.0, True),
+            ("b", 1.0, None, False),
+        ]
+
+    def test_cut_at_first_keyframe_after_fade(self):
+        """TC-CONCAT-002: 重新編碼到淡入後的第一個關鍵影格"""
+        segments = plan_concat_segments(
+            [_source("a", 5.0, [0.0]), _source("b", 12.0, [0.0, 4.2, 8.4])],
+            1.0,
+        )
+
+        assert segments[1].end == 4.2
+        assert segments[2].start == 4.2
+
+    def test_short_or_single_gop_clips(self):
+        """TC-CONCAT-003: 過短不淡入;沒有可切點時整支重新編碼"""
+        segments = plan_concat_segments(
+            [_source("a", 5.0, [0.0]), _source("short", 0.5, [0.0]),
+             _source("one_gop", 3.0, [0.0])],
+            1.0,
+        )
+
+        assert not segments[1].reencode
+        assert segments[2].reencode and segments[2].end is None
+
+
+class TestConcatWithFadein:
+    """實際 ffmpeg 串接測試套件"""
+
+    def test_fadein_applied_only_after_first_clip(self, tmp_path):
+        """TC-CONCAT-004: 第二支開頭淡入,其餘內容不變"""
+        try:
+            resolve_ffmpeg_exe()
+        except RuntimeError:
+            pytest.skip("ffmpeg not available")
+        imageio_ffmpeg = pytest.importorskip("imageio_ffmpeg")
+
+        first = _solid_video(tmp_path / "a.mp4", (200, 200, 200))
+        second = _solid_video(tmp_path / "b.mp4", (40, 200, 40))
+        output = tmp_path / "joined.mp4"
+
+        result = concat_with_fadein([first, second], str(output), 1.0)
+
+        assert result["clips_count"] == 2
+        assert result["reencoded_seconds"] == pytest.approx(1.0, abs=0.05)
+        reader = imageio_ffmpeg.read_frames(str(output))
+        next(reader)
+        frames = [np.frombuffer(f, np.uint8).reshape(48, 64, 3)
+                  for f in reader]
+        assert len(frames) == 40
+        assert frames[0].mean() > 190          # 第一支不淡入
+        assert frames[20][..., 1].mean() < 20  # 第二支從黑色開始
+        assert frames[35][..., 1].mean() > 190
+
+    def test_mismatched_sizes_raise(self, tmp_path):
+        """TC-CONCAT-005: 尺寸不同時回報錯誤,由呼叫端改走重新編碼"""
+        try:
+            resolve_ffmpeg_exe()
+        except RuntimeError:
+            pytest.skip("ffmpeg not available")
+
+        first = _solid_video(tmp_path / "a.mp4", (0, 0, 0))
+        second = _solid_video(tmp_path / "b.mp4", (0, 0, 0), size=(32, 32))
+
+        with pytest.raises(RuntimeError):
+            concat_with_fadein([first, second], str(tmp_path / "x.mp4"))
@@ -0,0 +1,114 @@
+"""單元測試: FFmpeg rawvideo 管線編碼器
+
+此測試驗證 infrastructure/video/ffmpeg_pipe.py:
+- ffmpeg 命令列組成(rawvideo stdin、同次 mux 音訊)
+- 影格數與 MoviePy iter_frames 一致
+- 實際編碼後可讀回正確尺寸與內容
+"""
+
+import numpy as np
+import pytest
+
+from spellvid.infrastructure.video.ffmpeg_pipe import (
+    FFmpegPipeWriter,
+    build_encode_command,
+    encode_frames,
+    frame_count,
+    resolve_ffmpeg_exe,
+)
+from spellvid.infrastructure.video.frame_compositor import (
+    FrameLayer,
+    NumpyFrameCompositor,
+)
+
+
+def _ffmpeg_or_skip():
+    try:
+        return resolve_ffmpeg_exe()
+    except RuntimeError:
+        pytest.skip("ffmpeg not available")
+
+
+class TestFFmpegPipe:
+    """rawvideo pipe 編碼測試套件"""
+
+    def test_command_reads_rawvideo_and_muxes_audio(self):
+        """TC-PIPE-001: 命令列由 stdin 讀 rgb24 並於同次呼叫 mux 音訊"""
+        cmd = build_encode_command(
+            "ffmpeg", "out.mp4", (64, 48), 24,
+            audio_path="bed.wav", duration=2.0,
+        )
+
+        assert cmd[cmd.index("-f") + 1] == "rawvideo"
+        assert cmd[cmd.index("-pix_fmt") + 1] == "rgb24"
+        assert cmd[cmd.index("-s") + 1] == "64x48"
+        assert cmd.count("-i") == 2
+        assert "pipe:0" in cmd and "bed.wav" in cmd
+        assert cmd[cmd.index("-c:a") + 1] == "aac"
+        assert cmd[-1] == "out.mp4"
+
+    def test_frame_count_matches_moviepy(self):
+        """TC-PIPE-002: 影格數為 int(duration * fps)"""
+        assert frame_count(2.0, 24) == 48
+        assert frame_count(1.99, 24) == 47
+        assert frame_count(0.0, 30) == 0
+
+    def test_encode_timeline_roundtrip(self, tmp_path):
+        """TC-PIPE-003: 合成時間軸經 pipe 編碼後可讀回"""
+        _ffmpeg_or_skip()
+        imageio_ffmpeg = pytest.importorskip("imageio_ffmpeg")
+
+        composer = NumpyFrameCompositor()
+        bg = composer.create_color_clip((64, 48), (200, 40, 40), 1.0)
+        block = FrameLayer(
+            frame_function=lambda t: np.full((16, 16, 3), 255, np.uint8),
+            position=(8, 8), size=(16, 16), end=1.0,
+        )
+        timeline = composer.compose_clips([bg, block], size=(64, 48))
+        output = tmp_path / "pipe.mp4"
+
+        written = encode_frames(timeline.make_frame, timeline.duration,
+                                str(output), size=timeline.size, fps=10)
+
+        assert written == 10
+        reader = imageio_ffmpeg.read_frames(str(output))
+        meta = next(reader)
+        frames = [np.frombuffer(f, np.uint8).reshape(48, 64, 3)
+                  for f in reader]
+        assert meta["size"] == (64, 48)
+        assert len(frames) == 10
+        assert abs(int(frames[0][30, 40, 0]) - 200) <= 8
+        assert frames[0][12, 12].min() >= 240
+
+    def test_render_to_file_with_audio(self, tmp_path):
+        """TC-PIPE-004: render_to_file 同時輸出音訊軌"""
+        _ffmpeg_or_skip()
+        moviepy = pytest.importorskip("moviepy")
+
+        composer = NumpyFrameCompositor()
+        bg = composer.create_color_clip((64, 48), (0, 0, 0), 1.0)
+        silence = moviepy.AudioClip(lambda t: np.zeros((np.size(t), 2)),
+                                    duration=1.0, fps=44100)
+        timeline = composer.compose_clips([bg], size=(64, 48))
+        output = tmp_path / "audio.mp4"
+
+        composer.render_to_file(timeline.with_audio(silence), str(output),
+                                fps=10)
+
+        clip = moviepy.VideoFileClip(str(output))
+        try:
+            assert clip.audio is not None
+            assert abs(clip.duration - 1.0) < 0.2
+        finally:
+            clip.close()
+
+    def test_mismatched_frame_size_raises(self, tmp_path):
+        """TC-PIPE-005: 影格尺寸不符時回報錯誤"""
+        _ffmpeg_or_skip()
+
+        writer = FFmpegPipeWriter(str(tmp_path / "bad.mp4"), (32, 32), 10)
+        try:
+            with pytest.raises(RuntimeError):
+                writer.write_frame(np.zeros((16, 16, 3), np.uint8))
+        finally:
+            writer.abort()
@@ -0,0 +1,136 @@
+"""單元測試: FFmpeg 背景解碼器
+
+此測試驗證 infrastructure/video/ffmpeg_reader.py:
+- cover 模式由 ffmpeg 放大裁切,影格即為畫布尺寸
+- fit 模式等比縮放並以背景色補邊
+- 較短的影片循環播放,倒退讀取時重新啟動 ffmpeg
+- 預算內的短片只解碼一次,循環影格由環形緩衝區提供
+"""
+
+import subprocess
+
+import numpy as np
+import pytest
+
+from spellvid.infrastructure.video.ffmpeg_pipe import resolve_ffmpeg_exe
+from spellvid.infrastructure.video.ffmpeg_reader import (
+    FFmpegFrameReader,
+    RingBufferFrameSource,
+    build_decode_command,
+    build_scale_filter,
+    open_background_source,
+)
+
+
+@pytest.fixture
+def wide_video(tmp_path):
+    """64x16、1 秒、10fps 的紅色影片(左右各一條白色直線)"""
+    try:
+        exe = resolve_ffmpeg_exe()
+    except RuntimeError:
+        pytest.skip("ffmpeg not available")
+    path = tmp_path / "wide.mp4"
+    subprocess.run(
+        [exe, "-y", "-loglevel", "error", "-f", "lavfi",
+         "-i", "color=c=red:s=64x16:r=10:d=1",
+         "-vf", "drawbox=x=0:y=0:w=4:h=16:c=white:t=fill,"
+                "drawbox=x=60:y=0:w=4:h=16:c=white:t=fill",
+         "-pix_fmt", "yuv444p", str(path)],
+        check=True,
+    )
+    return str(path)
+
+
+class TestFFmpegFrameReader:
+    """背景解碼器測試套件"""
+
+    def test_filters(self):
+        """TC-BGREAD-001: cover/fit 濾鏡與解碼指令"""
+        assert build_scale_filter((1920, 1080), "cover") == (
+            "scale=1920:1080:force_original_aspect_ratio=increase,"
+            "crop=1920:1080")
+        assert "pad=1920:1080:(ow-iw)/2:(oh-ih)/2:color=0xFFFAE9" in \
+            build_scale_filter((1920, 1080), "fit", (255, 250, 233))
+        with pytest.raises(ValueError):
+            build_scale_filter((1920, 1080), "stretch")
+
+        cmd = build_decode_command("ffmpeg", "bg.mp4", (32, 32), 24,
+                                   duration=5.0)
+        assert cmd[cmd.index("-stream_loop") + 1] == "-1"
+        assert cmd[cmd.index("-t") + 1] == "5.000000"
+        assert cmd[-3:] == ["-pix_fmt", "rgb24", "pipe:1"]
+
+    def test_cover_crops_center(self, wide_video):
+        """TC-BGREAD-002: cover 模式填滿畫布,左右超出的部分被裁切"""
+        reader = FFmpegFrameReader(wide_video, (32, 32), 10, mode="cover",
+                                   duration=1.0)
+        frame = reader.read_frame(0.0)
+
+        assert frame.shape == (32, 32, 3)
+        # 白色邊條位於裁切範圍外,整張應為紅色
+        assert frame[..., 0].min() > 200
+        assert frame[..., 1:].max() < 60
+        reader.close()
+
+    def test_fit_pads_with_background(self, wide_video):
+        """TC-BGREAD-003: fit 模式置中縮放,上下以背景色補邊"""
+        reader = FFmpegFrameReader(wide_video, (32, 32), 10, mode="fit",
+                                   duration=1.0, pad_color=(255, 250, 233))
+        frame = reader.read_frame(0.0)
+
+        assert np.all(frame[:12] == (255, 250, 233))
+        assert np.all(frame[20:] == (255, 250, 233))
+        assert frame[16, 16, 0] > 200 and frame[16, 16, 1] < 60
+        assert frame[16, 0].min() > 200  # 白色邊條保留在畫面內
+        reader.close()
+
+    def test_loop_and_seek_back(self, wide_video):
+        """TC-BGREAD-004: 較短影片循環,倒退讀取時重新啟動"""
+        reader = FFmpegFrameReader(wide_video, (32, 32), 10, duration=3.0)
+
+        first = reader.read_frame(0.0).copy()
+        looped = reader.read_frame(2.5).copy()
+        assert reader.restarts == 0
+        again = reader.read_frame(0.0)
+
+        assert reader.restarts == 1
+        assert np.array_equal(first, again)
+        assert np.abs(looped.astype(int) - first).max() < 16
+        reader.close()
+
+    def test_short_clip_looped_from_ram(self, tmp_path, monkeypatch):
+        """TC-BGREAD-005: 預算內的短片解碼一次,超出預算時改用串流循環"""
+        try:
+            exe = resolve_ffmpeg_exe()
+        except RuntimeError:
+            pytest.skip("ffmpeg not available")
+        path = str(tmp_path / "moving.mp4")
+        subprocess.run(
+            [exe, "-y", "-loglevel", "error", "-f", "lavfi",
+             "-i", "testsrc2=s=32x32:r=10:d=1", "-pix_fmt", "yuv444p", path],
+            check=True,
+        )
+        reference = FFmpegFrameReader(path, (32, 32), 10, duration=1.0,
+                                      loop=False)
+        expected = [reference.read_frame(i / 10).copy() for i in range(10)]
+        reference.close()
+
+        decodes = []
+        real_popen = subprocess.Popen
+        monkeypatch.setattr(subprocess, "Popen", lambda cmd, **k: (
+            decodes.append(cmd) if "pipe:1" in cmd else None,
+            real_popen(cmd, **k))[1])
+        source = open_background_source(path, (32, 32), 10, duration=4.0)
+
+        assert isinstance(source, RingBufferFrameSource)
+        assert source.frames.shape == (10, 32, 32, 3)
+        assert source.frames.flags["C_CONTIGUOUS"]
+        assert np.array_equal(source.read_frame(0.3), expected[3])
+        assert np.array_equal(source.read_frame(2.3), expected[3])
+        assert np.array_equal(source.read_frame(3.9), expected[9])
+        assert len(decodes) == 1
+
+        streamed = open_background_source(path, (32, 32), 10, duration=4.0,
+                                          loop_budget=32 * 32 * 3 * 4)
+        assert isinstance(streamed, FFmpegFrameReader)
+        streamed.close()
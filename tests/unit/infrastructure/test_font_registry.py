@@ -0,0 +1,78 @@
+"""單元測試: 字型註冊表
+
+此測試驗證 infrastructure/rendering/font_registry.py:
+- 字型路徑只解析一次(包含找不到的結果)
+- 字型目錄只走訪一次,樣式優先順序與遞迴 glob 相同
+- 字型物件以 (path, size) 共用
+"""
+
+import os
+
+import pytest
+
+from spellvid.infrastructure.rendering import font_registry
+from spellvid.infrastructure.rendering.font_registry import (
+    clear_font_caches,
+    find_font_file,
+    load_font,
+    resolve_font_path,
+)
+from spellvid.infrastructure.rendering.pillow_adapter import (
+    PillowAdapter,
+    _find_system_font,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    clear_font_caches()
+    yield
+    clear_font_caches()
+
+
+class TestFontRegistry:
+    """字型註冊表測試套件"""
+
+    def test_path_resolved_once(self):
+        """TC-FONT-001: 相同條件只呼叫一次搜尋函數,None 也快取"""
+        calls = []
+
+        def finder():
+            calls.append(1)
+            return None
+
+        assert resolve_font_path(("k", True), finder) is None
+        assert resolve_font_path(("k", True), finder) is None
+        assert len(calls) == 1
+
+    def test_directory_walked_once(self, tmp_path, monkeypatch):
+        """TC-FONT-002: 目錄只走訪一次,先依目錄再依樣式比對"""
+        first, second = tmp_path / "a", tmp_path / "b" / "nested"
+        second.mkdir(parents=True)
+        first.mkdir()
+        (first / "DejaVuSans.ttf").write_bytes(b"")
+        (second / "NotoSansCJK-Regular.ttc").write_bytes(b"")
+
+        walks = []
+        real_walk = os.walk
+        monkeypatch.setattr(font_registry.os, "walk",
+                            lambda d: walks.append(d) or real_walk(d))
+        dirs = [first, tmp_path / "b", tmp_path / "missing"]
+
+        cjk = find_font_file(dirs, ["NotoSansCJK*.ttc", "DejaVuSans.ttf"])
+        latin = find_font_file(dirs[1:], ["Arial.ttf", "NotoSansCJK*.ttc"])
+
+        assert cjk == str(first / "DejaVuSans.ttf")
+        assert latin == str(second / "NotoSansCJK-Regular.ttc")
+        assert len(walks) == 2
+
+    def test_font_objects_shared(self):
+        """TC-FONT-003: 相同 (path, size) 取得同一字型物件"""
+        assert _find_system_font(False, 48) is _find_system_font(False, 48)
+
+        try:
+            path = PillowAdapter().find_system_font()
+        except FileNotFoundError:
+            pytest.skip("no system font available")
+        assert load_font(path, 32) is load_font(path, 32)
+        assert load_font(path, 32) is not load_font(path, 33)
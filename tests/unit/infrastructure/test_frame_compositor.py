@@ -0,0 +1,177 @@
+"""單元測試: NumPy 單趟影格合成器
+
+此測試驗證 infrastructure/video/frame_compositor.py:
+- 實作 IVideoComposer Protocol
+- 靜態圖層的不透明 / 二值 / 半透明 blit
+- 時間範圍外的圖層不被合成
+- 與 MoviePy CompositeVideoClip 的輸出一致
+"""
+
+import numpy as np
+import pytest
+
+from spellvid.infrastructure.video.frame_compositor import (
+    FrameLayer,
+    FrameTimeline,
+    NumpyFrameCompositor,
+)
+
+
+class TestNumpyFrameCompositor:
+    """NumpyFrameCompositor 測試套件"""
+
+    def test_implements_video_composer_protocol(self):
+        """TC-COMPOSITOR-001: 實作 IVideoComposer"""
+        from spellvid.infrastructure.video.interface import IVideoComposer
+
+        assert isinstance(NumpyFrameCompositor(), IVideoComposer)
+
+    def test_background_and_opaque_layer(self):
+        """TC-COMPOSITOR-002: 不透明圖層直接覆寫畫布"""
+        composer = NumpyFrameCompositor()
+        bg = composer.create_color_clip((64, 48), (10, 20, 30), 2.0)
+        fg = composer.create_image_clip(
+            np.full((8, 8, 3), 200, np.uint8), 2.0, (4, 4)
+        )
+        timeline = composer.compose_clips([bg, fg], size=(64, 48))
+
+        frame = timeline.make_frame(0.5)
+        assert frame.shape == (48, 64, 3)
+        assert tuple(frame[0, 0]) == (10, 20, 30)
+        assert tuple(frame[5, 5]) == (200, 200, 200)
+
+    def test_layer_outside_time_range_is_skipped(self):
+        """TC-COMPOSITOR-003: 只合成時間 t 有效的圖層"""
+        bg = FrameLayer(image=np.zeros((10, 10, 3), np.uint8), end=3.0)
+        late = FrameLayer(image=np.full((10, 10, 3), 255, np.uint8),
+                          start=1.0, end=2.0)
+        timeline = FrameTimeline([bg, late], size=(10, 10))
+
+        assert timeline.make_frame(0.5).max() == 0
+        assert timeline.make_frame(1.5).min() == 255
+        assert timeline.make_frame(2.5).max() == 0
+
+    def test_alpha_blend_and_clipping(self):
+        """TC-COMPOSITOR-004: 半透明混色與超出畫布的裁切"""
+        bg = FrameLayer(image=np.zeros((10, 10, 3), np.uint8), end=1.0)
+        rgba = np.zeros((6, 6, 4), np.uint8)
+        rgba[..., :3] = 200
+        rgba[..., 3] = 128
+        overlay = FrameLayer(image=rgba, position=(7, -3), end=1.0)
+        timeline = FrameTimeline([bg, overlay], size=(10, 10))
+
+        frame = timeline.make_frame(0.0)
+        assert frame[0, 9, 0] == round(200 * 128 / 255)
+        assert frame[5, 5, 0] == 0
+
+    def test_dynamic_layer_can_hide_itself(self):
+        """TC-COMPOSITOR-005: frame_function 回傳 None 時不顯示"""
+        def frame_function(t):
+            if t < 1.0:
+                return None
+            return np.full((2, 2, 3), 99, np.uint8)
+
+        bg = FrameLayer(image=np.zeros((4, 4, 3), np.uint8), end=2.0)
+        dyn = FrameLayer(frame_function=frame_function, size=(2, 2), end=2.0)
+        timeline = FrameTimeline([bg, dyn], size=(4, 4))
+
+        assert timeline.make_frame(0.5).max() == 0
+        assert timeline.make_frame(1.5)[0, 0, 0] == 99
+
+    def test_fadeout_darkens_tail(self):
+        """TC-COMPOSITOR-006: apply_fadeout 只影響結尾"""
+        composer = NumpyFrameCompositor()
+        bg = composer.create_color_clip((4, 4), (200, 200, 200), 4.0)
+        timeline = composer.apply_fadeout(
+            composer.compose_clips([bg], size=(4, 4)), 2.0
+        )
+
+        assert timeline.duration == 4.0
+        assert timeline.make_frame(1.0)[0, 0, 0] == 200
+        assert timeline.make_frame(3.0)[0, 0, 0] == 100
+
+    def test_matches_moviepy_composite(self):
+        """TC-COMPOSITOR-007: 與 MoviePy CompositeVideoClip 輸出一致"""
+        moviepy = pytest.importorskip("moviepy")
+
+        bg = moviepy.ColorClip((120, 80), (255, 250, 233), duration=2.0)
+        sprite = np.zeros((20, 30, 4), np.uint8)
+        sprite[..., 0] = 255
+        sprite[5:15, 5:25, 3] = 255
+        fg = (moviepy.ImageClip(sprite, duration=1.0)
+              .with_start(0.5)
+              .with_position(("center", 10)))
+        clips = [bg, fg]
+
+        reference = moviepy.CompositeVideoClip(clips, size=(120, 80))
+        timeline = NumpyFrameCompositor().compose_clips(clips, size=(120, 80))
+
+        for t in (0.0, 0.75, 1.75):
+            expected = reference.get_frame(t).astype(int)
+            actual = timeline.make_frame(t).astype(int)
+            assert np.abs(expected - actual).max() <= 1
+
+
+class TestStaticPlate:
+    """靜態圖層預先攤平測試套件"""
+
+    @staticmethod
+    def _sprite(value, alpha):
+        img = np.zeros((10, 10, 4), np.uint8)
+        img[..., :3] = value
+        img[2:8, 2:8, 3] = alpha
+        return img
+
+    def test_bottom_static_layers_folded_into_plate(self):
+        """TC-COMPOSITOR-008: 底部靜態圖層合併進底圖,不再逐影格合成"""
+        bg = FrameLayer(image=np.full((20, 30, 3), 50, np.uint8), end=5.0)
+        letters = FrameLayer(image=self._sprite(200, 255), position=(2, 2))
+        zh = FrameLayer(image=self._sprite(100, 128), position=(15, 5))
+        timeline = FrameTimeline([bg, letters, zh], size=(30, 20),
+                                 duration=5.0)
+
+        assert timeline.dynamic_layer_count == 0
+        assert timeline.static_plate[5, 5, 0] == 200
+        np.testing.assert_array_equal(timeline.make_frame(4.0),
+                                      timeline.static_plate)
+
+    def test_static_run_above_dynamic_layer_is_merged(self):
+        """TC-COMPOSITOR-009: 動態圖層之上的靜態圖層合併為單一平面"""
+        video = FrameLayer(
+            frame_function=lambda t: np.full((20, 30, 3), int(t * 10),
+                                             np.uint8),
+            size=(30, 20), end=5.0,
+        )
+        sprites = [
+            (self._sprite(200, 255), (2, 2)),
+            (self._sprite(100, 128), (6, 4)),
+            (self._sprite(30, 200), (18, 8)),
+        ]
+        static = [FrameLayer(image=img, position=pos) for img, pos in sprites]
+        # 同內容但以動態函數提供,作為未攤平的對照組
+        reference = [
+            FrameLayer(frame_function=lambda t, img=img: img,
+                       position=pos, size=(10, 10))
+            for img, pos in sprites
+        ]
+
+        flattened = FrameTimeline([video] + static, size=(30, 20),
+                                  duration=5.0)
+        expected = FrameTimeline([video] + reference, size=(30, 20),
+                                 duration=5.0)
+
+        assert flattened.dynamic_layer_count == 2
+        for t in (0.0, 2.5, 4.9):
+            diff = (flattened.make_frame(t).astype(int)
+                    - expected.make_frame(t).astype(int))
+            assert np.abs(diff).max() <= 1
+
+    def test_partial_span_static_layer_stays_dynamic(self):
+        """TC-COMPOSITOR-010: 只在部分時間顯示的圖層不會被攤平"""
+        bg = FrameLayer(image=np.zeros((10, 10, 3), np.uint8), end=4.0)
+        hint = FrameLayer(image=np.full((10, 10, 3), 255, np.uint8),
+                          start=1.0, end=2.0)
+        timeline = FrameTimeline([bg, hint], size=(10, 10))
+
+        assert timeline.dynamic_layer_count == 1
+        assert timeline.static_plate.max() == 0
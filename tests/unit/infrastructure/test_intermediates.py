@@ -0,0 +1,151 @@
+"""單元測試: 片頭 / 片尾中介檔
+
+此測試驗證 infrastructure/video/intermediates.py:
+- 中介檔依來源與輸出設定快取,命中時不重新編碼
+- 片頭停留秒數延長中介檔長度
+- 片尾黑邊偵測
+- 中介檔與 pipe 編碼的主段落可串流複製串接
+- 串接後的視頻在 FADE_IN_DURATION 有關鍵影格(由片頭中介檔提供)
+"""
+
+import os
+import subprocess
+
+import numpy as np
+import pytest
+
+from spellvid.infrastructure.video.ffmpeg_concat import (
+    h264_parameter_sets,
+    plan_concat_segments,
+    scan_source,
+)
+from spellvid.infrastructure.video.ffmpeg_pipe import (
+    SILENT_AUDIO,
+    encode_frames,
+    resolve_ffmpeg_exe,
+)
+from spellvid.infrastructure.video.intermediates import (
+    OutputSpec,
+    detect_letterbox,
+    prepare_intermediate,
+    splice_segments,
+)
+from spellvid.shared.constants import FADE_IN_DURATION
+
+SPEC = OutputSpec(width=64, height=48, fps=10)
+
+
+@pytest.fixture
+def ffmpeg_exe(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPELLVID_CACHE_DIR", str(tmp_path / "cache"))
+    try:
+        return resolve_ffmpeg_exe()
+    except RuntimeError:
+        pytest.skip("ffmpeg not available")
+
+
+def _lavfi_source(ffmpeg_exe, path, source, duration=1.0):
+    subprocess.run(
+        [ffmpeg_exe, "-y", "-loglevel", "error", "-f", "lavfi", "-i",
+         f"{source}:duration={duration}", "-pix_fmt", "yuv420p",
+         "-colorspace", "bt709", str(path)],
+        check=True,
+    )
+    return str(path)
+
+
+class TestIntermediates:
+    """中介檔測試套件"""
+
+    def test_cache_hit_skips_encoding(self, ffmpeg_exe, tmp_path):
+        """TC-INTER-001: 相同來源與設定直接回傳快取檔"""
+        src = _lavfi_source(ffmpeg_exe, tmp_path / "entry.mp4",
+                            "testsrc=size=80x60:rate=25")
+
+        first = prepare_intermediate(src, "entry", SPEC)
+        mtime = os.stat(first).st_mtime_ns
+        second = prepare_intermediate(src, "entry", SPEC)
+        other = prepare_intermediate(src, "entry", SPEC, hold_sec=0.5)
+
+        assert first == second
+        assert other != first
+        assert os.stat(first).st_mtime_ns == mtime
+
+    def test_entry_hold_extends_duration(self, ffmpeg_exe, tmp_path):
+        """TC-INTER-002: 片頭停留以最後一格延長,並補上靜音音軌"""
+        src = _lavfi_source(ffmpeg_exe, tmp_path / "entry.mp4",
+                            "testsrc=size=80x60:rate=25")
+
+        path = prepare_intermediate(src, "entry", SPEC, hold_sec=1.0)
+        info = scan_source(path, ffmpeg_exe)
+
+        assert (info.width, info.height, info.fps) == (64, 48, 10.0)
+        assert info.duration == pytest.approx(2.0, abs=0.1)
+        assert info.has_audio
+
+    def test_detect_letterbox(self, ffmpeg_exe, tmp_path):
+        """TC-INTER-003: 偵測黑邊,內容區域外擴 2px"""
+        src = tmp_path / "boxed.mp4"
+        subprocess.run(
+            [ffmpeg_exe, "-y", "-loglevel", "error", "-f", "lavfi", "-i",
+             "color=c=white:size=64x32:rate=10:duration=1",
+             "-vf", "pad=64:48:0:8:black", "-pix_fmt", "yuv420p", str(src)],
+            check=True,
+        )
+
+        x, y, w, h = detect_letterbox(scan_source(str(src), ffmpeg_exe),
+                                      ffmpeg_exe)
+
+        assert (x, w) == (0, 64)
+        assert 5 <= y <= 7 and 34 <= h <= 38
+
+    def test_splice_with_pipe_encoded_main(self, ffmpeg_exe, tmp_path):
+        """TC-INTER-004: 中介檔與主段落參數集一致,串流複製串接"""
+        entry = prepare_intermediate(
+            _lavfi_source(ffmpeg_exe, tmp_path / "entry.mp4",
+                          "testsrc=size=80x60:rate=25"),
+            "entry", SPEC, hold_sec=0.5,
+        )
+        ending = prepare_intermediate(
+            _lavfi_source(ffmpeg_exe, tmp_path / "ending.mp4",
+                          "color=c=red:size=64x48:rate=30"),
+            "ending", SPEC,
+        )
+        frame = np.full((48, 64, 3), 128, np.uint8)
+        main = str(tmp_path / "main.mp4")
+        encode_frames(lambda t: frame, 1.0, main, size=(64, 48), fps=10,
+                      audio=SILENT_AUDIO)
+        output = str(tmp_path / "final.mp4")
+
+        splice_segments([entry, main, ending], output)
+
+        reference = h264_parameter_sets(ffmpeg_exe, main)
+        assert h264_parameter_sets(ffmpeg_exe, entry) == reference
+        assert h264_parameter_sets(ffmpeg_exe, ending) == reference
+        info = scan_source(output, ffmpeg_exe)
+        assert info.duration == pytest.approx(3.5, abs=0.1)
+        assert info.has_audio
+
+    def test_spliced_keyframe_at_fade_in(self, ffmpeg_exe, tmp_path):
+        """TC-INTER-005: 片頭在淡入結束處有關鍵影格,淡入只重編到那裡"""
+        entry = prepare_intermediate(
+            _lavfi_source(ffmpeg_exe, tmp_path / "entry.mp4",
+                          "testsrc=size=80x60:rate=25"),
+            "entry", SPEC, hold_sec=0.5,
+        )
+        frame = np.full((48, 64, 3), 128, np.uint8)
+        main = str(tmp_path / "main.mp4")
+        encode_frames(lambda t: frame, 2.0, main, size=(64, 48), fps=10,
+                      audio=SILENT_AUDIO)
+        output = str(tmp_path / "final.mp4")
+
+        splice_segments([entry, main], output)
+
+        info = scan_source(output, ffmpeg_exe)
+        # concat demuxer 讓視頻從 AAC 前置延遲之後開始,以第一格為基準
+        start = info.keyframes[0]
+        offsets = [k - start for k in info.keyframes]
+        assert any(abs(k - FADE_IN_DURATION) < 1e-3 for k in offsets)
+        segments = plan_concat_segments([info, info], FADE_IN_DURATION)
+        assert segments[1].end - start == pytest.approx(FADE_IN_DURATION,
+                                                        abs=1e-3)
@@ -0,0 +1,125 @@
+"""單元測試: 字母素材圖集
+
+此測試驗證 infrastructure/rendering/letter_atlas.py:
+- 圖集中的字形與逐次解碼縮放的結果相同,以 np.memmap 載入
+- 規格載入使用圖集索引的尺寸,不再開啟 PNG
+- 素材變更時圖集自動重建,並沿用建立時的額外高度
+- 上下文建立(dry-run)不建立圖集
+"""
+
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from spellvid.infrastructure.rendering import image_loader, letter_atlas
+from spellvid.infrastructure.rendering.image_loader import (
+    _load_letter_image_specs,
+)
+from spellvid.infrastructure.rendering.letter_atlas import (
+    build_letter_atlas,
+    default_letter_size,
+    load_letter_atlas,
+)
+
+
+def _write_letter(path, size, color):
+    Image.new("RGBA", size, color).save(path)
+
+
+@pytest.fixture
+def asset_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPELLVID_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(letter_atlas, "_atlases", {})
+    base = tmp_path / "AZ"
+    base.mkdir()
+    _write_letter(base / "I.png", (120, 400), (200, 10, 10, 255))
+    _write_letter(base / "i_small.png", (90, 150), (10, 10, 200, 128))
+    (base / "notes.txt").write_text("ignored")
+    return str(base)
+
+
+class TestLetterAtlas:
+    """字母素材圖集測試套件"""
+
+    def test_glyphs_match_decode_and_resize(self, asset_dir):
+        """TC-ATLAS-001: 圖集字形與 PIL 解碼縮放結果一致"""
+        atlas = load_letter_atlas(asset_dir)
+
+        assert atlas.source_size("I.png") == (120, 400)
+        assert "notes.txt" not in atlas
+        for name in ("I.png", "i_small.png"):
+            w, h = default_letter_size(*atlas.source_size(name))
+            with Image.open(os.path.join(asset_dir, name)) as img:
+                expected = np.array(
+                    img.convert("RGBA").resize((w, h), Image.LANCZOS))
+            glyph = atlas.get(name, w, h)
+            assert isinstance(glyph.base, np.memmap)
+            assert np.array_equal(glyph, expected)
+        assert atlas.get("I.png", 1, 1) is None
+        assert load_letter_atlas(asset_dir) is atlas
+
+    def test_specs_read_from_index(self, asset_dir, monkeypatch):
+        """TC-ATLAS-002: 規格載入不開啟 PNG,缺失項目照常回報"""
+        expected, _ = _load_letter_image_specs("I i", asset_dir)
+        atlas = load_letter_atlas(asset_dir)
+
+        def _no_open(*args, **kwargs):
+            raise AssertionError("Image.open should not be called")
+
+        monkeypatch.setattr(image_loader.Image, "open", _no_open)
+        specs, missing = _load_letter_image_specs("I i Z", asset_dir,
+                                                  atlas=atlas)
+
+        assert specs == expected
+        assert [m["reason"] for m in missing] == ["missing"]
+
+    def test_rebuilt_when_asset_changes(self, asset_dir):
+        """TC-ATLAS-003: 素材尺寸或修改時間變更時重建圖集"""
+        atlas = load_letter_atlas(asset_dir)
+        path = os.path.join(asset_dir, "I.png")
+        _write_letter(path, (60, 300), (0, 0, 0, 255))
+        os.utime(path, ns=(1, 1))
+
+        rebuilt = load_letter_atlas(asset_dir)
+
+        assert rebuilt is not atlas
+        assert rebuilt.source_size("I.png") == (60, 300)
+        assert not os.path.exists(atlas.data_path)
+        letter_atlas._atlases.clear()
+        assert load_letter_atlas(asset_dir, build=False).index == \
+            rebuilt.index
+
+    def test_rebuild_keeps_extra_heights(self, asset_dir):
+        """TC-ATLAS-004: 自動重建沿用 build_letter_atlas 的額外高度"""
+        built = build_letter_atlas(asset_dir, extra_heights=[200])
+        assert built.get("I.png", 60, 200) is not None
+
+        path = os.path.join(asset_dir, "i_small.png")
+        _write_letter(path, (60, 100), (0, 0, 0, 255))
+        os.utime(path, ns=(1, 1))
+        rebuilt = load_letter_atlas(asset_dir)
+
+        assert rebuilt.data_path != built.data_path
+        assert rebuilt.index["extra_heights"] == [200]
+        assert rebuilt.get("I.png", 60, 200) is not None
+        assert rebuilt.get("i_small.png", 120, 200) is not None
+
+    def test_context_does_not_build(self, asset_dir, monkeypatch):
+        """TC-ATLAS-005: prepare_letters_context 只讀取已建立的圖集"""
+        from spellvid.application.context_builder import (
+            prepare_letters_context,
+        )
+
+        def _no_build(*args, **kwargs):
+            raise AssertionError("atlas should not be built")
+
+        monkeypatch.setattr(letter_atlas, "build_letter_atlas", _no_build)
+        ctx = prepare_letters_context({"letters": "I i",
+                                       "letters_asset_dir": asset_dir})
+
+        assert ctx["filenames"] == ["I.png", "i_small.png"]
+        heights = [e["height"] for e in ctx["layout"]["letters"]]
+        assert heights[0] > heights[1] > 0
+        assert os.listdir(letter_atlas.cache_dir("letter_atlas")) == []
@@ -0,0 +1,81 @@
+"""單元測試: 解碼後 PCM 快取
+
+此測試驗證 infrastructure/media/pcm_cache.py:
+- 第一次載入解碼並寫入快取,之後以記憶體映射開啟、不再解碼
+- 來源檔變更時重新解碼並移除舊快取檔
+"""
+
+import os
+import subprocess
+
+import numpy as np
+import pytest
+
+from spellvid.infrastructure.media import audio
+from spellvid.infrastructure.media.pcm_cache import load_pcm, pcm_cache_path
+from spellvid.infrastructure.video.ffmpeg_pipe import resolve_ffmpeg_exe
+
+
+def _write_tone(exe, path, freq):
+    subprocess.run(
+        [exe, "-y", "-loglevel", "error", "-f", "lavfi",
+         "-i", f"sine=frequency={freq}:sample_rate=22050:duration=0.4",
+         str(path)],
+        check=True,
+    )
+
+
+@pytest.fixture
+def tone(tmp_path, monkeypatch):
+    """0.4 秒、22.05kHz 單聲道 WAV;快取位於暫存目錄"""
+    try:
+        exe = resolve_ffmpeg_exe()
+    except RuntimeError:
+        pytest.skip("ffmpeg not available")
+    monkeypatch.setenv("SPELLVID_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "tone.wav"
+    _write_tone(exe, path, 440)
+    return exe, str(path)
+
+
+def _count_decodes(monkeypatch):
+    calls = []
+    real = audio.decode_audio_pcm
+    monkeypatch.setattr(audio, "decode_audio_pcm",
+                        lambda *a, **k: calls.append(a) or real(*a, **k))
+    return calls
+
+
+class TestPcmCache:
+    """PCM 快取測試套件"""
+
+    def test_hit_is_memory_mapped(self, tone, monkeypatch):
+        """TC-PCM-001: 重新取樣為 44.1kHz 立體聲,命中時不再解碼"""
+        _, path = tone
+        calls = _count_decodes(monkeypatch)
+
+        first = load_pcm(path)
+        second = load_pcm(path)
+
+        assert len(calls) == 1
+        assert isinstance(second, np.memmap)
+        assert second.dtype == np.float32
+        assert second.shape[1] == 2
+        assert abs(len(second) - int(0.4 * 44100)) <= 64
+        assert np.array_equal(first, second)
+        assert not second.flags.writeable
+
+    def test_source_change_invalidates(self, tone, monkeypatch):
+        """TC-PCM-002: 來源變更時重新解碼,舊快取檔被移除"""
+        exe, path = tone
+        load_pcm(path)
+        old_cache = pcm_cache_path(path, 44100, 2)
+
+        _write_tone(exe, path, 880)
+        os.utime(path, ns=(1, 1))
+        calls = _count_decodes(monkeypatch)
+        load_pcm(path)
+
+        assert len(calls) == 1
+        assert pcm_cache_path(path, 44100, 2) != old_cache
+        assert not os.path.exists(old_cache)
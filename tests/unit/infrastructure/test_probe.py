@@ -0,0 +1,108 @@
+"""單元測試: 媒體元資料探測
+
+此測試驗證 infrastructure/media/probe.py:
+- ffprobe JSON 與 ffmpeg 標頭兩種輸出解析為相同欄位
+- 旋轉角度、像素格式、聲道數與取樣率
+- probe_many 同時探測多個檔案,失敗的檔案對應 None
+"""
+
+import subprocess
+
+import pytest
+
+from spellvid.infrastructure.media.probe import (
+    MediaInfo,
+    parse_ffmpeg_header,
+    parse_ffprobe_json,
+    probe,
+    probe_many,
+)
+from spellvid.infrastructure.video.ffmpeg_pipe import resolve_ffmpeg_exe
+
+_VIDEO_HEADER = """\
+Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'a.mp4':
+  Duration: 00:01:02.50, start: 0.000000, bitrate: 20 kb/s
+  Stream #0:0[0x1](und): Video: h264 (High) (avc1 / 0x31637661), \
+yuv420p(tv, bt709/unknown/unknown, progressive), 1920x1080 \
+[SAR 1:1 DAR 16:9], 11 kb/s, 29.97 fps, 29.97 tbr, 30k tbn (default)
+      Metadata:
+        handler_name    : VideoHandler
+      Side data:
+        displaymatrix: rotation of -90.00 degrees
+  Stream #0:1[0x2](und): Audio: aac (LC) (mp4a / 0x6134706D), 44100 Hz, \
+stereo, fltp, 2 kb/s (default)
+At least one output file must be specified
+"""
+
+_AUDIO_HEADER = """\
+Input #0, mp3, from 'music.mp3':
+  Duration: 00:00:03.50, start: 0.025057, bitrate: 128 kb/s
+  Stream #0:0: Audio: mp3 (mp3float), 22050 Hz, mono, fltp, 32 kb/s
+"""
+
+_FFPROBE_JSON = {
+    "streams": [
+        {"codec_type": "video", "codec_name": "h264", "width": 1920,
+         "height": 1080, "pix_fmt": "yuv420p", "avg_frame_rate": "30000/1001",
+         "side_data_list": [{"side_data_type": "Display Matrix",
+                             "rotation": -90}]},
+        {"codec_type": "audio", "codec_name": "aac", "sample_rate": "44100",
+         "channels": 2},
+    ],
+    "format": {"duration": "62.500000"},
+}
+
+_EXPECTED = MediaInfo(
+    duration=62.5, width=1920, height=1080, fps=29.97, has_audio=True,
+    codec="h264", rotation=270, pix_fmt="yuv420p", audio_channels=2,
+    sample_rate=44100,
+)
+
+
+@pytest.fixture
+def ffmpeg_exe(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPELLVID_CACHE_DIR", str(tmp_path / "cache"))
+    try:
+        return resolve_ffmpeg_exe()
+    except RuntimeError:
+        pytest.skip("ffmpeg not available")
+
+
+class TestProbe:
+    """媒體元資料探測測試套件"""
+
+    def test_ffprobe_json_and_ffmpeg_header_agree(self):
+        """TC-PROBE-004: 兩種輸出解析出相同的型別化記錄"""
+        assert parse_ffprobe_json(_FFPROBE_JSON) == _EXPECTED
+        assert parse_ffmpeg_header(_VIDEO_HEADER) == _EXPECTED
+        assert _EXPECTED.display_size == (1080, 1920)
+
+    def test_audio_only_header(self):
+        """TC-PROBE-005: 純音訊檔案沒有尺寸,編碼為音訊編碼"""
+        info = parse_ffmpeg_header(_AUDIO_HEADER)
+
+        assert info.size is None
+        assert (info.duration, info.codec, info.audio_channels,
+                info.sample_rate) == (3.5, "mp3", 1, 22050)
+
+    def test_probe_many(self, ffmpeg_exe, tmp_path):
+        """TC-PROBE-006: 批次探測,無法探測的檔案對應 None"""
+        paths = []
+        for idx, rate in enumerate((10, 25)):
+            path = tmp_path / f"v{idx}.mp4"
+            subprocess.run(
+                [ffmpeg_exe, "-y", "-loglevel", "error", "-f", "lavfi",
+                 "-i", f"testsrc=size=64x48:rate={rate}:duration=1",
+                 "-pix_fmt", "yuv420p", str(path)],
+                check=True,
+            )
+            paths.append(str(path))
+        missing = str(tmp_path / "missing.mp4")
+
+        infos = probe_many(paths + [missing, paths[0]])
+
+        assert list(infos) == paths + [missing]
+        assert [infos[p].fps for p in paths] == [10.0, 25.0]
+        assert infos[paths[0]].pix_fmt == "yuv420p"
+        assert infos[missing] is None
+        assert probe(paths[1]) == infos[paths[1]]
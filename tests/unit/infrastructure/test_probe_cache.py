@@ -0,0 +1,88 @@
+"""單元測試: 持久化媒體探測快取
+
+此測試驗證 infrastructure/media/probe_cache.py:
+- 快取命中不再啟動 ffmpeg,檔案變動後失效
+- 跨實例(模擬新行程)共用 SQLite 記錄
+- FFmpegWrapper 與 _probe_media_duration 共用同一份快取
+"""
+
+import os
+import subprocess
+
+import pytest
+
+from spellvid.infrastructure.media import probe as probe_module
+from spellvid.infrastructure.media import probe_cache
+from spellvid.infrastructure.media.probe import MediaInfo, probe
+from spellvid.infrastructure.media.probe_cache import ProbeCache
+from spellvid.infrastructure.video.ffmpeg_pipe import resolve_ffmpeg_exe
+
+
+@pytest.fixture
+def cache_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPELLVID_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path
+
+
+def _make_video(path):
+    try:
+        ffmpeg = resolve_ffmpeg_exe()
+    except RuntimeError:
+        pytest.skip("ffmpeg not available")
+    subprocess.run(
+        [ffmpeg, "-y", "-loglevel", "error", "-f", "lavfi", "-i",
+         "testsrc=size=64x48:rate=10:duration=1", "-pix_fmt", "yuv420p",
+         str(path)],
+        check=True,
+    )
+    return str(path)
+
+
+class TestProbeCache:
+    """探測快取測試套件"""
+
+    def test_hit_skips_ffmpeg_and_invalidates_on_change(
+        self, cache_env, monkeypatch
+    ):
+        """TC-PROBE-001: 命中時不啟動 ffmpeg;檔案修改後重新探測"""
+        video = _make_video(cache_env / "v.mp4")
+        first = probe(video)
+
+        calls = []
+        real = probe_module.read_media_info
+        monkeypatch.setattr(probe_module, "read_media_info",
+                            lambda *a, **k: calls.append(a) or real(*a, **k))
+        assert probe(video) == first
+        assert calls == []
+
+        stat = os.stat(video)
+        os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        probe(video)
+        assert len(calls) == 1
+
+    def test_records_shared_across_instances(self, cache_env):
+        """TC-PROBE-002: 新實例(新行程)可讀到先前寫入的記錄"""
+        video = _make_video(cache_env / "v.mp4")
+        db_path = str(cache_env / "probe.sqlite3")
+        info = MediaInfo(duration=1.0, width=64, height=48, fps=10.0,
+                         has_audio=False, codec="h264")
+
+        ProbeCache(db_path).put(video, info)
+
+        assert ProbeCache(db_path).get(video) == info
+        assert ProbeCache(db_path).get(str(cache_env / "missing.mp4")) is None
+
+    def test_wrapper_and_legacy_probe_share_cache(self, cache_env):
+        """TC-PROBE-003: FFmpegWrapper 與 _probe_media_duration 共用快取"""
+        from spellvid.infrastructure.media.ffmpeg_wrapper import (
+            FFmpegWrapper,
+            _probe_media_duration,
+        )
+
+        video = _make_video(cache_env / "v.mp4")
+        wrapper = FFmpegWrapper()
+
+        assert wrapper.probe_dimensions(video) == (64, 48)
+        assert wrapper.probe_duration(video) == pytest.approx(1.0, abs=0.05)
+        assert _probe_media_duration(video) == pytest.approx(1.0, abs=0.05)
+        assert probe_cache.get_probe_cache().get(video).fps == 10.0
@@ -0,0 +1,62 @@
+"""單元測試: 程序化進度條圖層
+
+此測試驗證 infrastructure/ui/progress_bar.py 的 make_frame 進度條:
+- 寬度計算與 plan_segments 的分段結果一致
+- 平滑模式每影格縮短
+- 影格內容等同於基底陣列的右對齊切片
+"""
+
+import numpy as np
+
+from spellvid.infrastructure.ui.progress_bar import (
+    generate_base_arrays,
+    make_progress_bar_frame_function,
+    plan_segments,
+    progress_width_at,
+)
+
+
+class TestProgressBarLayer:
+    """進度條 make_frame 測試套件"""
+
+    def test_stepped_width_matches_plan_segments(self):
+        """TC-PROGRESS-001: fps 模式的寬度與 plan_segments 相同"""
+        segments = plan_segments(3, 5, fps=10, bar_width=200)
+        for seg in segments[:-1]:
+            mid = (seg["start"] + seg["end"]) / 2
+            assert progress_width_at(mid, 3, 200, fps=10) == seg["width"]
+            assert progress_width_at(seg["start"], 3, 200,
+                                     fps=10) == seg["width"]
+
+    def test_smooth_width_shrinks_every_frame(self):
+        """TC-PROGRESS-002: 平滑模式在 10Hz 分段內仍持續縮短"""
+        widths = [progress_width_at(i / 30, 10, 1792) for i in range(301)]
+
+        assert widths[0] == 1792
+        assert widths[-1] == 0
+        assert all(a >= b for a, b in zip(widths, widths[1:]))
+        # 同一個 0.1 秒分段內仍有三個不同寬度
+        assert len(set(widths[30:33])) == 3
+
+    def test_frame_is_right_aligned_slice_of_base_arrays(self):
+        """TC-PROGRESS-003: 影格為基底色彩/遮罩的右對齊切片"""
+        color, mask = generate_base_arrays(400)
+        make_frame = make_progress_bar_frame_function(4, bar_width=400)
+
+        for t in (0.0, 1.0, 3.5, 0.5):
+            frame = make_frame(t)
+            width = progress_width_at(t, 4, 400)
+            x_start = 400 - width
+            assert frame.shape == (32, 400, 4)
+            np.testing.assert_array_equal(frame[..., :3], color)
+            assert frame[:, :x_start, 3].max(initial=0) == 0
+            np.testing.assert_array_equal(frame[:, x_start:, 3],
+                                          mask[:, x_start:])
+
+    def test_bar_hidden_after_countdown(self):
+        """TC-PROGRESS-004: 倒數結束後回傳 None"""
+        make_frame = make_progress_bar_frame_function(2, bar_width=100)
+
+        assert make_frame(1.99) is not None
+        assert make_frame(2.0) is None
+        assert make_progress_bar_frame_function(0, bar_width=100)(0.0) is None
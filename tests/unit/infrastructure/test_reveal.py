@@ -0,0 +1,79 @@
+"""單元測試: 打字機 reveal 圖層
+
+此測試驗證 infrastructure/ui/reveal.py:
+- 整字只點陣化一次,前綴以裁切取得且與逐前綴渲染的字形一致
+  (字距調整或字形外伸時改用該前綴的點陣圖)
+- 影格函數依時間回傳同一點陣圖的視圖
+- video_service 以單一動態圖層呈現 reveal
+"""
+
+import numpy as np
+
+from spellvid.application.video_service import (
+    _prepare_all_context,
+    _render_reveal_layer,
+)
+from spellvid.infrastructure.rendering import sprite_cache
+from spellvid.infrastructure.rendering.pillow_adapter import (
+    render_text_sprite,
+)
+from spellvid.infrastructure.rendering.sprite_cache import SpriteCache
+from spellvid.infrastructure.ui.reveal import (
+    make_reveal_frame_function,
+    render_reveal_prefixes,
+    render_reveal_sprite,
+)
+
+
+class TestReveal:
+    """打字機 reveal 測試套件"""
+
+    def test_prefix_crop_matches_prefix_render(self, monkeypatch):
+        """TC-REVEAL-001: 前綴畫面與舊版固定畫布的前綴渲染相同"""
+        monkeypatch.setattr(sprite_cache, "_cache", SpriteCache())
+        # "AV"/"Ty" 字距調整、"fjord" 的 f 外伸到 j 之上
+        for word in ("Ice cream", "AV", "Ty", "Wave", "fjord"):
+            sprite, edges = render_reveal_sprite(word)
+            prefixes = render_reveal_prefixes(word)
+
+            assert len(edges) == len(prefixes) == len(word)
+            assert edges == sorted(edges) and edges[-1] == sprite.shape[1]
+            assert np.shares_memory(prefixes[-1], sprite)
+            fixed = (sprite.shape[1], sprite.shape[0])
+            for idx in range(1, len(word)):
+                legacy = render_text_sprite(
+                    word[:idx], font_size=128, color=(0, 0, 0),
+                    extra_bottom=48, fixed_size=fixed,
+                )
+                edge = edges[idx - 1]
+                assert np.array_equal(prefixes[idx - 1], legacy[:, :edge]), \
+                    (word, idx)
+                # 裁切範圍外不應有前綴的墨水
+                assert not legacy[:, edge:, 3].any()
+
+    def test_frame_function_returns_views(self):
+        """TC-REVEAL-002: 每影格回傳預先裁切的視圖,寬度逐字增加"""
+        sprite, edges = render_reveal_sprite("Ice")
+        prefixes = render_reveal_prefixes("Ice")
+        make_frame = make_reveal_frame_function(prefixes, 0.5)
+
+        assert make_frame(-0.1) is None
+        widths = [make_frame(t).shape[1] for t in (0.0, 0.49, 0.5, 1.0, 9.0)]
+        assert widths == [edges[0], edges[0], edges[1], edges[2], edges[2]]
+        assert np.shares_memory(make_frame(0.7), sprite)
+
+    def test_service_uses_single_layer(self):
+        """TC-REVEAL-003: reveal 為一個置中底部的動態圖層"""
+        ctx = _prepare_all_context({
+            "letters": "I i", "word_en": "Ice", "word_zh": "冰",
+            "image_path": "", "music_path": "", "countdown_sec": 3,
+            "reveal_hold_sec": 2,
+        })
+
+        layer = _render_reveal_layer(ctx)
+
+        width, height = layer.size
+        assert not layer.is_static
+        assert (layer.start, layer.end) == (3.0, 8.0)
+        assert layer.position == ((1920 - width) // 2, 1080 - height - 48)
+        assert layer.frame_function(2.0).shape[1] == width
@@ -0,0 +1,93 @@
+"""單元測試: 文字點陣圖快取
+
+此測試驗證 infrastructure/rendering/sprite_cache.py:
+- 相同參數回傳同一份唯讀陣列
+- 記憶體層依位元組上限淘汰最久未使用的項目
+- 磁碟層讓新的快取實例(新的 worker)跳過點陣化
+- 文字與注音渲染經由快取
+"""
+
+import numpy as np
+import pytest
+
+from spellvid.infrastructure.rendering import sprite_cache
+from spellvid.infrastructure.rendering.pillow_adapter import (
+    _make_text_imageclip,
+    _render_chinese_zhuyin_image,
+    render_text_sprite,
+)
+from spellvid.infrastructure.rendering.sprite_cache import (
+    SpriteCache,
+    get_sprite_cache,
+)
+
+
+def _counting_render(calls, value=7, shape=(4, 5, 4)):
+    def render():
+        calls.append(1)
+        return np.full(shape, value, np.uint8)
+    return render
+
+
+class TestSpriteCache:
+    """點陣圖快取測試套件"""
+
+    def test_same_key_returns_shared_readonly_array(self):
+        """TC-SPRITE-001: 命中時不重新點陣化,回傳唯讀的同一物件"""
+        cache = SpriteCache()
+        calls = []
+
+        first = cache.get_or_render(("t", "00:10"), _counting_render(calls))
+        second = cache.get_or_render(("t", "00:10"), _counting_render(calls))
+
+        assert first is second
+        assert len(calls) == 1
+        assert not first.flags.writeable
+        with pytest.raises(ValueError):
+            first[0, 0, 0] = 1
+
+    def test_lru_eviction_by_bytes(self):
+        """TC-SPRITE-002: 超過位元組上限時淘汰最久未使用的項目"""
+        cache = SpriteCache(max_bytes=2 * 80)
+        calls = []
+        for key in ("a", "b"):
+            cache.get_or_render((key,), _counting_render(calls))
+        cache.get_or_render(("a",), _counting_render(calls))  # a 變為最新
+        cache.get_or_render(("c",), _counting_render(calls))  # 淘汰 b
+
+        cache.get_or_render(("a",), _counting_render(calls))
+        assert len(calls) == 3
+        cache.get_or_render(("b",), _counting_render(calls))
+        assert len(calls) == 4
+        assert len(cache) == 2
+
+    def test_disk_tier_shared_across_instances(self, tmp_path, monkeypatch):
+        """TC-SPRITE-003: 啟用磁碟層時,新實例直接讀取 .npz"""
+        monkeypatch.setenv("SPELLVID_CACHE_DIR", str(tmp_path))
+        monkeypatch.setenv("SPELLVID_SPRITE_DISK_CACHE", "1")
+        calls = []
+
+        first = get_sprite_cache().get_or_render(
+            ("t", "x"), _counting_render(calls, value=9))
+        fresh = SpriteCache(disk_dir=get_sprite_cache().disk_dir)
+        again = fresh.get_or_render(("t", "x"), _counting_render(calls))
+
+        assert len(calls) == 1
+        assert np.array_equal(first, again)
+        assert list((tmp_path / "sprites").glob("*.npz"))
+
+    def test_text_and_zhuyin_renderers_use_cache(self, monkeypatch):
+        """TC-SPRITE-004: 文字與注音渲染結果共用,參數不同則分開"""
+        monkeypatch.setattr(sprite_cache, "_cache", SpriteCache())
+
+        timer = render_text_sprite("00:10", font_size=64, bg=(0, 0, 0))
+        plain = render_text_sprite("00:10", font_size=64)
+        clip = _make_text_imageclip("00:10", font_size=64, bg=(0, 0, 0))
+
+        assert render_text_sprite("00:10", font_size=64,
+                                  bg=(0, 0, 0)) is timer
+        assert plain is not timer and plain.shape[0] < timer.shape[0]
+        assert np.array_equal(clip.get_frame(0), timer)
+        assert _render_chinese_zhuyin_image("冰") is \
+            _render_chinese_zhuyin_image("冰")
+        assert get_sprite_cache().hits >= 2
@@ -0,0 +1,107 @@
+"""單元測試: 倒數計時器圖層
+
+此測試驗證 infrastructure/ui/timer.py:
+- 數字與冒號的字形表每個字型大小只渲染一次
+- 以字形表組合的 "MM:SS" 與整串文字渲染的字形位置一致
+- 單一影格函數依時間切換文字,文字不變時不重新組合
+- video_service 以單一動態圖層呈現計時器
+"""
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from spellvid.application.video_service import (
+    _prepare_all_context,
+    _render_timer_layer,
+)
+from spellvid.infrastructure.rendering.pillow_adapter import (
+    _find_system_font,
+)
+from spellvid.infrastructure.ui import timer
+from spellvid.infrastructure.ui.timer import (
+    format_timer_text,
+    get_glyph_sheet,
+    make_timer_frame_function,
+)
+
+
+def _context(**overrides):
+    item = {
+        "letters": "I i", "word_en": "Ice", "word_zh": "冰",
+        "image_path": "", "music_path": "", "countdown_sec": 75,
+        "reveal_hold_sec": 2,
+    }
+    item.update(overrides)
+    return _prepare_all_context(item)
+
+
+class TestTimer:
+    """倒數計時器測試套件"""
+
+    def test_glyph_sheet_rendered_once(self, monkeypatch):
+        """TC-TIMER-001: 相同字型大小共用字形表,不同大小分開"""
+        monkeypatch.setattr(timer, "_glyph_sheet_cache", {})
+        calls = []
+        real = timer._rasterize_glyph_sheet
+        monkeypatch.setattr(timer, "_rasterize_glyph_sheet",
+                            lambda *a: calls.append(a) or real(*a))
+
+        sheet = get_glyph_sheet(64)
+        make_timer_frame_function(90)
+        make_timer_frame_function(5)
+
+        assert get_glyph_sheet(64) is sheet
+        assert len(calls) == 1
+        assert get_glyph_sheet(48) is not sheet
+        assert not sheet.sheet.flags.writeable
+
+    def test_composed_text_matches_full_render(self):
+        """TC-TIMER-002: 組合結果的墨水位置與整串渲染相同"""
+        sheet = get_glyph_sheet(64)
+        text = "01:15"
+        coverage = np.zeros((sheet.height, sheet.text_width(text)),
+                            np.uint8)
+        sheet.compose(text, coverage)
+
+        img = Image.new("L", coverage.shape[::-1], 0)
+        ImageDraw.Draw(img).text((sheet.pad_x, sheet.pad_y), text,
+                                 font=_find_system_font(False, 64),
+                                 fill=255)
+        full = np.array(img)
+
+        # 字形位置取整到像素,與整串渲染最多只有邊緣反鋸齒差異
+        assert coverage.any()
+        assert np.abs(coverage.astype(int) - full).mean() < 4
+
+    def test_frame_function_switches_each_second(self, monkeypatch):
+        """TC-TIMER-003: 每秒切換文字,同一秒內回傳同一緩衝區不重組"""
+        make_frame, (width, height) = make_timer_frame_function(75)
+        composes = []
+        sheet = get_glyph_sheet(64)
+        real = type(sheet).compose
+        monkeypatch.setattr(type(sheet), "compose",
+                            lambda s, *a: composes.append(a[0]) or
+                            real(s, *a))
+
+        first = make_frame(0.0)
+        snapshot = first.copy()
+        assert make_frame(0.5) is first
+        later = make_frame(1.0)
+        changed = not np.array_equal(snapshot, later)
+        done = make_frame(80.0)
+
+        assert first.shape == (height, width, 3)
+        assert changed
+        assert composes == ["01:15", "01:14", "00:00"]
+        assert format_timer_text(75) == "01:15"
+        assert done is first
+
+    def test_service_uses_single_layer(self):
+        """TC-TIMER-004: 計時器為一個全程動態圖層,可隱藏"""
+        layer = _render_timer_layer(_context())
+
+        assert not layer.is_static
+        assert layer.position == (64, 450)
+        assert (layer.start, layer.end) == (0.0, 80.0)
+        assert layer.frame_function(0.0).shape[:2] == layer.size[::-1]
+        assert _render_timer_layer(_context(timer_visible="false")) is None
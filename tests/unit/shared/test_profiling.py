@@ -0,0 +1,91 @@
+"""單元測試: 渲染階段計時
+
+此測試驗證 shared/profiling.py:
+- stage / add_stage 記錄牆鐘與 CPU 時間,to_dict 含影格數與峰值記憶體
+- encode_frames 在使用中的 profiler 回報合成與編碼子階段
+- Chrome trace-event 輸出與 --profile 參數
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from spellvid.cli.parser import build_parser
+from spellvid.infrastructure.video.ffmpeg_pipe import encode_frames
+from spellvid.shared.profiling import (
+    RenderProfiler,
+    active_profiler,
+    collect_profiles,
+    to_chrome_trace,
+    write_profile,
+)
+
+
+class TestRenderProfiler:
+    """渲染階段計時測試套件"""
+
+    def test_stages_recorded(self):
+        """TC-PROF-001: 階段依序記錄,例外時仍有計時"""
+        profiler = RenderProfiler("Ice")
+        with profiler.stage("plan"):
+            sum(range(10000))
+        with pytest.raises(RuntimeError):
+            with profiler.stage("background"):
+                raise RuntimeError("boom")
+
+        data = profiler.to_dict()
+
+        assert [s["name"] for s in data["stages"]] == ["plan", "background"]
+        for stage in data["stages"]:
+            assert stage["wall_sec"] >= 0 and stage["cpu_sec"] >= 0
+        assert data["label"] == "Ice"
+        assert data["wall_sec"] >= data["stages"][0]["wall_sec"]
+        assert data["peak_rss_mb"] is None or data["peak_rss_mb"] > 0
+        assert active_profiler() is None
+
+    def test_encode_reports_substages(self, tmp_path):
+        """TC-PROF-002: encode_frames 回報影格數與合成/編碼子階段"""
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        profiler = RenderProfiler("tiny")
+
+        with profiler.activate():
+            with profiler.stage("compose_export"):
+                encode_frames(lambda t: frame, 0.5, str(tmp_path / "a.mp4"),
+                              size=(64, 48), fps=10, preset="ultrafast")
+
+        data = profiler.to_dict()
+        assert data["frames"] == 5
+        substages = {s["name"]: s for s in data["stages"]
+                     if s.get("parent") == "compose_export"}
+        assert set(substages) == {"composite", "encode"}
+        total = data["stages"][0]["wall_sec"]
+        assert sum(s["wall_sec"] for s in substages.values()) <= total + 1e-3
+
+    def test_chrome_trace_and_cli(self, tmp_path):
+        """TC-PROF-003: trace-event 依 pid 分組,子階段巢狀於上層階段"""
+        profiler = RenderProfiler("Ice")
+        with profiler.stage("compose_export"):
+            pass
+        profiler.add_stage("composite", 0.0, parent="compose_export")
+        result = {"metadata": {"profile": profiler.to_dict()},
+                  "results": [{"success": True, "skipped": True}]}
+        profiles = collect_profiles(result)
+
+        trace = to_chrome_trace(profiles)
+        spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert [e["name"] for e in spans] == ["compose_export", "composite"]
+        assert spans[0]["ts"] == spans[1]["ts"]
+        assert {e["pid"] for e in spans} == {profiles[0]["pid"]}
+
+        path = write_profile(str(tmp_path / "p.json"), profiles, fmt="chrome")
+        with open(path, encoding="utf-8") as handle:
+            assert "traceEvents" in json.load(handle)
+        with pytest.raises(ValueError):
+            write_profile(str(tmp_path / "p.txt"), profiles, fmt="csv")
+
+        args = build_parser().parse_args([
+            "batch", "--json", "a.json", "--profile", "out.json",
+            "--profile-format", "chrome",
+        ])
+        assert (args.profile, args.profile_format) == ("out.json", "chrome")
@@ -3,6 +3,7 @@
 測試目標:
 - validate_schema() 驗證 JSON 資料符合 schema
 - load_json() 載入 JSON 檔案
+- iter_batch_items() 串流讀取 JSON Lines / CSV,逐行回報驗證錯誤
 - SCHEMA 定義的完整性
 
 遵循 TDD 原則: 這些測試在實作前應該失敗
@@ -266,3 +267,71 @@ def test_validate_schema_rejects_empty_dict():
 
     with pytest.raises(Exception):
         validate_schema({})
+
+
+# === iter_batch_items() 測試 ===
+
+def test_iter_batch_items_jsonl_reports_line_errors(tmp_path):
+    """驗證 JSON Lines 逐行驗證,錯誤以行號回報且不中斷讀取
+
+    測試案例: TC-VALIDATION-010
+    前置條件: .jsonl 含空白行、格式錯誤行與缺欄位行
+    預期結果: 有效行照常產生,錯誤行帶行號與錯誤訊息
+    """
+    from spellvid.shared.validation import iter_batch_items
+
+    jsonl = tmp_path / "words.jsonl"
+    jsonl.write_text(
+        '{"letters": "I i", "word_en": "Ice", "word_zh": "冰"}\n'
+        "\n"
+        "{not json}\n"
+        '{"letters": "A a", "word_en": "Apple"}\n'
+        '{"letters": "B b", "word_en": "Ball", "word_zh": "球"}\n',
+        encoding="utf-8",
+    )
+
+    records = iter_batch_items(str(jsonl))
+    first = next(records)
+    assert (first.line, first.item["word_en"]) == (1, "Ice")
+
+    rest = list(records)
+    assert [r.line for r in rest] == [3, 4, 5]
+    assert not rest[0].ok and "JSON" in rest[0].errors[0]
+    assert rest[1].errors == ["缺少必填欄位: word_zh"]
+    assert rest[2].ok and rest[2].item["word_zh"] == "球"
+
+
+def test_iter_batch_items_csv_formats(tmp_path):
+    """驗證 CSV 支援單字表格式與 SCHEMA 欄位格式
+
+    測試案例: TC-VALIDATION-011
+    前置條件: doc/Fry_Words_1_500.csv 格式與 SCHEMA 欄位名稱的 CSV
+    預期結果: 單字表由首字母推導 letters;SCHEMA 欄位依型別轉換
+    """
+    from spellvid.shared.validation import iter_batch_items
+
+    fry = tmp_path / "fry.csv"
+    fry.write_text(
+        "\ufeffWord,詞性,中文翻譯,例句\n"
+        "able,其他,能夠的,He is able to swim.\n"
+        "bus,公車\n",
+        encoding="utf-8",
+    )
+    good, bad = iter_batch_items(str(fry))
+    assert good.item == {"word_en": "able", "word_zh": "能夠的",
+                         "letters": "Aa"}
+    assert (bad.line, bad.errors) == (3, ["缺少必填欄位: word_zh"])
+
+    typed = tmp_path / "typed.csv"
+    typed.write_text(
+        "letters,word_en,word_zh,countdown_sec,timer_visible,image_path\n"
+        "I i,Ice,冰,8,false,\n",
+        encoding="utf-8",
+    )
+    (record,) = iter_batch_items(str(typed))
+    assert record.item == {"letters": "I i", "word_en": "Ice",
+                           "word_zh": "冰", "countdown_sec": 8,
+                           "timer_visible": False}
+
+    with pytest.raises(FileNotFoundError):
+        iter_batch_items(str(tmp_path / "missing.csv"))